@@ -0,0 +1,257 @@
+"""Sphinx extension: check image references while the site is built.
+
+As each document is read (``doctree-read``), its image references are
+recorded in the environment: image nodes (with their candidate source
+files) and ``src`` attributes in raw HTML, along with the section they
+appear in. The references are pickled with the environment, so documents
+an incremental build doesn't re-read keep theirs (``env-purge-doc`` drops a
+document's references before it is re-read, ``env-merge-info`` collects
+them from parallel readers).
+
+Once all documents are read (``env-updated``), the set of files the HTML
+build will output is known: pages, images collected from image nodes
+(copied to ``_images/``), static and extra files, theme static files
+already in the output's ``_static/`` and directories copied in after the
+build (``image_checks_copied_dirs``, output prefix -> source directory).
+The references of every document, re-read or not, are then checked:
+
+- image nodes must point at a readable source image, and
+- ``src`` attributes in raw HTML must resolve to an output file.
+
+Errors are logged as warnings at the reference's location, plus the topic
+and content block the image comes from, e.g. ``tasks:zoom-in-on-backend``.
+At ``build-finished`` a summary is printed and, with
+``image_checks_strict`` (the default), the build exits with status 1.
+
+This replaces a post-build pass that re-read and parsed every HTML file.
+"""
+
+import posixpath
+import re
+import sys
+from pathlib import Path
+from typing import Optional
+
+SRC_ATTRIBUTE = re.compile(r'\bsrc\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+EXTERNAL = ('http://', 'https://', 'data:', 'blob:', '//')
+# Sections the builder generates from metadata.yaml rather than content blocks
+METADATA_SECTIONS = {"Learning Questions", "Learning Objectives", "Key Takeaways", "Related Pull Requests"}
+
+
+def is_external(src: str) -> bool:
+    return src.startswith(EXTERNAL)
+
+
+def raw_html_sources(html: str) -> list[str]:
+    """Local src attribute values in a raw HTML snippet."""
+    return [src for src in SRC_ATTRIBUTE.findall(html) if not is_external(src)]
+
+
+def resolve_output_path(docname: str, src: str) -> str:
+    """Output path (relative to the output root) an src on docname's page points at."""
+    src = src.split('#')[0].split('?')[0]
+    if src.startswith('/'):
+        return posixpath.normpath(src.lstrip('/'))
+    return posixpath.normpath(posixpath.join(posixpath.dirname(docname), src))
+
+
+def output_files(outdir: Path, docnames, images: dict, static_dirs: list[Path], extra_dirs: list[Path],
+                 copied_dirs: Optional[dict[str, Path]] = None, page_suffix: str = ".html",
+                 image_dir: str = "_images") -> set[str]:
+    """Files (relative POSIX paths) the HTML build will have in its output.
+
+    Args:
+        outdir: Output directory (files already in its _static/ count, e.g.
+            theme static files; anything else there may be stale)
+        docnames: Documents that will be written as pages
+        images: env.images (source path -> (docnames, output file name))
+        static_dirs: html_static_path directories (copied to _static/)
+        extra_dirs: html_extra_path directories (copied to the root)
+        copied_dirs: Output prefix -> directory copied there after the build
+    """
+    files = {f"{docname}{page_suffix}" for docname in docnames}
+    files |= {f"{image_dir}/{name}" for _, name in images.values()}
+    directories = [("_static/", d) for d in static_dirs] + [("", d) for d in extra_dirs]
+    directories += [(f"{prefix.strip('/')}/", d) for prefix, d in (copied_dirs or {}).items()]
+    for prefix, directory in directories:
+        if directory.is_dir():
+            files |= {prefix + p.relative_to(directory).as_posix() for p in directory.rglob("*") if p.is_file()}
+    if (outdir / "_static").is_dir():
+        files |= {p.relative_to(outdir).as_posix() for p in (outdir / "_static").rglob("*") if p.is_file()}
+    return files
+
+
+def section_title(node) -> Optional[str]:
+    """Title of the section a node is in, if any."""
+    from docutils import nodes
+
+    parent = node.parent
+    while parent is not None and not isinstance(parent, nodes.section):
+        parent = parent.parent
+    if parent is not None and parent.children and isinstance(parent[0], nodes.title):
+        return parent[0].astext()
+    return None
+
+
+def image_references(doctree) -> list[dict]:
+    """Local image references of a read doctree.
+
+    Returns list of dicts with:
+        - kind: 'image' (image node) or 'raw' (src in raw HTML)
+        - src: Referenced URI
+        - paths: Candidate source files of an image node
+        - section: Title of the enclosing section
+        - line: Source line, if known
+    """
+    from docutils import nodes
+
+    references = []
+    for node in doctree.findall(nodes.image):
+        uri = node.get('uri', '')
+        if is_external(uri) or '://' in uri:
+            continue
+        # Images given with a '*' extension have one candidate per mimetype
+        paths = sorted(set(node.get('candidates', {}).values())) or [uri]
+        references.append({'kind': 'image', 'src': uri, 'paths': paths,
+                           'section': section_title(node), 'line': node.line})
+
+    for node in doctree.findall(nodes.raw):
+        if 'html' not in node.get('format', '').split():
+            continue
+        for src in raw_html_sources(node.astext()):
+            references.append({'kind': 'raw', 'src': src, 'paths': [],
+                               'section': section_title(node), 'line': node.line})
+    return references
+
+
+class BlockLocator:
+    """Find the topic content block an image reference comes from.
+
+    Documents are named after topics (architecture/<topic id>); within a
+    topic, the block whose content mentions the image file is taken,
+    preferring one whose heading is the section title.
+    """
+
+    def __init__(self, topics_dir: Path):
+        self.topics_dir = topics_dir
+        self.topics: dict[str, Optional[object]] = {}
+
+    def topic(self, topic_id: str):
+        if topic_id not in self.topics:
+            try:
+                sys.path.insert(0, str(self.topics_dir.parent / "scripts"))
+                from compiled_topics import compile_topic
+                self.topics[topic_id] = compile_topic(topic_id, self.topics_dir)
+            except Exception:
+                # Not a topic page, or a topic that doesn't compile (reported by validation)
+                self.topics[topic_id] = None
+        return self.topics[topic_id]
+
+    def locate(self, docname: str, src: str, section: Optional[str] = None) -> Optional[str]:
+        """'topic:block-id' (or 'topic metadata.yaml') for an image src, if found."""
+        topic_id = posixpath.basename(docname)
+        topic = self.topic(topic_id)
+        if topic is None:
+            return None
+        if section in METADATA_SECTIONS:
+            return f"{topic_id} metadata.yaml"
+        name = posixpath.basename(src.split('#')[0].split('?')[0])
+        blocks = [block for block in topic.blocks if name in block.text]
+        blocks.sort(key=lambda block: (block.heading or "").strip() != section)
+        return blocks[0].location if blocks else topic_id
+
+
+class ImageChecker:
+    """Event handlers checking image references during an HTML build.
+
+    References are kept per document in ``env.image_check_references``.
+    """
+
+    def __init__(self):
+        self.outputs: Optional[set[str]] = None
+        self.locator: Optional[BlockLocator] = None
+        self.errors: list[str] = []
+
+    def enabled(self, app) -> bool:
+        return app.builder.format == "html"
+
+    @staticmethod
+    def references(env) -> dict[str, list[dict]]:
+        if not hasattr(env, "image_check_references"):
+            env.image_check_references = {}
+        return env.image_check_references
+
+    def doctree_read(self, app, doctree):
+        self.references(app.env)[app.env.docname] = image_references(doctree)
+
+    def env_purge_doc(self, app, env, docname: str):
+        self.references(env).pop(docname, None)
+
+    def env_merge_info(self, app, env, docnames, other):
+        references = self.references(other)
+        self.references(env).update({docname: references[docname] for docname in docnames if docname in references})
+
+    def env_updated(self, app, env):
+        if not self.enabled(app):
+            return
+        confdir = Path(app.confdir)
+        self.outputs = output_files(
+            Path(app.outdir),
+            env.found_docs,
+            dict(env.images),
+            [confdir / path for path in app.config.html_static_path],
+            [confdir / path for path in app.config.html_extra_path],
+            {prefix: confdir / path for prefix, path in app.config.image_checks_copied_dirs.items()},
+            page_suffix=app.builder.out_suffix,
+            image_dir=app.builder.imagedir,
+        )
+        topics_dir = app.config.image_checks_topics_dir
+        self.locator = BlockLocator(Path(topics_dir) if topics_dir else confdir.parents[1] / "topics")
+
+        self.errors = []
+        srcdir = Path(app.srcdir)
+        for docname, references in sorted(self.references(env).items()):
+            for reference in references:
+                src = reference['src']
+                if reference['kind'] == 'image':
+                    if not any(path in env.images and (srcdir / path).is_file() for path in reference['paths']):
+                        self.report(docname, reference, f"image not found: {src}")
+                elif resolve_output_path(docname, src) not in self.outputs:
+                    self.report(docname, reference, f"raw HTML src not in build output: {src}")
+
+    def report(self, docname: str, reference: dict, message: str) -> None:
+        from sphinx.util import logging
+
+        where = self.locator.locate(docname, reference['src'], reference['section']) if self.locator else None
+        if where:
+            message += f" (topic block {where})"
+        self.errors.append(f"{docname}: {message}")
+        logging.getLogger(__name__).warning(message, location=(docname, reference['line']), type="image-check")
+
+    def build_finished(self, app, exception):
+        if exception is not None or self.outputs is None:
+            return
+        from sphinx.util import logging
+
+        logger = logging.getLogger(__name__)
+        if self.errors:
+            logger.info(f"❌ {len(self.errors)} broken image reference(s)")
+            if app.config.image_checks_strict:
+                app.statuscode = 1
+        else:
+            logger.info("✓ All image references resolve")
+
+
+def setup(app):
+    app.add_config_value("image_checks_topics_dir", None, "env")
+    app.add_config_value("image_checks_strict", True, "env")
+    app.add_config_value("image_checks_copied_dirs", {}, "env")
+
+    checker = ImageChecker()
+    # After Sphinx's image collector (priority 500) has resolved candidates
+    app.connect("doctree-read", checker.doctree_read, priority=600)
+    app.connect("env-purge-doc", checker.env_purge_doc)
+    app.connect("env-merge-info", checker.env_merge_info)
+    app.connect("env-updated", checker.env_updated)
+    app.connect("build-finished", checker.build_finished)
+    return {"version": "1.0", "env_version": 1, "parallel_read_safe": True, "parallel_write_safe": True}
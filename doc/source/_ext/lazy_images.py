@@ -0,0 +1,79 @@
+"""Sphinx extension: intrinsic sizes and lazy-loading hints for images.
+
+The Sphinx builder annotates images with their intrinsic size
+(``![alt](../_images/x.png){width=640px height=480px}``). Docutils renders
+those as an inline ``style="width: 640px; height: 480px;"`` (and Sphinx as
+``width="640px"`` for SVGs), which pins the height and distorts images that
+the theme scales down to fit narrow screens. This extension rewrites them
+into plain ``width``/``height`` attributes, which browsers use to reserve
+space (avoiding layout shift) while CSS keeps scaling proportional.
+
+Every image also gets ``decoding="async"``, and every image but the first on
+a page ``loading="lazy"``, so images below the fold are fetched on demand.
+"""
+
+import re
+
+IMG_TAG = re.compile(r"<img\b[^>]*>")
+ATTRIBUTE = re.compile(r'\s([\w-]+)="([^"]*)"')
+STYLE_DIMENSION = re.compile(r"(width|height)\s*:\s*([0-9.]+)px\s*;?\s*")
+PIXELS = re.compile(r"^([0-9.]+)(px)?$")
+
+
+def _pixels(value: str) -> str:
+    return str(round(float(value)))
+
+
+def rewrite_img_tag(tag: str, lazy: bool) -> str:
+    """Move pixel sizes from style into attributes and add loading hints."""
+    attributes = dict(ATTRIBUTE.findall(tag))
+
+    for name in ("width", "height"):
+        match = PIXELS.match(attributes.get(name, ""))
+        if match:
+            tag = tag.replace(f'{name}="{attributes[name]}"', f'{name}="{_pixels(match.group(1))}"', 1)
+
+    style = attributes.get("style")
+    if style:
+        dimensions = dict(STYLE_DIMENSION.findall(style))
+        if dimensions:
+            remaining = STYLE_DIMENSION.sub("", style).strip()
+            new_style = f' style="{remaining}"' if remaining else ""
+            tag = tag.replace(f' style="{style}"', new_style, 1)
+            for name, value in dimensions.items():
+                if name not in attributes:
+                    tag = _add_attribute(tag, name, _pixels(value))
+
+    if "decoding" not in attributes:
+        tag = _add_attribute(tag, "decoding", "async")
+    if lazy and "loading" not in attributes:
+        tag = _add_attribute(tag, "loading", "lazy")
+    return tag
+
+
+def _add_attribute(tag: str, name: str, value: str) -> str:
+    if tag.endswith("/>"):
+        return f'{tag[:-2].rstrip()} {name}="{value}" />'
+    return f'{tag[:-1].rstrip()} {name}="{value}">'
+
+
+def rewrite_images(html: str) -> str:
+    """Rewrite all <img> tags in a page body; the first image loads eagerly."""
+    count = 0
+
+    def replace(match):
+        nonlocal count
+        count += 1
+        return rewrite_img_tag(match.group(), lazy=count > 1)
+
+    return IMG_TAG.sub(replace, html)
+
+
+def on_html_page_context(app, pagename, templatename, context, doctree):
+    if "body" in context:
+        context["body"] = rewrite_images(context["body"])
+
+
+def setup(app):
+    app.connect("html-page-context", on_html_page_context)
+    return {"version": "1.0", "parallel_read_safe": True, "parallel_write_safe": True}
@@ -6,6 +6,10 @@
 
 import datetime
 import os
+import sys
+
+# Local extensions
+sys.path.insert(0, os.path.abspath("_ext"))
 
 # -- General configuration ------------------------------------------------
 
@@ -13,11 +17,15 @@ import os
 extensions = [
     "myst_parser",
     "sphinx.ext.intersphinx",
+    "lazy_images",
+    "image_checks",
 ]
 
 # MyST parser configuration - matches Galaxy's setup
 myst_enable_extensions = [
     "attrs_block",
+    # Image sizes: ![alt](src){width=640px height=480px}
+    "attrs_inline",
     "deflist",
     "substitution",
     "colon_fence",
@@ -56,6 +64,12 @@ html_theme_options = {
 
 html_baseurl = "https://galaxyproject.org/architecture/"
 
+# Images carry their intrinsic size; don't turn them into links to themselves
+html_scaled_image_link = False
+
+# image_checks: images/ is copied into the site after the build (for slides)
+image_checks_copied_dirs = {"images": "../../images"}
+
 # Templates path
 templates_path = ["_templates"]
 
@@ -6,6 +6,8 @@ Usage:
     python outputs/sphinx-docs/build.py all
 """
 
+import inspect
+import re
 import sys
 import shutil
 from pathlib import Path
@@ -14,7 +16,13 @@ from typing import Optional
 # Add scripts to path so we can import models
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
 
+from artifact_store import ArtifactStore, input_key, topic_inputs
+from build_cache import cache_path, hash_file, hash_text, load_json, save_json
+from build_metrics import BuildMetrics
+from image_dimensions import ImageDimensions
 from models import load_metadata, load_content, ContentBlockType
+from pull_requests import format_pull_request_markdown, load_cached_pull_requests
+from symbol_index import link_code_references, load_symbol_index, save_symbols
 
 
 def strip_speaker_notes(markdown: str) -> str:
@@ -68,8 +76,6 @@ def _process_pull_directives(markdown: str) -> str:
     Extracts both directives and formats them as:
     LEFT_CONTENT | RIGHT_CONTENT
     """
-    import re
-
     # Look for .pull-left[ and .pull-right[ patterns
     left_match = re.search(r'\.pull-left\[', markdown)
     right_match = re.search(r'\.pull-right\[', markdown)
@@ -117,8 +123,6 @@ def _unwrap_remark_directives(markdown: str) -> str:
 
     Uses bracket counting to handle multi-line content and nested brackets.
     """
-    import re
-
     while True:
         # Find the next directive
         match = re.search(r'\.(\w+)\[', markdown)
@@ -152,8 +156,6 @@ def process_markdown_for_sphinx(markdown: str, topic_id: str) -> str:
 
     Note: Speaker notes should be stripped per-block before this is called.
     """
-    import re
-
     # Handle .pull-left and .pull-right directives specially
     # Convert them to a two-column layout for Sphinx
     markdown = _process_pull_directives(markdown)
@@ -196,6 +198,24 @@ def process_markdown_for_sphinx(markdown: str, topic_id: str) -> str:
     return markdown
 
 
+def add_image_dimensions(markdown: str, dimensions: ImageDimensions, images_dir: Path = Path("images")) -> str:
+    """Annotate images with their intrinsic size using MyST inline attributes.
+
+    ![alt](../_images/name.png) becomes ![alt](../_images/name.png){width=640px height=480px}
+    so browsers can reserve space before the image loads. Images that already
+    have attributes, or whose size is unknown (e.g. not yet generated), are
+    left as they are. The lazy_images extension turns the resulting styles
+    into width/height attributes and adds loading hints.
+    """
+    def annotate(match):
+        size = dimensions.get(images_dir / match.group(2))
+        if not size:
+            return match.group(1)
+        return f"{match.group(1)}{{width={size[0]}px height={size[1]}px}}"
+
+    return re.sub(r'(!\[[^\]]*\]\(\.\./_images/([^)\s]+)\))(?!\{)', annotate, markdown)
+
+
 def rewrite_image_paths_for_sphinx(markdown: str) -> str:
     """Rewrite image paths to work in Sphinx documentation context.
 
@@ -212,8 +232,6 @@ def rewrite_image_paths_for_sphinx(markdown: str) -> str:
     - Builds to: doc/build/html/architecture/file.html with src="../../images/img.svg"
     - Resolves to: doc/build/html/images/img.svg ✓
     """
-    import re
-
     # Handle shared images: ../../../../shared/images/ → ../../images/
     markdown = re.sub(
         r'(\[.*?\])\(../../../../shared/images/',
@@ -263,15 +281,19 @@ def get_block_content(block, topic_dir: Path) -> str:
     return ""
 
 
-def generate_topic_markdown(topic_id: str, topic_dir: Path) -> str:
-    """Generate markdown for a single topic.
+def topic_markdown_parts(topic_id: str, topic_dir: Path) -> list[str]:
+    """Generate a topic's markdown as separate parts, before Sphinx transforms.
+
+    The parts are the header (title, questions, objectives), one part per
+    rendered content block and the footer (key points, pull requests);
+    joined with newlines they form the topic document.
 
     Args:
         topic_id: Topic identifier
         topic_dir: Path to topic directory
 
     Returns:
-        Generated markdown content
+        List of markdown parts
     """
     # Load metadata and content
     metadata, content = load_metadata(topic_id), load_content(topic_id)
@@ -297,6 +319,8 @@ def generate_topic_markdown(topic_id: str, topic_dir: Path) -> str:
             lines.append(f"- {obj}")
         lines.append("")
 
+    parts = ["\n".join(lines)]
+
     # Process content blocks
     for block in content.root:
         # Check if doc rendering is explicitly disabled
@@ -322,6 +346,8 @@ def generate_topic_markdown(topic_id: str, topic_dir: Path) -> str:
         # Strip speaker notes from block content
         block_content = strip_speaker_notes(block_content)
 
+        lines = []
+
         # Add heading if present
         if block.heading:
             lines.append(f"## {block.heading}")
@@ -330,6 +356,9 @@ def generate_topic_markdown(topic_id: str, topic_dir: Path) -> str:
         # Add content
         lines.append(block_content)
         lines.append("")
+        parts.append("\n".join(lines))
+
+    lines = []
 
     # Add key points as summary
     if metadata.training.key_points:
@@ -338,13 +367,94 @@ def generate_topic_markdown(topic_id: str, topic_dir: Path) -> str:
             lines.append(f"- {point}")
         lines.append("")
 
+    # Add related pull requests, enriched with titles/status when resolved
+    # (run scripts/pull_requests.py to populate the cache)
+    if metadata.related_pull_requests:
+        resolved = load_cached_pull_requests()
+        lines.append("## Related Pull Requests")
+        for item in metadata.related_pull_requests:
+            lines.append(format_pull_request_markdown(item, resolved))
+        lines.append("")
+
+    if lines:
+        parts.append("\n".join(lines))
+    return parts
+
+
+def generate_topic_markdown(topic_id: str, topic_dir: Path) -> str:
+    """Generate markdown for a single topic.
+
+    Args:
+        topic_id: Topic identifier
+        topic_dir: Path to topic directory
+
+    Returns:
+        Generated markdown content
+    """
     # Build final markdown and rewrite image paths for Sphinx context
-    markdown = "\n".join(lines)
+    markdown = "\n".join(topic_markdown_parts(topic_id, topic_dir))
     markdown = rewrite_image_paths_for_sphinx(markdown)
 
     return markdown
 
 
+def transform_part(markdown: str, topic_id: str) -> str:
+    """Apply the Sphinx text transforms to one part of a topic document."""
+    return process_markdown_for_sphinx(rewrite_image_paths_for_sphinx(markdown), topic_id)
+
+
+# Bump when the transforms' output changes without a change to their source
+# (e.g. through a helper not listed in TRANSFORMS)
+TRANSFORM_VERSION = 1
+TRANSFORMS = (
+    transform_part, rewrite_image_paths_for_sphinx, process_markdown_for_sphinx,
+    _process_pull_directives, _unwrap_remark_directives, _extract_directive_content,
+)
+
+
+class BlockTransformCache:
+    """Sphinx transform results memoized per block in .cache/sphinx_blocks.json.
+
+    The transforms only look at the text of one block at a time, so their
+    output is keyed by the hash of the block's markdown and the transform
+    version (TRANSFORM_VERSION plus the source of the transform functions,
+    so editing a transform invalidates its results). Editing one block of a
+    topic re-transforms just that block; the topic document is assembled
+    from the cached outputs.
+
+    Args:
+        cache_file: JSON file for the memoized outputs (default .cache/sphinx_blocks.json)
+    """
+
+    def __init__(self, cache_file: Optional[Path] = None):
+        self.cache_file = cache_file or cache_path("sphinx_blocks.json")
+        self.version = hash_text(str(TRANSFORM_VERSION) + "".join(inspect.getsource(f) for f in TRANSFORMS))
+        cached = load_json(self.cache_file) or {}
+        self.outputs: dict[str, str] = cached.get('outputs', {}) if cached.get('version') == self.version else {}
+        self.used: set[str] = set()
+        self.lookups = 0
+        self.misses = 0
+
+    def transform(self, markdown: str, topic_id: str) -> str:
+        key = hash_text(f"{topic_id}\0{markdown}")
+        self.used.add(key)
+        self.lookups += 1
+        if key not in self.outputs:
+            self.outputs[key] = transform_part(markdown, topic_id)
+            self.misses += 1
+        return self.outputs[key]
+
+    def topic_markdown(self, topic_id: str, topic_dir: Path) -> str:
+        """Sphinx markdown for a topic, transforming only blocks not seen before."""
+        return "\n".join(self.transform(part, topic_id) for part in topic_markdown_parts(topic_id, topic_dir))
+
+    def save(self, prune: bool = False) -> None:
+        """Persist the outputs; prune drops those not used since loading (after a full build)."""
+        outputs = {k: v for k, v in self.outputs.items() if k in self.used} if prune else self.outputs
+        if self.misses or len(outputs) != len(self.outputs):
+            save_json(self.cache_file, {'version': self.version, 'outputs': outputs})
+
+
 def copy_topic_images(topic_id: str, src_dir: Path, dest_dir: Path) -> None:
     """Copy images from topic to Sphinx _images directory.
 
@@ -362,13 +472,25 @@ def copy_topic_images(topic_id: str, src_dir: Path, dest_dir: Path) -> None:
         pass
 
 
-def generate_sphinx_docs(topic_name: str) -> None:
+# Files besides the topic's own inputs that a generated page depends on
+BUILDER_INPUTS = [
+    Path("outputs/sphinx-docs/build.py"),
+    Path("scripts/models.py"),
+    Path("scripts/image_dimensions.py"),
+    Path("scripts/pull_requests.py"),
+    Path("scripts/symbol_index.py"),
+]
+
+
+def generate_sphinx_docs(topic_name: str, metrics: Optional[BuildMetrics] = None,
+                         store: Optional[ArtifactStore] = None) -> None:
     """Generate Sphinx documentation for a topic.
 
     Args:
         topic_name: Topic ID or 'all' for all topics
+        metrics: Records per-topic durations, sizes and cache hits (not saved here)
+        store: Artifact store to restore pages with unchanged inputs from (not saved here)
     """
-    import shutil
     topics_dir = Path("topics")
     outputs_dir = Path("outputs/sphinx-docs/generated/architecture")
     doc_arch_dir = Path("doc/source/architecture")
@@ -385,6 +507,18 @@ def generate_sphinx_docs(topic_name: str) -> None:
             if asset_file.is_file():
                 shutil.copy2(asset_file, doc_images_dir / asset_file.name)
 
+    metrics = metrics or BuildMetrics("sphinx")
+    dimensions = ImageDimensions()
+    blocks = BlockTransformCache()
+    # Deep-link code references when a Galaxy checkout is available (only
+    # the modules they name are parsed)
+    symbols = load_symbol_index()
+    # Inputs shared by all pages besides BUILDER_INPUTS: the indexed Galaxy
+    # commit and the resolved pull requests
+    pull_requests = cache_path("pull_requests.json")
+    shared_inputs = [symbols.head if symbols else "", hash_file(pull_requests) if pull_requests.exists() else ""]
+    restored = 0
+
     # Determine which topics to generate
     if topic_name == "all":
         topic_ids = [d.name for d in topics_dir.iterdir() if d.is_dir() and (d / "metadata.yaml").exists()]
@@ -400,11 +534,21 @@ def generate_sphinx_docs(topic_name: str) -> None:
             continue
 
         try:
-            # Generate markdown
-            markdown = generate_topic_markdown(topic_id, topic_dir)
-
-            # Process for Sphinx compatibility
-            sphinx_markdown = process_markdown_for_sphinx(markdown, topic_id)
+            key = input_key("sphinx", BUILDER_INPUTS + topic_inputs(topic_id, topics_dir), shared_inputs)
+            stored = store.get(key) if store else None
+            if stored:
+                sphinx_markdown = stored['page'].decode()
+                restored += 1
+            else:
+                # Generate markdown, processed for Sphinx compatibility block by block
+                with metrics.stage("markdown", topic_id):
+                    sphinx_markdown = blocks.topic_markdown(topic_id, topic_dir)
+                    sphinx_markdown = add_image_dimensions(sphinx_markdown, dimensions)
+                    sphinx_markdown = link_code_references(sphinx_markdown, symbols)
+                if store:
+                    store.put(key, {'page': sphinx_markdown.encode()})
+            images = set(re.findall(r'\]\(\.\./_images/([^)\s]+)\)', sphinx_markdown))
+            metrics.files("images", [Path("images") / name for name in sorted(images)], topic_id, name="image_bytes")
 
             # Write to outputs/sphinx-docs/generated/
             output_file = outputs_dir / f"{topic_id}.md"
@@ -415,12 +559,22 @@ def generate_sphinx_docs(topic_name: str) -> None:
             doc_file = doc_arch_dir / f"{topic_id}.md"
             doc_file.write_text(sphinx_markdown)
             print(f"✓ Copied to: {doc_file}")
+            metrics.files("write", [output_file, doc_file], topic_id)
 
         except Exception as e:
             print(f"❌ Error generating {topic_id}: {e}")
             import traceback
             traceback.print_exc()
 
+    dimensions.save()
+    if symbols:
+        save_symbols(symbols)
+    # Restored pages didn't use their blocks, so only prune after a full render
+    blocks.save(prune=topic_name == "all" and not restored)
+    metrics.cache("markdown", hits=blocks.lookups - blocks.misses, misses=blocks.misses)
+    if store:
+        metrics.cache("artifacts", hits=restored, misses=len(topic_ids) - restored)
+
 
 def update_architecture_index(topics_to_include: list[str]) -> None:
     """Update doc/source/architecture/index.md with generated topics.
@@ -503,8 +657,12 @@ if __name__ == "__main__":
 
     topic_name = sys.argv[1]
 
-    # Generate Sphinx docs
-    generate_sphinx_docs(topic_name)
+    # Generate Sphinx docs (single-topic runs are tracked separately so their
+    # timings aren't compared with full builds)
+    metrics = BuildMetrics("sphinx" if topic_name == "all" else f"sphinx/{topic_name}")
+    store = ArtifactStore()
+    generate_sphinx_docs(topic_name, metrics, store)
+    store.save()
 
     # Update index with all available topics
     topics_dir = Path("topics")
@@ -514,7 +672,9 @@ if __name__ == "__main__":
     ])
 
     if available_topics:
-        update_architecture_index(available_topics)
+        with metrics.stage("index"):
+            update_architecture_index(available_topics)
+    metrics.save()
 
     print("\n✓ Sphinx documentation generated successfully!")
     print(f"  Generated files: outputs/sphinx-docs/generated/architecture/")
@@ -7,16 +7,47 @@ Usage:
     uv run python outputs/training-slides/build.py all
 """
 
+import html
+import re
 import sys
 from pathlib import Path
-from jinja2 import Template
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 
 # Add scripts to path so we can import models
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
 
+from artifact_store import ArtifactStore, input_key, topic_inputs
+from build_cache import cache_root
+from build_metrics import BuildMetrics
+from image_dimensions import ImageDimensions
 from models import load_metadata, load_content, ContentBlockType
 
 
+def template_environment(auto_reload: bool = False, bytecode_cache: bool = True) -> Environment:
+    """Create the Jinja2 environment for the slide templates.
+
+    Compiled templates are kept in a bytecode cache under the build cache
+    directory, keyed by template source checksum, so each template version
+    is compiled once across processes (make build-slides runs one process
+    per topic). auto_reload is off for batch builds; long-running tools
+    that edit templates can turn it on, and turn off the bytecode cache to
+    keep compiled templates in memory only.
+    """
+    cache = None
+    if bytecode_cache:
+        bytecode_dir = cache_root() / "jinja2"
+        bytecode_dir.mkdir(parents=True, exist_ok=True)
+        cache = FileSystemBytecodeCache(str(bytecode_dir))
+    return Environment(
+        loader=FileSystemLoader(Path(__file__).parent),
+        auto_reload=auto_reload,
+        bytecode_cache=cache,
+    )
+
+
+templates = template_environment()
+
+
 def rewrite_image_paths_for_html(markdown: str, topic_name: str) -> str:
     """Rewrite image paths for standalone HTML slides.
 
@@ -34,8 +65,6 @@ def rewrite_image_paths_for_html(markdown: str, topic_name: str) -> str:
     - Shared resources: ../../../../shared/images/ -> ../../../../images/ (map to main images dir)
     - Relative paths: ../../images/ -> ../../../../images/
     """
-    import re
-
     # Handle GTN template variables - convert directly to root images
     # {{ site.baseurl }}/assets/images/filename.png -> ../../../../images/filename.png
     markdown = re.sub(
@@ -62,6 +91,26 @@ def rewrite_image_paths_for_html(markdown: str, topic_name: str) -> str:
     return markdown
 
 
+def add_image_hints(markdown: str, dimensions: ImageDimensions, images_dir: Path = Path("images")) -> str:
+    """Turn local images into <img> tags with intrinsic size and lazy loading.
+
+    Expects paths already rewritten by rewrite_image_paths_for_html(). The
+    width/height attributes let the browser reserve space before the image
+    loads; loading="lazy" defers images on slides that aren't shown yet.
+    Images whose size is unknown still get the loading hints.
+    """
+    def replace(match):
+        alt, src, name = match.groups()
+        attributes = [f'src="{html.escape(src)}"', f'alt="{html.escape(alt)}"']
+        size = dimensions.get(images_dir / name)
+        if size:
+            attributes += [f'width="{size[0]}"', f'height="{size[1]}"']
+        attributes += ['loading="lazy"', 'decoding="async"']
+        return f"<img {' '.join(attributes)}>"
+
+    return re.sub(r'!\[([^\]]*)\]\((\.\./\.\./\.\./\.\./images/([^)\s]+))\)', replace, markdown)
+
+
 def extract_markdown_from_content_block(block) -> str:
     """Extract markdown text from a content block.
 
@@ -101,7 +150,6 @@ def process_code_wrappers(text):
     code...
     ```]
     """
-    import re
     
     # Pattern: {.code} followed by optional blank lines, then code block
     pattern = r'\{\.code\}\s*\n(\s*)```(\w+)\n(.*?)```'
@@ -188,10 +236,23 @@ def markdown_to_slides(markdown_text):
     return slides
 
 
-def generate_slides(topic_name):
-    """Generate slides for a topic in two formats:
+def render_slides(topic_name, assets=None, dimensions=None):
+    """Render a topic's slides in two formats:
     1. slides.md - GTN-compatible Remark.js markdown format
     2. slides.html - Standalone HTML viewer with embedded Remark.js
+
+    Args:
+        topic_name: Topic ID
+        assets: Optional dict with 'remark_js' and 'fonts_css' URLs for
+            self-contained decks (see scripts/bundle_slides.py). By default
+            the HTML loads Remark.js from remarkjs.com and resolves font and
+            image paths at view time.
+        dimensions: ImageDimensions for the image size hints, kept by the
+            caller. By default the persistent cache is loaded, and saved
+            after rendering.
+
+    Returns:
+        Tuple of (GTN markdown, standalone HTML)
     """
     metadata = load_metadata(topic_name)
     content = load_content(topic_name)
@@ -263,8 +324,7 @@ class: center, middle
     formatted_slides_with_layouts = [layout_definitions_str] + formatted_slides
 
     # Generate GTN-compatible markdown format (slides.md)
-    gtn_template_path = Path(__file__).parent / "template.html"
-    gtn_template = Template(gtn_template_path.read_text())
+    gtn_template = templates.get_template("template.html")
 
     # Format title as "Architecture NN - <title>" for proper lexicographic sorting
     tutorial_num = metadata.training.tutorial_number
@@ -283,12 +343,17 @@ class: center, middle
     )
 
     # Generate standalone HTML format (slides.html)
-    html_wrapper_path = Path(__file__).parent / "html_wrapper_template.html"
-    html_wrapper_template = Template(html_wrapper_path.read_text())
+    html_wrapper_template = templates.get_template("html_wrapper_template.html")
 
     # Build markdown content for embedding in HTML
     # Rewrite image paths for HTML context (different depth than GTN markdown)
     fixed_slides = [rewrite_image_paths_for_html(slide, topic_name) for slide in formatted_slides]
+    persistent = dimensions is None
+    if persistent:
+        dimensions = ImageDimensions()
+    fixed_slides = [add_image_hints(slide, dimensions) for slide in fixed_slides]
+    if persistent:
+        dimensions.save()
 
     # Add layout definitions for HTML slides (these are Remark.js templates, not visible slides)
     html_layout_definitions_str = """
@@ -325,22 +390,61 @@ class: center, middle
         title=metadata.title,
         subtitle=metadata.training.subtitle,
         markdown_content=markdown_content,
+        assets=assets,
     )
 
-    # Write outputs
-    output_dir = Path(f"outputs/training-slides/generated/architecture-{topic_name}")
-    output_dir.mkdir(parents=True, exist_ok=True)
+    return gtn_output, html_output
+
+
+# Files besides the topic's own inputs that the rendered slides depend on
+BUILDER_INPUTS = [
+    Path("outputs/training-slides/build.py"),
+    Path("outputs/training-slides/template.html"),
+    Path("outputs/training-slides/html_wrapper_template.html"),
+    Path("scripts/models.py"),
+    Path("scripts/image_dimensions.py"),
+]
 
-    # Write GTN markdown format
-    md_file = output_dir / "slides.md"
-    md_file.write_text(gtn_output)
-    print(f"✓ Generated GTN slides: {md_file}")
-    print(f"  Copy to training-material/topics/dev/tutorials/architecture-{metadata.topic_id}/slides.html")
 
-    # Write standalone HTML format
+def generate_slides(topic_name, metrics=None, store=None):
+    """Generate slides.md and slides.html for a topic under generated/.
+
+    metrics (a BuildMetrics) records the render time and output sizes.
+    With an ArtifactStore, slides whose inputs are unchanged are restored
+    from it instead of rendered (the caller saves the store).
+    """
+    metrics = metrics or BuildMetrics("slides")
+    metadata = load_metadata(topic_name)
+
+    output_dir = Path(f"outputs/training-slides/generated/architecture-{topic_name}")
+    md_file = output_dir / "slides.md"
     html_file = output_dir / "slides.html"
-    html_file.write_text(html_output)
-    print(f"✓ Generated standalone HTML: {html_file}")
+    outputs = {'slides.md': md_file, 'slides.html': html_file}
+
+    key = input_key("slides", BUILDER_INPUTS + topic_inputs(topic_name)) if store else None
+    restored = bool(store) and store.restore(key, outputs)
+    if restored:
+        print(f"✓ Restored slides from the artifact store: {output_dir}")
+    else:
+        with metrics.stage("render", topic_name):
+            gtn_output, html_output = render_slides(topic_name)
+
+        # Write outputs
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        # Write GTN markdown format
+        md_file.write_text(gtn_output)
+        print(f"✓ Generated GTN slides: {md_file}")
+        print(f"  Copy to training-material/topics/dev/tutorials/architecture-{metadata.topic_id}/slides.html")
+
+        # Write standalone HTML format
+        html_file.write_text(html_output)
+        print(f"✓ Generated standalone HTML: {html_file}")
+        if store:
+            store.store(key, outputs)
+    if store:
+        metrics.cache("artifacts", hits=int(restored), misses=int(not restored))
+    metrics.files("write", [md_file, html_file], topic_name)
 
     return md_file, html_file
 
@@ -350,5 +454,10 @@ if __name__ == "__main__":
         print("Usage: uv run python outputs/training-slides/build.py <topic-name>")
         sys.exit(1)
 
-    generate_slides(sys.argv[1])
+    # One run per topic (make build-slides); tracked per topic so trends compare like with like
+    metrics = BuildMetrics(f"slides/{sys.argv[1]}")
+    store = ArtifactStore()
+    generate_slides(sys.argv[1], metrics, store)
+    store.save()
+    metrics.save()
 
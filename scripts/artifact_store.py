@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store of build outputs, shared across checkouts and CI runs.
+
+Build stages (diagram rendering, slides, Sphinx pages) hash their inputs
+into a key and look it up before doing any work; on a miss they do the
+work and store the outputs under the key. Like ccache, the store is a
+directory of blobs sharded by content hash plus an index:
+
+    <root>/objects/ab/cdef...   output contents, named by SHA-256
+    <root>/index.json           key -> {output name: blob}, size, last use
+
+Identical outputs of different keys share a blob. When the blobs exceed
+the size limit, the least recently used entries are evicted.
+
+The store lives in .cache/artifacts/ by default; set
+``GALAXY_ARCH_ARTIFACTS`` to share one store between worktrees, and
+``GALAXY_ARCH_ARTIFACTS_MAX_SIZE`` (e.g. 500M) to change the 256M limit.
+CI restores it from a tarball (``import``) and saves it after the build
+(``export``).
+
+Usage:
+    uv run python scripts/artifact_store.py stats
+    uv run python scripts/artifact_store.py export artifacts.tar.gz
+    uv run python scripts/artifact_store.py import artifacts.tar.gz
+    uv run python scripts/artifact_store.py evict --max-size 100M
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+# Add scripts to path for models
+sys.path.insert(0, str(Path(__file__).parent))
+from build_cache import cache_root, hash_bytes, hash_file, hash_text, load_json, save_json
+
+STORE_VERSION = 1
+DEFAULT_MAX_SIZE = 256 << 20
+SIZE_UNITS = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+BLOB_MEMBER = re.compile(r'^objects/([0-9a-f]{2})/([0-9a-f]{62})$')
+
+
+def parse_size(value: str) -> int:
+    """Parse a size such as '500M', '2G' or '1048576' into bytes.
+
+    Raises:
+        ValueError: If the size can't be parsed
+    """
+    match = re.fullmatch(r'\s*(\d+)\s*([KMG]?)i?B?\s*', value, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"invalid size: {value!r}")
+    return int(match.group(1)) * SIZE_UNITS[match.group(2).upper()]
+
+
+def format_size(size: float) -> str:
+    for unit in ('B', 'K', 'M'):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == 'B' else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}G"
+
+
+def store_root() -> Path:
+    """Store directory ($GALAXY_ARCH_ARTIFACTS or .cache/artifacts)."""
+    return Path(os.environ.get("GALAXY_ARCH_ARTIFACTS", cache_root() / "artifacts"))
+
+
+def input_key(stage: str, files: Iterable[Path] = (), extra: Iterable[str] = (), base: Path = Path(".")) -> str:
+    """Key of a build step from its stage name, input files and other inputs.
+
+    Files are identified by their path relative to base (so checkouts in
+    different places share keys) and their content hash; missing files
+    are part of the key too.
+    """
+    parts = [f"{STORE_VERSION}", stage]
+    for path in files:
+        full = base / path
+        parts.append(f"{path}:{hash_file(full) if full.is_file() else 'missing'}")
+    parts.extend(extra)
+    return hash_text("\0".join(parts))
+
+
+def topic_inputs(topic_id: str, topics_dir: Path = Path("topics"), images_dir: Path = Path("images")) -> list[Path]:
+    """A topic's input files plus the images they reference.
+
+    Builders put image sizes into their output, so the images are inputs
+    of a topic's pages too (missing ones, e.g. unrendered diagrams, count
+    as 'missing').
+    """
+    from compiled_topics import topic_input_files
+    from image_references import extract_image_names
+
+    files = topic_input_files(topic_id, topics_dir)
+    images = set()
+    for path in files:
+        images |= extract_image_names(path.read_text())
+    return files + [images_dir / name for name in sorted(images)]
+
+
+class ArtifactStore:
+    """Content-addressed blobs with an LRU-evicted index.
+
+    Lookups and stores update the in-memory index; save() merges it with
+    the index on disk (other processes may have added entries meanwhile),
+    evicts down to max_size and writes it back.
+
+    Args:
+        root: Store directory (default: store_root())
+        max_size: Blob size limit in bytes (default: $GALAXY_ARCH_ARTIFACTS_MAX_SIZE or 256M)
+    """
+
+    def __init__(self, root: Optional[Path] = None, max_size: Optional[int] = None):
+        self.root = root or store_root()
+        if max_size is None:
+            max_size = parse_size(os.environ.get("GALAXY_ARCH_ARTIFACTS_MAX_SIZE", str(DEFAULT_MAX_SIZE)))
+        self.max_size = max_size
+        self.entries, self.blobs = self._load_index()
+        self.changed: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def index_file(self) -> Path:
+        return self.root / "index.json"
+
+    def blob_path(self, blob: str) -> Path:
+        return self.root / "objects" / blob[:2] / blob[2:]
+
+    def _load_index(self) -> tuple[dict[str, dict], dict[str, int]]:
+        index = load_json(self.index_file) or {}
+        if index.get('version') != STORE_VERSION:
+            return {}, {}
+        return index.get('entries', {}), index.get('blobs', {})
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[dict[str, bytes]]:
+        """Outputs stored under key (output name -> contents), or None.
+
+        Blobs that are missing or don't match their hash (e.g. removed by
+        another process's eviction) make the lookup a miss.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        outputs = {}
+        for name, blob in entry['outputs'].items():
+            try:
+                data = self.blob_path(blob).read_bytes()
+            except FileNotFoundError:
+                data = None
+            if data is None or hash_bytes(data) != blob:
+                del self.entries[key]
+                self.changed.add(key)
+                self.misses += 1
+                return None
+            outputs[name] = data
+        entry['used'] = time.time()
+        self.changed.add(key)
+        self.hits += 1
+        return outputs
+
+    def write_blob(self, data: bytes) -> str:
+        """Write data as a blob (atomically, if not stored yet) and return its hash."""
+        blob = hash_bytes(data)
+        path = self.blob_path(blob)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".blob.", suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        self.blobs[blob] = len(data)
+        return blob
+
+    def put(self, key: str, outputs: dict[str, bytes]) -> None:
+        """Store outputs (output name -> contents) under key."""
+        blobs = {name: self.write_blob(data) for name, data in outputs.items()}
+        self.entries[key] = {'outputs': blobs, 'used': time.time()}
+        self.changed.add(key)
+
+    def restore(self, key: str, files: dict[str, Path]) -> bool:
+        """Write the outputs stored under key to files (output name -> path).
+
+        Returns:
+            True on a hit (all files written), False on a miss
+        """
+        outputs = self.get(key)
+        if outputs is None or set(outputs) != set(files):
+            return False
+        for name, path in files.items():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(outputs[name])
+        return True
+
+    def store(self, key: str, files: dict[str, Path]) -> None:
+        """Store the contents of files (output name -> path) under key."""
+        self.put(key, {name: path.read_bytes() for name, path in files.items()})
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    def size(self) -> int:
+        """Total size of the blobs referenced by the index."""
+        referenced = {blob for entry in self.entries.values() for blob in entry['outputs'].values()}
+        return sum(self.blobs.get(blob, 0) for blob in referenced)
+
+    def evict(self, max_size: Optional[int] = None) -> int:
+        """Drop least recently used entries until the blobs fit in max_size.
+
+        Returns:
+            Number of entries evicted
+        """
+        max_size = self.max_size if max_size is None else max_size
+        evicted = 0
+        size = self.size()
+        refcount: dict[str, int] = {}
+        for entry in self.entries.values():
+            for blob in set(entry['outputs'].values()):
+                refcount[blob] = refcount.get(blob, 0) + 1
+
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1]['used']):
+            if size <= max_size:
+                break
+            for blob in set(entry['outputs'].values()):
+                refcount[blob] -= 1
+                if not refcount[blob]:
+                    size -= self.blobs.get(blob, 0)
+            del self.entries[key]
+            evicted += 1
+
+        # Remove blobs no entry references any more
+        for blob in [b for b in self.blobs if not refcount.get(b)]:
+            self.blob_path(blob).unlink(missing_ok=True)
+            del self.blobs[blob]
+        return evicted
+
+    def save(self) -> None:
+        """Merge changes into the index on disk, evict, and write it."""
+        if not self.changed and self.size() <= self.max_size:
+            return
+        entries, blobs = self._load_index()
+        for key in self.changed:
+            if key in self.entries:
+                entries[key] = self.entries[key]
+            else:
+                entries.pop(key, None)
+        # Keep other processes' recent uses of entries we also loaded
+        for key, entry in self.entries.items():
+            if key in entries and key not in self.changed:
+                entries[key]['used'] = max(entries[key]['used'], entry['used'])
+        blobs.update(self.blobs)
+        self.entries, self.blobs = entries, blobs
+        self.evict()
+        self.write_index()
+
+    def write_index(self) -> None:
+        save_json(self.index_file, {'version': STORE_VERSION, 'entries': self.entries, 'blobs': self.blobs})
+        self.changed.clear()
+
+    def clear(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+        self.entries, self.blobs = {}, {}
+        self.changed.clear()
+
+    # ------------------------------------------------------------------
+    # Tarballs
+    # ------------------------------------------------------------------
+
+    def export(self, tarball: Path) -> int:
+        """Write the index and blobs to a gzipped tarball (e.g. for a CI cache).
+
+        Returns:
+            Number of entries exported
+        """
+        self.save()
+        with tarfile.open(tarball, "w:gz") as tar:
+            if self.index_file.exists():
+                tar.add(self.index_file, arcname="index.json")
+            for blob in sorted(self.blobs):
+                path = self.blob_path(blob)
+                if path.exists():
+                    tar.add(path, arcname=f"objects/{blob[:2]}/{blob[2:]}")
+        return len(self.entries)
+
+    def import_tarball(self, tarball: Path) -> int:
+        """Merge a tarball written by export() into the store.
+
+        Only blobs whose contents match their name are taken; entries
+        already in the store keep the more recent use time.
+
+        Returns:
+            Number of entries added
+        """
+        imported: dict[str, dict] = {}
+        with tarfile.open(tarball, "r:*") as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                f = tar.extractfile(member)
+                if f is None:
+                    continue
+                if member.name == "index.json":
+                    index = json.loads(f.read())
+                    if index.get('version') == STORE_VERSION:
+                        imported = index.get('entries', {})
+                    continue
+                match = BLOB_MEMBER.match(member.name)
+                if not match:
+                    continue
+                data = f.read()
+                if hash_bytes(data) == match.group(1) + match.group(2):
+                    self.write_blob(data)
+
+        added = 0
+        for key, entry in imported.items():
+            if not all(blob in self.blobs for blob in entry['outputs'].values()):
+                continue
+            if key in self.entries:
+                self.entries[key]['used'] = max(self.entries[key]['used'], entry['used'])
+            else:
+                self.entries[key] = entry
+                added += 1
+            self.changed.add(key)
+        self.save()
+        return added
+
+
+def print_stats(store: ArtifactStore) -> None:
+    print(f"\n{'='*60}")
+    print("ARTIFACT STORE")
+    print(f"{'='*60}\n")
+    print(f"Location: {store.root}")
+    print(f"Entries:  {len(store.entries)}")
+    print(f"Blobs:    {len(store.blobs)}")
+    print(f"Size:     {format_size(store.size())} of {format_size(store.max_size)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the content-addressed build artifact store')
+    parser.add_argument('--root', type=Path, help='Store directory (default: $GALAXY_ARCH_ARTIFACTS or .cache/artifacts)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('stats', help='Show store size and entry count')
+    export_parser = subparsers.add_parser('export', help='Write the store to a tarball')
+    export_parser.add_argument('tarball', type=Path)
+    import_parser = subparsers.add_parser('import', help='Merge a tarball into the store')
+    import_parser.add_argument('tarball', type=Path)
+    evict_parser = subparsers.add_parser('evict', help='Evict least recently used entries')
+    evict_parser.add_argument('--max-size', type=parse_size, help='Size to evict down to (default: the store limit)')
+    subparsers.add_parser('clear', help='Remove the store')
+
+    args = parser.parse_args()
+    store = ArtifactStore(args.root)
+
+    if args.command == 'stats':
+        print_stats(store)
+    elif args.command == 'export':
+        count = store.export(args.tarball)
+        print(f"✓ Exported {count} entries to {args.tarball}")
+    elif args.command == 'import':
+        if not args.tarball.exists():
+            print(f"ℹ️  No artifact tarball at {args.tarball}")
+            return
+        count = store.import_tarball(args.tarball)
+        print(f"✓ Imported {count} new entries from {args.tarball}")
+    elif args.command == 'evict':
+        evicted = store.evict(args.max_size)
+        store.write_index()
+        print(f"✓ Evicted {evicted} entries ({format_size(store.size())} left)")
+    elif args.command == 'clear':
+        store.clear()
+        print(f"✓ Removed {store.root}")
+
+
+if __name__ == '__main__':
+    main()
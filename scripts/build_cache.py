@@ -0,0 +1,93 @@
+"""Shared on-disk cache helpers for build and analysis scripts.
+
+All caches live under a single directory (``.cache/`` in the repository
+root by default, override with ``GALAXY_ARCH_CACHE_DIR``) so they can be
+cleared with ``make clean-cache`` and persisted between CI runs.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+
+def cache_root() -> Path:
+    """Return the root cache directory (not created)."""
+    return Path(os.environ.get("GALAXY_ARCH_CACHE_DIR", ".cache"))
+
+
+def cache_path(name: str) -> Path:
+    """Return path of a named cache file or directory, creating its parent.
+
+    Args:
+        name: Path relative to the cache root (e.g., 'links.json')
+    """
+    path = cache_root() / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def hash_bytes(data: bytes) -> str:
+    """Return the SHA-256 hex digest of bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """Return the SHA-256 hex digest of a UTF-8 string."""
+    return hash_bytes(text.encode("utf-8"))
+
+
+def fingerprint_name(name: str, data: bytes) -> str:
+    """Insert a content hash into a filename: 'remark.min.js' -> 'remark.<hash>.min.js'."""
+    base, _, extension = name.partition('.')
+    return f"{base}.{hash_bytes(data)[:12]}.{extension}"
+
+
+def hash_file(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_files(files: list[Path], salt: str = "") -> str:
+    """Cheap fingerprint of a set of files from their paths, sizes and mtimes.
+
+    Used to decide whether a derived index is stale without reading or
+    parsing its inputs.
+    """
+    parts = [salt]
+    for f in sorted(files):
+        stat = f.stat()
+        parts.append(f"{f}:{stat.st_size}:{stat.st_mtime_ns}")
+    return hash_text("\n".join(parts))
+
+
+def load_json(path: Path, default: Any = None) -> Any:
+    """Load JSON from a cache file, returning default if missing or corrupt."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+def save_json(path: Path, data: Any) -> None:
+    """Atomically write JSON to a cache file.
+
+    Writes to a temporary file in the same directory and renames it, so a
+    concurrent reader never sees a partially written cache.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Build metrics history with regression detection.
+
+Builders record structured metrics for each run (per-stage and per-topic
+durations, bytes written, cache hits and misses, image counts and sizes)
+and append them to a local SQLite database, .metrics/builds.sqlite
+(override with ``GALAXY_ARCH_METRICS_DB``). It lives outside .cache/ so
+``make clean-cache`` doesn't erase the history.
+
+The ``metrics`` command shows recent runs and per-stage trends, and flags
+stages whose latest duration regressed beyond a threshold compared with
+the median of the preceding runs (the rolling baseline).
+
+Recording from a builder:
+
+    metrics = BuildMetrics("sphinx")
+    with metrics.stage("markdown", topic="tasks"):
+        ...
+    metrics.add("markdown", "bytes_written", len(data), topic="tasks")
+    metrics.cache("blocks", hits=10, misses=2)
+    metrics.save()
+
+Usage:
+    uv run python scripts/build_metrics.py
+    uv run python scripts/build_metrics.py --builder sphinx --runs 20
+    uv run python scripts/build_metrics.py --threshold 0.5 --check
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+DEFAULT_DB = Path(".metrics") / "builds.sqlite"
+DEFAULT_THRESHOLD = 0.25  # 25% slower than the baseline
+DEFAULT_BASELINE_RUNS = 10
+# Stages faster than this are too noisy to flag
+MIN_DURATION = 0.05
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    builder TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    git_commit TEXT,
+    args TEXT
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    stage TEXT NOT NULL,
+    topic TEXT NOT NULL DEFAULT '',
+    name TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS metrics_run ON metrics(run_id);
+CREATE INDEX IF NOT EXISTS runs_builder ON runs(builder, id);
+"""
+
+
+def metrics_db() -> Path:
+    """Metrics database path ($GALAXY_ARCH_METRICS_DB or .metrics/builds.sqlite)."""
+    return Path(os.environ.get("GALAXY_ARCH_METRICS_DB", DEFAULT_DB))
+
+
+def connect(db_path: Optional[Path] = None) -> sqlite3.Connection:
+    db_path = db_path or metrics_db()
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class BuildMetrics:
+    """Metrics of one builder run, written to the database by save().
+
+    Args:
+        builder: Builder name (e.g. 'sphinx', 'slides')
+        db_path: Database (default: metrics_db())
+    """
+
+    def __init__(self, builder: str, db_path: Optional[Path] = None):
+        self.builder = builder
+        self.db_path = db_path
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.values: dict[tuple[str, str, str], float] = {}
+
+    def add(self, stage: str, name: str, value: float, topic: Optional[str] = None) -> None:
+        """Add to a metric (values for the same stage, topic and name accumulate)."""
+        key = (stage, topic or "", name)
+        self.values[key] = self.values.get(key, 0) + value
+
+    @contextmanager
+    def stage(self, stage: str, topic: Optional[str] = None) -> Iterator[None]:
+        """Time a block of work as the duration of a stage (per topic if given)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, "duration", time.perf_counter() - start, topic)
+
+    def cache(self, stage: str, hits: int, misses: int) -> None:
+        """Record cache hits and misses of a stage."""
+        self.add(stage, "cache_hits", hits)
+        self.add(stage, "cache_misses", misses)
+
+    def files(self, stage: str, paths: list[Path], topic: Optional[str] = None, name: str = "bytes_written") -> None:
+        """Record the count and total size of files (e.g. outputs written)."""
+        existing = [p for p in paths if p.is_file()]
+        self.add(stage, "files", len(existing), topic)
+        self.add(stage, name, sum(p.stat().st_size for p in existing), topic)
+
+    def save(self, args: Optional[list[str]] = None) -> int:
+        """Append the run to the database.
+
+        Returns:
+            The run ID
+        """
+        duration = time.perf_counter() - self.start
+        with connect(self.db_path) as conn:
+            cursor = conn.execute(
+                "INSERT INTO runs (builder, started_at, duration, git_commit, args) VALUES (?, ?, ?, ?, ?)",
+                (self.builder, self.started_at, duration, git_commit(), json.dumps(args if args is not None else sys.argv[1:])),
+            )
+            run_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO metrics (run_id, stage, topic, name, value) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, stage, topic, name, value) for (stage, topic, name), value in self.values.items()],
+            )
+        conn.close()
+        return run_id
+
+
+# ============================================================================
+# Reporting
+# ============================================================================
+
+def recent_runs(conn: sqlite3.Connection, builder: Optional[str] = None, limit: int = 20) -> list[dict]:
+    """Most recent runs, newest first."""
+    query = "SELECT id, builder, started_at, duration, git_commit FROM runs"
+    params: tuple = ()
+    if builder:
+        query += " WHERE builder = ?"
+        params = (builder,)
+    rows = conn.execute(query + " ORDER BY id DESC LIMIT ?", params + (limit,)).fetchall()
+    return [dict(zip(('id', 'builder', 'started_at', 'duration', 'git_commit'), row)) for row in rows]
+
+
+def stage_series(conn: sqlite3.Connection, builder: str, name: str = "duration", limit: int = 20) -> dict[str, list[tuple[int, float]]]:
+    """Per-stage totals (summed over topics) of a metric for a builder's recent runs.
+
+    Returns:
+        Stage -> [(run ID, value)] oldest first
+    """
+    rows = conn.execute(
+        """
+        SELECT m.stage, m.run_id, SUM(m.value) FROM metrics m
+        WHERE m.name = ? AND m.run_id IN (SELECT id FROM runs WHERE builder = ? ORDER BY id DESC LIMIT ?)
+        GROUP BY m.stage, m.run_id ORDER BY m.run_id
+        """,
+        (name, builder, limit),
+    ).fetchall()
+    series: dict[str, list[tuple[int, float]]] = {}
+    for stage, run_id, value in rows:
+        series.setdefault(stage, []).append((run_id, value))
+    return series
+
+
+def cache_hit_rates(conn: sqlite3.Connection, run_id: int) -> dict[str, float]:
+    """Stage -> cache hit rate of a run."""
+    rows = conn.execute(
+        "SELECT stage, name, SUM(value) FROM metrics WHERE run_id = ? AND name IN ('cache_hits', 'cache_misses') "
+        "GROUP BY stage, name",
+        (run_id,),
+    ).fetchall()
+    counts: dict[str, dict[str, float]] = {}
+    for stage, name, value in rows:
+        counts.setdefault(stage, {})[name] = value
+    return {
+        stage: c.get('cache_hits', 0) / total
+        for stage, c in counts.items()
+        if (total := c.get('cache_hits', 0) + c.get('cache_misses', 0))
+    }
+
+
+def find_regressions(conn: sqlite3.Connection, threshold: float = DEFAULT_THRESHOLD,
+                     baseline_runs: int = DEFAULT_BASELINE_RUNS) -> list[dict]:
+    """Stages whose latest duration exceeds the rolling baseline by more than threshold.
+
+    The baseline is the median of the stage's durations in the builder's
+    previous baseline_runs runs (at least 3 are needed).
+
+    Returns:
+        List of {'builder', 'stage', 'run_id', 'latest', 'baseline', 'change'}
+    """
+    regressions = []
+    builders = [row[0] for row in conn.execute("SELECT DISTINCT builder FROM runs ORDER BY builder")]
+    for builder in builders:
+        latest_run = recent_runs(conn, builder, limit=1)[0]['id']
+        for stage, values in stage_series(conn, builder, limit=baseline_runs + 1).items():
+            if values[-1][0] != latest_run:
+                continue  # Stage didn't run in the latest run
+            previous = [value for _, value in values[:-1]]
+            if len(previous) < 3:
+                continue
+            baseline = statistics.median(previous)
+            latest = values[-1][1]
+            if latest < MIN_DURATION or baseline <= 0:
+                continue
+            change = latest / baseline - 1
+            if change > threshold:
+                regressions.append({
+                    'builder': builder, 'stage': stage, 'run_id': latest_run,
+                    'latest': latest, 'baseline': baseline, 'change': change,
+                })
+    return regressions
+
+
+def sparkline(values: list[float]) -> str:
+    bars = "▁▂▃▄▅▆▇█"
+    low, high = min(values), max(values)
+    if high == low:
+        return bars[0] * len(values)
+    return "".join(bars[int((v - low) / (high - low) * (len(bars) - 1))] for v in values)
+
+
+def print_report(conn: sqlite3.Connection, builder: Optional[str], runs: int, threshold: float, baseline_runs: int) -> list[dict]:
+    print(f"\n{'='*60}")
+    print("BUILD METRICS")
+    print(f"{'='*60}\n")
+
+    latest = recent_runs(conn, builder, limit=runs)
+    if not latest:
+        print("ℹ️  No builds recorded yet")
+        return []
+
+    print("Recent runs:")
+    for run in latest[:5]:
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(run['started_at']))
+        print(f"  #{run['id']:<5} {when}  {run['builder']:<14} {run['duration']:7.2f}s  {run['git_commit'] or ''}")
+    print()
+
+    builders = sorted({run['builder'] for run in latest})
+    for name in builders:
+        print(f"{name}:")
+        last_run = recent_runs(conn, name, limit=1)[0]['id']
+        rates = cache_hit_rates(conn, last_run)
+        for stage, values in sorted(stage_series(conn, name, limit=runs).items()):
+            durations = [v for _, v in values]
+            line = f"  {stage:<20} {sparkline(durations)}  last {durations[-1]:.2f}s"
+            if stage in rates:
+                line += f", cache hits {rates[stage]:.0%}"
+            print(line)
+        print()
+
+    regressions = [r for r in find_regressions(conn, threshold, baseline_runs) if not builder or r['builder'] == builder]
+    if regressions:
+        print(f"❌ Regressions (> {threshold:.0%} over the median of the previous {baseline_runs} runs):")
+        for r in regressions:
+            print(f"  {r['builder']} / {r['stage']}: {r['latest']:.2f}s vs {r['baseline']:.2f}s (+{r['change']:.0%})")
+    else:
+        print("✅ No stage regressed beyond the threshold")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show build metric trends and regressions')
+    parser.add_argument('--builder', help='Only show this builder (e.g. sphinx, slides)')
+    parser.add_argument('--runs', type=int, default=20, help='Runs to show trends for (default: 20)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Regression threshold as a fraction (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--baseline-runs', type=int, default=DEFAULT_BASELINE_RUNS,
+                        help=f'Previous runs the baseline median is taken over (default: {DEFAULT_BASELINE_RUNS})')
+    parser.add_argument('--check', action='store_true', help='Exit with status 1 if a stage regressed')
+    parser.add_argument('--json', action='store_true', help='Print regressions as JSON')
+
+    args = parser.parse_args()
+
+    if not metrics_db().exists():
+        print(f"ℹ️  No metrics recorded yet ({metrics_db()})")
+        return
+
+    conn = connect()
+    if args.json:
+        regressions = [r for r in find_regressions(conn, args.threshold, args.baseline_runs)
+                       if not args.builder or r['builder'] == args.builder]
+        print(json.dumps(regressions, indent=2))
+    else:
+        regressions = print_report(conn, args.builder, args.runs, args.threshold, args.baseline_runs)
+    conn.close()
+    sys.exit(1 if args.check and regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Build a self-contained, offline bundle of the standalone slide decks.
+
+The default slides.html loads Remark.js from remarkjs.com and resolves font
+and image paths at view time. The bundle instead vendors Remark.js and the
+DIN 1451 fonts.css once into a shared assets/ directory under content-hashed
+(immutable) filenames referenced by every deck, and copies only the images
+the decks actually use. The fonts are subset to the characters of every
+deck's headings (see subset_fonts.py), including decks left out with
+--topic, so a partial rebuild writes the same fonts as a full one:
+
+    bundle/
+        assets/remark.<hash>.min.js
+        assets/fonts.<hash>.css
+        assets/fonts/Altinn-DINCondensed.<hash>.woff2
+        images/<referenced images>
+        <topic>/slides.html
+
+Decks load without network access (apart from the optional Google Fonts
+stylesheet, which falls back to system fonts) and hashed assets can be
+served with long-lived cache headers. Remark.js is downloaded once into
+.cache/vendor/ unless a local copy is given with --remark.
+
+Usage:
+    uv run python scripts/bundle_slides.py
+    uv run python scripts/bundle_slides.py --output /tmp/slides --topic dependency-injection
+    uv run python scripts/bundle_slides.py --remark ~/Downloads/remark-latest.min.js
+"""
+
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Optional
+
+# Add scripts to path for models
+sys.path.insert(0, str(Path(__file__).parent))
+from build_cache import cache_path, fingerprint_name
+from build_metrics import BuildMetrics
+from compiled_topics import list_topic_ids, load_builder
+from subset_fonts import FontSubsetter, heading_characters, write_fonts
+
+REMARK_URL = "https://remarkjs.com/downloads/remark-latest.min.js"
+SLIDES_ASSETS = Path(__file__).parent.parent / "outputs" / "training-slides" / "assets"
+DEFAULT_OUTPUT = Path("outputs/training-slides/bundle")
+IMAGES_DIR = Path("images")
+
+# Image prefix written by the slide builder for slides.html (see rewrite_image_paths_for_html)
+HTML_IMAGE_PREFIX = "../../../../images/"
+IMAGE_REFERENCE = re.compile(re.escape(HTML_IMAGE_PREFIX) + r"""([^)\s"'<>]+)""")
+CSS_URL = re.compile(r"url\(([^)]+)\)")
+# Shared files referenced by a bundled deck
+DECK_REFERENCE = re.compile(r"""\.\./(assets|images)/([^)\s"'<>]+)""")
+# Decks are rendered before the fonts (whose subsets depend on the decks'
+# headings); the fingerprinted fonts.css name replaces this afterwards
+FONTS_CSS_PLACEHOLDER = "../assets/fonts.css"
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def write_asset(directory: Path, name: str, data: bytes) -> str:
+    """Write data under its fingerprinted name (once) and return that name."""
+    hashed = fingerprint_name(name, data)
+    path = directory / hashed
+    if not path.exists():
+        write_atomic(path, data)
+    return hashed
+
+
+def load_remark(source: Optional[Path] = None) -> bytes:
+    """Return Remark.js from a local file, the vendor cache, or remarkjs.com.
+
+    Raises:
+        RuntimeError: If Remark.js isn't cached and can't be downloaded
+    """
+    if source:
+        return source.read_bytes()
+
+    cached = cache_path('vendor/remark.min.js')
+    if cached.exists():
+        return cached.read_bytes()
+
+    try:
+        with urllib.request.urlopen(REMARK_URL, timeout=30) as response:
+            data = response.read()
+    except (urllib.error.URLError, TimeoutError) as e:
+        raise RuntimeError(f"Could not download {REMARK_URL} ({e}); pass a local copy with --remark") from e
+    write_atomic(cached, data)
+    return data
+
+
+def vendor_fonts(assets_dir: Path, subsetter: FontSubsetter) -> bytes:
+    """Write the (subset) fonts referenced by fonts.css into assets/fonts/ under hashed names.
+
+    Returns:
+        fonts.css rewritten to reference the hashed font files
+    """
+    def name_font(name: str, data: bytes) -> str:
+        return f"fonts/{write_asset(assets_dir / 'fonts', name, data)}"
+
+    return write_fonts(subsetter, name_font, SLIDES_ASSETS / "css" / "fonts.css").encode()
+
+
+def copy_images(names: set[str], images_dir: Path, dest: Path) -> dict:
+    """Copy images to dest, skipping ones already there with same size and mtime.
+
+    Returns dict with:
+        - copied: Names of images copied
+        - unchanged: Names of images already up to date
+        - missing: Names of images not found in images_dir
+    """
+    result = {'copied': [], 'unchanged': [], 'missing': []}
+    for name in sorted(names):
+        src, dst = images_dir / name, dest / name
+        if not src.is_file():
+            result['missing'].append(name)
+            continue
+        src_stat = src.stat()
+        if dst.exists():
+            dst_stat = dst.stat()
+            if dst_stat.st_size == src_stat.st_size and dst_stat.st_mtime_ns == src_stat.st_mtime_ns:
+                result['unchanged'].append(name)
+                continue
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(src, dst)
+        result['copied'].append(name)
+    return result
+
+
+def referenced_files(output_dir: Path) -> set[Path]:
+    """Assets and images used by any deck in the bundle, including fonts.css's fonts.
+
+    Decks bundled by earlier runs (e.g. with other --topic values) count too,
+    so a partial rebuild keeps what the rest of the bundle needs.
+    """
+    referenced = set()
+    for deck in output_dir.glob("*/slides.html"):
+        referenced.update(output_dir / kind / name for kind, name in DECK_REFERENCE.findall(deck.read_text()))
+    for css in [path for path in referenced if path.suffix == ".css" and path.is_file()]:
+        referenced.update(css.parent / url.strip('\'"') for url in CSS_URL.findall(css.read_text()))
+    return referenced
+
+
+def prune(directory: Path, keep: set[Path]) -> list[Path]:
+    """Remove files under directory that are not in keep (stale hashed assets, unused images)."""
+    removed = []
+    if directory.exists():
+        for path in sorted(directory.rglob("*")):
+            if path.is_file() and path not in keep:
+                path.unlink()
+                removed.append(path)
+    return removed
+
+
+def bundle_slides(
+    topics: list[str],
+    output_dir: Path = DEFAULT_OUTPUT,
+    remark_source: Optional[Path] = None,
+    images_dir: Path = IMAGES_DIR,
+) -> dict:
+    """Render decks into a self-contained bundle.
+
+    Args:
+        topics: Topic IDs to include
+        output_dir: Bundle directory
+        remark_source: Local Remark.js file (default: cached download)
+        images_dir: Directory images are copied from
+
+    Returns dict with:
+        - decks: Paths of written slides.html files
+        - assets: Fingerprinted asset names (relative to assets/)
+        - fonts: FontSubsetter used for the fonts
+        - images: Result of copy_images()
+        - pruned: Paths of files no bundled deck references any more
+    """
+    render_slides = load_builder("training-slides").render_slides
+    assets_dir = output_dir / "assets"
+
+    remark_name = write_asset(assets_dir, "remark.min.js", load_remark(remark_source))
+    asset_urls = {
+        'remark_js': f"../assets/{remark_name}",
+        'fonts_css': FONTS_CSS_PLACEHOLDER,
+    }
+    rendered = {topic_id: render_slides(topic_id, assets=asset_urls)[1]
+                for topic_id in dict.fromkeys([*topics, *list_topic_ids()])}
+
+    subsetter = FontSubsetter(heading_characters(rendered.values()))
+    fonts_css_name = write_asset(assets_dir, "fonts.css", vendor_fonts(assets_dir, subsetter))
+
+    decks, images = [], set()
+    for topic_id in topics:
+        html = rendered[topic_id]
+        images.update(IMAGE_REFERENCE.findall(html))
+        html = html.replace(f'href="{FONTS_CSS_PLACEHOLDER}"', f'href="../assets/{fonts_css_name}"', 1)
+        deck = output_dir / topic_id / "slides.html"
+        write_atomic(deck, html.replace(HTML_IMAGE_PREFIX, "../images/").encode())
+        decks.append(deck)
+
+    copied = copy_images(images, images_dir, output_dir / "images")
+
+    fonts = {assets_dir / "fonts" / url.split('/', 1)[1]
+             for url in CSS_URL.findall((assets_dir / fonts_css_name).read_text())}
+    keep = {assets_dir / remark_name, assets_dir / fonts_css_name} | fonts
+    referenced = referenced_files(output_dir) | keep
+    pruned = prune(assets_dir, referenced) + prune(output_dir / "images", referenced)
+
+    return {
+        'decks': decks,
+        'assets': sorted(str(path.relative_to(assets_dir)) for path in keep),
+        'fonts': subsetter,
+        'images': copied,
+        'pruned': pruned,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build an offline bundle of the standalone slide decks')
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT, help=f'Bundle directory (default: {DEFAULT_OUTPUT})')
+    parser.add_argument('--topic', action='append', help='Topic to include (repeatable; default: all)')
+    parser.add_argument('--remark', type=Path, help='Local Remark.js to vendor instead of downloading it')
+
+    args = parser.parse_args()
+
+    metrics = BuildMetrics("bundle-slides")
+    try:
+        with metrics.stage("bundle"):
+            result = bundle_slides(args.topic or list_topic_ids(), args.output, args.remark)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    images, fonts = result['images'], result['fonts']
+    metrics.files("bundle", result['decks'])
+    metrics.files("fonts", sorted((args.output / "assets" / "fonts").iterdir()), name="font_bytes")
+    metrics.cache("fonts", hits=fonts.hits, misses=fonts.misses)
+    metrics.add("bundle", "images", len(images['copied']) + len(images['unchanged']))
+    metrics.cache("bundle", hits=len(images['unchanged']), misses=len(images['copied']))
+    metrics.save()
+    print(f"✓ Bundled {len(result['decks'])} deck(s) into {args.output}")
+    for asset in result['assets']:
+        print(f"  assets/{asset}")
+    if fonts.available:
+        print(f"✓ Fonts subset to {len(fonts.characters)} heading characters")
+    else:
+        print("⚠️  fontTools not installed, fonts not subset (install with: uv sync --extra fonts)")
+    print(f"✓ Images: {len(images['copied'])} copied, {len(images['unchanged'])} unchanged"
+          + (f", {len(result['pruned'])} stale file(s) removed" if result['pruned'] else ""))
+    for name in images['missing']:
+        print(f"⚠️  Missing image: {name}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Check that external links in topics resolve.
+
+Extracts URLs from the compiled content of every topic (bare URLs, markdown
+links and related_pull_requests) and checks them concurrently with a small
+asyncio HTTP client. Each host gets its own pool of keep-alive connections
+and requests try HEAD first, falling back to GET for servers that reject
+HEAD. Results are cached on disk with a TTL, so repeated runs only check
+new or expired URLs.
+
+Usage:
+    uv run python scripts/check_links.py
+    uv run python scripts/check_links.py --topic file-sources
+    uv run python scripts/check_links.py --force --json
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import ssl
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urljoin, urlsplit
+
+# Add scripts to path for models
+sys.path.insert(0, str(Path(__file__).parent))
+from build_cache import cache_path, load_json, save_json
+from compiled_topics import CompiledTopic, compile_all_topics, compile_topic
+
+GITHUB_PR_URL = "https://github.com/galaxyproject/galaxy/pull/{number}"
+USER_AGENT = "galaxy-architecture-link-checker/1.0"
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+# Servers that answer HEAD with one of these usually support GET
+HEAD_FALLBACK_STATUSES = {403, 404, 405, 501}
+MAX_REDIRECTS = 5
+
+URL_PATTERN = re.compile(r'https?://[^\s\)\]>"\'`<]+')
+FENCED_CODE_PATTERN = re.compile(r'^```.*?^```', re.MULTILINE | re.DOTALL)
+INLINE_CODE_PATTERN = re.compile(r'`[^`\n]+`')
+IGNORED_HOSTS = {"localhost", "127.0.0.1", "0.0.0.0", "example.com", "example.org"}
+
+
+# ============================================================================
+# URL Extraction
+# ============================================================================
+
+def extract_urls_from_markdown(markdown: str) -> set[str]:
+    """Extract checkable URLs from markdown.
+
+    URLs inside code blocks and inline code are examples rather than links
+    and are skipped, as are local hosts and templated/wildcard URLs.
+    """
+    text = FENCED_CODE_PATTERN.sub('', markdown)
+    text = INLINE_CODE_PATTERN.sub('', text)
+
+    urls = set()
+    for match in URL_PATTERN.findall(text):
+        url = match.rstrip('.,;:!?*')
+        if any(c in url for c in '{}\\*'):
+            continue
+        host = urlsplit(url).hostname
+        if not host or host in IGNORED_HOSTS:
+            continue
+        urls.add(url)
+    return urls
+
+
+def pull_request_url(reference: str) -> Optional[str]:
+    """Return a URL for a related_pull_requests entry (number or URL)."""
+    reference = reference.strip()
+    if reference.isdigit():
+        return GITHUB_PR_URL.format(number=reference)
+    if reference.startswith(('http://', 'https://')):
+        return reference
+    return None
+
+
+def collect_topic_urls(topics: list[CompiledTopic]) -> dict[str, list[str]]:
+    """Collect URLs across topics.
+
+    Returns:
+        Dict mapping URL to sorted list of locations ('topic:block-id' or
+        'topic:metadata') that reference it
+    """
+    locations: dict[str, set[str]] = {}
+
+    for topic in topics:
+        for block in topic.blocks:
+            for url in extract_urls_from_markdown(block.text):
+                locations.setdefault(url, set()).add(block.location)
+
+        for item in topic.metadata.related_pull_requests:
+            reference = item if isinstance(item, str) else item.pull_request
+            url = pull_request_url(reference)
+            if url:
+                locations.setdefault(url, set()).add(f"{topic.topic_id}:metadata")
+
+    return {url: sorted(locs) for url, locs in sorted(locations.items())}
+
+
+# ============================================================================
+# Async HTTP Client
+# ============================================================================
+
+class HostPool:
+    """Pool of keep-alive HTTP/1.1 connections to a single host.
+
+    At most ``size`` requests are in flight to the host at once; idle
+    connections are reused for subsequent HEAD requests.
+    """
+
+    def __init__(self, scheme: str, host: str, port: int, size: int, ssl_context: Optional[ssl.SSLContext]):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl_context if scheme == 'https' else None
+        self.semaphore = asyncio.Semaphore(size)
+        self.idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def _connect(self):
+        return await asyncio.open_connection(
+            self.host, self.port,
+            ssl=self.ssl_context,
+            server_hostname=self.host if self.ssl_context else None,
+        )
+
+    async def request(self, method: str, target: str, timeout: Optional[float] = None) -> tuple[int, dict[str, str]]:
+        """Send a request and return (status, lowercased headers).
+
+        The timeout covers connecting and the exchange only, not waiting for
+        a free slot, so links queued behind others to the same host don't
+        time out. Response bodies are never read: connections are only
+        returned to the pool after bodiless (HEAD) responses the server
+        agreed to keep open.
+        """
+        async with self.semaphore:
+            return await asyncio.wait_for(self._request(method, target), timeout)
+
+    async def _request(self, method: str, target: str) -> tuple[int, dict[str, str]]:
+        if self.idle:
+            reader, writer = self.idle.pop()
+            try:
+                return await self._send(reader, writer, method, target)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass  # The server closed the idle connection - retry on a fresh one
+        reader, writer = await self._connect()
+        return await self._send(reader, writer, method, target)
+
+    async def _send(self, reader, writer, method: str, target: str) -> tuple[int, dict[str, str]]:
+        try:
+            status, headers, keep_alive = await self._exchange(reader, writer, method, target)
+        except BaseException:
+            writer.close()
+            raise
+
+        if keep_alive and method == 'HEAD':
+            self.idle.append((reader, writer))
+        else:
+            writer.close()
+        return status, headers
+
+    async def _exchange(self, reader, writer, method: str, target: str) -> tuple[int, dict[str, str], bool]:
+        default_port = 443 if self.scheme == 'https' else 80
+        host_header = self.host if self.port == default_port else f"{self.host}:{self.port}"
+        writer.write(
+            f"{method} {target} HTTP/1.1\r\n"
+            f"Host: {host_header}\r\n"
+            f"User-Agent: {USER_AGENT}\r\n"
+            f"Accept: */*\r\n"
+            f"Connection: keep-alive\r\n\r\n".encode('latin-1')
+        )
+        await writer.drain()
+
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode('latin-1').split("\r\n")
+        version, status = lines[0].split(" ", 2)[:2]
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+        return int(status), headers, keep_alive
+
+    async def close(self) -> None:
+        for _, writer in self.idle:
+            writer.close()
+        self.idle.clear()
+
+
+class LinkChecker:
+    """Check URLs concurrently with per-host connection pools."""
+
+    def __init__(self, concurrency: int = 20, per_host: int = 4, timeout: float = 15.0):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.per_host = per_host
+        self.timeout = timeout
+        self.ssl_context = ssl.create_default_context()
+        self.pools: dict[tuple[str, str, int], HostPool] = {}
+
+    def _pool(self, url: str) -> tuple[HostPool, str]:
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        key = (parts.scheme, parts.hostname, port)
+        if key not in self.pools:
+            self.pools[key] = HostPool(parts.scheme, parts.hostname, port, self.per_host, self.ssl_context)
+        target = parts.path or '/'
+        if parts.query:
+            target += f"?{parts.query}"
+        return self.pools[key], target
+
+    async def _fetch(self, method: str, url: str) -> tuple[int, str]:
+        """Request url with method, following redirects. Returns (status, final_url)."""
+        for _ in range(MAX_REDIRECTS + 1):
+            pool, target = self._pool(url)
+            status, headers = await pool.request(method, target, self.timeout)
+            if status in REDIRECT_STATUSES and 'location' in headers:
+                url = urljoin(url, headers['location'])
+                continue
+            return status, url
+        raise RuntimeError(f"Too many redirects (> {MAX_REDIRECTS})")
+
+    async def check(self, url: str) -> dict:
+        """Check one URL: HEAD first, then GET if HEAD fails or is rejected."""
+        async with self.semaphore:
+            result = {'url': url, 'status': None, 'ok': False, 'error': None, 'checked_at': time.time()}
+            try:
+                try:
+                    status, final_url = await self._fetch('HEAD', url)
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                    status = None
+                if status is None or status in HEAD_FALLBACK_STATUSES:
+                    status, final_url = await self._fetch('GET', url)
+                result['status'] = status
+                result['ok'] = 200 <= status < 400
+                if final_url != url:
+                    result['final_url'] = final_url
+            except asyncio.TimeoutError:
+                result['error'] = f"Timed out after {self.timeout}s"
+            except Exception as e:
+                result['error'] = f"{type(e).__name__}: {e}"
+            return result
+
+    async def check_all(self, urls: list[str]) -> list[dict]:
+        try:
+            return await asyncio.gather(*(self.check(url) for url in urls))
+        finally:
+            for pool in self.pools.values():
+                await pool.close()
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+def is_fresh(entry: dict, now: float, ttl: float, failure_ttl: float) -> bool:
+    """Whether a cached result is still valid (failures expire sooner)."""
+    age = now - entry.get('checked_at', 0)
+    return age < (ttl if entry.get('ok') else failure_ttl)
+
+
+def check_links(
+    url_locations: dict[str, list[str]],
+    cache_file: Path,
+    ttl: float = 7 * 24 * 3600,
+    failure_ttl: float = 24 * 3600,
+    force: bool = False,
+    concurrency: int = 20,
+    per_host: int = 4,
+    timeout: float = 15.0,
+) -> dict:
+    """Check URLs, reusing fresh cached results.
+
+    Returns dict with:
+        - results: dict mapping URL to result (with 'locations' and 'cached')
+        - checked: number of URLs requested in this run
+    """
+    cache = load_json(cache_file, default={})
+    now = time.time()
+
+    pending = [
+        url for url in url_locations
+        if force or url not in cache or not is_fresh(cache[url], now, ttl, failure_ttl)
+    ]
+
+    if pending:
+        checker = LinkChecker(concurrency=concurrency, per_host=per_host, timeout=timeout)
+        for result in asyncio.run(checker.check_all(pending)):
+            cache[result['url']] = {k: v for k, v in result.items() if k != 'url'}
+        save_json(cache_file, cache)
+
+    pending_set = set(pending)
+    results = {
+        url: {**cache[url], 'locations': locations, 'cached': url not in pending_set}
+        for url, locations in url_locations.items()
+    }
+    return {'results': results, 'checked': len(pending)}
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Check external links in topics')
+    parser.add_argument('--topic', help='Topic ID to check (default: all topics)')
+    parser.add_argument('--cache', type=Path, default=None, help='Cache file (default: .cache/links.json)')
+    parser.add_argument('--ttl-days', type=float, default=7, help='Days before a working link is rechecked')
+    parser.add_argument('--failure-ttl-hours', type=float, default=24, help='Hours before a broken link is rechecked')
+    parser.add_argument('--force', action='store_true', help='Ignore cached results')
+    parser.add_argument('--concurrency', type=int, default=20, help='Maximum concurrent requests')
+    parser.add_argument('--per-host', type=int, default=4, help='Maximum concurrent connections per host')
+    parser.add_argument('--timeout', type=float, default=15.0, help='Per-request timeout in seconds')
+    parser.add_argument('--json', action='store_true', help='Print a JSON report')
+
+    args = parser.parse_args()
+
+    topics = [compile_topic(args.topic)] if args.topic else compile_all_topics()
+    url_locations = collect_topic_urls(topics)
+
+    report = check_links(
+        url_locations,
+        cache_file=args.cache or cache_path('links.json'),
+        ttl=args.ttl_days * 24 * 3600,
+        failure_ttl=args.failure_ttl_hours * 3600,
+        force=args.force,
+        concurrency=args.concurrency,
+        per_host=args.per_host,
+        timeout=args.timeout,
+    )
+    broken = {url: r for url, r in report['results'].items() if not r['ok']}
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Found {len(url_locations)} URLs ({report['checked']} checked, "
+              f"{len(url_locations) - report['checked']} from cache)")
+
+        if broken:
+            print(f"\n❌ Broken links ({len(broken)}):")
+            for url, result in broken.items():
+                reason = result['error'] or f"HTTP {result['status']}"
+                print(f"  {url} ({reason})")
+                for location in result['locations']:
+                    print(f"    in {location}")
+        else:
+            print("\n✅ All links resolve")
+
+    sys.exit(1 if broken else 0)
+
+
+if __name__ == '__main__':
+    main()
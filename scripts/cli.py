@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Unified command line entry point: ``galaxy-arch <command> [args...]``.
+
+Each command runs one of the repository's scripts or builders as if it were
+invoked directly, so they keep their own arguments and --help. Nothing but
+the standard library is imported until a command is chosen: pydantic, yaml,
+jinja2 and numpy are only loaded by the commands that need them, which keeps
+``galaxy-arch --help`` and trivial commands fast (tests/test_cli.py enforces
+an import-time budget).
+
+Run commands from the repository root, as with the scripts themselves.
+
+Usage:
+    uv run galaxy-arch --help
+    uv run galaxy-arch validate
+    uv run galaxy-arch build-slides dependency-injection
+    uv run galaxy-arch compare --json
+    uv run python scripts/cli.py topics
+"""
+
+import runpy
+import sys
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# command -> (script relative to the repository root, summary)
+COMMANDS = {
+    'validate': ('scripts/validate.py', 'Validate all topics (metadata.yaml, content.yaml)'),
+    'validate-service': ('scripts/validation_service.py', 'Run the persistent validation service'),
+    'check': ('scripts/validation_client.py', 'Validate changed topic files via the service'),
+    'lsp': ('scripts/language_server.py', 'Language server for topic YAML (stdio)'),
+    'build-slides': ('outputs/training-slides/build.py', 'Generate training slides for a topic or all'),
+    'bundle-slides': ('scripts/bundle_slides.py', 'Build offline slide decks with fingerprinted assets'),
+    'subset-fonts': ('scripts/subset_fonts.py', 'Subset the slide fonts to the characters used in headings'),
+    'build-sphinx': ('outputs/sphinx-docs/build.py', 'Generate Sphinx documentation for a topic or all'),
+    'serve': ('scripts/dev_server.py', 'Serve topic pages and slides with live reload'),
+    'optimize-images': ('scripts/optimize_images.py', 'Losslessly optimize PNG and SVG images'),
+    'metrics': ('scripts/build_metrics.py', 'Show build timing trends and regressions'),
+    'artifacts': ('scripts/artifact_store.py', 'Manage the content-addressed build artifact store'),
+    'render-diagrams': ('scripts/render_diagrams.py', 'Render diagrams, reusing stored renders'),
+    'sync': ('scripts/sync_to_training_material.py', 'Sync slides to training-material'),
+    'sync-images': ('scripts/sync_images.py', 'Sync images to training-material'),
+    'compare': ('scripts/compare_slides.py', 'Compare slides with training-material'),
+    'validate-sync': ('scripts/validate_sync.py', 'Validate synced content in training-material'),
+    'validate-images': ('scripts/validate_images.py', 'Check referenced images, copy missing ones'),
+    'image-report': ('scripts/image_references.py', 'Report missing, orphaned and duplicate images'),
+    'migrate': ('scripts/migrate_topic.py', 'Migrate a topic from training-material'),
+    'check-links': ('scripts/check_links.py', 'Check external links in topics'),
+    'resolve-prs': ('scripts/pull_requests.py', 'Resolve related pull requests via GitHub'),
+    'code-index': ('scripts/code_index.py', 'Query the Galaxy code path -> topic index'),
+    'symbol-index': ('scripts/symbol_index.py', 'Check and resolve path::Symbol references in Galaxy'),
+    'staleness': ('scripts/staleness.py', 'Rank topics whose referenced Galaxy code changed since'),
+    'search': ('scripts/search_index.py', 'Full-text search over topic content'),
+    'tfidf': ('scripts/tfidf_index.py', 'TF-IDF relevance index over content blocks'),
+    'dedupe-report': ('scripts/dedupe_report.py', 'Report near-duplicate content blocks'),
+    'agentic-op': ('scripts/generate_agentic_operation.py', 'Generate agentic operation commands'),
+    'files-prose': ('scripts/generate_files_prose.py', 'Generate file link prose from YAML mindmaps'),
+    'schema-docs': ('scripts/generate_schema_docs.py', 'Regenerate docs/SCHEMA.md'),
+}
+
+
+def print_help() -> None:
+    print("usage: galaxy-arch <command> [args...]")
+    print()
+    print("Galaxy architecture documentation tools.")
+    print()
+    print("commands:")
+    print(f"  {'topics':16} List topic IDs")
+    for name, (_, summary) in COMMANDS.items():
+        print(f"  {name:16} {summary}")
+    print()
+    print("Run 'galaxy-arch <command> --help' for command options.")
+
+
+def list_topics() -> int:
+    from compiled_topics import list_topic_ids
+
+    for topic_id in list_topic_ids():
+        print(topic_id)
+    return 0
+
+
+def run_command(name: str, args: list[str]) -> int:
+    """Run a command's script as __main__ with the given arguments."""
+    script, _ = COMMANDS[name]
+    sys.argv = [f"galaxy-arch {name}", *args]
+    try:
+        runpy.run_path(str(ROOT / script), run_name="__main__")
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help', 'help'):
+        print_help()
+        return 0
+
+    name, args = argv[0], argv[1:]
+    if name == 'topics':
+        return list_topics()
+    if name not in COMMANDS:
+        print(f"galaxy-arch: unknown command '{name}'", file=sys.stderr)
+        print("Run 'galaxy-arch --help' for the list of commands.", file=sys.stderr)
+        return 2
+    return run_command(name, args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Reverse index from Galaxy code paths to topics, blocks and mindmap nodes.
+
+Code paths are referenced in three places: ``related_code_paths`` in
+metadata.yaml, the ``*files*.mindmap.yml`` trees, and file links or
+backticked paths inside content. This script collects all of them into a
+trie keyed by path segments, persisted in .cache/code_index.json, so a
+prefix lookup costs O(path length) plus the size of the answer.
+
+The index is rebuilt automatically when any topic or mindmap file changes.
+
+Usage:
+    uv run python scripts/code_index.py query lib/galaxy/managers/
+    uv run python scripts/code_index.py query lib/galaxy/managers/hdas.py --json
+    uv run python scripts/code_index.py build
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Iterator, Optional
+
+import yaml
+
+# Add scripts to path for models
+sys.path.insert(0, str(Path(__file__).parent))
+from build_cache import cache_path, fingerprint_files, load_json, save_json
+
+INDEX_VERSION = 1
+
+GALAXY_BLOB_PATTERN = re.compile(
+    r'https?://github\.com/galaxyproject/galaxy/(?:blob|tree)/[^/\s)]+/([^\s)#?"\']+)'
+)
+# Top-level directories of a Galaxy checkout; backticked paths under these are code references
+GALAXY_ROOTS = (
+    'lib', 'client', 'config', 'test', 'test-data', 'scripts', 'packages',
+    'tools', 'templates', 'static', 'doc', 'database', '.ci', '.github',
+)
+BACKTICK_PATH_PATTERN = re.compile(r'`((?:' + '|'.join(re.escape(r) for r in GALAXY_ROOTS) + r')/[^`\s]*)`')
+
+
+def normalize_path(path: str) -> str:
+    """Normalize a Galaxy code path for indexing.
+
+    Strips leading ./ and /, trailing slashes, line anchors (#L10) and
+    symbol suffixes (path::Symbol).
+    """
+    path = path.strip().split('::', 1)[0].split('#', 1)[0]
+    parts = [p for p in path.split('/') if p and p != '.']
+    return '/'.join(parts)
+
+
+def iter_mindmap_paths(node, prefix: str = "") -> Iterator[tuple[str, Optional[str]]]:
+    """Yield (path, doc) for every node of a file mindmap tree."""
+    if isinstance(node, str):
+        label, doc, items = node, None, []
+    else:
+        label, doc, items = node.get('label', ''), node.get('doc'), node.get('items') or []
+
+    # A leading underscore is PlantUML formatting (boxless node), not part of the name
+    path = normalize_path(f"{prefix}/{label.lstrip('_').strip()}")
+    if path:
+        yield path, doc
+    for item in items:
+        yield from iter_mindmap_paths(item, path)
+
+
+# ============================================================================
+# Trie
+# ============================================================================
+
+def new_node() -> dict:
+    """Trie node: 'c' maps path segment to child node, 'r' holds references."""
+    return {'c': {}, 'r': []}
+
+
+def trie_insert(root: dict, path: str, ref: dict) -> None:
+    """Add a reference at path, creating intermediate nodes."""
+    node = root
+    for segment in path.split('/'):
+        node = node['c'].setdefault(segment, new_node())
+    if ref not in node['r']:
+        node['r'].append(ref)
+
+
+def trie_find(root: dict, path: str) -> Optional[dict]:
+    """Return the node for path, or None. O(number of path segments)."""
+    node = root
+    for segment in normalize_path(path).split('/'):
+        if not segment:
+            continue
+        node = node['c'].get(segment)
+        if node is None:
+            return None
+    return node
+
+
+def trie_walk(node: dict, path: str) -> Iterator[tuple[str, dict]]:
+    """Yield (path, ref) for all references at or below node."""
+    stack = [(path, node)]
+    while stack:
+        current_path, current = stack.pop()
+        for ref in current['r']:
+            yield current_path, ref
+        for segment in sorted(current['c'], reverse=True):
+            child_path = f"{current_path}/{segment}" if current_path else segment
+            stack.append((child_path, current['c'][segment]))
+
+
+def trie_ancestors(root: dict, path: str) -> Iterator[tuple[str, dict]]:
+    """Yield (path, ref) for references on directories containing path."""
+    node = root
+    segments = normalize_path(path).split('/')
+    for depth, segment in enumerate(segments[:-1]):
+        node = node['c'].get(segment)
+        if node is None:
+            return
+        for ref in node['r']:
+            yield '/'.join(segments[:depth + 1]), ref
+
+
+# ============================================================================
+# Building
+# ============================================================================
+
+def input_files(topics_dir: Path = Path("topics"), images_dir: Path = Path("images")) -> list[Path]:
+    """Files whose content feeds the index."""
+    files = list(topics_dir.glob("*/metadata.yaml"))
+    files += topics_dir.glob("*/content.yaml")
+    files += topics_dir.glob("*/fragments/**/*")
+    files += images_dir.glob("*files*.mindmap.yml")
+    return sorted(f for f in files if f.is_file())
+
+
+def build_index(topics_dir: Path = Path("topics"), images_dir: Path = Path("images")) -> dict:
+    """Build the code path trie from metadata, content and file mindmaps.
+
+    References are dicts with 'topic', 'source' ('metadata', 'content' or
+    'mindmap') and, where known, 'block', 'mindmap' and 'note'.
+    """
+    from compiled_topics import compile_all_topics
+
+    root = new_node()
+    topics = compile_all_topics(topics_dir)
+    # Mindmap name -> blocks whose content embeds its rendered SVG
+    mindmap_blocks: dict[str, list[tuple[str, str]]] = {}
+
+    for topic in topics:
+        for item in topic.metadata.related_code_paths:
+            path = item if isinstance(item, str) else item.path
+            ref = {'topic': topic.topic_id, 'source': 'metadata'}
+            if not isinstance(item, str):
+                ref['note'] = item.note
+            if normalize_path(path):
+                trie_insert(root, normalize_path(path), ref)
+
+        for block in topic.blocks:
+            paths = GALAXY_BLOB_PATTERN.findall(block.text) + BACKTICK_PATH_PATTERN.findall(block.text)
+            for path in paths:
+                if normalize_path(path):
+                    trie_insert(root, normalize_path(path), {
+                        'topic': topic.topic_id, 'block': block.block_id, 'source': 'content',
+                    })
+            for name in re.findall(r'([\w.-]+)\.mindmap\.plantuml\.svg', block.text):
+                mindmap_blocks.setdefault(name, []).append((topic.topic_id, block.block_id))
+
+    for mindmap_file in sorted(images_dir.glob("*files*.mindmap.yml")):
+        name = mindmap_file.name[:-len(".mindmap.yml")]
+        data = yaml.safe_load(mindmap_file.read_text())
+        if not data:
+            continue
+        owners = mindmap_blocks.get(name) or [(None, None)]
+        for path, doc in iter_mindmap_paths(data):
+            for topic_id, block_id in owners:
+                ref = {'topic': topic_id, 'block': block_id, 'source': 'mindmap', 'mindmap': mindmap_file.name}
+                if doc:
+                    ref['note'] = doc
+                trie_insert(root, path, ref)
+
+    return root
+
+
+def load_index(cache_file: Optional[Path] = None, rebuild: bool = False) -> dict:
+    """Load the persisted trie, rebuilding it if inputs changed."""
+    cache_file = cache_file or cache_path('code_index.json')
+    fingerprint = fingerprint_files(input_files(), salt=str(INDEX_VERSION))
+
+    cached = None if rebuild else load_json(cache_file)
+    if cached and cached.get('fingerprint') == fingerprint:
+        return cached['trie']
+
+    trie = build_index()
+    save_json(cache_file, {'fingerprint': fingerprint, 'trie': trie})
+    return trie
+
+
+def query_index(trie: dict, path: str, include_ancestors: bool = True) -> dict:
+    """Look up everything that mentions path or anything beneath it.
+
+    Returns dict with:
+        - matches: list of {'path', **ref} at or below path
+        - ancestors: list of {'path', **ref} on directories containing path
+    """
+    node = trie_find(trie, path)
+    matches = [{'path': p, **ref} for p, ref in trie_walk(node, normalize_path(path))] if node else []
+    ancestors = [{'path': p, **ref} for p, ref in trie_ancestors(trie, path)] if include_ancestors else []
+    return {'matches': matches, 'ancestors': ancestors}
+
+
+def topics_for_paths(trie: dict, paths: list[str]) -> set[str]:
+    """Return IDs of topics referencing any of paths (at, above or below)."""
+    topics = set()
+    for path in paths:
+        result = query_index(trie, path)
+        topics.update(r['topic'] for r in result['matches'] + result['ancestors'] if r['topic'])
+    return topics
+
+
+def print_query(path: str, result: dict) -> None:
+    """Print query results grouped by topic."""
+    refs = result['matches'] + result['ancestors']
+    if not refs:
+        print(f"No topics reference {path}")
+        return
+
+    by_topic: dict[str, list[dict]] = {}
+    for ref in refs:
+        by_topic.setdefault(ref['topic'] or '(unused mindmap)', []).append(ref)
+
+    for topic in sorted(by_topic):
+        print(f"\n{topic}:")
+        for ref in by_topic[topic]:
+            where = ref['source']
+            if ref.get('block'):
+                where += f" {ref['block']}"
+            if ref.get('mindmap'):
+                where += f" ({ref['mindmap']})"
+            line = f"  {ref['path']} [{where}]"
+            if ref.get('note'):
+                line += f" - {ref['note']}"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reverse index from Galaxy code paths to topics')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('build', help='Rebuild the index')
+
+    query_parser = subparsers.add_parser('query', help='Find topics and blocks referencing a path prefix')
+    query_parser.add_argument('path', help='Galaxy code path or prefix (e.g., lib/galaxy/managers/)')
+    query_parser.add_argument('--no-ancestors', action='store_true', help='Only show references at or below path')
+    query_parser.add_argument('--json', action='store_true', help='Print JSON')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        trie = load_index(rebuild=True)
+        count = sum(1 for _ in trie_walk(trie, ''))
+        print(f"✓ Indexed {count} code path references")
+        return
+
+    trie = load_index()
+    result = query_index(trie, args.path, include_ancestors=not args.no_ancestors)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_query(args.path, result)
+
+
+if __name__ == '__main__':
+    main()
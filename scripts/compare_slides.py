@@ -2,15 +2,25 @@
 """
 Compare generated slides with training-material slides.
 
+Decks are split into slides and aligned by slide hash, so the report shows
+which slides were added, removed, moved or modified rather than one large
+line diff per deck.
+
 Usage:
     uv run python scripts/compare_slides.py ecosystem
     uv run python scripts/compare_slides.py --all
+    uv run python scripts/compare_slides.py --all --json > slide-report.json
 """
 
 import argparse
+import bisect
 import difflib
+import hashlib
+import json
 import re
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -67,11 +77,234 @@ def extract_front_matter(html_path: Path) -> dict:
     return {}
 
 
+def split_slides(markdown: str) -> list[str]:
+    """Split Remark markdown into slides.
+
+    Slides are separated by ``---`` lines. Separators inside fenced code
+    blocks are ignored so YAML documents in examples don't split a slide.
+    """
+    if not markdown:
+        return []
+
+    slides = []
+    current = []
+    in_code_block = False
+
+    for line in markdown.split('\n'):
+        if line.strip().startswith('```'):
+            in_code_block = not in_code_block
+
+        if line.strip() == '---' and not in_code_block:
+            slides.append('\n'.join(current).strip())
+            current = []
+        else:
+            current.append(line)
+
+    slides.append('\n'.join(current).strip())
+    return [s for s in slides if s]
+
+
 def count_slides(markdown: str) -> int:
     """Count number of slides in markdown (separated by ---)."""
-    if not markdown:
-        return 0
-    return len([s.strip() for s in markdown.split('\n---\n') if s.strip()])
+    return len(split_slides(markdown))
+
+
+def hash_slide(slide: str) -> str:
+    """Hash a slide, ignoring trailing whitespace and blank line runs."""
+    lines = [line.rstrip() for line in slide.strip().split('\n')]
+    normalized = '\n'.join(line for i, line in enumerate(lines) if line or (i and lines[i - 1]))
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+def slide_title(slide: str) -> str:
+    """Return a short human-readable label for a slide (first heading or line)."""
+    lines = [line.strip() for line in slide.split('\n') if line.strip()]
+    for line in lines:
+        if line.startswith('#'):
+            return line.lstrip('#').strip()[:60]
+    for line in lines:
+        # Skip Remark directives like "class: center" or "layout: true"
+        if not re.match(r'^(class|layout|name|background-image):', line):
+            return line[:60]
+    return lines[0][:60] if lines else ''
+
+
+def _longest_increasing_subsequence(pairs: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Patience-sort LIS over pairs ordered by first index, keyed on second index."""
+    tails: list[int] = []  # index into pairs of the smallest tail for each length
+    tail_keys: list[int] = []
+    back: list[Optional[int]] = [None] * len(pairs)
+
+    for idx, (_, b) in enumerate(pairs):
+        pos = bisect.bisect_left(tail_keys, b)
+        if pos > 0:
+            back[idx] = tails[pos - 1]
+        if pos == len(tails):
+            tails.append(idx)
+            tail_keys.append(b)
+        else:
+            tails[pos] = idx
+            tail_keys[pos] = b
+
+    result = []
+    idx = tails[-1] if tails else None
+    while idx is not None:
+        result.append(pairs[idx])
+        idx = back[idx]
+    return result[::-1]
+
+
+def align_slides(theirs: list[str], ours: list[str]) -> list[tuple[int, int]]:
+    """Align two slide hash sequences with a patience/histogram LCS.
+
+    Slides that occur exactly once on both sides anchor the alignment
+    (patience diff). Regions without unique anchors fall back to the least
+    frequent common slide (histogram diff). Everything runs on hashes, so
+    the cost is linear in the number of slides for typical decks.
+
+    Args:
+        theirs: Slide hashes from training-material
+        ours: Slide hashes from our generated deck
+
+    Returns:
+        Sorted list of (their_index, our_index) pairs of identical slides
+    """
+    matches: list[tuple[int, int]] = []
+    # Explicit stack of (a_lo, a_hi, b_lo, b_hi) ranges to avoid deep recursion
+    stack = [(0, len(theirs), 0, len(ours))]
+
+    while stack:
+        a_lo, a_hi, b_lo, b_hi = stack.pop()
+
+        # Common prefix and suffix are always matched
+        while a_lo < a_hi and b_lo < b_hi and theirs[a_lo] == ours[b_lo]:
+            matches.append((a_lo, b_lo))
+            a_lo += 1
+            b_lo += 1
+        while a_lo < a_hi and b_lo < b_hi and theirs[a_hi - 1] == ours[b_hi - 1]:
+            a_hi -= 1
+            b_hi -= 1
+            matches.append((a_hi, b_hi))
+        if a_lo >= a_hi or b_lo >= b_hi:
+            continue
+
+        a_counts = Counter(theirs[a_lo:a_hi])
+        b_counts = Counter(ours[b_lo:b_hi])
+        a_first: dict[str, int] = {}
+        for i in range(a_lo, a_hi):
+            a_first.setdefault(theirs[i], i)
+
+        # Patience: anchor on slides unique to both ranges
+        unique = [
+            (a_first[ours[j]], j)
+            for j in range(b_lo, b_hi)
+            if b_counts[ours[j]] == 1 and a_counts.get(ours[j]) == 1
+        ]
+        if unique:
+            unique.sort()
+            anchors = _longest_increasing_subsequence(unique)
+        else:
+            # Histogram: anchor on the least frequent common slide
+            common = [h for h in b_counts if h in a_counts]
+            if not common:
+                continue
+            rarest = min(common, key=lambda h: (a_counts[h] + b_counts[h], a_first[h]))
+            anchors = [(a_first[rarest], ours.index(rarest, b_lo, b_hi))]
+
+        prev_a, prev_b = a_lo, b_lo
+        for a, b in anchors:
+            matches.append((a, b))
+            stack.append((prev_a, a, prev_b, b))
+            prev_a, prev_b = a + 1, b + 1
+        stack.append((prev_a, a_hi, prev_b, b_hi))
+
+    return sorted(matches)
+
+
+def diff_slides(theirs: list[str], ours: list[str], include_diff: bool = False) -> dict:
+    """Compare two decks slide by slide.
+
+    Identical slides are aligned by hash; slides that changed position are
+    reported as moved. Remaining slides in the same gap between aligned
+    slides are paired up as modified and only those pairs get a line diff.
+
+    Args:
+        theirs: Slides from training-material
+        ours: Slides from our generated deck
+        include_diff: Include unified diff text for modified slides
+
+    Returns:
+        Dict with unchanged count and added/removed/moved/modified lists.
+        Slide numbers are 1-based.
+    """
+    their_hashes = [hash_slide(s) for s in theirs]
+    our_hashes = [hash_slide(s) for s in ours]
+    matches = align_slides(their_hashes, our_hashes)
+
+    # Collect unmatched slides per gap between consecutive aligned slides
+    gaps: list[tuple[list[int], list[int]]] = []
+    prev_a, prev_b = 0, 0
+    for a, b in matches + [(len(theirs), len(ours))]:
+        if a > prev_a or b > prev_b:
+            gaps.append((list(range(prev_a, a)), list(range(prev_b, b))))
+        prev_a, prev_b = a + 1, b + 1
+
+    # Slides present on both sides but outside the alignment were moved
+    removed_by_hash: dict[str, list[int]] = {}
+    for removed, _ in gaps:
+        for i in removed:
+            removed_by_hash.setdefault(their_hashes[i], []).append(i)
+
+    moved = []
+    moved_theirs: set[int] = set()
+    moved_ours: set[int] = set()
+    for _, added in gaps:
+        for j in added:
+            candidates = removed_by_hash.get(our_hashes[j])
+            if candidates:
+                i = candidates.pop(0)
+                moved.append({'from': i + 1, 'to': j + 1, 'title': slide_title(ours[j])})
+                moved_theirs.add(i)
+                moved_ours.add(j)
+
+    added_slides = []
+    removed_slides = []
+    modified = []
+    for removed, added in gaps:
+        removed = [i for i in removed if i not in moved_theirs]
+        added = [j for j in added if j not in moved_ours]
+
+        for i, j in zip(removed, added):
+            their_lines = theirs[i].splitlines()
+            our_lines = ours[j].splitlines()
+            diff_lines = list(difflib.unified_diff(
+                their_lines, our_lines,
+                fromfile=f'training-material/slide-{i + 1}',
+                tofile=f'galaxy-architecture/slide-{j + 1}',
+                lineterm='',
+            ))
+            entry = {
+                'from': i + 1,
+                'to': j + 1,
+                'title': slide_title(ours[j]),
+                'lines_added': sum(1 for l in diff_lines if l.startswith('+') and not l.startswith('+++')),
+                'lines_removed': sum(1 for l in diff_lines if l.startswith('-') and not l.startswith('---')),
+            }
+            if include_diff:
+                entry['diff'] = '\n'.join(diff_lines)
+            modified.append(entry)
+
+        pairs = min(len(removed), len(added))
+        removed_slides.extend({'slide': i + 1, 'title': slide_title(theirs[i])} for i in removed[pairs:])
+        added_slides.extend({'slide': j + 1, 'title': slide_title(ours[j])} for j in added[pairs:])
+
+    return {
+        'unchanged': len(matches),
+        'added': added_slides,
+        'removed': removed_slides,
+        'moved': moved,
+        'modified': modified,
+    }
 
 
 def compare_front_matter(ours: dict, theirs: dict) -> list[str]:
@@ -120,57 +353,66 @@ def compare_front_matter(ours: dict, theirs: dict) -> list[str]:
     return changes
 
 
-def generate_unified_diff(ours: str, theirs: str, topic_id: str) -> str:
-    """Generate unified diff between two markdown strings."""
-    ours_lines = ours.splitlines(keepends=True)
-    theirs_lines = theirs.splitlines(keepends=True)
+def build_topic_report(topic_id: str, training_material_root: Path, include_diff: bool = False) -> dict:
+    """Compare single topic and return a slide-level report.
 
-    diff = difflib.unified_diff(
-        theirs_lines,
-        ours_lines,
-        fromfile=f'training-material/{topic_id}',
-        tofile=f'galaxy-architecture/{topic_id}',
-        lineterm=''
-    )
+    Returns dict with:
+        - topic: topic ID
+        - error: error message if the comparison could not run
+        - slides: {'ours': n, 'theirs': n} slide counts
+        - front_matter: list of front matter differences
+        - unchanged/added/removed/moved/modified: from diff_slides()
+    """
+    report = {'topic': topic_id, 'error': None}
 
-    return ''.join(diff)
+    try:
+        # Load our metadata
+        metadata = load_metadata(topic_id)
+        tutorial_num = metadata.training.tutorial_number
 
+        # Find paths
+        our_slides = Path(f"outputs/training-slides/generated/architecture-{topic_id}/slides.html")
+        their_dir = training_material_root / f"topics/dev/tutorials/architecture-{tutorial_num}-{topic_id}"
+        their_slides = their_dir / "slides.html"
 
-def compare_topics(topic_id: str, training_material_root: Path) -> None:
-    """Compare single topic and print report."""
-    print(f"\n{'='*60}")
-    print(f"Topic: {topic_id}")
-    print('='*60)
+        # Check files exist
+        if not our_slides.exists():
+            report['error'] = f"Our slides not found: {our_slides} (run: make build-slides)"
+            return report
 
-    # Load our metadata
-    metadata = load_metadata(topic_id)
-    tutorial_num = metadata.training.tutorial_number
+        if not their_slides.exists():
+            report['error'] = f"Training-material slides not found: {their_slides}"
+            return report
 
-    # Find paths
-    our_slides = Path(f"outputs/training-slides/generated/architecture-{topic_id}/slides.html")
-    their_dir = training_material_root / f"topics/dev/tutorials/architecture-{tutorial_num}-{topic_id}"
-    their_slides = their_dir / "slides.html"
+        # Extract content
+        ours = split_slides(extract_markdown_from_html(our_slides))
+        theirs = split_slides(extract_markdown_from_html(their_slides))
 
-    # Check files exist
-    if not our_slides.exists():
-        print(f"⚠️  Our slides not found: {our_slides}")
-        print("   Run: make build-slides")
-        return
+        report['slides'] = {'ours': len(ours), 'theirs': len(theirs)}
+        report['front_matter'] = compare_front_matter(
+            extract_front_matter(our_slides),
+            extract_front_matter(their_slides),
+        )
+        report.update(diff_slides(theirs, ours, include_diff=include_diff))
 
-    if not their_slides.exists():
-        print(f"⚠️  Training-material slides not found: {their_slides}")
-        return
+    except Exception as e:
+        report['error'] = f"{type(e).__name__}: {e}"
 
-    # Extract content
-    our_markdown = extract_markdown_from_html(our_slides)
-    their_markdown = extract_markdown_from_html(their_slides)
+    return report
 
-    our_front_matter = extract_front_matter(our_slides)
-    their_front_matter = extract_front_matter(their_slides)
 
-    # Compare slide counts
-    our_count = count_slides(our_markdown)
-    their_count = count_slides(their_markdown)
+def print_topic_report(report: dict) -> None:
+    """Print a human-readable slide-level report for one topic."""
+    print(f"\n{'='*60}")
+    print(f"Topic: {report['topic']}")
+    print('='*60)
+
+    if report['error']:
+        print(f"⚠️  {report['error']}")
+        return
+
+    our_count = report['slides']['ours']
+    their_count = report['slides']['theirs']
 
     print(f"\nSLIDE COUNT:")
     if our_count != their_count:
@@ -178,29 +420,60 @@ def compare_topics(topic_id: str, training_material_root: Path) -> None:
     else:
         print(f"  {our_count} slides (no change)")
 
-    # Compare front matter
     print(f"\nFRONT MATTER CHANGES:")
-    fm_changes = compare_front_matter(our_front_matter, their_front_matter)
-    if fm_changes:
-        for change in fm_changes:
+    if report['front_matter']:
+        for change in report['front_matter']:
             print(change)
     else:
         print("  No changes")
 
-    # Show markdown diff
-    print(f"\nMARKDOWN DIFF:")
-    diff = generate_unified_diff(our_markdown, their_markdown, topic_id)
-    if diff:
-        # Limit diff output
-        diff_lines = diff.split('\n')
-        if len(diff_lines) > 50:
-            print('\n'.join(diff_lines[:25]))
-            print(f"\n  ... ({len(diff_lines) - 50} more lines) ...\n")
-            print('\n'.join(diff_lines[-25:]))
-        else:
-            print(diff)
-    else:
+    print(f"\nSLIDE CHANGES:")
+    print(f"  Unchanged: {report['unchanged']}")
+    if not (report['added'] or report['removed'] or report['moved'] or report['modified']):
         print("  No differences")
+        return
+
+    for slide in report['added']:
+        print(f"  + added    #{slide['slide']}: {slide['title']}")
+    for slide in report['removed']:
+        print(f"  - removed  #{slide['slide']}: {slide['title']}")
+    for slide in report['moved']:
+        print(f"  ↕ moved    #{slide['from']} → #{slide['to']}: {slide['title']}")
+    for slide in report['modified']:
+        print(f"  ~ modified #{slide['from']} → #{slide['to']}: {slide['title']} "
+              f"(+{slide['lines_added']} -{slide['lines_removed']})")
+        if slide.get('diff'):
+            diff_lines = slide['diff'].split('\n')
+            # Limit diff output per slide
+            if len(diff_lines) > 30:
+                print('\n'.join(diff_lines[:30]))
+                print(f"\n  ... ({len(diff_lines) - 30} more lines) ...\n")
+            else:
+                print(slide['diff'])
+
+
+def compare_topics(topic_id: str, training_material_root: Path) -> None:
+    """Compare single topic and print report."""
+    print_topic_report(build_topic_report(topic_id, training_material_root, include_diff=True))
+
+
+def compare_all(
+    topics: list[str],
+    training_material_root: Path,
+    include_diff: bool = False,
+    jobs: Optional[int] = None,
+) -> list[dict]:
+    """Compare topics concurrently, returning reports in input order."""
+    if jobs == 1 or len(topics) <= 1:
+        return [build_topic_report(t, training_material_root, include_diff) for t in topics]
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(
+            build_topic_report,
+            topics,
+            [training_material_root] * len(topics),
+            [include_diff] * len(topics),
+        ))
 
 
 def main():
@@ -213,6 +486,9 @@ def main():
         default=Path.home() / 'workspace' / 'training-material',
         help='Path to training-material repository'
     )
+    parser.add_argument('--json', action='store_true', help='Print a JSON report instead of text')
+    parser.add_argument('--diff', action='store_true', help='Include line diffs of modified slides in JSON output')
+    parser.add_argument('--jobs', '-j', type=int, default=None, help='Number of topics to compare in parallel')
 
     args = parser.parse_args()
 
@@ -230,14 +506,16 @@ def main():
     else:
         topics = [args.topic]
 
-    # Compare each topic
-    for topic in topics:
-        try:
-            compare_topics(topic, args.training_material_root)
-        except Exception as e:
-            print(f"\n❌ Error comparing {topic}: {e}")
-            import traceback
-            traceback.print_exc()
+    # Text output always shows slide diffs; JSON output only on request
+    include_diff = args.diff or not args.json
+    reports = compare_all(topics, args.training_material_root, include_diff, args.jobs)
+
+    if args.json:
+        print(json.dumps(reports, separators=(',', ':')))
+        return
+
+    for report in reports:
+        print_topic_report(report)
 
     print(f"\n{'='*60}")
     print(f"Compared {len(topics)} topic(s)")
@@ -0,0 +1,112 @@
+"""Compile topics into resolved content blocks.
+
+Analysis tools (link checking, indexing, agent context generation) work on
+the resolved text of every content block rather than on raw content.yaml.
+This module loads each topic once and resolves ``content``, ``file`` and
+``fragments`` sources the same way the builders do.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from build_cache import hash_text
+
+if TYPE_CHECKING:
+    from models import ContentBlockType, TopicMetadata
+
+
+@dataclass(frozen=True)
+class CompiledBlock:
+    """A content block with its content sources resolved to text."""
+    topic_id: str
+    block_id: str
+    type: ContentBlockType
+    position: int
+    text: str
+    heading: Optional[str] = None
+
+    @cached_property
+    def hash(self) -> str:
+        """Content hash of the block (heading and text)."""
+        return hash_text(f"{self.heading or ''}\n{self.text}")
+
+    @property
+    def location(self) -> str:
+        """Human-readable location, e.g. 'ecosystem:matrix-slide'."""
+        return f"{self.topic_id}:{self.block_id}"
+
+
+@dataclass
+class CompiledTopic:
+    """A topic's metadata and resolved content blocks."""
+    topic_id: str
+    metadata: TopicMetadata
+    blocks: list[CompiledBlock] = field(default_factory=list)
+
+
+def list_topic_ids(topics_dir: Path = Path("topics")) -> list[str]:
+    """Return sorted IDs of all topics that have a metadata.yaml."""
+    return sorted(
+        d.name for d in topics_dir.iterdir()
+        if d.is_dir() and (d / "metadata.yaml").exists()
+    )
+
+
+def compile_topic(topic_id: str, topics_dir: Path = Path("topics")) -> CompiledTopic:
+    """Load a topic and resolve every content block.
+
+    Raises:
+        FileNotFoundError: If metadata, content or a fragment is missing
+        ValidationError: If metadata or content is invalid
+    """
+    # Imported lazily so tools that only need list_topic_ids() start fast
+    from models import load_content, load_metadata
+
+    metadata = load_metadata(topic_id, topics_dir)
+    content = load_content(topic_id, topics_dir)
+    topic_dir = topics_dir / topic_id
+
+    blocks = [
+        CompiledBlock(
+            topic_id=topic_id,
+            block_id=block.id,
+            type=block.type,
+            position=position,
+            text=block.resolve_content(topic_dir),
+            heading=block.heading,
+        )
+        for position, block in enumerate(content)
+    ]
+    return CompiledTopic(topic_id=topic_id, metadata=metadata, blocks=blocks)
+
+
+def topic_input_files(topic_id: str, topics_dir: Path = Path("topics")) -> list[Path]:
+    """Files a topic's compiled content depends on (metadata, content, fragments)."""
+    topic_dir = topics_dir / topic_id
+    files = [topic_dir / "metadata.yaml", topic_dir / "content.yaml"]
+    files += (topic_dir / "fragments").glob("**/*")
+    return sorted(f for f in files if f.is_file())
+
+
+@lru_cache(maxsize=None)
+def load_builder(output_name: str):
+    """Import an output builder module (outputs/<output_name>/build.py) by path.
+
+    The builders live in hyphenated directories and aren't importable as
+    packages; tools that reuse their rendering functions load them here.
+    """
+    path = Path(__file__).parent.parent / "outputs" / output_name / "build.py"
+    spec = importlib.util.spec_from_file_location(f"{output_name.replace('-', '_')}_build", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def compile_all_topics(topics_dir: Path = Path("topics")) -> list[CompiledTopic]:
+    """Compile all topics in topics_dir, sorted by topic ID."""
+    return [compile_topic(topic_id, topics_dir) for topic_id in list_topic_ids(topics_dir)]
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Report near-duplicate content blocks across topics.
+
+Much of the content was migrated from GTN slide decks and several topics
+repeat similar slides. This report shingles every block into word n-grams,
+computes MinHash signatures with NumPy, buckets them with locality-sensitive
+hashing (LSH banding) and verifies candidate pairs with exact Jaccard
+similarity, so only likely duplicates are ever compared.
+
+Signatures are cached per block content hash in .cache/minhash.npz, so only
+new or edited blocks are hashed on later runs.
+
+Requires the optional analysis dependencies (numpy).
+
+Usage:
+    uv run --extra analysis python scripts/dedupe_report.py
+    uv run --extra analysis python scripts/dedupe_report.py --threshold 0.5 --cross-topic
+    uv run --extra analysis python scripts/dedupe_report.py --json
+"""
+
+import argparse
+import json
+import re
+import sys
+import zlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+# Add scripts to path for models
+sys.path.insert(0, str(Path(__file__).parent))
+from build_cache import cache_path
+from compiled_topics import CompiledBlock, compile_all_topics
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+SEED = 1
+# Blocks with fewer shingles than this are too short to compare meaningfully
+MIN_SHINGLES = 8
+DEFAULT_THRESHOLD = 0.7
+
+# Universal hashing modulo a Mersenne prime; a * x stays below 2**62
+MERSENNE_PRIME = (1 << 31) - 1
+MAX_HASH = np.uint64(MERSENNE_PRIME)
+
+WORD_PATTERN = re.compile(r"\w+")
+SIGNATURE_VERSION = f"1:{SHINGLE_SIZE}:{NUM_PERM}:{SEED}"
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[int]:
+    """Hashed word n-grams of text (lowercased, punctuation ignored).
+
+    Texts shorter than size words yield a single shingle.
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode())} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + size]).encode()) for i in range(len(words) - size + 1)}
+
+
+def permutations(num_perm: int = NUM_PERM, seed: int = SEED) -> tuple[np.ndarray, np.ndarray]:
+    """Coefficients (a, b) of num_perm hash functions (a * x + b) mod p."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash(shingle_set: set[int], a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """MinHash signature of a shingle set: one minimum per hash function."""
+    if not shingle_set:
+        return np.full(len(a), MAX_HASH, dtype=np.uint64)
+    values = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set)) % MAX_HASH
+    return ((np.outer(a, values) + b[:, None]) % MAX_HASH).min(axis=1)
+
+
+def choose_bands(threshold: float, num_perm: int = NUM_PERM) -> tuple[int, int]:
+    """Pick (bands, rows) for LSH so the S-curve threshold sits at or below threshold.
+
+    The probability that a pair with Jaccard similarity s shares a bucket is
+    1 - (1 - s**rows)**bands, with its steepest point near (1/bands)**(1/rows).
+    Erring below the requested threshold favors recall; exact verification
+    removes the extra candidates.
+    """
+    options = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    below = [(bands, rows) for bands, rows in options if (1 / bands) ** (1 / rows) <= threshold]
+    return max(below, key=lambda option: (1 / option[0]) ** (1 / option[1]), default=options[0])
+
+
+def load_signatures(cache_file: Path) -> dict[str, np.ndarray]:
+    """Cached signatures by block hash (empty if missing or from other parameters)."""
+    try:
+        with np.load(cache_file) as npz:
+            if str(npz['version']) != SIGNATURE_VERSION:
+                return {}
+            return dict(zip(npz['hashes'].tolist(), npz['signatures']))
+    except (FileNotFoundError, KeyError, ValueError):
+        return {}
+
+
+def save_signatures(cache_file: Path, signatures: dict[str, np.ndarray]) -> None:
+    hashes = sorted(signatures)
+    matrix = np.array([signatures[h] for h in hashes], dtype=np.uint64).reshape(len(hashes), NUM_PERM)
+    tmp = cache_file.with_name(f".{cache_file.name}.tmp.npz")
+    np.savez_compressed(tmp, version=np.array(SIGNATURE_VERSION), hashes=np.array(hashes, dtype=str),
+                        signatures=matrix)
+    tmp.replace(cache_file)
+
+
+def candidate_pairs(signatures: np.ndarray, bands: int, rows: int) -> set[tuple[int, int]]:
+    """Index pairs sharing at least one LSH band bucket."""
+    pairs = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        for i, chunk in enumerate(signatures[:, band * rows:(band + 1) * rows]):
+            buckets[chunk.tobytes()].append(i)
+        for members in buckets.values():
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    pairs.add((members[x], members[y]))
+    return pairs
+
+
+def find_duplicates(
+    blocks: list[CompiledBlock],
+    threshold: float = DEFAULT_THRESHOLD,
+    cross_topic: bool = False,
+    cache_file: Optional[Path] = None,
+) -> dict:
+    """Find near-duplicate block pairs.
+
+    Args:
+        blocks: Compiled blocks to compare
+        threshold: Minimum Jaccard similarity of shingle sets to report
+        cross_topic: Only report pairs from different topics
+        cache_file: Signature cache (default: .cache/minhash.npz)
+
+    Returns dict with:
+        - pairs: List of {a, b, similarity} sorted by similarity (descending)
+        - blocks: Number of blocks compared
+        - candidates: Number of LSH candidate pairs verified
+        - hashed: Number of signatures computed (not cached)
+    """
+    cache_file = cache_file or cache_path('minhash.npz')
+    cached = load_signatures(cache_file)
+
+    shingle_sets = [shingles(block.text) for block in blocks]
+    kept = [i for i, s in enumerate(shingle_sets) if len(s) >= MIN_SHINGLES]
+
+    a, b = permutations()
+    signatures = {}
+    hashed = 0
+    for i in kept:
+        key = blocks[i].hash
+        if key not in signatures:
+            if key not in cached:
+                cached[key] = minhash(shingle_sets[i], a, b)
+                hashed += 1
+            signatures[key] = cached[key]
+
+    if hashed:
+        save_signatures(cache_file, signatures)
+
+    matrix = np.array([signatures[blocks[i].hash] for i in kept], dtype=np.uint64).reshape(len(kept), NUM_PERM)
+    bands, rows = choose_bands(threshold)
+    candidates = candidate_pairs(matrix, bands, rows)
+
+    pairs = []
+    for x, y in candidates:
+        first, second = blocks[kept[x]], blocks[kept[y]]
+        if cross_topic and first.topic_id == second.topic_id:
+            continue
+        s1, s2 = shingle_sets[kept[x]], shingle_sets[kept[y]]
+        similarity = len(s1 & s2) / len(s1 | s2)
+        if similarity >= threshold:
+            pairs.append({'a': first.location, 'b': second.location, 'similarity': round(similarity, 3)})
+
+    pairs.sort(key=lambda p: (-p['similarity'], p['a'], p['b']))
+    return {'pairs': pairs, 'blocks': len(kept), 'candidates': len(candidates), 'hashed': hashed}
+
+
+def print_report(result: dict, threshold: float) -> None:
+    print("=" * 60)
+    print("Near-Duplicate Content Report")
+    print("=" * 60)
+    print(f"Compared {result['blocks']} blocks, verified {result['candidates']} LSH candidate pairs "
+          f"({result['hashed']} signatures computed)")
+    print()
+
+    if not result['pairs']:
+        print(f"✅ No block pairs with Jaccard similarity >= {threshold}")
+        return
+
+    for pair in result['pairs']:
+        scope = "cross-topic" if pair['a'].split(':')[0] != pair['b'].split(':')[0] else "same topic"
+        print(f"⚠️  {pair['similarity']:.2f}  {pair['a']}  ↔  {pair['b']}  ({scope})")
+    print()
+    print(f"Found {len(result['pairs'])} near-duplicate pair(s) with Jaccard similarity >= {threshold}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report near-duplicate content blocks across topics')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Minimum Jaccard similarity (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--cross-topic', action='store_true', help='Only report pairs from different topics')
+    parser.add_argument('--json', action='store_true', help='Print JSON')
+
+    args = parser.parse_args()
+    if not 0 < args.threshold <= 1:
+        parser.error('--threshold must be in (0, 1]')
+
+    blocks = [block for topic in compile_all_topics() for block in topic.blocks]
+    result = find_duplicates(blocks, args.threshold, args.cross_topic)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result, args.threshold)
+
+
+if __name__ == '__main__':
+    main()
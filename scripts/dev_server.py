@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Local development server with live reload for topic pages and slide decks.
+
+Pages are rendered on request with the same builder functions as the
+Sphinx and slide builds, without writing any output files:
+
+    /                                     topic index
+    /architecture/<topic>.html            documentation page (Sphinx markdown preview)
+    /architecture/<topic>/slides.html     standalone Remark.js deck
+
+Rendered pages are cached by the content hash of everything they depend
+on (topic YAML and fragments, referenced images, builder and templates).
+A watcher polls those files; when a dependency's content changes, only the
+pages that depend on it get a reload event over Server-Sent Events, and the
+next request renders them again.
+
+Documentation pages are a preview rendered with markdown-it (installed with
+the docs extra); MyST directives are shown as code. Use ``make view-sphinx``
+for the real Sphinx build.
+
+Usage:
+    uv run python scripts/dev_server.py
+    uv run python scripts/dev_server.py --port 8080 --open
+"""
+
+import argparse
+import html
+import mimetypes
+import re
+import sys
+import threading
+import time
+import webbrowser
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+# Add scripts to path for models
+sys.path.insert(0, str(Path(__file__).parent))
+from build_cache import cache_root, hash_file, hash_text
+from compiled_topics import list_topic_ids, load_builder, topic_input_files
+from image_dimensions import ImageDimensions
+from image_references import extract_image_names
+
+ROOT = Path(__file__).resolve().parent.parent
+SPHINX_BUILDER = ROOT / "outputs" / "sphinx-docs" / "build.py"
+SLIDES_DIR = ROOT / "outputs" / "training-slides"
+SLIDES_BUILDER_FILES = [SLIDES_DIR / "build.py", SLIDES_DIR / "template.html", SLIDES_DIR / "html_wrapper_template.html"]
+SLIDES_ASSETS = SLIDES_DIR / "assets"
+REMARK_URL = "https://remarkjs.com/downloads/remark-latest.min.js"
+
+# Image prefixes written by the builders, served from /_images/
+SLIDES_IMAGE_PREFIX = "../../../../images/"
+PAGE_ROUTE = re.compile(r"^/architecture/([\w-]+)(\.html|/slides\.html)$")
+
+POLL_INTERVAL = 0.2
+HEARTBEAT_INTERVAL = 15
+CACHE_SIZE = 64
+
+RELOAD_SCRIPT = """<script>
+new EventSource('/events?page=' + encodeURIComponent(location.pathname)).onmessage = function () {
+    location.reload();
+};
+</script>"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; max-width: 50em; margin: 2em auto; padding: 0 1em; line-height: 1.5; }}
+img {{ max-width: 100%; height: auto; }}
+pre {{ background: #f5f5f5; padding: 0.5em; overflow-x: auto; }}
+table {{ border-collapse: collapse; }} td, th {{ border: 1px solid #ccc; padding: 0.25em 0.5em; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+def route(path: str) -> Optional[tuple[str, Optional[str]]]:
+    """Map a URL path to (page kind, topic ID); kind is 'index', 'doc' or 'slides'."""
+    if path in ("/", "/index.html"):
+        return "index", None
+    match = PAGE_ROUTE.match(path)
+    if not match:
+        return None
+    return ("doc" if match.group(2) == ".html" else "slides"), match.group(1)
+
+
+def markdown_to_html(markdown: str) -> str:
+    """Render markdown with markdown-it, or show it preformatted if not installed."""
+    try:
+        from markdown_it import MarkdownIt
+    except ImportError:
+        return ("<p><em>Install the docs extra (markdown-it-py) for rendered previews.</em></p>"
+                f"<pre>{html.escape(markdown)}</pre>")
+    return MarkdownIt("commonmark", {"html": True}).enable("table").render(markdown)
+
+
+def inject_reload_script(page: str) -> str:
+    return page.replace("</body>", f"{RELOAD_SCRIPT}\n</body>", 1)
+
+
+def slides_builder():
+    """The slide builder, with templates reloaded when they change on disk.
+
+    Compiled templates stay in memory (no bytecode cache writes per request).
+    """
+    builder = load_builder("training-slides")
+    if not builder.templates.auto_reload:
+        builder.templates = builder.template_environment(auto_reload=True, bytecode_cache=False)
+    return builder
+
+
+class DevServer:
+    """Renders pages on demand, caches them and tracks their dependencies.
+
+    Args:
+        topics_dir: Topics directory
+        images_dir: Image directory served under /_images/
+    """
+
+    def __init__(self, topics_dir: Path = Path("topics"), images_dir: Path = Path("images")):
+        self.topics_dir = topics_dir
+        self.images_dir = images_dir
+        self.cache: OrderedDict[str, bytes] = OrderedDict()
+        # page path -> files it was rendered from / dependency key it was served with
+        self.dependencies: dict[str, set[Path]] = {}
+        self.served: dict[str, str] = {}
+        # page path -> number of reload events sent
+        self.generations: dict[str, int] = {}
+        self.renders = 0
+        self.hashes: dict[Path, tuple[Optional[tuple[int, int]], str]] = {}
+        # Slide image sizes: read from the build cache once, never saved
+        self.dimensions = ImageDimensions(cache_root() / "image_dimensions.json")
+        self.stats: dict[Path, tuple[int, int]] = self.snapshot()
+        self.lock = threading.Lock()
+        self.render_lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+
+    def watched_files(self) -> list[Path]:
+        files = [p for root in (self.topics_dir, self.images_dir) if root.exists() for p in root.rglob("*")]
+        return files + [SPHINX_BUILDER, *SLIDES_BUILDER_FILES]
+
+    def snapshot(self) -> dict[Path, tuple[int, int]]:
+        """(size, mtime) of every watched file."""
+        stats = {}
+        for path in self.watched_files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if not path.is_dir():
+                stats[path] = (stat.st_size, stat.st_mtime_ns)
+        return stats
+
+    def content_hash(self, path: Path) -> str:
+        """Content hash of a file, re-read only when its size or mtime changes."""
+        try:
+            stat = path.stat()
+            signature = (stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            return "missing"
+        cached = self.hashes.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+        digest = hash_file(path)
+        self.hashes[path] = (signature, digest)
+        return digest
+
+    def dependency_key(self, page: str, files: set[Path]) -> str:
+        return hash_text(page + "\n" + "\n".join(f"{f}:{self.content_hash(f)}" for f in sorted(files)))
+
+    def base_dependencies(self, kind: str, topic_id: Optional[str]) -> set[Path]:
+        """Dependencies known without rendering (everything but images)."""
+        if kind == "index":
+            return {self.topics_dir / t / "metadata.yaml" for t in list_topic_ids(self.topics_dir)}
+        builder_files = [SPHINX_BUILDER] if kind == "doc" else SLIDES_BUILDER_FILES
+        return set(topic_input_files(topic_id, self.topics_dir)) | set(builder_files)
+
+    def render(self, kind: str, topic_id: Optional[str]) -> tuple[str, set[str]]:
+        """Render a page; returns (HTML, referenced image names)."""
+        if kind == "index":
+            from models import load_metadata
+
+            items = []
+            for t in list_topic_ids(self.topics_dir):
+                title = html.escape(load_metadata(t, self.topics_dir).title)
+                items.append(f'<li>{title}: <a href="/architecture/{t}.html">page</a> · '
+                             f'<a href="/architecture/{t}/slides.html">slides</a></li>')
+            body = "<h1>Galaxy Architecture</h1>\n<ul>\n" + "\n".join(items) + "\n</ul>"
+            return PAGE_TEMPLATE.format(title="Galaxy Architecture", body=body), set()
+
+        if kind == "doc":
+            builder = load_builder("sphinx-docs")
+            markdown = builder.generate_topic_markdown(topic_id, self.topics_dir / topic_id)
+            markdown = builder.process_markdown_for_sphinx(markdown, topic_id)
+            page = PAGE_TEMPLATE.format(title=html.escape(topic_id), body=markdown_to_html(markdown))
+            # Images are ../_images/ relative to /architecture/
+            return page, extract_image_names(markdown)
+
+        remark = cache_root() / "vendor" / "remark.min.js"
+        assets = {
+            'remark_js': "/vendor/remark.min.js" if remark.exists() else REMARK_URL,
+            'fonts_css': "/assets/css/fonts.css",
+        }
+        _, page = slides_builder().render_slides(topic_id, assets=assets, dimensions=self.dimensions)
+        images = {name for name in re.findall(re.escape(SLIDES_IMAGE_PREFIX) + r"""([^)\s"'<>]+)""", page)}
+        return page.replace(SLIDES_IMAGE_PREFIX, "/_images/"), images
+
+    def get_page(self, path: str) -> Optional[bytes]:
+        """Rendered page for a URL path (from cache when its dependencies are unchanged)."""
+        target = route(path)
+        if target is None or (target[1] and target[1] not in list_topic_ids(self.topics_dir)):
+            return None
+
+        with self.lock:
+            known = self.dependencies.get(path)
+            if known is not None:
+                key = self.dependency_key(path, known)
+                if key in self.cache:
+                    self.cache.move_to_end(key)
+                    self.served[path] = key
+                    return self.cache[key]
+
+        with self.render_lock:
+            while True:
+                base = self.base_dependencies(*target)
+                with self.lock:
+                    before = self.dependency_key(path, base)
+                page, images = self.render(*target)
+                self.renders += 1
+                with self.lock:
+                    # Render again if an input changed while rendering
+                    if self.dependency_key(path, base) == before:
+                        break
+
+        data = inject_reload_script(page).encode()
+        files = base | {self.images_dir / name for name in images}
+        with self.lock:
+            key = self.dependency_key(path, files)
+            self.cache[key] = data
+            while len(self.cache) > CACHE_SIZE:
+                self.cache.popitem(last=False)
+            self.dependencies[path] = files
+            self.served[path] = key
+        return data
+
+    def poll(self) -> list[str]:
+        """Check watched files once; send reload events to affected pages.
+
+        Returns:
+            Paths of pages that were told to reload
+        """
+        stats = self.snapshot()
+        changed = {p for p in stats.keys() | self.stats.keys() if stats.get(p) != self.stats.get(p)}
+        self.stats = stats
+        if not changed:
+            return []
+
+        if changed & ({SPHINX_BUILDER} | set(SLIDES_BUILDER_FILES)):
+            # Pick up edits to the builder modules themselves
+            load_builder.cache_clear()
+
+        reloaded = []
+        with self.lock:
+            for page, files in self.dependencies.items():
+                if files & changed and self.dependency_key(page, files) != self.served.get(page):
+                    self.generations[page] = self.generations.get(page, 0) + 1
+                    reloaded.append(page)
+            if reloaded:
+                self.changed.notify_all()
+        return reloaded
+
+    def watch(self, interval: float = POLL_INTERVAL) -> None:
+        while True:
+            time.sleep(interval)
+            for page in self.poll():
+                print(f"↻ {page}")
+
+    def wait_for_reload(self, page: str, generation: int, timeout: float) -> int:
+        """Block until page's reload generation moves past generation (or timeout)."""
+        with self.changed:
+            self.changed.wait_for(lambda: self.generations.get(page, 0) != generation, timeout)
+            return self.generations.get(page, 0)
+
+
+class Handler(BaseHTTPRequestHandler):
+    app: DevServer
+    verbose = False
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/events":
+            return self.send_events(parse_qs(url.query).get("page", ["/"])[0])
+        if url.path.startswith("/_images/"):
+            return self.send_file(self.app.images_dir, url.path[len("/_images/"):])
+        if url.path.startswith("/assets/"):
+            return self.send_file(SLIDES_ASSETS, url.path[len("/assets/"):])
+        if url.path == "/vendor/remark.min.js":
+            return self.send_file(cache_root() / "vendor", "remark.min.js")
+
+        data = self.app.get_page(url.path)
+        if data is None:
+            return self.send_error(404)
+        self.send_data(data, "text/html; charset=utf-8")
+
+    def send_data(self, data: bytes, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_file(self, directory: Path, name: str) -> None:
+        path = (directory / name).resolve()
+        if not path.is_relative_to(directory.resolve()) or not path.is_file():
+            return self.send_error(404)
+        self.send_data(path.read_bytes(), mimetypes.guess_type(path.name)[0] or "application/octet-stream")
+
+    def send_events(self, page: str) -> None:
+        # Read before responding so no reload is missed once the client is connected
+        generation = self.app.generations.get(page, 0)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        try:
+            while True:
+                current = self.app.wait_for_reload(page, generation, HEARTBEAT_INTERVAL)
+                self.wfile.write(b"data: reload\n\n" if current != generation else b": ping\n\n")
+                self.wfile.flush()
+                generation = current
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(app: DevServer, host: str = "127.0.0.1", port: int = 8000, verbose: bool = False) -> ThreadingHTTPServer:
+    handler = type("DevServerHandler", (Handler,), {"app": app, "verbose": verbose})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve topic pages and slide decks with live reload')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8000, help='Port (default: 8000)')
+    parser.add_argument('--open', action='store_true', help='Open the index in a browser')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Log requests')
+
+    args = parser.parse_args()
+
+    app = DevServer()
+    server = make_server(app, args.host, args.port, args.verbose)
+    threading.Thread(target=app.watch, daemon=True).start()
+
+    url = f"http://{args.host}:{server.server_address[1]}/"
+    print(f"✓ Serving {len(list_topic_ids())} topics at {url} (Ctrl+C to stop)")
+    if args.open:
+        webbrowser.open(url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print()
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
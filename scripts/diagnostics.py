@@ -0,0 +1,205 @@
+"""Structured validation diagnostics with YAML source positions.
+
+Validation errors from pydantic and the cross-checks in validate.py only
+say *what* is wrong (``training -> tutorial_number: ...``). Editors, the
+validation service and the pre-commit hook need to say *where*, so this
+module validates a topic's YAML files and maps every error location back to
+a line and column using the composed YAML nodes (start marks).
+
+Lines and columns are 1-based.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import yaml
+from pydantic import ValidationError
+
+from models import TopicContent, TopicMetadata
+
+ERROR = "error"
+WARNING = "warning"
+
+
+@dataclass(frozen=True)
+class Diagnostic:
+    """A validation problem at a position in a file."""
+    path: str
+    line: int
+    column: int
+    message: str
+    severity: str = ERROR
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def __str__(self) -> str:
+        return f"{self.path}:{self.line}:{self.column}: {self.severity}: {self.message}"
+
+
+def parse(text: str) -> tuple[Any, Optional[yaml.Node]]:
+    """Parse YAML once into (data, node tree); both None for an empty document.
+
+    Raises:
+        yaml.YAMLError: If the text isn't valid YAML
+    """
+    loader = yaml.SafeLoader(text)
+    try:
+        node = loader.get_single_node()
+        return (loader.construct_document(node) if node is not None else None), node
+    finally:
+        loader.dispose()
+
+
+def find_node(root: Optional[yaml.Node], loc: tuple) -> tuple[Optional[yaml.Node], bool]:
+    """Follow an error location (keys and indexes) through a YAML node tree.
+
+    Returns:
+        Tuple of (deepest node reached, whether the whole location was found).
+        A missing key stops at its parent mapping, so "field required"
+        errors point at the object missing the field.
+    """
+    node = root
+    for part in loc:
+        if isinstance(node, yaml.MappingNode):
+            value = next((v for k, v in node.value if k.value == str(part)), None)
+            if value is None:
+                return node, False
+            node = value
+        elif isinstance(node, yaml.SequenceNode) and isinstance(part, int) and 0 <= part < len(node.value):
+            node = node.value[part]
+        else:
+            return node, False
+    return node, True
+
+
+def position(root: Optional[yaml.Node], loc: tuple) -> tuple[int, int]:
+    """1-based (line, column) for an error location in a composed document."""
+    node, _ = find_node(root, loc)
+    if node is None:
+        return 1, 1
+    return node.start_mark.line + 1, node.start_mark.column + 1
+
+
+def format_loc(loc: tuple) -> str:
+    return " -> ".join(str(part) for part in loc)
+
+
+def load_yaml(path: Path, text: Optional[str] = None) -> tuple[Any, Optional[yaml.Node], list[Diagnostic]]:
+    """Parse a YAML file into (data, node tree, syntax diagnostics).
+
+    Args:
+        text: Unsaved text to parse instead of the file on disk
+    """
+    if text is None:
+        try:
+            text = path.read_text()
+        except FileNotFoundError:
+            return None, None, [Diagnostic(str(path), 1, 1, f"{path.name} not found")]
+    try:
+        data, root = parse(text)
+        return data, root, []
+    except yaml.YAMLError as e:
+        mark = getattr(e, "problem_mark", None) or getattr(e, "context_mark", None)
+        line, column = (mark.line + 1, mark.column + 1) if mark else (1, 1)
+        problem = getattr(e, "problem", None) or str(e)
+        return None, None, [Diagnostic(str(path), line, column, f"YAML syntax error: {problem}")]
+
+
+def validation_diagnostics(path: Path, root: Optional[yaml.Node], error: ValidationError, strip: int = 0) -> list[Diagnostic]:
+    """Diagnostics for a pydantic ValidationError, positioned in the YAML source.
+
+    Args:
+        strip: Number of leading location parts that aren't in the YAML
+            (e.g. 1 for a RootModel's 'root')
+    """
+    diagnostics = []
+    for item in error.errors():
+        loc = tuple(item['loc'])[strip:]
+        line, column = position(root, loc)
+        message = f"{format_loc(loc)}: {item['msg']}" if loc else item['msg']
+        diagnostics.append(Diagnostic(str(path), line, column, message))
+    return diagnostics
+
+
+def check_metadata(topic_dir: Path, text: Optional[str] = None) -> tuple[Optional[TopicMetadata], Optional[yaml.Node], list[Diagnostic]]:
+    """Validate a topic's metadata.yaml (or unsaved text for it).
+
+    Returns:
+        Tuple of (metadata or None if invalid, node tree, diagnostics)
+    """
+    path = topic_dir / "metadata.yaml"
+    data, root, diagnostics = load_yaml(path, text)
+    if diagnostics:
+        return None, root, diagnostics
+    try:
+        metadata = TopicMetadata(**(data or {}))
+    except ValidationError as e:
+        return None, root, validation_diagnostics(path, root, e)
+    except TypeError as e:
+        return None, root, [Diagnostic(str(path), 1, 1, f"metadata must be a mapping ({e})")]
+
+    if metadata.topic_id != topic_dir.name:
+        line, column = position(root, ("topic_id",))
+        diagnostics.append(Diagnostic(
+            str(path), line, column,
+            f"Topic ID mismatch: directory is '{topic_dir.name}' but metadata.yaml has topic_id '{metadata.topic_id}'",
+        ))
+    for index, related_id in enumerate(metadata.related_topics):
+        if not (topic_dir.parent / related_id).exists():
+            line, column = position(root, ("related_topics", index))
+            diagnostics.append(Diagnostic(str(path), line, column, f"Related topic not found: {related_id}"))
+    return metadata, root, diagnostics
+
+
+def check_content(topic_dir: Path, text: Optional[str] = None) -> tuple[Optional[TopicContent], list[Diagnostic]]:
+    """Validate a topic's content.yaml (or unsaved text for it), including file/fragments references.
+
+    Returns:
+        Tuple of (content or None if invalid, diagnostics)
+    """
+    path = topic_dir / "content.yaml"
+    data, root, diagnostics = load_yaml(path, text)
+    if diagnostics:
+        return None, diagnostics
+    try:
+        content = TopicContent(root=data)
+    except ValidationError as e:
+        return None, validation_diagnostics(path, root, e, strip=1)
+
+    for index, block in enumerate(content):
+        try:
+            block.resolve_content(topic_dir)
+        except FileNotFoundError as e:
+            field = "file" if block.file else "fragments"
+            line, column = position(root, (index, field))
+            diagnostics.append(Diagnostic(str(path), line, column, str(e)))
+    return content, diagnostics
+
+
+CHAIN_FIELDS = ("previous_to", "continues_to")
+CHAIN_TOPIC = re.compile(r"^([\w-]+)[: (]")
+
+
+def chain_diagnostics(messages: list[str], metadata_roots: dict[str, tuple[Path, Optional[yaml.Node]]]) -> list[Diagnostic]:
+    """Position tutorial-chain errors (from validate.validate_tutorial_chain).
+
+    Each message is attributed to the topic it starts with, at the chain
+    field it mentions (or tutorial_number).
+    """
+    diagnostics = []
+    for message in messages:
+        match = CHAIN_TOPIC.match(message)
+        topic_id = match.group(1) if match else None
+        if topic_id not in metadata_roots:
+            diagnostics.append(Diagnostic("topics", 1, 1, message))
+            continue
+        path, root = metadata_roots[topic_id]
+        field = next((f for f in CHAIN_FIELDS if f in message), "tutorial_number")
+        line, column = position(root, ("training", field))
+        diagnostics.append(Diagnostic(str(path), line, column, message))
+    return diagnostics
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Generate agentic operation commands with a token-budgeted context pack.
+
+Each operation declared in a topic's metadata.yaml (agentic_operations) is
+turned into a markdown command in generated_agentic_operations/commands/.
+The command carries the operation prompt, the topic's related code paths
+and as much architectural context as fits in a token budget: agent-context,
+prose and slide blocks of the topic and its related topics are scored for
+relevance to the prompt (TF-IDF cosine, all prompts in one batch; see
+tfidf_index.py) and packed by relevance-per-token, so commands stay small
+and dense.
+
+Token counts come from a local tokenizer approximation and are cached per
+block content hash in .cache/token_counts.json.
+
+Usage:
+    uv run --extra analysis python scripts/generate_agentic_operation.py dependency-injection refactor-to-di
+    uv run --extra analysis python scripts/generate_agentic_operation.py dependency-injection --budget 2000
+    uv run --extra analysis python scripts/generate_agentic_operation.py --all --dry-run
+    uv run --extra analysis python scripts/generate_agentic_operation.py frameworks review-async-sync --stdout
+"""
+
+import argparse
+import math
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+
+from pydantic import ValidationError
+
+# Add scripts to path for models
+sys.path.insert(0, str(Path(__file__).parent))
+from build_cache import cache_path, load_json, save_json
+from compiled_topics import CompiledBlock, CompiledTopic, compile_topic, list_topic_ids, load_builder
+from tfidf_index import load_index
+
+OUTPUT_DIR = Path("generated_agentic_operations/commands")
+DEFAULT_BUDGET = 4000
+TOKENIZER_VERSION = "1"
+
+# Agent-context blocks are written for agents; prefer them over docs prose
+TYPE_WEIGHTS = {
+    'agent-context': 2.0,
+    'prose': 1.0,
+    'slide': 1.0,
+}
+# Blocks from related topics count for less than the operation's own topic
+RELATED_TOPIC_WEIGHT = 0.5
+# Agent-context blocks are always somewhat relevant to their topic's operations
+AGENT_CONTEXT_MIN_RELEVANCE = 0.05
+# Knapsack works in units of this many tokens to keep the table small
+KNAPSACK_GRANULARITY = 16
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+IMAGE_LINE = re.compile(r"^\s*!\[[^\]]*\]\([^)]*\)\s*$", re.MULTILINE)
+
+
+def count_tokens(text: str) -> int:
+    """Approximate the number of BPE tokens in text.
+
+    Words count one token per four characters (at least one), punctuation
+    one token each. Close enough to real tokenizers to budget context.
+    """
+    total = 0
+    for piece in TOKEN_PATTERN.findall(text):
+        total += max(1, round(len(piece) / 4)) if piece[0].isalnum() or piece[0] == '_' else 1
+    return total
+
+
+class TokenCounter:
+    """Token counts memoized by content hash and persisted between runs."""
+
+    def __init__(self, cache_file: Optional[Path] = None):
+        self.cache_file = cache_file or cache_path('token_counts.json')
+        cache = load_json(self.cache_file, default={})
+        self.counts: dict[str, int] = cache.get('counts', {}) if cache.get('version') == TOKENIZER_VERSION else {}
+        self.dirty = False
+
+    def count(self, key: str, text: str) -> int:
+        """Return the token count of text, cached under key (a content hash)."""
+        if key not in self.counts:
+            self.counts[key] = count_tokens(text)
+            self.dirty = True
+        return self.counts[key]
+
+    def save(self) -> None:
+        if self.dirty:
+            save_json(self.cache_file, {'version': TOKENIZER_VERSION, 'counts': self.counts})
+            self.dirty = False
+
+
+@dataclass
+class Candidate:
+    """A block that may be packed into the context."""
+    block: CompiledBlock
+    text: str
+    tokens: int
+    value: float
+
+    @property
+    def density(self) -> float:
+        return self.value / self.tokens if self.tokens else 0.0
+
+
+def render_block(block: CompiledBlock) -> str:
+    """Render a block as markdown for agent consumption.
+
+    Remark.js class wrappers are unwrapped and standalone images dropped
+    (agents can't see them and they cost tokens); speaker notes are kept
+    since they often carry the explanation.
+    """
+    text = block.text
+    if block.type.value == 'slide':
+        text = load_builder("sphinx-docs")._unwrap_remark_directives(text).replace('???', '')
+    text = IMAGE_LINE.sub('', text)
+    text = re.sub(r'\n{3,}', '\n\n', text).strip()
+    if block.heading:
+        text = f"### {block.heading}\n\n{text}"
+    return text
+
+
+def build_candidates(
+    topic: CompiledTopic,
+    scores: dict[str, float],
+    counter: TokenCounter,
+    related: Sequence[CompiledTopic] = (),
+) -> list[Candidate]:
+    """Measure and value the relevant blocks of a topic and its related topics.
+
+    Args:
+        topic: The operation's topic
+        scores: Relevance of blocks to the operation prompt by block location
+        counter: Token counter
+        related: Related topics whose relevant blocks may also be packed
+    """
+    candidates = []
+    for source in [topic, *related]:
+        own = source.topic_id == topic.topic_id
+        for block in source.blocks:
+            relevance = scores.get(block.location, 0.0)
+            if own and block.type.value == 'agent-context':
+                relevance = max(relevance, AGENT_CONTEXT_MIN_RELEVANCE)
+            if relevance <= 0:
+                continue
+            text = render_block(block)
+            if not text:
+                continue
+            value = relevance * TYPE_WEIGHTS[block.type.value] * (1.0 if own else RELATED_TOPIC_WEIGHT)
+            candidates.append(Candidate(block, text, counter.count(block.hash, text), value))
+    return candidates
+
+
+def pack_greedy(candidates: list[Candidate], budget: int) -> list[Candidate]:
+    """Take candidates in order of value per token while they fit.
+
+    The best single candidate that fits is returned instead when it beats
+    the greedy fill (the classic half-optimal knapsack approximation).
+    """
+    packed, used = [], 0
+    for candidate in sorted(candidates, key=lambda c: c.density, reverse=True):
+        if used + candidate.tokens <= budget:
+            packed.append(candidate)
+            used += candidate.tokens
+
+    fitting = [c for c in candidates if c.tokens <= budget]
+    best = max(fitting, key=lambda c: c.value, default=None)
+    if best and best.value > sum(c.value for c in packed):
+        return [best]
+    return packed
+
+
+def pack_knapsack(candidates: list[Candidate], budget: int) -> list[Candidate]:
+    """Exact 0/1 knapsack over token counts rounded up to KNAPSACK_GRANULARITY."""
+    capacity = budget // KNAPSACK_GRANULARITY
+    weights = [math.ceil(c.tokens / KNAPSACK_GRANULARITY) for c in candidates]
+
+    # best[w] = best value with weight <= w; keep[i][w] records choices for backtracking
+    best = [0.0] * (capacity + 1)
+    keep = []
+    for candidate, weight in zip(candidates, weights):
+        row = [False] * (capacity + 1)
+        for w in range(capacity, weight - 1, -1):
+            value = best[w - weight] + candidate.value
+            if value > best[w]:
+                best[w] = value
+                row[w] = True
+        keep.append(row)
+
+    packed, w = [], capacity
+    for i in range(len(candidates) - 1, -1, -1):
+        if keep[i][w]:
+            packed.append(candidates[i])
+            w -= weights[i]
+    return packed
+
+
+PACKERS = {
+    'greedy': pack_greedy,
+    'knapsack': pack_knapsack,
+}
+
+
+def operation_query(operation_name: str, prompt: str) -> str:
+    """Text scored against blocks for an operation."""
+    return f"{operation_name.replace('-', ' ')}\n{prompt}"
+
+
+def operation_title(topic: CompiledTopic, operation_name: str) -> str:
+    """Human-readable command title, e.g. 'Review Di: Dependency Injection'."""
+    return f"{operation_name.replace('-', ' ').title()}: {topic.metadata.title}"
+
+
+def render_code_paths(topic: CompiledTopic) -> str:
+    lines = []
+    for item in topic.metadata.related_code_paths:
+        if isinstance(item, str):
+            lines.append(f"- `{item}`")
+        else:
+            lines.append(f"- `{item.path}` - {item.note}")
+    return "\n".join(lines)
+
+
+def generate_operation(
+    topic: CompiledTopic,
+    operation_name: str,
+    budget: int = DEFAULT_BUDGET,
+    strategy: str = 'knapsack',
+    counter: Optional[TokenCounter] = None,
+    scores: Optional[dict[str, float]] = None,
+    related: Sequence[CompiledTopic] = (),
+) -> dict:
+    """Assemble a command for one operation within a token budget.
+
+    The title, prompt and related code paths are always included; the
+    remaining budget is filled with the most relevant content blocks of the
+    topic and its related topics, which are emitted in topic order.
+
+    Args:
+        topic: Compiled topic declaring the operation
+        operation_name: Name of the operation in topic metadata
+        budget: Token budget for the whole command
+        strategy: Packing strategy ('knapsack' or 'greedy')
+        counter: Token counter (default: cached in .cache/token_counts.json)
+        scores: Block relevance by location, as from TfidfIndex.scores_by_location()
+            (default: scored against the cached TF-IDF index)
+        related: Related compiled topics to draw context from
+
+    Returns dict with:
+        - markdown: The generated command
+        - tokens: Approximate token count of the command
+        - budget: The token budget
+        - blocks: IDs of packed blocks
+        - dropped: IDs of relevant blocks that did not fit
+    """
+    counter = counter or TokenCounter()
+    operation = next((op for op in topic.metadata.agentic_operations if op.name == operation_name), None)
+    if operation is None:
+        raise KeyError(f"Topic '{topic.topic_id}' has no agentic operation '{operation_name}'")
+
+    header = f"# {operation_title(topic, operation_name)}\n\n{operation.prompt.strip()}\n"
+    code_paths = render_code_paths(topic)
+    footer = f"\n## Related Code Paths\n\n{code_paths}\n" if code_paths else ""
+    context_heading = "\n## Architecture Context\n\n"
+    fixed_tokens = count_tokens(header + context_heading + footer)
+
+    if scores is None:
+        index = load_index()
+        scores = index.scores_by_location(index.score([operation_query(operation_name, operation.prompt)])[0])
+
+    candidates = build_candidates(topic, scores, counter, related)
+    remaining = max(0, budget - fixed_tokens)
+    packed = PACKERS[strategy](candidates, remaining)
+    order = {t.topic_id: i for i, t in enumerate([topic, *related])}
+    packed.sort(key=lambda c: (order[c.block.topic_id], c.block.position))
+
+    markdown = header
+    if packed:
+        markdown += context_heading + "\n\n".join(c.text for c in packed) + "\n"
+    markdown += footer
+
+    packed_ids = {c.block.location for c in packed}
+    return {
+        'markdown': markdown,
+        'tokens': count_tokens(markdown),
+        'budget': budget,
+        'blocks': [c.block.location for c in packed],
+        'dropped': [c.block.location for c in candidates if c.block.location not in packed_ids],
+    }
+
+
+def output_path(topic_id: str, operation_name: str, output_dir: Path = OUTPUT_DIR) -> Path:
+    return output_dir / f"{topic_id}-{operation_name}.md"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate agentic operation commands from topic content')
+    parser.add_argument('topic', nargs='?', help='Topic ID')
+    parser.add_argument('operation', nargs='?', help='Operation name (default: all operations of the topic)')
+    parser.add_argument('--all', action='store_true', help='Generate every operation of every topic')
+    parser.add_argument('--budget', type=int, default=DEFAULT_BUDGET,
+                        help=f'Token budget per command (default: {DEFAULT_BUDGET})')
+    parser.add_argument('--strategy', choices=sorted(PACKERS), default='knapsack',
+                        help='Packing strategy (default: knapsack)')
+    parser.add_argument('--output-dir', type=Path, default=OUTPUT_DIR, help=f'Output directory (default: {OUTPUT_DIR})')
+    parser.add_argument('--force', action='store_true', help='Overwrite existing (possibly hand-edited) commands')
+    parser.add_argument('--dry-run', action='store_true', help='Report packing without writing files')
+    parser.add_argument('--stdout', action='store_true', help='Print commands instead of writing files')
+
+    args = parser.parse_args()
+    if not args.all and not args.topic:
+        parser.error('a topic is required unless --all is given')
+
+    topic_ids = list_topic_ids() if args.all else [args.topic]
+    topics: dict[str, CompiledTopic] = {}
+    errors = 0
+
+    def get_topic(topic_id: str) -> Optional[CompiledTopic]:
+        """Compiled topic, or None (reported and counted once) if it can't be loaded."""
+        nonlocal errors
+        if topic_id not in topics:
+            try:
+                topics[topic_id] = compile_topic(topic_id)
+            except (FileNotFoundError, ValidationError, ValueError) as e:
+                print(f"❌ {topic_id}: {e}")
+                topics[topic_id] = None
+                errors += 1
+        return topics[topic_id]
+
+    jobs = []
+    for topic_id in topic_ids:
+        topic = get_topic(topic_id)
+        if topic is None:
+            continue
+        operations = {op.name: op for op in topic.metadata.agentic_operations}
+        for name in [args.operation] if args.operation else operations:
+            if name not in operations:
+                print(f"❌ Topic '{topic_id}' has no agentic operation '{name}'")
+                errors += 1
+                continue
+            jobs.append((topic, operations[name]))
+
+    # Score every operation prompt against every block in one batch
+    index = load_index()
+    all_scores = index.score([operation_query(op.name, op.prompt) for _, op in jobs]) if jobs else []
+    counter = TokenCounter()
+
+    for (topic, operation), row in zip(jobs, all_scores):
+        related = [t for t in map(get_topic, topic.metadata.related_topics) if t is not None]
+        result = generate_operation(topic, operation.name, args.budget, args.strategy, counter,
+                                    scores=index.scores_by_location(row), related=related)
+
+        if args.stdout:
+            print(result['markdown'])
+            continue
+
+        path = output_path(topic.topic_id, operation.name, args.output_dir)
+        summary = (f"{topic.topic_id}/{operation.name}: {result['tokens']}/{result['budget']} tokens, "
+                   f"{len(result['blocks'])} blocks ({len(result['dropped'])} dropped)")
+        if args.dry_run:
+            print(f"  {summary}")
+        elif path.exists() and not args.force:
+            print(f"⚠️  {summary} - {path} exists, use --force to overwrite")
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(result['markdown'])
+            print(f"✓ {summary} -> {path}")
+
+    counter.save()
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,8 @@ with links to GitHub for the architecture slides.
 from pathlib import Path
 import yaml
 
+from symbol_index import galaxy_root
+
 
 def parse_mindmap_yaml_items(items: list, prefix: str = "") -> dict[str, str]:
     """Recursively parse items from mindmap YAML."""
@@ -65,13 +67,12 @@ def parse_mindmap_yaml(filepath: str) -> dict[str, str]:
 
 
 def verify_files_in_galaxy(files: dict[str, str]) -> dict[str, str]:
-    """Verify files exist in ~/workspace/galaxy and return verified files."""
-    galaxy_root = Path.home() / 'workspace' / 'galaxy'
+    """Verify files exist in the Galaxy checkout ($GALAXY_ROOT) and return verified files."""
+    root = galaxy_root()
     verified = {}
 
     for filepath, description in files.items():
-        full_path = galaxy_root / filepath
-        if full_path.exists():
+        if (root / filepath).exists():
             verified[filepath] = description
         else:
             print(f"⚠️  Not found: {filepath}")
@@ -0,0 +1,124 @@
+"""Intrinsic image dimensions for layout hints in generated HTML.
+
+Reads sizes from PNG, GIF and JPEG headers and from SVG width/height or
+viewBox attributes. Sizes are cached per image content hash in
+.cache/image_dimensions.json, so each image version is parsed once.
+"""
+
+import re
+import struct
+from pathlib import Path
+from typing import Optional
+
+from build_cache import cache_path, hash_file, load_json, save_json
+
+CACHE_VERSION = "1"
+
+SVG_TAG = re.compile(rb'<svg\b[^>]*>', re.DOTALL)
+SVG_ATTRIBUTE = re.compile(rb'\b(width|height|viewBox)\s*=\s*["\']([^"\']*)["\']')
+# Absolute CSS lengths in px (unitless or px); percentages etc. are ignored
+SVG_LENGTH = re.compile(rb'^\s*([0-9.]+)\s*(px)?\s*$')
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def png_size(data: bytes) -> Optional[tuple[int, int]]:
+    if data[:8] == b'\x89PNG\r\n\x1a\n' and data[12:16] == b'IHDR':
+        return struct.unpack('>II', data[16:24])
+    return None
+
+
+def gif_size(data: bytes) -> Optional[tuple[int, int]]:
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        return struct.unpack('<HH', data[6:10])
+    return None
+
+
+def jpeg_size(data: bytes) -> Optional[tuple[int, int]]:
+    """Size from the first start-of-frame segment of a JPEG."""
+    if data[:2] != b'\xff\xd8':
+        return None
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            # Fill byte
+            pos += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            # Standalone markers without a length
+            pos += 2
+            continue
+        (length,) = struct.unpack('>H', data[pos + 2:pos + 4])
+        if marker in JPEG_SOF_MARKERS and pos + 9 <= len(data):
+            height, width = struct.unpack('>HH', data[pos + 5:pos + 9])
+            return width, height
+        pos += 2 + length
+    return None
+
+
+def svg_size(data: bytes) -> Optional[tuple[int, int]]:
+    """Size from the root <svg> width/height (px), falling back to its viewBox."""
+    tag = SVG_TAG.search(data)
+    if not tag:
+        return None
+    attributes = dict(SVG_ATTRIBUTE.findall(tag.group()))
+
+    width, height = (SVG_LENGTH.match(attributes.get(name, b'')) for name in (b'width', b'height'))
+    if width and height:
+        return round(float(width.group(1))), round(float(height.group(1)))
+
+    view_box = attributes.get(b'viewBox', b'').replace(b',', b' ').split()
+    if len(view_box) == 4:
+        try:
+            _, _, box_width, box_height = (float(value) for value in view_box)
+        except ValueError:
+            return None
+        if box_width > 0 and box_height > 0:
+            return round(box_width), round(box_height)
+    return None
+
+
+def image_size(path: Path) -> Optional[tuple[int, int]]:
+    """Intrinsic (width, height) of an image file, or None if unknown."""
+    suffix = path.suffix.lower()
+    if suffix == '.svg':
+        return svg_size(path.read_bytes())
+    with open(path, 'rb') as f:
+        # Headers are at the start; JPEG frames can follow large EXIF segments
+        head = f.read(1 << 16) if suffix in ('.jpg', '.jpeg') else f.read(32)
+    for parse in (png_size, gif_size, jpeg_size):
+        size = parse(head)
+        if size:
+            return size
+    return None
+
+
+class ImageDimensions:
+    """Image sizes memoized by content hash and persisted between runs."""
+
+    def __init__(self, cache_file: Optional[Path] = None):
+        self.cache_file = cache_file or cache_path('image_dimensions.json')
+        cache = load_json(self.cache_file, default={})
+        self.sizes: dict[str, Optional[list[int]]] = (
+            cache.get('sizes', {}) if cache.get('version') == CACHE_VERSION else {}
+        )
+        self.dirty = False
+
+    def get(self, path: Path) -> Optional[tuple[int, int]]:
+        """Size of an image, or None if it is missing or its size is unknown."""
+        if not path.is_file():
+            return None
+        key = hash_file(path)
+        if key not in self.sizes:
+            size = image_size(path)
+            self.sizes[key] = list(size) if size else None
+            self.dirty = True
+        size = self.sizes[key]
+        return (size[0], size[1]) if size else None
+
+    def save(self) -> None:
+        if self.dirty:
+            save_json(self.cache_file, {'version': CACHE_VERSION, 'sizes': self.sizes})
+            self.dirty = False
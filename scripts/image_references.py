@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Report missing, orphaned and duplicate images from a single reference index.
+
+The index is built once from the compiled topics (so ``content``, ``file``
+and ``fragments`` blocks are all scanned, with fragments resolved the same
+way the builders do) and from the diagram sources in images/:
+
+- A referenced ``x.plantuml.svg`` / ``x.mermaid.svg`` uses its source
+  ``x.plantuml.txt`` / ``x.mermaid.txt``; ``x.mindmap.plantuml.svg`` uses
+  ``x.mindmap.yml`` (and the generated ``x.mindmap.plantuml.txt``).
+- PlantUML sources use the files they ``!include``, as do mindmaps through
+  the includes emitted by mindmap_yaml_to_plantuml.py.
+
+The report lists referenced images that neither exist nor can be built,
+image and diagram source files nothing references (safe to prune), and
+images with identical content under different names.
+
+Usage:
+    uv run python scripts/image_references.py
+    uv run python scripts/image_references.py --json
+    uv run python scripts/image_references.py --prune
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+# Add scripts to path for models
+sys.path.insert(0, str(Path(__file__).parent))
+from build_cache import hash_file
+from compiled_topics import CompiledTopic, compile_all_topics
+
+IMAGES_DIR = Path("images")
+IMAGE_SUFFIXES = {'.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp'}
+# Generated image suffix -> diagram source suffix (most specific first)
+DIAGRAM_SOURCES = {
+    '.mindmap.plantuml.svg': '.mindmap.yml',
+    '.plantuml.svg': '.plantuml.txt',
+    '.mermaid.svg': '.mermaid.txt',
+}
+SOURCE_SUFFIXES = tuple(DIAGRAM_SOURCES.values())
+MINDMAP_CONVERTER = "mindmap_yaml_to_plantuml.py"
+
+# Paths may contain spaces ({{ site.baseurl }}/...); an optional "title" is dropped
+IMAGE_REFERENCE = re.compile(r'!\[[^\]]*\]\(\s*([^)"]+?)\s*(?:"[^"]*")?\s*\)')
+INCLUDE = re.compile(r"!include\s+([^\s'\"]+)")
+
+
+def extract_image_names(markdown: str) -> set[str]:
+    """Filenames of local images referenced in markdown (external URLs skipped).
+
+    images/ is flat, so every local path form (../../images/x.png,
+    ../../../../shared/images/x.png, {{ site.baseurl }}/assets/images/x.png)
+    resolves to its filename.
+    """
+    return {
+        Path(path).name
+        for path in IMAGE_REFERENCE.findall(markdown)
+        if not path.startswith(('http://', 'https://', 'data:'))
+    }
+
+
+def diagram_source(name: str) -> str | None:
+    """Source file a generated diagram is built from, e.g. 'a.plantuml.svg' -> 'a.plantuml.txt'."""
+    for generated, source in DIAGRAM_SOURCES.items():
+        if name.endswith(generated):
+            return name[:-len(generated)] + source
+    return None
+
+
+def diagram_includes(source: Path, images_dir: Path) -> set[str]:
+    """Files a diagram source pulls in with PlantUML !include."""
+    if source.name.endswith('.mindmap.yml'):
+        # The includes are added when the mindmap is converted to PlantUML
+        source = images_dir / MINDMAP_CONVERTER
+    if not source.is_file():
+        return set()
+    return set(INCLUDE.findall(source.read_text()))
+
+
+def is_tracked_image_file(path: Path) -> bool:
+    """Whether a file in images/ is an image or diagram source (i.e. can be orphaned)."""
+    return path.is_file() and (path.suffix.lower() in IMAGE_SUFFIXES or path.name.endswith(SOURCE_SUFFIXES))
+
+
+def build_reference_index(topics: list[CompiledTopic], images_dir: Path = IMAGES_DIR) -> dict:
+    """Index image references of all topics against the files in images_dir.
+
+    Args:
+        topics: Compiled topics to scan
+        images_dir: Flat image directory
+
+    Returns dict with:
+        - references: {image name: [block locations]} for every referenced image
+        - used: Names of files in images_dir that are needed (images, sources, includes)
+        - missing: {name: [locations]} of referenced images or includes that
+          don't exist and can't be built from a source
+        - unbuilt: Referenced diagrams whose source exists but output hasn't been built
+        - orphaned: Image and diagram source files nothing references
+        - duplicates: Lists of image names with identical content
+    """
+    references = defaultdict(list)
+    for topic in topics:
+        for block in topic.blocks:
+            for name in extract_image_names(block.text):
+                references[name].append(block.location)
+
+    files = {path.name for path in images_dir.iterdir() if is_tracked_image_file(path)} if images_dir.exists() else set()
+
+    used, missing, unbuilt = set(), defaultdict(list), []
+    for name, locations in sorted(references.items()):
+        source = diagram_source(name)
+        if name in files:
+            used.add(name)
+        elif source and (images_dir / source).is_file():
+            unbuilt.append(name)
+        else:
+            missing[name] += locations
+            continue
+
+        if source and (images_dir / source).is_file():
+            used.add(source)
+            if source.endswith('.mindmap.yml'):
+                # Intermediate PlantUML generated from the mindmap
+                used.add(name[:-len('.svg')] + '.txt')
+            for include in sorted(diagram_includes(images_dir / source, images_dir)):
+                used.add(include)
+                if not (images_dir / include).is_file():
+                    missing[include].append(f"images/{source}")
+
+    orphaned = sorted(files - used)
+
+    by_hash = defaultdict(list)
+    for name in sorted(files):
+        if Path(name).suffix.lower() in IMAGE_SUFFIXES:
+            by_hash[hash_file(images_dir / name)].append(name)
+    duplicates = [names for names in by_hash.values() if len(names) > 1]
+
+    return {
+        'references': dict(references),
+        'used': sorted(used),
+        'missing': dict(missing),
+        'unbuilt': unbuilt,
+        'orphaned': orphaned,
+        'duplicates': duplicates,
+    }
+
+
+def print_report(index: dict) -> None:
+    print("=" * 60)
+    print("Image Reference Report")
+    print("=" * 60)
+    print(f"{len(index['references'])} images referenced, {len(index['used'])} files in use")
+    print()
+
+    if index['missing']:
+        print(f"❌ Missing ({len(index['missing'])}):")
+        for name, locations in sorted(index['missing'].items()):
+            print(f"  {name}  ({', '.join(sorted(set(locations)))})")
+        print()
+
+    if index['unbuilt']:
+        print(f"ℹ️  {len(index['unbuilt'])} referenced diagram(s) not built yet (run 'make images')")
+        print()
+
+    if index['orphaned']:
+        print(f"⚠️  Orphaned ({len(index['orphaned'])}, not referenced by any topic):")
+        for name in index['orphaned']:
+            print(f"  {name}")
+        print()
+
+    if index['duplicates']:
+        print(f"⚠️  Duplicates ({len(index['duplicates'])} groups with identical content):")
+        for names in index['duplicates']:
+            print(f"  {' = '.join(names)}")
+        print()
+
+    if not (index['missing'] or index['orphaned'] or index['duplicates']):
+        print("✅ All referenced images exist, no orphans or duplicates")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report missing, orphaned and duplicate images')
+    parser.add_argument('--images-dir', type=Path, default=IMAGES_DIR, help=f'Image directory (default: {IMAGES_DIR})')
+    parser.add_argument('--prune', action='store_true', help='Delete orphaned files')
+    parser.add_argument('--json', action='store_true', help='Print JSON')
+
+    args = parser.parse_args()
+
+    index = build_reference_index(compile_all_topics(), args.images_dir)
+
+    if args.json:
+        print(json.dumps(index, indent=2))
+    else:
+        print_report(index)
+
+    if args.prune:
+        for name in index['orphaned']:
+            (args.images_dir / name).unlink()
+        print(f"✓ Removed {len(index['orphaned'])} orphaned file(s)")
+
+    sys.exit(1 if index['missing'] else 0)
+
+
+if __name__ == '__main__':
+    main()
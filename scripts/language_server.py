@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+Language server (LSP over stdio) for topic content.yaml and metadata.yaml.
+
+Validates open documents with the pydantic models as you type and reports
+positioned diagnostics (see diagnostics.py), and offers:
+
+- Completion of topic IDs in ``related_topics``, ``prerequisites``,
+  ``previous_to`` and ``continues_to``; of topic files in ``file:`` and
+  ``fragments:``; of image filenames in ``](../../images/`` links; and of
+  slide layout names in ``layout_name:``
+- Go-to-definition for ``file:``/``fragments:`` paths (and chain topic IDs)
+
+Edits are applied incrementally. content.yaml is split into its top-level
+blocks (``- `` at column 0) and each block's parse and validation result
+is cached by the hash of its text, so after an edit only the edited block
+is parsed and validated again; the topic-wide checks (unique IDs, at least
+one slide) run on the cached blocks. Diagnostics are only published when
+they change.
+
+Editor setup: run ``uv run python scripts/language_server.py`` as the
+language server for ``topics/*/content.yaml`` and ``topics/*/metadata.yaml``
+(e.g. with vim-lsp, Neovim's ``vim.lsp.start`` or a generic VS Code LSP client).
+
+Usage:
+    uv run python scripts/language_server.py
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, BinaryIO, Optional
+from urllib.parse import quote, unquote, urlparse
+
+import yaml
+from pydantic import ValidationError
+
+# Add scripts to path for models
+sys.path.insert(0, str(Path(__file__).parent))
+from build_cache import hash_text
+from compiled_topics import list_topic_ids
+from diagnostics import Diagnostic, check_content, check_metadata, parse, position, validation_diagnostics
+from image_references import DIAGRAM_SOURCES, IMAGE_SUFFIXES
+from models import ContentBlock, TopicContent
+
+ROOT = Path(__file__).resolve().parent.parent
+SLIDES_BUILDER = ROOT / "outputs" / "training-slides" / "build.py"
+CACHE_SIZE = 1024
+
+METHOD_NOT_FOUND = -32601
+
+# LSP constants
+SYNC_INCREMENTAL = 2
+SEVERITY = {"error": 1, "warning": 2}
+KIND_MODULE, KIND_FILE, KIND_ENUM_MEMBER = 9, 17, 20
+
+TOPIC_ID_KEYS = {"related_topics", "prerequisites", "previous_to", "continues_to"}
+PATH_KEYS = {"file", "fragments"}
+TOPIC_FILES = {"metadata.yaml", "content.yaml"}
+
+KEY_VALUE = re.compile(r"^\s*(?:- )?(\w+):\s*['\"]?([^'\"\s#]*)$")
+LIST_ITEM = re.compile(r"^(\s*)- ['\"]?([^'\"\s#]*)$")
+KEY_ONLY = re.compile(r"^\s*(?:- )?(\w+):\s*(?:#.*)?$")
+IMAGE_LINK = re.compile(r"!\[[^\]]*\]\((?:[^)\s]*/)?images/([^)/\s]*)$")
+LAYOUT_NAME = re.compile(r"^name: (\S+)$", re.M)
+
+
+@dataclass(frozen=True)
+class BlockResult:
+    """Cached parse and validation result of one content.yaml block.
+
+    Diagnostic lines are relative to the start of the block.
+    """
+    block: Optional[ContentBlock]
+    diagnostics: tuple[Diagnostic, ...]
+    references: tuple[tuple[int, int, str], ...]  # (line, column, path) of file/fragments
+    id_position: tuple[int, int] = (1, 1)
+
+
+def check_block(text: str) -> BlockResult:
+    """Parse and validate a single top-level content.yaml block."""
+    try:
+        data, root = parse(text)
+    except yaml.YAMLError as e:
+        mark = getattr(e, "problem_mark", None) or getattr(e, "context_mark", None)
+        line, column = (mark.line + 1, mark.column + 1) if mark else (1, 1)
+        problem = getattr(e, "problem", None) or str(e)
+        return BlockResult(None, (Diagnostic("", line, column, f"YAML syntax error: {problem}"),), ())
+
+    node = root.value[0] if isinstance(root, yaml.SequenceNode) and root.value else None
+    item = data[0] if isinstance(data, list) and data else None
+    if not isinstance(item, dict):
+        return BlockResult(None, (Diagnostic("", 1, 1, "content block must be a mapping"),), ())
+
+    try:
+        block = ContentBlock(**item)
+    except ValidationError as e:
+        return BlockResult(None, tuple(validation_diagnostics(Path(""), node, e)), ())
+    except TypeError as e:
+        return BlockResult(None, (Diagnostic("", 1, 1, f"content block must be a mapping ({e})"),), ())
+
+    references = []
+    if block.file:
+        references.append((*position(node, ("file",)), block.file))
+    for index, fragment in enumerate(block.fragments or []):
+        references.append((*position(node, ("fragments", index)), fragment))
+    return BlockResult(block, (), tuple(references), position(node, ("id",)))
+
+
+def split_blocks(text: str) -> Optional[list[tuple[int, str]]]:
+    """Split content.yaml into (start line, text) of its top-level sequence items.
+
+    Returns None if the document isn't a plain top-level list (anything
+    but blank lines and comments before the first item), in which case it
+    is validated as a whole.
+    """
+    lines = text.splitlines(keepends=True)
+    starts = [i for i, line in enumerate(lines) if line.startswith("- ") or line.rstrip("\r\n") == "-"]
+    if not starts:
+        return None
+    if any(line.strip() and not line.lstrip().startswith("#") for line in lines[:starts[0]]):
+        return None
+    ends = starts[1:] + [len(lines)]
+    return [(start, "".join(lines[start:end])) for start, end in zip(starts, ends)]
+
+
+def utf16_length(text: str) -> int:
+    return len(text.encode("utf-16-le")) // 2
+
+
+def from_utf16(line: str, character: int) -> int:
+    """Python string index for an LSP (UTF-16) character offset within a line."""
+    units = 0
+    for index, char in enumerate(line):
+        if units >= character:
+            return index
+        units += 2 if ord(char) > 0xFFFF else 1
+    return len(line)
+
+
+def offset_at(text: str, line: int, character: int) -> int:
+    """Offset into text of an LSP position."""
+    lines = text.splitlines(keepends=True)
+    if line >= len(lines):
+        return len(text)
+    start = sum(len(l) for l in lines[:line])
+    return start + from_utf16(lines[line].rstrip("\r\n"), character)
+
+
+def apply_change(text: str, change: dict) -> str:
+    """Apply one textDocument/didChange content change (ranged or full)."""
+    if "range" not in change:
+        return change["text"]
+    start, end = change["range"]["start"], change["range"]["end"]
+    return (text[:offset_at(text, start["line"], start["character"])]
+            + change["text"]
+            + text[offset_at(text, end["line"], end["character"]):])
+
+
+def uri_to_path(uri: str) -> Path:
+    return Path(unquote(urlparse(uri).path))
+
+
+def path_to_uri(path: Path) -> str:
+    return "file://" + quote(str(path.resolve()))
+
+
+def enclosing_key(lines: list[str], line_no: int, indent: int) -> Optional[str]:
+    """Key of the list a ``- item`` line at the given indent belongs to."""
+    for line in reversed(lines[:line_no]):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        line_indent = len(line) - len(line.lstrip())
+        if stripped.startswith("- ") and line_indent == indent:
+            continue
+        match = KEY_ONLY.match(line)
+        return match.group(1) if match and line_indent <= indent else None
+    return None
+
+
+def value_context(lines: list[str], line_no: int, prefix: str) -> Optional[tuple[str, str]]:
+    """(key, partial value) being typed at the end of prefix, if any."""
+    match = KEY_VALUE.match(prefix)
+    if match:
+        return match.group(1), match.group(2)
+    match = LIST_ITEM.match(prefix)
+    if match:
+        key = enclosing_key(lines, line_no, len(match.group(1)))
+        return (key, match.group(2)) if key else None
+    return None
+
+
+class LanguageServer:
+    """LSP state: open documents and cached per-block validation results.
+
+    Args:
+        layouts_source: File defining the Remark.js slide layouts
+    """
+
+    def __init__(self, layouts_source: Path = SLIDES_BUILDER):
+        self.layouts_source = layouts_source
+        self.documents: dict[str, str] = {}
+        self.published: dict[str, list[dict]] = {}
+        self.blocks: OrderedDict[str, BlockResult] = OrderedDict()
+        self.metadata: OrderedDict[tuple[str, str], list[Diagnostic]] = OrderedDict()
+        self.blocks_checked = 0
+        self.running = True
+
+    # Diagnostics
+
+    def block_result(self, text: str) -> BlockResult:
+        key = hash_text(text)
+        result = self.blocks.get(key)
+        if result is not None:
+            self.blocks.move_to_end(key)
+            return result
+        result = check_block(text)
+        self.blocks_checked += 1
+        self.blocks[key] = result
+        while len(self.blocks) > CACHE_SIZE:
+            self.blocks.popitem(last=False)
+        return result
+
+    def content_diagnostics(self, path: Path, text: str) -> list[Diagnostic]:
+        blocks = split_blocks(text)
+        if blocks is None:
+            return check_content(path.parent, text)[1]
+
+        diagnostics, valid = [], []
+        for start, block_text in blocks:
+            result = self.block_result(block_text)
+            diagnostics += [replace(d, path=str(path), line=d.line + start) for d in result.diagnostics]
+            for line, column, reference in result.references:
+                # Existence is checked every time: it depends on the disk, not the text
+                if not (path.parent / reference).exists():
+                    diagnostics.append(Diagnostic(
+                        str(path), line + start, column,
+                        f"Block '{result.block.id}': fragment not found: {reference}",
+                    ))
+            if result.block is not None:
+                valid.append((start, result))
+
+        if len(valid) == len(blocks):
+            try:
+                TopicContent(root=[result.block for _, result in valid])
+            except ValidationError as e:
+                for item in e.errors():
+                    if "Duplicate" in item['msg']:
+                        seen = set()
+                        for start, result in valid:
+                            if result.block.id in seen:
+                                line, column = result.id_position
+                                diagnostics.append(Diagnostic(str(path), line + start, column, item['msg']))
+                            seen.add(result.block.id)
+                    else:
+                        diagnostics.append(Diagnostic(str(path), 1, 1, item['msg']))
+        return diagnostics
+
+    def metadata_diagnostics(self, path: Path, text: str) -> list[Diagnostic]:
+        key = (str(path), hash_text(text))
+        if key not in self.metadata:
+            self.metadata[key] = check_metadata(path.parent, text)[2]
+            while len(self.metadata) > CACHE_SIZE:
+                self.metadata.popitem(last=False)
+        return self.metadata[key]
+
+    def diagnose(self, uri: str) -> list[dict]:
+        """publishDiagnostics notifications for a document (empty if unchanged)."""
+        path = uri_to_path(uri)
+        text = self.documents.get(uri)
+        if text is None:
+            diagnostics = []
+        elif path.name == "content.yaml":
+            diagnostics = self.content_diagnostics(path, text)
+        elif path.name == "metadata.yaml":
+            diagnostics = self.metadata_diagnostics(path, text)
+        else:
+            return []
+
+        lines = (text or "").splitlines()
+        items = []
+        for d in diagnostics:
+            line = min(d.line - 1, max(len(lines) - 1, 0))
+            line_text = lines[line] if lines else ""
+            column = utf16_length(line_text[:d.column - 1])
+            items.append({
+                'range': {'start': {'line': line, 'character': column},
+                          'end': {'line': line, 'character': max(utf16_length(line_text), column)}},
+                'severity': SEVERITY.get(d.severity, 1),
+                'source': 'topics',
+                'message': d.message,
+            })
+        if self.published.get(uri) == items:
+            return []
+        self.published[uri] = items
+        return [notification('textDocument/publishDiagnostics', {'uri': uri, 'diagnostics': items})]
+
+    # Completion and definition
+
+    def topic_ids(self, topics_dir: Path) -> list[str]:
+        return list_topic_ids(topics_dir) if topics_dir.is_dir() else []
+
+    def topic_files(self, topic_dir: Path) -> list[str]:
+        return sorted(
+            path.relative_to(topic_dir).as_posix()
+            for path in topic_dir.rglob("*")
+            if path.is_file() and path.name not in TOPIC_FILES and not path.name.startswith(".")
+        )
+
+    def image_names(self, images_dir: Path) -> list[str]:
+        """Images in images/, including diagrams that are built from a source."""
+        if not images_dir.is_dir():
+            return []
+        names = set()
+        for path in images_dir.iterdir():
+            if not path.is_file():
+                continue
+            if path.suffix.lower() in IMAGE_SUFFIXES:
+                names.add(path.name)
+            for generated, source in DIAGRAM_SOURCES.items():
+                if path.name.endswith(source):
+                    names.add(path.name[:-len(source)] + generated)
+                    break
+        return sorted(names)
+
+    def layout_names(self) -> list[str]:
+        if not self.layouts_source.exists():
+            return []
+        return sorted(set(LAYOUT_NAME.findall(self.layouts_source.read_text())))
+
+    def completion(self, uri: str, line_no: int, character: int) -> list[dict]:
+        path = uri_to_path(uri)
+        lines = self.documents.get(uri, "").splitlines()
+        if line_no >= len(lines):
+            return []
+        line = lines[line_no]
+        prefix = line[:from_utf16(line, character)]
+        topic_dir = path.parent
+
+        image = IMAGE_LINK.search(prefix)
+        context = value_context(lines, line_no, prefix)
+        if image:
+            partial, kind, candidates = image.group(1), KIND_FILE, self.image_names(topic_dir.parent.parent / "images")
+        elif context and context[0] in TOPIC_ID_KEYS:
+            partial, kind = context[1], KIND_MODULE
+            candidates = [t for t in self.topic_ids(topic_dir.parent) if t != topic_dir.name]
+        elif context and context[0] in PATH_KEYS and path.name == "content.yaml":
+            partial, kind, candidates = context[1], KIND_FILE, self.topic_files(topic_dir)
+        elif context and context[0] == "layout_name":
+            partial, kind, candidates = context[1], KIND_ENUM_MEMBER, self.layout_names()
+        else:
+            return []
+
+        # Replace the whole partial value (paths contain '/' and '.', which
+        # editors don't treat as part of a word)
+        start = utf16_length(prefix) - utf16_length(partial)
+        edit_range = {'start': {'line': line_no, 'character': start}, 'end': {'line': line_no, 'character': character}}
+        return [
+            {'label': name, 'kind': kind, 'textEdit': {'range': edit_range, 'newText': name}}
+            for name in candidates if name.startswith(partial)
+        ]
+
+    def definition(self, uri: str, line_no: int) -> Optional[dict]:
+        path = uri_to_path(uri)
+        lines = self.documents.get(uri, "").splitlines()
+        if line_no >= len(lines):
+            return None
+        context = value_context(lines, line_no, lines[line_no].rstrip())
+        if not context or not context[1]:
+            return None
+
+        key, value = context
+        if key in PATH_KEYS and path.name == "content.yaml":
+            target = path.parent / value
+        elif key in TOPIC_ID_KEYS:
+            target = path.parent.parent / value / "metadata.yaml"
+        else:
+            return None
+        if not target.is_file():
+            return None
+        zero = {'line': 0, 'character': 0}
+        return {'uri': path_to_uri(target), 'range': {'start': zero, 'end': zero}}
+
+    # Protocol
+
+    def handle(self, message: dict) -> list[dict]:
+        """Handle one client message; returns the messages to send back."""
+        method = message.get('method')
+        params = message.get('params') or {}
+        request_id = message.get('id')
+        is_request = 'id' in message
+        out = []
+
+        if method == 'initialize':
+            result = {
+                'capabilities': {
+                    'textDocumentSync': {'openClose': True, 'change': SYNC_INCREMENTAL, 'save': {'includeText': False}},
+                    'completionProvider': {'triggerCharacters': [' ', '/', '-']},
+                    'definitionProvider': True,
+                },
+                'serverInfo': {'name': 'galaxy-architecture-topics'},
+            }
+        elif method == 'shutdown':
+            result = None
+        elif method == 'exit':
+            self.running = False
+            return []
+        elif method == 'textDocument/didOpen':
+            document = params['textDocument']
+            self.documents[document['uri']] = document['text']
+            return self.diagnose(document['uri'])
+        elif method == 'textDocument/didChange':
+            uri = params['textDocument']['uri']
+            text = self.documents.get(uri, "")
+            for change in params['contentChanges']:
+                text = apply_change(text, change)
+            self.documents[uri] = text
+            return self.diagnose(uri)
+        elif method == 'textDocument/didSave':
+            # A saved fragment may fix (or break) references in any open document
+            for uri in self.documents:
+                out += self.diagnose(uri)
+            return out
+        elif method == 'textDocument/didClose':
+            uri = params['textDocument']['uri']
+            self.documents.pop(uri, None)
+            self.published.pop(uri, None)
+            return [notification('textDocument/publishDiagnostics', {'uri': uri, 'diagnostics': []})]
+        elif method == 'textDocument/completion':
+            position = params['position']
+            result = {'isIncomplete': False,
+                      'items': self.completion(params['textDocument']['uri'], position['line'], position['character'])}
+        elif method == 'textDocument/definition':
+            result = self.definition(params['textDocument']['uri'], params['position']['line'])
+        elif is_request:
+            return [{'jsonrpc': '2.0', 'id': request_id,
+                     'error': {'code': METHOD_NOT_FOUND, 'message': f"Unknown method: {method}"}}]
+        else:
+            # Other notifications (initialized, $/cancelRequest, ...) need no answer
+            return []
+
+        if is_request:
+            out.append({'jsonrpc': '2.0', 'id': request_id, 'result': result})
+        return out
+
+
+def notification(method: str, params: Any) -> dict:
+    return {'jsonrpc': '2.0', 'method': method, 'params': params}
+
+
+def read_message(stream: BinaryIO) -> Optional[dict]:
+    """Read one Content-Length framed JSON-RPC message (None at end of input)."""
+    headers = {}
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.decode("ascii").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return json.loads(stream.read(int(headers['content-length'])))
+
+
+def write_message(stream: BinaryIO, message: dict) -> None:
+    body = json.dumps(message).encode()
+    stream.write(f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    stream.flush()
+
+
+def serve(server: LanguageServer, reader: BinaryIO, writer: BinaryIO) -> None:
+    """Answer messages until the client sends exit or closes the stream."""
+    while server.running:
+        message = read_message(reader)
+        if message is None:
+            break
+        for response in server.handle(message):
+            write_message(writer, response)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Language server for topic content.yaml and metadata.yaml')
+    parser.add_argument('--stdio', action='store_true', help='Communicate over stdin/stdout (the default)')
+    parser.parse_args()
+
+    serve(LanguageServer(), sys.stdin.buffer, sys.stdout.buffer)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Optimize images for publishing (Sphinx site, slide bundles).
+
+- PNG: lossless recompression. Text and timestamp chunks are dropped and
+  the image data is re-deflated at maximum compression (pixels and color
+  chunks are untouched). If oxipng is on PATH it is used as well.
+- SVG: comments are removed from PlantUML/Mermaid output (they carry the
+  embedded diagram source). Whitespace is kept: between <tspan>s, in
+  xml:space="preserve" text and in Mermaid's <foreignObject> HTML it renders.
+- WebP: optional lossless variants of PNGs next to the originals (needs
+  Pillow), kept only when smaller.
+
+Results are cached by source content hash in .cache/images/, so each image
+is processed once; uncached images are optimized in parallel across cores.
+An optimized file is only used if it is smaller than the source.
+
+Usage:
+    uv run python scripts/optimize_images.py images --output doc/build/html/images
+    uv run python scripts/optimize_images.py doc/build/html/_images --in-place
+    uv run python scripts/optimize_images.py images --output /tmp/images --webp
+"""
+
+import argparse
+import os
+import re
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+# Add scripts to path for models
+sys.path.insert(0, str(Path(__file__).parent))
+from build_cache import cache_path, hash_bytes
+from build_metrics import BuildMetrics
+
+OPTIMIZER_VERSION = "2"
+IMAGE_SUFFIXES = {'.png', '.svg'}
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# Ancillary chunks that don't affect rendering
+DROPPED_PNG_CHUNKS = {b'tEXt', b'zTXt', b'iTXt', b'tIME'}
+ZLIB_STRATEGIES = (zlib.Z_DEFAULT_STRATEGY, zlib.Z_FILTERED)
+
+SVG_COMMENT = re.compile(r'<!--.*?-->', re.DOTALL)
+
+
+def png_chunks(data: bytes) -> list[tuple[bytes, bytes]]:
+    """Split PNG data into (type, payload) chunks.
+
+    Raises:
+        ValueError: If data is not a well-formed PNG
+    """
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError("not a PNG file")
+    chunks, pos = [], len(PNG_SIGNATURE)
+    while pos < len(data):
+        if pos + 8 > len(data):
+            raise ValueError("truncated PNG chunk header")
+        length, chunk_type = struct.unpack('>I4s', data[pos:pos + 8])
+        payload = data[pos + 8:pos + 8 + length]
+        if len(payload) != length:
+            raise ValueError("truncated PNG chunk")
+        chunks.append((chunk_type, payload))
+        pos += 12 + length
+        if chunk_type == b'IEND':
+            break
+    return chunks
+
+
+def png_chunk(chunk_type: bytes, payload: bytes) -> bytes:
+    crc = zlib.crc32(chunk_type + payload)
+    return struct.pack('>I4s', len(payload), chunk_type) + payload + struct.pack('>I', crc)
+
+
+def deflate(data: bytes, strategy: int) -> bytes:
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 15, 9, strategy)
+    return compressor.compress(data) + compressor.flush()
+
+
+def recompress_png(data: bytes) -> bytes:
+    """Losslessly recompress a PNG; returns the original if not smaller."""
+    chunks = png_chunks(data)
+    idat = zlib.decompress(b''.join(payload for chunk_type, payload in chunks if chunk_type == b'IDAT'))
+    compressed = min((deflate(idat, strategy) for strategy in ZLIB_STRATEGIES), key=len)
+
+    out = [PNG_SIGNATURE]
+    for chunk_type, payload in chunks:
+        if chunk_type in DROPPED_PNG_CHUNKS:
+            continue
+        if chunk_type == b'IDAT':
+            if compressed is not None:
+                out.append(png_chunk(b'IDAT', compressed))
+                compressed = None
+            continue
+        out.append(png_chunk(chunk_type, payload))
+
+    result = b''.join(out)
+    return result if len(result) < len(data) else data
+
+
+def run_oxipng(data: bytes) -> bytes:
+    """Optimize PNG data with oxipng (must be on PATH); returns input on failure."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "image.png"
+        path.write_bytes(data)
+        result = subprocess.run(['oxipng', '-q', '-o', '4', '--strip', 'safe', str(path)], capture_output=True)
+        if result.returncode != 0:
+            return data
+        optimized = path.read_bytes()
+    return optimized if len(optimized) < len(data) else data
+
+
+def minify_svg(data: bytes) -> bytes:
+    """Strip comments from SVG markup (whitespace is left as is, see module docstring)."""
+    minified = SVG_COMMENT.sub('', data.decode('utf-8')).strip()
+    result = minified.encode('utf-8')
+    return result if len(result) < len(data) else data
+
+
+def webp_variant(data: bytes) -> Optional[bytes]:
+    """Lossless WebP encoding of a PNG, or None if Pillow is missing or it isn't smaller."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    import io
+
+    with Image.open(io.BytesIO(data)) as image:
+        out = io.BytesIO()
+        image.save(out, format='WEBP', lossless=True, method=6)
+    encoded = out.getvalue()
+    return encoded if len(encoded) < len(data) else None
+
+
+def optimize_data(suffix: str, data: bytes, use_oxipng: bool = False, webp: bool = False) -> tuple[bytes, Optional[bytes]]:
+    """Optimize image bytes by type.
+
+    Returns:
+        Tuple of (optimized data, WebP variant or None)
+    """
+    if suffix == '.png':
+        optimized = recompress_png(data)
+        if use_oxipng:
+            optimized = run_oxipng(optimized)
+        return optimized, webp_variant(data) if webp else None
+    if suffix == '.svg':
+        return minify_svg(data), None
+    return data, None
+
+
+def cache_key(data: bytes, use_oxipng: bool, webp: bool) -> str:
+    return hash_bytes(data + f"\0{OPTIMIZER_VERSION}:{use_oxipng}:{webp}".encode())
+
+
+def _optimize_job(job: tuple) -> tuple[str, Optional[str]]:
+    """Worker: optimize one source into the cache. Returns (error, name)."""
+    src, cached, cached_webp, use_oxipng, webp = job
+    data = Path(src).read_bytes()
+    try:
+        optimized, variant = optimize_data(Path(src).suffix.lower(), data, use_oxipng, webp)
+    except (ValueError, zlib.error, UnicodeDecodeError) as e:
+        # Leave malformed files as they are
+        optimized, variant = data, None
+        error = f"{Path(src).name}: {e}"
+    else:
+        error = None
+    _write(Path(cached), optimized)
+    if webp:
+        # An empty file records that no (smaller) WebP variant exists
+        _write(Path(cached_webp), variant or b'')
+    return src, error
+
+
+def _write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def collect_images(sources: list[Path]) -> list[Path]:
+    """PNG and SVG files in the given files and directories (not recursive)."""
+    images = []
+    for source in sources:
+        candidates = sorted(source.iterdir()) if source.is_dir() else [source]
+        images += [p for p in candidates if p.is_file() and p.suffix.lower() in IMAGE_SUFFIXES]
+    return images
+
+
+def optimize_images(
+    images: list[Path],
+    output_dir: Optional[Path] = None,
+    webp: bool = False,
+    use_oxipng: Optional[bool] = None,
+    jobs: Optional[int] = None,
+    cache_dir: Optional[Path] = None,
+) -> dict:
+    """Optimize images into output_dir, or in place if output_dir is None.
+
+    Args:
+        images: Image files to optimize
+        output_dir: Destination directory (flat); None overwrites the sources
+        webp: Also write .webp variants of PNGs (needs Pillow)
+        use_oxipng: Run oxipng on PNGs (default: if on PATH)
+        jobs: Worker processes for uncached images (default: CPU count)
+        cache_dir: Optimized image cache (default: .cache/images/)
+
+    Returns dict with:
+        - files: Number of images
+        - processed: Number of images optimized (not served from cache)
+        - original_bytes / optimized_bytes: Total sizes before and after
+        - webp: Number of WebP variants written
+        - errors: Messages for images that couldn't be optimized (copied as is)
+    """
+    cache_dir = cache_dir or cache_path('images/')
+    if use_oxipng is None:
+        use_oxipng = shutil.which('oxipng') is not None
+
+    plans = []
+    for src in images:
+        data = src.read_bytes()
+        key = cache_key(data, use_oxipng, webp)
+        cached = cache_dir / key[:2] / f"{key}{src.suffix.lower()}"
+        plans.append((src, len(data), cached, cached.with_suffix('.webp')))
+
+    pending = [(str(src), str(cached), str(cached_webp), use_oxipng, webp)
+               for src, _, cached, cached_webp in plans
+               if not cached.exists() or (webp and not cached_webp.exists())]
+    errors = []
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            errors = [error for _, error in executor.map(_optimize_job, pending) if error]
+
+    result = {'files': len(plans), 'processed': len(pending), 'original_bytes': 0,
+              'optimized_bytes': 0, 'webp': 0, 'errors': errors}
+    for src, size, cached, cached_webp in plans:
+        dest = (output_dir / src.name) if output_dir else src
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(cached, dest)
+        result['original_bytes'] += size
+        result['optimized_bytes'] += cached.stat().st_size
+        if webp and cached_webp.stat().st_size:
+            shutil.copyfile(cached_webp, dest.with_suffix('.webp'))
+            result['webp'] += 1
+    return result
+
+
+def metrics_builder(sources: list[Path], in_place: bool) -> str:
+    """Builder name for recorded metrics, one per workload.
+
+    The site build optimizes doc/build/html/_images in place and images/
+    into the output; each gets its own history so regressions compare like
+    with like.
+    """
+    mode = "in-place" if in_place else "output"
+    return f"optimize-images/{','.join(sorted(source.as_posix() for source in sources))}:{mode}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Losslessly optimize PNG and SVG images')
+    parser.add_argument('sources', nargs='*', type=Path, default=[Path('images')],
+                        help='Image files or directories (default: images/)')
+    destination = parser.add_mutually_exclusive_group(required=True)
+    destination.add_argument('--output', '-o', type=Path, help='Write optimized images to this directory')
+    destination.add_argument('--in-place', action='store_true', help='Overwrite the source images')
+    parser.add_argument('--webp', action='store_true', help='Also write lossless WebP variants of PNGs (needs Pillow)')
+    parser.add_argument('--no-oxipng', action='store_true', help="Don't use oxipng even if installed")
+    parser.add_argument('--jobs', '-j', type=int, default=None, help='Worker processes (default: CPU count)')
+
+    args = parser.parse_args()
+
+    metrics = BuildMetrics(metrics_builder(args.sources, args.in_place))
+    with metrics.stage("optimize"):
+        result = optimize_images(
+            collect_images(args.sources),
+            output_dir=None if args.in_place else args.output,
+            webp=args.webp,
+            use_oxipng=False if args.no_oxipng else None,
+            jobs=args.jobs,
+        )
+    metrics.add("optimize", "images", result['files'])
+    metrics.add("optimize", "image_bytes", result['original_bytes'])
+    metrics.add("optimize", "bytes_written", result['optimized_bytes'])
+    metrics.cache("optimize", hits=result['files'] - result['processed'], misses=result['processed'])
+    metrics.save()
+
+    for error in result['errors']:
+        print(f"⚠️  {error}")
+    saved = result['original_bytes'] - result['optimized_bytes']
+    percent = 100 * saved / result['original_bytes'] if result['original_bytes'] else 0
+    print(f"✓ Optimized {result['files']} images ({result['processed']} processed, "
+          f"{result['files'] - result['processed']} cached): "
+          f"{result['original_bytes'] / 1024:.0f} KB -> {result['optimized_bytes'] / 1024:.0f} KB "
+          f"(-{percent:.1f}%)")
+    if args.webp:
+        print(f"✓ Wrote {result['webp']} WebP variant(s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Resolve related_pull_requests to GitHub titles and merge status.
+
+Collects every pull request reference across all topics and resolves them
+with batched GitHub GraphQL queries (one request per batch of PRs rather
+than one REST call per PR). Responses are cached on disk keyed by PR, so
+the Sphinx builder can render titles and status without network access.
+
+Usage:
+    GITHUB_TOKEN=... uv run python scripts/pull_requests.py
+    uv run python scripts/pull_requests.py --endpoint http://localhost:8000/graphql
+    uv run python scripts/pull_requests.py --force
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Optional, Union
+
+# Add scripts to path for models
+sys.path.insert(0, str(Path(__file__).parent))
+from build_cache import cache_path, load_json, save_json
+from models import PullRequestReference, TopicMetadata
+
+DEFAULT_ENDPOINT = "https://api.github.com/graphql"
+DEFAULT_REPOSITORY = ("galaxyproject", "galaxy")
+DEFAULT_BATCH_SIZE = 50
+# Open PRs can still change state; closed and merged PRs are final
+OPEN_TTL = 24 * 3600
+
+PR_URL_PATTERN = re.compile(r'^https?://github\.com/([\w.-]+)/([\w.-]+)/pull/(\d+)')
+PR_SHORTHAND_PATTERN = re.compile(r'^([\w.-]+)/([\w.-]+)#(\d+)$')
+
+
+def parse_pull_request(reference: str) -> Optional[tuple[str, str, int]]:
+    """Parse a PR reference into (owner, repo, number).
+
+    Accepts a number (Galaxy PR), a GitHub pull request URL or
+    ``owner/repo#number``. Returns None for unrecognized references.
+    """
+    reference = reference.strip()
+    if reference.isdigit():
+        return (*DEFAULT_REPOSITORY, int(reference))
+
+    match = PR_URL_PATTERN.match(reference) or PR_SHORTHAND_PATTERN.match(reference)
+    if match:
+        return match.group(1), match.group(2), int(match.group(3))
+    return None
+
+
+def pull_request_key(owner: str, repo: str, number: int) -> str:
+    """Cache key for a pull request, e.g. 'galaxyproject/galaxy#9888'."""
+    return f"{owner}/{repo}#{number}"
+
+
+def reference_key(item: Union[str, PullRequestReference]) -> Optional[str]:
+    """Cache key for a related_pull_requests entry, or None if unparseable."""
+    reference = item if isinstance(item, str) else item.pull_request
+    parsed = parse_pull_request(reference)
+    return pull_request_key(*parsed) if parsed else None
+
+
+def collect_pull_requests(all_metadata: dict[str, TopicMetadata]) -> dict[str, list[str]]:
+    """Collect PR references across topics.
+
+    Returns:
+        Dict mapping PR key to sorted list of topic IDs referencing it
+    """
+    references: dict[str, set[str]] = {}
+    for topic_id, metadata in all_metadata.items():
+        for item in metadata.related_pull_requests:
+            key = reference_key(item)
+            if key:
+                references.setdefault(key, set()).add(topic_id)
+    return {key: sorted(topics) for key, topics in sorted(references.items())}
+
+
+def build_query(keys: list[str]) -> str:
+    """Build one GraphQL query resolving all keys via aliases pr0..prN."""
+    fields = []
+    for i, key in enumerate(keys):
+        owner, rest = key.split('/', 1)
+        repo, number = rest.split('#')
+        fields.append(
+            f'  pr{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) {{\n'
+            f'    pullRequest(number: {int(number)}) {{ number title state merged mergedAt url }}\n'
+            f'  }}'
+        )
+    return "query {\n" + "\n".join(fields) + "\n}"
+
+
+def post_graphql(endpoint: str, query: str, token: Optional[str], timeout: float = 30.0) -> dict:
+    """POST a GraphQL query and return the decoded JSON response."""
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": "galaxy-architecture-docs",
+    }
+    if token:
+        headers["Authorization"] = f"bearer {token}"
+
+    request = urllib.request.Request(
+        endpoint,
+        data=json.dumps({"query": query}).encode("utf-8"),
+        headers=headers,
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.load(response)
+
+
+def needs_refresh(entry: Optional[dict], now: float) -> bool:
+    """Whether a cached PR entry is missing or may be out of date."""
+    if entry is None:
+        return True
+    if entry.get('state') == 'OPEN':
+        return now - entry.get('fetched_at', 0) > OPEN_TTL
+    return False
+
+
+def resolve_pull_requests(
+    keys: list[str],
+    cache_file: Path,
+    endpoint: str = DEFAULT_ENDPOINT,
+    token: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    force: bool = False,
+) -> dict:
+    """Resolve PR keys to metadata, querying only uncached PRs in batches.
+
+    Returns dict with:
+        - pull_requests: dict mapping key to cached entry (title, state,
+          merged, mergedAt, url) or {'missing': True} if GitHub has no such PR
+        - requests: number of GraphQL requests made
+        - errors: list of GraphQL error messages
+    """
+    cache = load_json(cache_file, default={})
+    now = time.time()
+    pending = [key for key in keys if force or needs_refresh(cache.get(key), now)]
+
+    requests = 0
+    errors = []
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        response = post_graphql(endpoint, build_query(batch), token)
+        requests += 1
+
+        errors.extend(error.get('message', str(error)) for error in response.get('errors') or [])
+        data = response.get('data') or {}
+        for i, key in enumerate(batch):
+            repository = data.get(f"pr{i}")
+            if repository is None and f"pr{i}" not in data:
+                continue  # Whole batch failed - leave uncached so it's retried
+            pull_request = (repository or {}).get('pullRequest')
+            entry = dict(pull_request) if pull_request else {'missing': True}
+            entry['fetched_at'] = now
+            cache[key] = entry
+        # Saved per batch so PRs already resolved survive a later failing request
+        save_json(cache_file, cache)
+
+    return {
+        'pull_requests': {key: cache[key] for key in keys if key in cache},
+        'requests': requests,
+        'errors': errors,
+    }
+
+
+def load_cached_pull_requests(cache_file: Optional[Path] = None) -> dict[str, dict]:
+    """Load resolved PR metadata without network access (empty if never resolved)."""
+    return load_json(cache_file or cache_path('pull_requests.json'), default={})
+
+
+def pull_request_status(entry: dict) -> str:
+    """Short status label for a resolved PR: merged, open or closed."""
+    if entry.get('merged'):
+        return "merged"
+    return (entry.get('state') or 'unknown').lower()
+
+
+def format_pull_request_markdown(item: Union[str, PullRequestReference], resolved: dict[str, dict]) -> str:
+    """Format one related_pull_requests entry as a markdown list item.
+
+    Resolved PRs show their title and merge status; unresolved ones fall
+    back to the bare reference.
+    """
+    reference = item if isinstance(item, str) else item.pull_request
+    note = None if isinstance(item, str) else item.note
+    parsed = parse_pull_request(reference)
+
+    if parsed is None:
+        line = f"- {reference}"
+    else:
+        key = pull_request_key(*parsed)
+        owner, repo, number = parsed
+        entry = resolved.get(key)
+        url = f"https://github.com/{owner}/{repo}/pull/{number}"
+        line = f"- [{key}]({url})"
+        if entry and not entry.get('missing'):
+            status = pull_request_status(entry)
+            if status == "merged" and entry.get('mergedAt'):
+                status = f"merged {entry['mergedAt'][:10]}"
+            line += f" {entry['title']} ({status})"
+
+    if note:
+        line += f" — {note}"
+    return line
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resolve related_pull_requests via GitHub GraphQL')
+    parser.add_argument(
+        '--endpoint',
+        default=os.environ.get('GITHUB_GRAPHQL_URL', DEFAULT_ENDPOINT),
+        help='GraphQL endpoint (default: $GITHUB_GRAPHQL_URL or GitHub)'
+    )
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='PRs per GraphQL request')
+    parser.add_argument('--cache', type=Path, default=None, help='Cache file (default: .cache/pull_requests.json)')
+    parser.add_argument('--force', action='store_true', help='Refetch all PRs, ignoring the cache')
+
+    args = parser.parse_args()
+
+    from compiled_topics import list_topic_ids
+    from models import load_metadata
+
+    all_metadata = {topic_id: load_metadata(topic_id) for topic_id in list_topic_ids()}
+    references = collect_pull_requests(all_metadata)
+    print(f"Found {len(references)} pull request reference(s)")
+
+    try:
+        result = resolve_pull_requests(
+            list(references),
+            cache_file=args.cache or cache_path('pull_requests.json'),
+            endpoint=args.endpoint,
+            token=os.environ.get('GITHUB_TOKEN'),
+            batch_size=args.batch_size,
+            force=args.force,
+        )
+    except (urllib.error.URLError, TimeoutError, json.JSONDecodeError) as e:
+        print(f"❌ GraphQL request to {args.endpoint} failed: {type(e).__name__}: {e}")
+        sys.exit(1)
+    print(f"GraphQL requests: {result['requests']}")
+
+    for key, topics in references.items():
+        entry = result['pull_requests'].get(key)
+        if entry is None:
+            print(f"  ? {key} (unresolved) [{', '.join(topics)}]")
+        elif entry.get('missing'):
+            print(f"  ✗ {key} (not found) [{', '.join(topics)}]")
+        else:
+            print(f"  ✓ {key} {entry['title']} ({pull_request_status(entry)}) [{', '.join(topics)}]")
+
+    if result['errors']:
+        print(f"\n⚠️  GraphQL errors ({len(result['errors'])}):")
+        for error in result['errors']:
+            print(f"  - {error}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Render PlantUML and Mermaid diagrams in images/, reusing stored renders.
+
+Mindmaps (``*.mindmap.yml``) are converted to PlantUML first. Each
+diagram's key is the hash of its source, the files it ``!include``s, the
+PlantUML options and the renderer (plantuml.jar contents, mermaid-cli
+version); diagrams found in the artifact store (see artifact_store.py)
+are restored without starting the JVM or a browser. The rest are rendered
+(all PlantUML diagrams in one JVM run) and stored.
+
+Usage:
+    uv run python scripts/render_diagrams.py
+    uv run python scripts/render_diagrams.py --images-dir images --jar images/plantuml.jar
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Add scripts to path for models
+sys.path.insert(0, str(Path(__file__).parent))
+from artifact_store import ArtifactStore, input_key
+from build_cache import hash_file
+from build_metrics import BuildMetrics
+from image_references import INCLUDE, MINDMAP_CONVERTER
+
+PLANTUML_OPTIONS = "plantuml_options.txt"
+MERMAID_ARGS = ("-b", "transparent")
+
+
+def find_mmdc(images_dir: Path) -> Optional[str]:
+    """mermaid-cli executable, preferring the local node_modules install."""
+    local = images_dir.parent / "node_modules" / ".bin" / "mmdc"
+    if local.exists():
+        return str(local)
+    return shutil.which("mmdc")
+
+
+def convert_mindmaps(images_dir: Path) -> None:
+    """Convert *.mindmap.yml to *.mindmap.plantuml.txt."""
+    mindmaps = sorted(p.name for p in images_dir.glob("*.mindmap.yml"))
+    if mindmaps:
+        subprocess.run([sys.executable, MINDMAP_CONVERTER, *mindmaps], cwd=images_dir, check=True)
+
+
+def plantuml_inputs(source: Path, images_dir: Path) -> list[Path]:
+    """Source and included files of a PlantUML diagram, relative to images_dir."""
+    files = [Path(source.name), Path(PLANTUML_OPTIONS)]
+    seen = {source.name, PLANTUML_OPTIONS}
+    pending = [source, images_dir / PLANTUML_OPTIONS]
+    while pending:
+        path = pending.pop()
+        if not path.is_file():
+            continue
+        for include in INCLUDE.findall(path.read_text()):
+            if include not in seen:
+                seen.add(include)
+                files.append(Path(include))
+                pending.append(images_dir / include)
+    return files
+
+
+def render_diagrams(images_dir: Path, jar: Path, store: ArtifactStore, metrics: BuildMetrics) -> dict:
+    """Render all diagrams in images_dir, restoring stored ones.
+
+    Returns dict with:
+        - restored: Diagram outputs restored from the store
+        - rendered: Diagram outputs rendered
+        - skipped: Sources skipped because their renderer isn't installed
+    """
+    result = {'restored': [], 'rendered': [], 'skipped': []}
+    convert_mindmaps(images_dir)
+
+    # PlantUML: look up every diagram, then render the misses in one JVM run
+    sources = sorted(images_dir.glob("*.plantuml.txt"))
+    if sources and not jar.exists():
+        print(f"⚠️  {jar} not found, skipping PlantUML diagrams (run make -C images plantuml.jar)")
+        result['skipped'] += [s.name for s in sources]
+        sources = []
+    jar_hash = hash_file(jar) if sources else ""
+    pending = {}
+    for source in sources:
+        output = source.with_suffix(".svg")
+        key = input_key("plantuml", plantuml_inputs(source, images_dir), [jar_hash], base=images_dir)
+        if store.restore(key, {'svg': output}):
+            result['restored'].append(output.name)
+        else:
+            pending[source] = key
+    if pending:
+        with metrics.stage("plantuml"):
+            subprocess.run(["java", "-jar", str(jar.resolve()), "-c", PLANTUML_OPTIONS, "-tsvg",
+                            *(s.name for s in pending)], cwd=images_dir, check=True)
+        for source, key in pending.items():
+            output = source.with_suffix(".svg")
+            if output.exists():
+                store.store(key, {'svg': output})
+                result['rendered'].append(output.name)
+
+    # Mermaid: one browser render per diagram
+    sources = sorted(images_dir.glob("*.mermaid.txt"))
+    mmdc = find_mmdc(images_dir) if sources else None
+    if sources and not mmdc:
+        print("⚠️  mermaid-cli not found, skipping Mermaid diagrams (install with: npm install)")
+        result['skipped'] += [s.name for s in sources]
+        sources = []
+    if sources:
+        version = subprocess.run([mmdc, "--version"], capture_output=True, text=True).stdout.strip()
+    for source in sources:
+        output = source.with_suffix(".svg")
+        key = input_key("mermaid", [Path(source.name)], [version, *MERMAID_ARGS], base=images_dir)
+        if store.restore(key, {'svg': output}):
+            result['restored'].append(output.name)
+            continue
+        with metrics.stage("mermaid"):
+            subprocess.run([mmdc, "-i", str(source), "-o", str(output), *MERMAID_ARGS], check=True)
+        store.store(key, {'svg': output})
+        result['rendered'].append(output.name)
+
+    metrics.cache("diagrams", hits=len(result['restored']), misses=len(result['rendered']))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render diagrams, reusing stored renders')
+    parser.add_argument('--images-dir', type=Path, default=Path('images'), help='Diagram directory (default: images)')
+    parser.add_argument('--jar', type=Path, help='plantuml.jar (default: <images-dir>/plantuml.jar)')
+
+    args = parser.parse_args()
+    store = ArtifactStore()
+    metrics = BuildMetrics("diagrams")
+    result = render_diagrams(args.images_dir, args.jar or args.images_dir / "plantuml.jar", store, metrics)
+    store.save()
+    metrics.save()
+
+    print(f"✓ Diagrams: {len(result['rendered'])} rendered, {len(result['restored'])} restored from the artifact store")
+    if result['skipped']:
+        print(f"⚠️  {len(result['skipped'])} skipped (renderer not installed)")
+
+
+if __name__ == '__main__':
+    main()
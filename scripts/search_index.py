@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Local full-text search over compiled topic content.
+
+Builds a SQLite FTS5 index (Porter-stemmed, unicode tokenized) with one row
+per content block, recording the block position and, for slide blocks, the
+slide number in the standalone deck. Queries are ranked with BM25. The index
+lives in .cache/search.sqlite and is updated per topic: only topics whose
+files changed since the last run are recompiled and reindexed.
+
+The index can also be exported as a gzipped JSON shard (stemmed terms with
+postings and document lengths) for client-side search in slide decks.
+
+Usage:
+    uv run python scripts/search_index.py search "dependency injection"
+    uv run python scripts/search_index.py search "celery task" --json
+    uv run python scripts/search_index.py build --rebuild
+    uv run python scripts/search_index.py export search-shard.json.gz --topic tasks
+"""
+
+import argparse
+import gzip
+import json
+import re
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Add scripts to path for models
+sys.path.insert(0, str(Path(__file__).parent))
+from build_cache import cache_path, fingerprint_files
+from compiled_topics import CompiledTopic, compile_topic, list_topic_ids, load_builder, topic_input_files
+
+SCHEMA_VERSION = "1"
+# BM25 column weights: heading matches count more than body matches
+HEADING_WEIGHT = 5.0
+BODY_WEIGHT = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS topics (topic_id TEXT PRIMARY KEY, fingerprint TEXT NOT NULL);
+CREATE VIRTUAL TABLE IF NOT EXISTS blocks USING fts5(
+    heading,
+    body,
+    topic_id UNINDEXED,
+    block_id UNINDEXED,
+    block_type UNINDEXED,
+    position UNINDEXED,
+    slide UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS terms USING fts5vocab(blocks, 'instance');
+"""
+
+
+def connect(db_path: Optional[Path] = None) -> sqlite3.Connection:
+    """Open the search index, recreating it if the schema version changed."""
+    db_path = db_path or cache_path('search.sqlite')
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+
+    row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+    if row is None or row[0] != SCHEMA_VERSION:
+        conn.executescript("DELETE FROM blocks; DELETE FROM topics;")
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (SCHEMA_VERSION,))
+        conn.commit()
+    return conn
+
+
+def slide_numbers(topic: CompiledTopic) -> dict[str, int]:
+    """Map slide block IDs to the number of their first slide in slides.html.
+
+    Mirrors the standalone deck built by outputs/training-slides/build.py:
+    a title slide, optional questions and objectives slides, then each slide
+    block split into one or more slides.
+    """
+    from models import ContentBlockType
+
+    markdown_to_slides = load_builder("training-slides").markdown_to_slides
+
+    training = topic.metadata.training
+    number = 2 + bool(training.questions) + bool(training.objectives)
+    numbers = {}
+    for block in topic.blocks:
+        if block.type != ContentBlockType.SLIDE:
+            continue
+        markdown = block.text
+        if block.heading and block.heading.strip():
+            markdown = f"### {block.heading}\n\n{markdown}"
+        if markdown.strip():
+            numbers[block.block_id] = number
+            number += len(markdown_to_slides(markdown))
+    return numbers
+
+
+def topic_rows(topic: CompiledTopic) -> list[tuple]:
+    """Rows to index for a topic: one per content block plus its metadata."""
+    training = topic.metadata.training
+    metadata_text = "\n".join([topic.metadata.title, training.subtitle] + training.questions
+                              + training.objectives + training.key_points)
+    rows = [(topic.metadata.title, metadata_text, topic.topic_id, '', 'metadata', -1, None)]
+
+    slides = slide_numbers(topic)
+    for block in topic.blocks:
+        rows.append((
+            block.heading or '',
+            block.text,
+            topic.topic_id,
+            block.block_id,
+            block.type.value,
+            block.position,
+            slides.get(block.block_id),
+        ))
+    return rows
+
+
+def update_index(conn: sqlite3.Connection, topics_dir: Path = Path("topics"), rebuild: bool = False) -> list[str]:
+    """Reindex topics whose input files changed.
+
+    Returns:
+        IDs of topics that were (re)indexed or removed
+    """
+    current = {row[0]: row[1] for row in conn.execute("SELECT topic_id, fingerprint FROM topics")}
+    topic_ids = list_topic_ids(topics_dir)
+    changed = []
+
+    with conn:
+        for topic_id in topic_ids:
+            fingerprint = fingerprint_files(topic_input_files(topic_id, topics_dir), salt=SCHEMA_VERSION)
+            if not rebuild and current.get(topic_id) == fingerprint:
+                continue
+
+            topic = compile_topic(topic_id, topics_dir)
+            conn.execute("DELETE FROM blocks WHERE topic_id = ?", (topic_id,))
+            conn.executemany("INSERT INTO blocks VALUES (?, ?, ?, ?, ?, ?, ?)", topic_rows(topic))
+            conn.execute("INSERT OR REPLACE INTO topics VALUES (?, ?)", (topic_id, fingerprint))
+            changed.append(topic_id)
+
+        for topic_id in set(current) - set(topic_ids):
+            conn.execute("DELETE FROM blocks WHERE topic_id = ?", (topic_id,))
+            conn.execute("DELETE FROM topics WHERE topic_id = ?", (topic_id,))
+            changed.append(topic_id)
+
+    if changed:
+        conn.execute("INSERT INTO blocks(blocks) VALUES ('optimize')")
+        conn.commit()
+    return changed
+
+
+def to_match_expression(query: str) -> str:
+    """Turn free text into an FTS5 expression requiring every term."""
+    terms = re.findall(r'\w+', query)
+    return ' '.join(f'"{term}"' for term in terms)
+
+
+def search(conn: sqlite3.Connection, query: str, limit: int = 10, raw: bool = False) -> list[dict]:
+    """BM25-ranked search over indexed blocks.
+
+    Args:
+        conn: Open index connection
+        query: Free text (all terms required) or an FTS5 expression if raw
+        limit: Maximum number of results
+        raw: Pass query to FTS5 unchanged (supports OR, NEAR, prefix*)
+
+    Returns:
+        List of result dicts, best match first
+    """
+    expression = query if raw else to_match_expression(query)
+    if not expression:
+        return []
+
+    rows = conn.execute(
+        """
+        SELECT topic_id, block_id, block_type, position, slide, heading,
+               snippet(blocks, 1, '[', ']', '…', 16),
+               bm25(blocks, ?, ?) AS score
+        FROM blocks
+        WHERE blocks MATCH ?
+        ORDER BY score
+        LIMIT ?
+        """,
+        (HEADING_WEIGHT, BODY_WEIGHT, expression, limit),
+    ).fetchall()
+
+    return [
+        {
+            'topic': topic_id,
+            'block': block_id or None,
+            'type': block_type,
+            'position': position,
+            'slide': slide,
+            'heading': heading,
+            'snippet': snippet.replace('\n', ' '),
+            # bm25() is negative, lower is better; report a positive score
+            'score': round(-score, 4),
+        }
+        for topic_id, block_id, block_type, position, slide, heading, snippet, score in rows
+    ]
+
+
+def export_shard(conn: sqlite3.Connection, output: Path, topic_id: Optional[str] = None) -> dict:
+    """Export the index as a gzipped JSON shard for client-side search.
+
+    The shard holds:
+        - docs: [topic, block, type, slide, heading] per document
+        - lengths: token count per document (for BM25 length normalization)
+        - terms: stemmed term -> flat [doc, tf, doc, tf, ...] postings
+
+    Returns:
+        Dict with document and term counts
+    """
+    where, params = ("WHERE topic_id = ?", (topic_id,)) if topic_id else ("", ())
+    doc_rows = conn.execute(
+        f"SELECT rowid, topic_id, block_id, block_type, slide, heading FROM blocks {where} ORDER BY rowid",
+        params,
+    ).fetchall()
+    doc_index = {row[0]: i for i, row in enumerate(doc_rows)}
+
+    lengths = [0] * len(doc_rows)
+    term_freqs: dict[str, dict[int, int]] = {}
+    for term, rowid in conn.execute("SELECT term, doc FROM terms"):
+        doc = doc_index.get(rowid)
+        if doc is None:
+            continue
+        lengths[doc] += 1
+        postings = term_freqs.setdefault(term, {})
+        postings[doc] = postings.get(doc, 0) + 1
+
+    shard = {
+        'version': SCHEMA_VERSION,
+        'docs': [[t, b, bt, s, h] for _, t, b, bt, s, h in doc_rows],
+        'lengths': lengths,
+        'terms': {
+            term: [value for doc, tf in sorted(postings.items()) for value in (doc, tf)]
+            for term, postings in sorted(term_freqs.items())
+        },
+    }
+    with gzip.open(output, 'wt', encoding='utf-8') as f:
+        json.dump(shard, f, separators=(',', ':'))
+
+    return {'docs': len(doc_rows), 'terms': len(term_freqs)}
+
+
+def print_results(query: str, results: list[dict]) -> None:
+    """Print search results."""
+    if not results:
+        print(f"No results for: {query}")
+        return
+
+    for i, result in enumerate(results, 1):
+        where = result['topic']
+        if result['block']:
+            where += f":{result['block']}"
+        if result['slide']:
+            where += f" (slide {result['slide']})"
+        print(f"{i:2}. {where}  [{result['score']:.2f}]")
+        if result['heading']:
+            print(f"    {result['heading']}")
+        print(f"    {result['snippet']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Full-text search over topic content')
+    parser.add_argument('--db', type=Path, default=None, help='Index database (default: .cache/search.sqlite)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Update the index for changed topics')
+    build_parser.add_argument('--rebuild', action='store_true', help='Reindex all topics')
+
+    search_parser = subparsers.add_parser('search', help='Search the index (updates it first)')
+    search_parser.add_argument('query', help='Search terms')
+    search_parser.add_argument('--limit', '-n', type=int, default=10, help='Maximum number of results')
+    search_parser.add_argument('--raw', action='store_true', help='Treat query as an FTS5 expression')
+    search_parser.add_argument('--json', action='store_true', help='Print JSON')
+
+    export_parser = subparsers.add_parser('export', help='Export a gzipped JSON shard for client-side search')
+    export_parser.add_argument('output', type=Path, help='Output file (e.g., search.json.gz)')
+    export_parser.add_argument('--topic', help='Only export one topic')
+
+    args = parser.parse_args()
+    conn = connect(args.db)
+
+    changed = update_index(conn, rebuild=getattr(args, 'rebuild', False))
+
+    if args.command == 'build':
+        print(f"✓ Indexed {len(changed)} changed topic(s)")
+    elif args.command == 'search':
+        try:
+            results = search(conn, args.query, limit=args.limit, raw=args.raw)
+        except sqlite3.OperationalError as e:
+            print(f"❌ Invalid query: {e}")
+            sys.exit(1)
+        if args.json:
+            print(json.dumps(results, indent=2))
+        else:
+            print_results(args.query, results)
+    elif args.command == 'export':
+        counts = export_shard(conn, args.output, args.topic)
+        print(f"✓ Exported {counts['docs']} documents, {counts['terms']} terms to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
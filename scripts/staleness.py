@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Find topics whose referenced Galaxy code changed after the topic did.
+
+Every code path a topic references (``related_code_paths``, paths in
+content, and the ``*files*.mindmap.yml`` trees it embeds; see
+code_index.py) is compared with the Galaxy history: a reference is stale
+when Galaxy commits touched the path (or, for directories, anything under
+it) after the topic's own last commit. Topics are ranked by churn, the
+number of such commits.
+
+The Galaxy history is read in a single ``git log --name-only`` pass (not
+one git call per path), limited to the referenced paths and to commits
+after the oldest referencing topic's last update. Every commit is counted
+once for each referenced directory above the files it touched. Only what
+the report needs is kept: for each referenced path, the commit times after
+its topics' last update. This is cached in .cache/staleness.json by Galaxy
+HEAD, --since (resolved to a date) and the topics' update times, so repeated
+runs don't call git log again until one of them moves.
+
+Topic times come from one ``git log`` pass over this repository's topics/
+and images/ (the mindmap a reference comes from counts as part of the
+topic); uncommitted edits aren't taken into account.
+
+Usage:
+    uv run python scripts/staleness.py
+    uv run python scripts/staleness.py --since 2023-01-01 --json
+    uv run python scripts/staleness.py --galaxy-root ~/src/galaxy --limit 5
+"""
+
+import argparse
+import json
+import sys
+from bisect import bisect_right
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+# Add scripts to path for models
+sys.path.insert(0, str(Path(__file__).parent))
+from build_cache import cache_path, load_json, save_json
+from code_index import load_index, trie_walk
+from symbol_index import galaxy_root, git
+
+INDEX_VERSION = 2
+COMMIT_MARKER = "\x00"
+DAY = 24 * 60 * 60
+
+
+def parse_log(output: str, paths: Optional[set[str]] = None) -> dict[str, list[int]]:
+    """Index ``git log --name-only --format=%x00%ct`` output by path.
+
+    Args:
+        paths: Only index these files and directories (default: all)
+
+    Returns:
+        Path -> ascending commit times, for files and every directory above
+        them (each commit counted once per directory)
+    """
+    times: dict[str, list[int]] = {}
+    for record in output.split(COMMIT_MARKER):
+        lines = record.strip().splitlines()
+        if not lines:
+            continue
+        timestamp = int(lines[0])
+        touched = set()
+        for path in lines[1:]:
+            path = path.strip()
+            if not path:
+                continue
+            touched.add(path)
+            touched.update(str(parent) for parent in Path(path).parents if str(parent) != ".")
+        if paths is not None:
+            touched &= paths
+        for path in touched:
+            times.setdefault(path, []).append(timestamp)
+
+    # git log lists newest first
+    for path_times in times.values():
+        path_times.reverse()
+    return times
+
+
+def change_index(root: Path, since: Optional[str] = None, paths: tuple[str, ...] = (),
+                 only: Optional[set[str]] = None) -> dict[str, list[int]]:
+    """Path -> commit times of a repository from a single git log pass.
+
+    Args:
+        since: git --since value
+        paths: Limit the log to commits touching these paths
+        only: Index only these files and directories (default: all)
+    """
+    args = ["log", "--no-renames", "--name-only", "--format=%x00%ct"]
+    if since:
+        args.append(f"--since={since}")
+    if paths:
+        args += ["--", *paths]
+    return parse_log(git(root, *args), only)
+
+
+def load_topic_changes(root: Path = Path("."), topics_dir: str = "topics",
+                       images_dir: str = "images") -> dict[str, list[int]]:
+    """Commit times of every topic and mindmap (see reference_updates())."""
+    return change_index(root, paths=(topics_dir, images_dir))
+
+
+def git_date(timestamp: int) -> str:
+    """Absolute date git parses unambiguously (small '@<timestamp>' values aren't)."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d %H:%M:%S +0000")
+
+
+def resolve_since(root: Path, since: str) -> int:
+    """Absolute start (UTC midnight) of a git --since value such as '1 year ago'.
+
+    Rounded to the day so relative values keep a cache valid for the day.
+    """
+    timestamp = int(git(root, "rev-parse", f"--since={since}").strip().split("=", 1)[1])
+    return timestamp - timestamp % DAY
+
+
+def load_galaxy_changes(root: Path, updated: dict[str, int], since: Optional[str] = None,
+                        cache_file: Optional[Path] = None) -> tuple[str, dict[str, list[int]]]:
+    """Galaxy commit times of referenced paths after their topics' last update.
+
+    Args:
+        updated: Referenced path -> earliest last update of a topic
+            referencing it (see reference_updates())
+        since: Ignore Galaxy history before this (git --since value)
+
+    Returns:
+        Tuple of (HEAD commit, path -> ascending commit times after updated[path])
+    """
+    cache_file = cache_file or cache_path("staleness.json")
+    head = git(root, "rev-parse", "HEAD").strip()
+    start = resolve_since(root, since) if since else 0
+    key = {'version': INDEX_VERSION, 'head': head, 'since': start, 'updated': updated}
+
+    cached = load_json(cache_file)
+    if cached and cached.get('key') == key:
+        return head, cached['paths']
+
+    changes = {}
+    if updated:
+        oldest = max(start, min(updated.values()))
+        times = change_index(root, git_date(oldest) if oldest else None, tuple(sorted(updated)), only=set(updated))
+        for path, path_times in times.items():
+            after = path_times[bisect_right(path_times, max(start, updated[path])):]
+            if after:
+                changes[path] = after
+    save_json(cache_file, {'key': key, 'paths': changes})
+    return head, changes
+
+
+def changes_after(times: list[int], timestamp: int) -> int:
+    """Number of commit times after timestamp (times ascending)."""
+    return len(times) - bisect_right(times, timestamp)
+
+
+def reference_updates(trie: dict, topic_changes: dict[str, list[int]], topics_dir: str = "topics",
+                      images_dir: str = "images") -> dict[tuple[str, str], tuple[int, set[str]]]:
+    """Last update of each (topic, referenced path) and where it's referenced.
+
+    A reference counts as updated when its topic was committed, or the
+    mindmap it comes from. A path referenced several ways counts once.
+
+    Returns:
+        (topic, path) -> (last update time, sources)
+    """
+    def last_commit(path: str) -> int:
+        times = topic_changes.get(path)
+        return times[-1] if times else 0
+
+    sources: dict[tuple[str, str], set[str]] = {}
+    for path, ref in trie_walk(trie, ""):
+        if ref.get('topic'):
+            sources.setdefault((ref['topic'], path), set()).add(ref.get('mindmap') or ref['source'])
+
+    updates = {}
+    for (topic_id, path), reference_sources in sources.items():
+        updated = last_commit(f"{topics_dir}/{topic_id}")
+        for source in reference_sources:
+            if source.endswith(".mindmap.yml"):
+                updated = max(updated, last_commit(f"{images_dir}/{source}"))
+        updates[(topic_id, path)] = (updated, reference_sources)
+    return updates
+
+
+def oldest_updates(updates: dict[tuple[str, str], tuple[int, set[str]]]) -> dict[str, int]:
+    """Referenced path -> earliest last update among the topics referencing it."""
+    oldest: dict[str, int] = {}
+    for (_, path), (updated, _) in updates.items():
+        oldest[path] = min(updated, oldest.get(path, updated))
+    return oldest
+
+
+def find_stale_topics(trie: dict, galaxy_changes: dict[str, list[int]], topic_changes: dict[str, list[int]],
+                      topics_dir: str = "topics", images_dir: str = "images") -> list[dict]:
+    """Topics with references to code that changed after the topic's last commit.
+
+    Args:
+        trie: Code path index from code_index.py
+        galaxy_changes: Galaxy path -> ascending commit times
+        topic_changes: This repository's path -> ascending commit times
+
+    Returns:
+        List of {'topic', 'last_updated', 'churn', 'stale': [{'path',
+        'sources', 'last_changed', 'commits'}]}, most churn first
+    """
+    def last_commit(path: str) -> int:
+        times = topic_changes.get(path)
+        return times[-1] if times else 0
+
+    topics: dict[str, dict] = {}
+    for (topic_id, path), (updated, sources) in sorted(reference_updates(trie, topic_changes, topics_dir, images_dir).items()):
+        times = galaxy_changes.get(path)
+        if not times:
+            continue
+        commits = changes_after(times, updated)
+        topic = topics.setdefault(topic_id, {'topic': topic_id, 'last_updated': last_commit(f"{topics_dir}/{topic_id}"),
+                                             'churn': 0, 'stale': []})
+        if commits:
+            topic['churn'] += commits
+            topic['stale'].append({'path': path, 'sources': sorted(sources), 'last_changed': times[-1], 'commits': commits})
+
+    stale = [t for t in topics.values() if t['stale']]
+    for topic in stale:
+        topic['stale'].sort(key=lambda s: (-s['commits'], s['path']))
+    return sorted(stale, key=lambda t: (-t['churn'], t['topic']))
+
+
+def format_time(timestamp: int) -> str:
+    if not timestamp:
+        return "never committed"
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d")
+
+
+def print_report(stale: list[dict], head: str, limit: Optional[int] = None, paths_per_topic: int = 5) -> None:
+    print(f"\n{'='*60}")
+    print(f"STALENESS REPORT (Galaxy {head[:10]})")
+    print(f"{'='*60}\n")
+
+    if not stale:
+        print("✅ No topic references code that changed after the topic")
+        return
+
+    for topic in stale[:limit]:
+        print(f"⚠️  {topic['topic']}: {topic['churn']} commit(s) since {format_time(topic['last_updated'])}")
+        for item in topic['stale'][:paths_per_topic]:
+            print(f"    - {item['path']}: {item['commits']} commit(s), last {format_time(item['last_changed'])}"
+                  f" [{', '.join(item['sources'])}]")
+        if len(topic['stale']) > paths_per_topic:
+            print(f"    ... and {len(topic['stale']) - paths_per_topic} more")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rank topics by changes to the Galaxy code they reference')
+    parser.add_argument('--galaxy-root', type=Path, help='Galaxy checkout (default: $GALAXY_ROOT or ~/workspace/galaxy)')
+    parser.add_argument('--since', help='Only read Galaxy history after this date (git --since)')
+    parser.add_argument('--limit', type=int, help='Show only the N most stale topics')
+    parser.add_argument('--json', action='store_true', help='Print JSON')
+
+    args = parser.parse_args()
+    root = args.galaxy_root or galaxy_root()
+    if not (root / ".git").exists():
+        print(f"❌ No Galaxy git checkout at {root} (set GALAXY_ROOT)")
+        sys.exit(1)
+
+    trie = load_index()
+    topic_changes = load_topic_changes()
+    updated = oldest_updates(reference_updates(trie, topic_changes))
+    head, galaxy_changes = load_galaxy_changes(root, updated, args.since)
+    stale = find_stale_topics(trie, galaxy_changes, topic_changes)
+
+    if args.json:
+        print(json.dumps({'head': head, 'topics': stale[:args.limit]}, indent=2))
+    else:
+        print_report(stale, head, args.limit)
+
+
+if __name__ == '__main__':
+    main()
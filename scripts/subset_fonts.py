@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Subset the DIN 1451 slide fonts to the characters the decks' headings use.
+
+The DIN 1451 web fonts are only used for slide headings (h1-h3), so every
+glyph not in a heading is dead weight on each deck's first render. This
+stage collects the characters of all heading lines of the rendered decks,
+subsets each font in fonts.css to them with fontTools and emits woff2
+files. fonts.css is rewritten to reference the subsets, with
+``font-display: swap`` on every @font-face.
+
+Subsets are cached in .cache/fonts/ by font content and glyph-set hash, so
+they are only recomputed when a heading gains a new character or a font
+changes. fontTools is optional (``uv sync --extra fonts``); without it the
+full fonts are used.
+
+scripts/bundle_slides.py uses this for the offline bundle. Run directly,
+it writes the subsets for the published site under content-hashed names
+(Altinn-DINCondensed.<hash>.woff2) and points the published decks given
+with --slides at them; slides.html names the fonts in its @font-face rules
+rather than loading fonts.css.
+
+Usage:
+    uv run python scripts/subset_fonts.py --output doc/build/html/images --slides doc/build/html/architecture
+    uv run python scripts/subset_fonts.py --output /tmp/fonts --topic tasks
+"""
+
+import argparse
+import html
+import io
+import re
+import sys
+from pathlib import Path
+from typing import Iterable, Optional
+
+# Add scripts to path for models
+sys.path.insert(0, str(Path(__file__).parent))
+from build_cache import cache_path, fingerprint_name, hash_bytes, hash_text
+from compiled_topics import list_topic_ids, load_builder
+
+SUBSET_VERSION = "1"
+FONTS_CSS = Path(__file__).parent.parent / "outputs" / "training-slides" / "assets" / "css" / "fonts.css"
+# Headings the DIN 1451 font applies to (h1-h3) in the decks' Remark.js markdown
+HEADING_LINE = re.compile(r'^\s*#{1,3}\s+(.+?)\s*$', re.MULTILINE)
+CSS_URL = re.compile(r"url\(([^)]+)\)")
+FONT_FACE = re.compile(r'@font-face\s*\{([^}]*)\}')
+
+
+def heading_characters(decks: Iterable[str]) -> str:
+    """Sorted unique characters of all h1-h3 heading lines in rendered decks (plus space)."""
+    characters = {" "}
+    for deck in decks:
+        for heading in HEADING_LINE.findall(deck):
+            characters.update(html.unescape(heading))
+    return "".join(sorted(characters))
+
+
+def ensure_font_display(css: str, display: str = "swap") -> str:
+    """Add ``font-display`` to every @font-face rule that doesn't set it."""
+    def replace(match: re.Match) -> str:
+        body = match.group(1)
+        if "font-display" in body:
+            return match.group(0)
+        return "@font-face {" + body.rstrip() + f"\n  font-display: {display};\n}}"
+
+    return FONT_FACE.sub(replace, css)
+
+
+def subset_font(data: bytes, characters: str) -> bytes:
+    """Subset a font to characters and return it as woff2.
+
+    Raises:
+        ImportError: If fontTools (with brotli for woff2) isn't installed
+    """
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+
+    options = subset.Options()
+    options.flavor = "woff2"
+    # Keep all OpenType layout features (kerning, ligatures) for the kept glyphs
+    options.layout_features = ["*"]
+    # FontForge's timestamp table, which fontTools can't subset
+    options.drop_tables += ["FFTM"]
+    font = TTFont(io.BytesIO(data))
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=characters)
+    subsetter.subset(font)
+    font.flavor = "woff2"
+    output = io.BytesIO()
+    font.save(output)
+    return output.getvalue()
+
+
+class FontSubsetter:
+    """Font subsets for one set of characters, cached in .cache/fonts/.
+
+    Args:
+        characters: Characters to keep (see heading_characters())
+        cache_dir: Subset cache directory (default .cache/fonts)
+    """
+
+    def __init__(self, characters: str, cache_dir: Optional[Path] = None):
+        self.characters = characters
+        self.cache_dir = cache_dir or cache_path("fonts")
+        self.glyph_hash = hash_text("".join(sorted(set(characters))))
+        self.hits = 0
+        self.misses = 0
+        try:
+            import fontTools.subset  # noqa: F401
+            import brotli  # noqa: F401
+            self.available = True
+        except ImportError:
+            self.available = False
+
+    def font(self, path: Path) -> bytes:
+        """The subset of a font file, or the font itself without fontTools."""
+        data = path.read_bytes()
+        if not self.available:
+            return data
+        cached = self.cache_dir / f"{hash_text(f'{SUBSET_VERSION}:{hash_bytes(data)}:{self.glyph_hash}')}.woff2"
+        if cached.exists():
+            self.hits += 1
+            return cached.read_bytes()
+        subset = subset_font(data, self.characters)
+        self.misses += 1
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        cached.write_bytes(subset)
+        return subset
+
+
+def write_fonts(subsetter: FontSubsetter, name_font, css_file: Path = FONTS_CSS) -> str:
+    """Subset every font fonts.css references and rewrite it to the new files.
+
+    Args:
+        subsetter: Subsets the fonts
+        name_font: Called with (font file name, font data); writes the font
+            and returns the URL fonts.css should use for it
+
+    Returns:
+        The rewritten fonts.css, with ``font-display: swap``
+    """
+    css = css_file.read_text()
+
+    def replace(match: re.Match) -> str:
+        font = (css_file.parent / match.group(1).strip('\'"')).resolve()
+        return f"url({name_font(font.name, subsetter.font(font))})"
+
+    return ensure_font_display(CSS_URL.sub(replace, css))
+
+
+def rewrite_font_names(deck: str, names: dict[str, str]) -> str:
+    """Point a deck's font URLs at renamed fonts.
+
+    Args:
+        names: Original font file name -> new name; earlier hashed names
+            of the same font are replaced too
+    """
+    for name, renamed in names.items():
+        base, _, extension = name.partition('.')
+        font = re.compile(re.escape(base) + r'(?:\.[0-9a-f]{12})?\.' + re.escape(extension))
+        deck = font.sub(renamed, deck)
+    return deck
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Subset the DIN 1451 slide fonts to the characters used in headings')
+    parser.add_argument('--output', type=Path, default=Path('doc/build/html/images'),
+                        help='Directory to write the fonts to (default: doc/build/html/images)')
+    parser.add_argument('--topic', action='append', help='Topic whose deck headings to include (repeatable; default: all)')
+    parser.add_argument('--slides', type=Path, help='Published decks (*/slides.html) to point at the hashed fonts')
+
+    args = parser.parse_args()
+
+    render_slides = load_builder("training-slides").render_slides
+    decks = [render_slides(topic_id)[1] for topic_id in args.topic or list_topic_ids()]
+    subsetter = FontSubsetter(heading_characters(decks))
+    if not subsetter.available:
+        print("⚠️  fontTools not installed, copying full fonts (install with: uv sync --extra fonts)")
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    names, sizes = {}, {}
+
+    def name_font(name: str, data: bytes) -> str:
+        names[name] = fingerprint_name(name, data)
+        (args.output / names[name]).write_bytes(data)
+        sizes[names[name]] = len(data)
+        return names[name]
+
+    write_fonts(subsetter, name_font)
+    print(f"✓ Fonts for {len(decks)} deck(s), {len(subsetter.characters)} characters:")
+    for name, size in sorted(sizes.items()):
+        print(f"  {args.output / name}: {size / 1024:.1f} KB")
+
+    if args.slides:
+        slides = sorted(args.slides.glob("*/slides.html"))
+        for deck in slides:
+            deck.write_text(rewrite_font_names(deck.read_text(), names))
+        print(f"✓ {len(slides)} deck(s) in {args.slides} use the hashed fonts")
+
+
+if __name__ == '__main__':
+    main()
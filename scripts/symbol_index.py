@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Symbol index of a Galaxy checkout for checking and deep-linking code references.
+
+Topics reference Galaxy code as paths (``lib/galaxy/managers/hdas.py``) and
+as symbols inside them (``lib/galaxy/managers/hdas.py::HDAManager.purge``,
+also written ``path:function()``). This index lists every tracked file of
+the checkout with ``git ls-files -s`` (which gives each file's blob hash
+without reading it) and parses Python modules with ``ast`` in a process
+pool to record their classes, functions, methods and module-level names
+with line numbers.
+
+Parse results are cached in .cache/symbol_index.json by blob hash, so only
+files whose content changed since the last run are parsed again (switching
+branches back and forth costs nothing for unchanged files). Lookups are
+dict/set lookups, i.e. O(1) per reference.
+
+``build`` parses the whole checkout. Checking references (``check``,
+``lookup``, ``make validate --symbols``) and deep-linking in the Sphinx build
+use load_symbol_index() instead, which only parses the modules references
+actually name, on first lookup.
+
+The checkout is found at $GALAXY_ROOT (default ~/workspace/galaxy). Blob
+hashes come from the git index, so uncommitted edits to a file aren't
+picked up until they're staged.
+
+Usage:
+    uv run python scripts/symbol_index.py build
+    uv run python scripts/symbol_index.py lookup lib/galaxy/managers/hdas.py::HDAManager
+    uv run python scripts/symbol_index.py check
+    uv run python scripts/symbol_index.py check --json
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional
+
+import yaml
+
+# Add scripts to path for models
+sys.path.insert(0, str(Path(__file__).parent))
+from build_cache import cache_path, load_json, save_json
+from code_index import BACKTICK_PATH_PATTERN, GALAXY_BLOB_PATTERN, GALAXY_ROOTS, iter_mindmap_paths, normalize_path
+
+INDEX_VERSION = 1
+DEFAULT_GALAXY_ROOT = Path.home() / "workspace" / "galaxy"
+GITHUB_BLOB_URL = "https://github.com/galaxyproject/galaxy/blob"
+GITHUB_TREE_URL = "https://github.com/galaxyproject/galaxy/tree"
+# Below this many changed modules, parsing in-process beats starting a pool
+POOL_THRESHOLD = 64
+
+# path, path::Symbol, path::Class.method, path:function() (optionally #L10)
+REFERENCE = re.compile(r"^(?P<path>[^:#]+?)(?:::?(?P<symbol>[A-Za-z_][\w.]*)(?:\(\))?)?(?:#L\d+)?$")
+
+
+def galaxy_root() -> Path:
+    """Galaxy checkout to index ($GALAXY_ROOT or ~/workspace/galaxy)."""
+    return Path(os.environ.get("GALAXY_ROOT", DEFAULT_GALAXY_ROOT)).expanduser()
+
+
+def parse_reference(reference: str) -> tuple[str, Optional[str]]:
+    """Split a code reference into (normalized path, symbol or None)."""
+    match = REFERENCE.match(reference.strip())
+    if not match:
+        return normalize_path(reference), None
+    return normalize_path(match.group('path')), match.group('symbol')
+
+
+def extract_symbols(source: bytes) -> dict[str, int]:
+    """Classes, functions, methods and module-level names of a module with their line numbers.
+
+    Nested definitions get dotted names (``Class.method``). Modules that
+    don't parse (e.g. Python 2 scripts) have no symbols.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return {}
+
+    symbols = {}
+
+    def visit(body: list[ast.stmt], prefix: str) -> None:
+        for node in body:
+            if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+                name = prefix + node.name
+                symbols.setdefault(name, node.lineno)
+                if isinstance(node, ast.ClassDef):
+                    visit(node.body, name + ".")
+            elif not prefix and isinstance(node, (ast.Assign, ast.AnnAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        symbols.setdefault(target.id, node.lineno)
+
+    visit(tree.body, "")
+    return symbols
+
+
+def _parse_file(job: tuple[str, str]) -> tuple[str, dict[str, int]]:
+    """Process pool worker: (path, blob hash) -> (blob hash, symbols)."""
+    path, blob = job
+    try:
+        return blob, extract_symbols(Path(path).read_bytes())
+    except OSError:
+        return blob, {}
+
+
+def git(root: Path, *args: str) -> str:
+    return subprocess.run(["git", "-C", str(root), *args], capture_output=True, text=True, check=True).stdout
+
+
+def list_files(root: Path) -> dict[str, str]:
+    """Tracked files of a git checkout mapped to their blob hashes."""
+    files = {}
+    for entry in git(root, "ls-files", "-s", "-z").split("\0"):
+        if not entry:
+            continue
+        meta, path = entry.split("\t", 1)
+        files[path] = meta.split()[1]
+    return files
+
+
+class SymbolIndex:
+    """Files and Python symbols of a Galaxy checkout.
+
+    Args:
+        head: Commit the index was built from (used for permalinks)
+        files: Tracked file path -> blob hash
+        symbols: Blob hash -> {symbol: line} for Python modules
+        root: Checkout to parse modules missing from symbols from on first
+            lookup (None: symbols is complete)
+    """
+
+    def __init__(self, head: str, files: dict[str, str], symbols: dict[str, dict[str, int]],
+                 root: Optional[Path] = None):
+        self.head = head
+        self.files = files
+        self.symbols = symbols
+        self.root = root
+        self.parsed = 0
+        self.directories = {str(parent) for path in files for parent in Path(path).parents if str(parent) != "."}
+
+    def has_path(self, path: str) -> bool:
+        path = normalize_path(path)
+        return path in self.files or path in self.directories
+
+    def line(self, path: str, symbol: str) -> Optional[int]:
+        """Line of a symbol in a module (None if it isn't defined there)."""
+        path = normalize_path(path)
+        blob = self.files.get(path)
+        if not blob:
+            return None
+        if blob not in self.symbols and self.root is not None and path.endswith(".py"):
+            self.symbols[blob] = _parse_file((str(self.root / path), blob))[1]
+            self.parsed += 1
+        return self.symbols.get(blob, {}).get(symbol)
+
+    def check(self, reference: str) -> Optional[str]:
+        """Problem with a code reference, or None if it resolves.
+
+        Symbols are only checked in Python modules.
+        """
+        path, symbol = parse_reference(reference)
+        if not self.has_path(path):
+            return f"Code path not found in Galaxy: {path}"
+        if symbol and path not in self.files:
+            return f"Symbol reference on a directory: {reference}"
+        if symbol and path.endswith(".py") and self.line(path, symbol) is None:
+            return f"Symbol not found in {path}: {symbol}"
+        return None
+
+    def url(self, reference: str) -> Optional[str]:
+        """GitHub permalink (at the indexed commit) for a resolvable reference."""
+        if self.check(reference):
+            return None
+        path, symbol = parse_reference(reference)
+        if path in self.directories:
+            return f"{GITHUB_TREE_URL}/{self.head}/{path}"
+        url = f"{GITHUB_BLOB_URL}/{self.head}/{path}"
+        line = self.line(path, symbol) if symbol else None
+        return f"{url}#L{line}" if line else url
+
+
+def load_cached_symbols(cache_file: Path) -> dict[str, dict[str, int]]:
+    cached = load_json(cache_file) or {}
+    return cached.get('symbols', {}) if cached.get('version') == INDEX_VERSION else {}
+
+
+def build_symbol_index(root: Optional[Path] = None, cache_file: Optional[Path] = None,
+                       workers: Optional[int] = None) -> tuple[SymbolIndex, int]:
+    """Index a Galaxy checkout, parsing only modules whose blobs aren't cached.
+
+    Returns:
+        Tuple of (index, number of modules parsed)
+    """
+    root = root or galaxy_root()
+    cache_file = cache_file or cache_path("symbol_index.json")
+    files = list_files(root)
+    head = git(root, "rev-parse", "HEAD").strip()
+
+    cached = load_json(cache_file) or {}
+    cached_symbols = load_cached_symbols(cache_file)
+
+    modules = {blob: path for path, blob in files.items() if path.endswith(".py")}
+    symbols = {blob: cached_symbols[blob] for blob in modules if blob in cached_symbols}
+    jobs = [(str(root / path), blob) for blob, path in modules.items() if blob not in symbols]
+
+    if len(jobs) < POOL_THRESHOLD:
+        symbols.update(map(_parse_file, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            symbols.update(pool.map(_parse_file, jobs, chunksize=32))
+
+    # Blobs no longer in the checkout are dropped so the cache stays bounded
+    if jobs or set(cached_symbols) != set(symbols) or cached.get('head') != head:
+        save_json(cache_file, {'version': INDEX_VERSION, 'head': head, 'symbols': symbols})
+    return SymbolIndex(head, files, symbols), len(jobs)
+
+
+def load_symbol_index(root: Optional[Path] = None, cache_file: Optional[Path] = None) -> Optional[SymbolIndex]:
+    """Symbol index of the Galaxy checkout, or None if there's no git checkout.
+
+    Only lists the checkout's files: modules are parsed on first lookup,
+    unless their blob is in the cache already. Call save_symbols() to cache
+    what was parsed.
+    """
+    root = root or galaxy_root()
+    if not (root / ".git").exists():
+        return None
+    try:
+        files = list_files(root)
+        head = git(root, "rev-parse", "HEAD").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    cached_symbols = load_cached_symbols(cache_file or cache_path("symbol_index.json"))
+    blobs = {blob for path, blob in files.items() if path.endswith(".py")}
+    symbols = {blob: lines for blob, lines in cached_symbols.items() if blob in blobs}
+    return SymbolIndex(head, files, symbols, root=root)
+
+
+def save_symbols(index: SymbolIndex, cache_file: Optional[Path] = None) -> None:
+    """Add modules parsed on demand by a load_symbol_index() index to the cache."""
+    if not index.parsed:
+        return
+    cache_file = cache_file or cache_path("symbol_index.json")
+    blobs = set(index.files.values())
+    symbols = {blob: lines for blob, lines in load_cached_symbols(cache_file).items() if blob in blobs}
+    symbols.update(index.symbols)
+    save_json(cache_file, {'version': INDEX_VERSION, 'head': index.head, 'symbols': symbols})
+    index.parsed = 0
+
+
+# ============================================================================
+# Checking topic references
+# ============================================================================
+
+def iter_code_references(topics_dir: Path = Path("topics"), images_dir: Path = Path("images")) -> Iterator[tuple[str, str, str]]:
+    """Yield (topic or mindmap, location, reference) for every code reference.
+
+    Covers related_code_paths, backticked paths and GitHub links in content,
+    and file mindmaps (the same sources as code_index.py, keeping symbols).
+    """
+    from compiled_topics import compile_all_topics
+
+    for topic in compile_all_topics(topics_dir):
+        for item in topic.metadata.related_code_paths:
+            yield topic.topic_id, "related_code_paths", item if isinstance(item, str) else item.path
+        for block in topic.blocks:
+            for reference in BACKTICK_PATH_PATTERN.findall(block.text) + GALAXY_BLOB_PATTERN.findall(block.text):
+                yield topic.topic_id, block.block_id, reference
+
+    for mindmap_file in sorted(images_dir.glob("*files*.mindmap.yml")):
+        data = yaml.safe_load(mindmap_file.read_text())
+        if data:
+            for path, _ in iter_mindmap_paths(data):
+                yield mindmap_file.name, "mindmap", path
+
+
+def check_code_references(index: SymbolIndex, topics_dir: Path = Path("topics"),
+                          images_dir: Path = Path("images")) -> list[dict]:
+    """Code references that don't resolve in the index.
+
+    Returns:
+        List of {'topic', 'location', 'reference', 'message'}
+    """
+    problems = []
+    for topic, location, reference in iter_code_references(topics_dir, images_dir):
+        message = index.check(reference)
+        if message:
+            problems.append({'topic': topic, 'location': location, 'reference': reference, 'message': message})
+    return problems
+
+
+# Backticked Galaxy path not already inside a link
+CODE_SPAN = re.compile(r"(?<![\[`])`((?:" + "|".join(re.escape(r) for r in GALAXY_ROOTS) + r")/[^`\s]*)`(?![\]`])")
+FENCE = re.compile(r"^(```|~~~).*?^\1", re.M | re.S)
+
+
+def link_code_references(markdown: str, index: Optional[SymbolIndex]) -> str:
+    """Turn backticked Galaxy paths/symbols into GitHub links at their exact line.
+
+    Fenced code blocks and references that don't resolve are left as they
+    are, as is everything when no index is available.
+    """
+    if index is None:
+        return markdown
+
+    def link(match: re.Match) -> str:
+        url = index.url(match.group(1))
+        return f"[{match.group(0)}]({url})" if url else match.group(0)
+
+    parts, last = [], 0
+    for fence in FENCE.finditer(markdown):
+        parts.append(CODE_SPAN.sub(link, markdown[last:fence.start()]))
+        parts.append(fence.group(0))
+        last = fence.end()
+    parts.append(CODE_SPAN.sub(link, markdown[last:]))
+    return "".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Symbol index of a Galaxy checkout')
+    parser.add_argument('--galaxy-root', type=Path, help='Galaxy checkout (default: $GALAXY_ROOT or ~/workspace/galaxy)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Update the index')
+    build_parser.add_argument('--workers', type=int, help='Parser processes (default: CPU count)')
+
+    lookup_parser = subparsers.add_parser('lookup', help='Resolve a path or path::Symbol reference')
+    lookup_parser.add_argument('reference')
+
+    check_parser = subparsers.add_parser('check', help='Check all code references in topics and mindmaps')
+    check_parser.add_argument('--json', action='store_true', help='Print JSON')
+
+    args = parser.parse_args()
+    root = args.galaxy_root or galaxy_root()
+    if not (root / ".git").exists():
+        print(f"❌ No Galaxy git checkout at {root} (set GALAXY_ROOT)")
+        sys.exit(1)
+
+    if args.command == 'build':
+        index, parsed = build_symbol_index(root, workers=args.workers)
+        symbols = sum(len(s) for s in index.symbols.values())
+        print(f"✓ Indexed {len(index.files)} files, {symbols} symbols at {index.head[:10]} ({parsed} modules parsed)")
+        return
+
+    index = load_symbol_index(root)
+    if index is None:
+        print(f"❌ Could not list files of the Galaxy checkout at {root}")
+        sys.exit(1)
+
+    if args.command == 'lookup':
+        problem = index.check(args.reference)
+        save_symbols(index)
+        if problem:
+            print(f"❌ {problem}")
+            sys.exit(1)
+        print(index.url(args.reference))
+
+    elif args.command == 'check':
+        problems = check_code_references(index)
+        save_symbols(index)
+        if args.json:
+            print(json.dumps(problems, indent=2))
+        elif problems:
+            print(f"❌ {len(problems)} unresolved code reference(s):\n")
+            for problem in problems:
+                print(f"  {problem['topic']} [{problem['location']}]: {problem['message']}")
+        else:
+            print("✅ All code references resolve")
+        sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
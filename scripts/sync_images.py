@@ -12,7 +12,6 @@ Usage:
 """
 
 import argparse
-import re
 import shutil
 import sys
 from pathlib import Path
@@ -20,7 +19,8 @@ from typing import Set
 
 # Add scripts to path for models
 sys.path.insert(0, str(Path(__file__).parent))
-from models import load_content
+from compiled_topics import compile_topic
+from image_references import extract_image_names
 
 
 def should_copy_image(image_path: Path) -> bool:
@@ -39,44 +39,13 @@ def should_copy_image(image_path: Path) -> bool:
 
 
 def find_referenced_images(topic_id: str) -> Set[str]:
-    """Extract all image filenames from content blocks."""
-    content = load_content(topic_id)
-    images = set()
-
-    for block in content.root:
-        # Get markdown from block
-        markdown = ""
-
-        if block.content:
-            # Inline content
-            markdown = block.content
-        elif block.file:
-            # Read from single file
-            file_path = Path('topics') / topic_id / block.file
-            if file_path.exists():
-                markdown = file_path.read_text()
-        elif block.fragments:
-            # Read multiple fragments
-            for frag in block.fragments:
-                frag_path = Path('topics') / topic_id / 'fragments' / frag
-                if frag_path.exists():
-                    markdown += frag_path.read_text() + "\n"
-
-        if not markdown:
-            continue
-
-        # Find all image references: ![alt](path)
-        img_matches = re.findall(r'!\[.*?\]\((.*?)\)', markdown)
-        for img_path in img_matches:
-            # Skip external URLs
-            if img_path.startswith('http://') or img_path.startswith('https://'):
-                continue
+    """Extract all image filenames from content blocks.
 
-            # Extract filename from path
-            filename = Path(img_path).name
-            images.add(filename)
-
-    return images
+    Blocks are resolved like the builders resolve them, so images in
+    ``file`` and ``fragments`` blocks are found too.
+    """
+    topic = compile_topic(topic_id)
+    return {name for block in topic.blocks for name in extract_image_names(block.text)}
 
 
 def categorize_image_source(image_name: str, images_dir: Path) -> str:
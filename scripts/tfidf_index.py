@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+TF-IDF vectors over all compiled content blocks.
+
+Every content block of every topic becomes a row of a sparse TF-IDF matrix
+(sublinear term frequency, smoothed IDF, L2-normalized rows), so relevance
+of any number of prompts to all blocks is one sparse matrix multiply. The
+matrix is cached in .cache/tfidf.npz and reused while no topic file changed;
+when one did, per-block term counts are reused by block hash
+(.cache/tfidf_terms.json) and only new or edited blocks are re-analyzed.
+
+Requires the optional analysis dependencies (numpy, scipy).
+
+Usage:
+    uv run --extra analysis python scripts/tfidf_index.py build --rebuild
+    uv run --extra analysis python scripts/tfidf_index.py query "Refactor a component to use dependency injection"
+"""
+
+import argparse
+import math
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from scipy import sparse
+
+# Add scripts to path for models
+sys.path.insert(0, str(Path(__file__).parent))
+from build_cache import cache_path, fingerprint_files, load_json, save_json
+from compiled_topics import CompiledTopic, compile_all_topics, list_topic_ids, topic_input_files
+
+INDEX_VERSION = "1"
+
+STOPWORDS = frozenset("""
+a an and any are as at be by can do does for from has have how if in into is it
+its not of on or our should so than that the their them then there these they
+this to use used using was we what when which will with you your
+""".split())
+
+TERM_PATTERN = re.compile(r"[a-z][a-z0-9_]+")
+
+
+def analyze(text: str) -> list[str]:
+    """Lowercased terms of text without stopwords, with a naive plural strip."""
+    found = []
+    for term in TERM_PATTERN.findall(text.lower()):
+        if term in STOPWORDS:
+            continue
+        if len(term) > 4 and term.endswith('s') and not term.endswith('ss'):
+            term = term[:-1]
+        found.append(term)
+    return found
+
+
+def block_document(heading: Optional[str], text: str) -> str:
+    """Text indexed for a block; the heading is repeated to weight it up."""
+    heading = heading or ''
+    return f"{heading}\n{heading}\n{text}"
+
+
+@dataclass
+class TfidfIndex:
+    """Sparse TF-IDF matrix with one L2-normalized row per content block."""
+    locations: list[str]
+    hashes: list[str]
+    vocabulary: dict[str, int]
+    idf: np.ndarray
+    matrix: sparse.csr_matrix
+
+    def vectorize(self, texts: list[str]) -> sparse.csr_matrix:
+        """TF-IDF vectors for arbitrary texts (unknown terms are ignored)."""
+        return _weigh([Counter(analyze(text)) for text in texts], self.vocabulary, self.idf)
+
+    def score(self, texts: list[str]) -> np.ndarray:
+        """Cosine similarity of each text to every block.
+
+        Returns:
+            Dense array of shape (len(texts), number of blocks)
+        """
+        return (self.vectorize(texts) @ self.matrix.T).toarray()
+
+    def scores_by_location(self, row: np.ndarray) -> dict[str, float]:
+        """Map one row of score() to block locations ('topic:block')."""
+        return {location: float(score) for location, score in zip(self.locations, row) if score > 0}
+
+
+def _weigh(counts: list[Counter], vocabulary: dict[str, int], idf: np.ndarray) -> sparse.csr_matrix:
+    """Build an L2-normalized sublinear TF-IDF matrix from term counts."""
+    indptr, indices, data = [0], [], []
+    for doc in counts:
+        for term, count in doc.items():
+            column = vocabulary.get(term)
+            if column is not None:
+                indices.append(column)
+                data.append(1.0 + math.log(count))
+        indptr.append(len(indices))
+
+    matrix = sparse.csr_matrix(
+        (np.array(data, dtype=np.float64), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int32)),
+        shape=(len(counts), len(vocabulary)),
+    )
+    matrix = matrix @ sparse.diags(idf)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.csr_matrix(sparse.diags(1.0 / norms) @ matrix)
+
+
+def build_index(topics: list[CompiledTopic], term_cache: Optional[dict] = None) -> TfidfIndex:
+    """Build the index over all blocks of the given topics.
+
+    Args:
+        topics: Compiled topics to index
+        term_cache: Block hash -> {term: count}; reused for unchanged blocks
+            and updated in place for new ones
+
+    Returns:
+        TfidfIndex with rows in topic and block order
+    """
+    term_cache = term_cache if term_cache is not None else {}
+    locations, hashes, counts = [], [], []
+    for topic in topics:
+        for block in topic.blocks:
+            if block.hash not in term_cache:
+                term_cache[block.hash] = dict(Counter(analyze(block_document(block.heading, block.text))))
+            locations.append(block.location)
+            hashes.append(block.hash)
+            counts.append(Counter(term_cache[block.hash]))
+
+    vocabulary = {term: i for i, term in enumerate(sorted({term for doc in counts for term in doc}))}
+    df = np.zeros(len(vocabulary))
+    for doc in counts:
+        for term in doc:
+            df[vocabulary[term]] += 1
+    idf = np.log((1 + len(counts)) / (1 + df)) + 1.0
+
+    return TfidfIndex(locations, hashes, vocabulary, idf, _weigh(counts, vocabulary, idf))
+
+
+def save_index(index: TfidfIndex, path: Path, fingerprint: str) -> None:
+    """Save the index as a compressed .npz (no pickled objects)."""
+    terms = sorted(index.vocabulary, key=index.vocabulary.get)
+    tmp = path.with_name(f".{path.name}.tmp.npz")
+    np.savez_compressed(
+        tmp,
+        version=np.array(INDEX_VERSION),
+        fingerprint=np.array(fingerprint),
+        locations=np.array(index.locations, dtype=str),
+        hashes=np.array(index.hashes, dtype=str),
+        terms=np.array(terms, dtype=str),
+        idf=index.idf,
+        data=index.matrix.data,
+        indices=index.matrix.indices,
+        indptr=index.matrix.indptr,
+        shape=np.array(index.matrix.shape),
+    )
+    tmp.replace(path)
+
+
+def read_index(path: Path, fingerprint: str) -> Optional[TfidfIndex]:
+    """Load a saved index if it exists and matches fingerprint."""
+    try:
+        with np.load(path) as npz:
+            if str(npz['version']) != INDEX_VERSION or str(npz['fingerprint']) != fingerprint:
+                return None
+            matrix = sparse.csr_matrix((npz['data'], npz['indices'], npz['indptr']), shape=tuple(npz['shape']))
+            return TfidfIndex(
+                locations=npz['locations'].tolist(),
+                hashes=npz['hashes'].tolist(),
+                vocabulary={term: i for i, term in enumerate(npz['terms'].tolist())},
+                idf=npz['idf'],
+                matrix=matrix,
+            )
+    except (FileNotFoundError, KeyError, ValueError):
+        return None
+
+
+def load_index(
+    topics_dir: Path = Path("topics"),
+    rebuild: bool = False,
+    index_file: Optional[Path] = None,
+    terms_file: Optional[Path] = None,
+) -> TfidfIndex:
+    """Load the cached index, rebuilding it if any topic file changed.
+
+    Args:
+        topics_dir: Topics directory
+        rebuild: Ignore the cached matrix and per-block term counts
+        index_file: Cached matrix (default: .cache/tfidf.npz)
+        terms_file: Cached per-block term counts (default: .cache/tfidf_terms.json)
+    """
+    index_file = index_file or cache_path('tfidf.npz')
+    terms_file = terms_file or cache_path('tfidf_terms.json')
+
+    files = [f for topic_id in list_topic_ids(topics_dir) for f in topic_input_files(topic_id, topics_dir)]
+    fingerprint = fingerprint_files(files, salt=INDEX_VERSION)
+    if not rebuild:
+        index = read_index(index_file, fingerprint)
+        if index is not None:
+            return index
+
+    cached = {} if rebuild else load_json(terms_file, default={})
+    term_cache = cached.get('blocks', {}) if cached.get('version') == INDEX_VERSION else {}
+
+    index = build_index(compile_all_topics(topics_dir), term_cache)
+
+    # Drop term counts of blocks that no longer exist
+    live = set(index.hashes)
+    save_json(terms_file, {
+        'version': INDEX_VERSION,
+        'blocks': {h: terms for h, terms in term_cache.items() if h in live},
+    })
+    save_index(index, index_file, fingerprint)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TF-IDF relevance index over topic content blocks')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Build or update the index')
+    build_parser.add_argument('--rebuild', action='store_true', help='Ignore cached term counts')
+
+    query_parser = subparsers.add_parser('query', help='Rank blocks by relevance to a prompt')
+    query_parser.add_argument('prompt', help='Prompt text')
+    query_parser.add_argument('--limit', '-n', type=int, default=10, help='Maximum number of results')
+
+    args = parser.parse_args()
+    index = load_index(rebuild=getattr(args, 'rebuild', False))
+
+    if args.command == 'build':
+        print(f"✓ Indexed {index.matrix.shape[0]} blocks, {index.matrix.shape[1]} terms")
+    elif args.command == 'query':
+        scores = index.score([args.prompt])[0]
+        ranked = np.argsort(-scores)[:args.limit]
+        for i, row in enumerate(ranked, 1):
+            if scores[row] <= 0:
+                break
+            print(f"{i:2}. {index.locations[row]}  [{scores[row]:.3f}]")
+
+
+if __name__ == '__main__':
+    main()
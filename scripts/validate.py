@@ -7,8 +7,11 @@ Checks:
 - content.yaml has valid structure and references
 - All referenced files exist
 - Internal topic references are valid
+- With --symbols, code paths and path::Symbol references resolve in the
+  Galaxy checkout ($GALAXY_ROOT)
 """
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -155,8 +158,13 @@ def validate_topic(topic_dir: Path) -> tuple[list[str], list[str]]:
     return errors, warnings
 
 
-def validate_all() -> bool:
-    """Validate all topics."""
+def validate_all(check_symbols: bool = False) -> bool:
+    """Validate all topics.
+
+    Args:
+        check_symbols: Also check code paths and path::Symbol references
+            against the local Galaxy checkout ($GALAXY_ROOT), if there is one
+    """
     topics_dir = Path("topics")
     if not topics_dir.exists():
         print("❌ ERROR: topics/ directory not found")
@@ -187,6 +195,17 @@ def validate_all() -> bool:
         if chain_errors:
             all_errors["[tutorial-chain]"] = chain_errors
 
+    # Code references are warnings: the checkout may be on another branch
+    if check_symbols:
+        from symbol_index import check_code_references, load_symbol_index, save_symbols
+        index = load_symbol_index()
+        if index is None:
+            all_warnings.setdefault("[symbols]", []).append("No Galaxy git checkout found (set GALAXY_ROOT)")
+        else:
+            for problem in check_code_references(index, topics_dir):
+                all_warnings.setdefault(problem['topic'], []).append(f"[{problem['location']}] {problem['message']}")
+            save_symbols(index)
+
     # Report results
     print(f"\n{'='*60}")
     print("VALIDATION REPORT")
@@ -218,7 +237,12 @@ def validate_all() -> bool:
 
 def main():
     """Main entry point for the validate-topics script."""
-    success = validate_all()
+    parser = argparse.ArgumentParser(description='Validate all topics')
+    parser.add_argument('--symbols', action='store_true',
+                        help='Also check code references against the Galaxy checkout ($GALAXY_ROOT)')
+    args = parser.parse_args()
+
+    success = validate_all(check_symbols=args.symbols)
     sys.exit(0 if success else 1)
 
 
@@ -18,7 +18,7 @@ from typing import Set, Dict, List
 # Add scripts to path for models import
 sys.path.insert(0, str(Path(__file__).parent))
 
-from models import load_content
+from compiled_topics import compile_topic, list_topic_ids
 
 
 def extract_image_paths(markdown: str) -> Set[str]:
@@ -87,19 +87,19 @@ def find_missing_images(verbose: bool = False) -> Dict[str, List[str]]:
         "unknown": set()
     }
 
-    for topic_dir in topics_dir.glob("*/"):
+    for topic_id in list_topic_ids(topics_dir):
         try:
-            content = load_content(topic_dir.name)
-
-            for block in content.root:
-                if block.content:
-                    paths = extract_image_paths(block.content)
-                    for path in paths:
-                        category, filename = categorize_image_path(path)
-                        all_paths[category].add(filename)
+            # Resolves file and fragments blocks, not just inline content
+            topic = compile_topic(topic_id, topics_dir)
+
+            for block in topic.blocks:
+                paths = extract_image_paths(block.text)
+                for path in paths:
+                    category, filename = categorize_image_path(path)
+                    all_paths[category].add(filename)
         except Exception as e:
             if verbose:
-                print(f"Warning: Could not load {topic_dir.name}: {e}")
+                print(f"Warning: Could not load {topic_id}: {e}")
 
     # Check which images exist
     for category, filenames in all_paths.items():
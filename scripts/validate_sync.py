@@ -4,41 +4,127 @@ Validate sync to training-material.
 
 Checks that:
 - All topics have slides in training-material
-- All referenced images exist
+- All referenced images exist and match our copy (not stale)
 - No .plantuml.txt or .mindmap.yml files copied
 - Front matter matches metadata.yaml
 
+The training-material image directories are indexed once up front and all
+topics are checked against that index in parallel.
+
 Usage:
     uv run python scripts/validate_sync.py
     uv run python scripts/validate_sync.py --topic ecosystem
+    uv run python scripts/validate_sync.py --json > sync-report.json
 """
 
 import argparse
+import json
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 # Add scripts to path for models
 sys.path.insert(0, str(Path(__file__).parent))
+from build_cache import hash_file
 from models import load_metadata
-from sync_images import find_referenced_images
+from sync_images import categorize_image_source, find_referenced_images
 from sync_to_training_material import get_training_material_directory
 
+SOURCE_SUFFIXES = ('.plantuml.txt', '.mindmap.yml')
+
+
+def index_directory(directory: Path) -> dict[str, dict]:
+    """Index regular files in a directory by name.
+
+    Returns dict mapping filename to {'path': Path, 'size': int, 'mtime': int}.
+    Hashes are only computed in check_image() for same-sized files.
+    """
+    index = {}
+    if not directory.is_dir():
+        return index
+
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file():
+                stat = entry.stat()
+                index[entry.name] = {'path': Path(entry.path), 'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+    return index
+
+
+def build_image_index(tm_root: Path) -> dict[str, dict[str, dict]]:
+    """Index training-material image directories once for all topics.
+
+    Returns dict with 'dev' (topics/dev/images) and 'shared' (shared/images)
+    directory indexes, keyed the same way as categorize_image_source().
+    """
+    return {
+        'dev': index_directory(tm_root / "topics/dev/images"),
+        'shared': index_directory(tm_root / "shared/images"),
+    }
+
+
+@lru_cache(maxsize=None)
+def file_hash(path: Path, mtime: int) -> str:
+    """hash_file() memoized by path and mtime, so images several topics use are hashed once."""
+    return hash_file(path)
+
+
+def check_image(img_name: str, image_index: dict, images_dir: Path = Path('images')) -> str:
+    """Check one referenced image against the training-material index.
+
+    Returns:
+        'ok', 'missing' (in neither directory), 'stale' (differs from ours)
+        or 'unverified' (no copy in images_dir to compare against)
+    """
+    expected = 'shared' if categorize_image_source(img_name, images_dir) == 'shared' else 'dev'
+    other = 'dev' if expected == 'shared' else 'shared'
+    entry = image_index[expected].get(img_name) or image_index[other].get(img_name)
+    if entry is None:
+        return 'missing'
+
+    ours = images_dir / img_name
+    if not ours.exists():
+        return 'unverified'
+    stat = ours.stat()
+    if stat.st_size != entry['size']:
+        return 'stale'
+    if file_hash(ours, stat.st_mtime_ns) != file_hash(entry['path'], entry['mtime']):
+        return 'stale'
+    return 'ok'
+
+
+def find_source_files(image_index: dict) -> list[str]:
+    """Return PlantUML/mindmap source files that were copied to training-material."""
+    return sorted(name for name in image_index['dev'] if name.endswith(SOURCE_SUFFIXES))
 
-def validate_topic(topic_id: str, tm_root: Path) -> dict:
+
+def validate_topic(topic_id: str, tm_root: Path, image_index: dict = None) -> dict:
     """
     Validate sync for single topic.
 
+    Args:
+        topic_id: Topic identifier
+        tm_root: Path to training-material repository
+        image_index: Prebuilt build_image_index() result (built if omitted)
+
     Returns dict with:
         - valid: bool
         - errors: list of error messages
         - warnings: list of warning messages
+        - images: {'ok': int, 'missing': list, 'stale': list, 'unverified': list}
     """
     result = {
         'valid': True,
         'errors': [],
-        'warnings': []
+        'warnings': [],
+        'images': {'ok': 0, 'missing': [], 'stale': [], 'unverified': []},
     }
 
+    if image_index is None:
+        image_index = build_image_index(tm_root)
+
     try:
         # Load metadata
         metadata = load_metadata(topic_id)
@@ -50,77 +136,78 @@ def validate_topic(topic_id: str, tm_root: Path) -> dict:
             result['errors'].append(f"Slides not found: {target_slides}")
             result['valid'] = False
 
-        # Check images exist
-        images = find_referenced_images(topic_id)
-        tm_images_dir = tm_root / "topics/dev/images"
-        tm_shared_dir = tm_root / "shared/images"
-
-        for img_name in images:
-            # Check in both possible locations
-            dev_path = tm_images_dir / img_name
-            shared_path = tm_shared_dir / img_name
-
-            if not dev_path.exists() and not shared_path.exists():
+        # Check images exist and are up to date
+        for img_name in sorted(find_referenced_images(topic_id)):
+            status = check_image(img_name, image_index)
+            if status == 'ok':
+                result['images']['ok'] += 1
+            elif status == 'missing':
+                result['images']['missing'].append(img_name)
                 result['errors'].append(f"Image missing: {img_name}")
                 result['valid'] = False
-
-        # Check no source files copied
-        for src_pattern in ['*.plantuml.txt', '*.mindmap.yml']:
-            found = list(tm_images_dir.glob(src_pattern))
-            if found:
-                result['errors'].append(f"Source files found in training-material: {[f.name for f in found]}")
+            elif status == 'unverified':
+                # Not in our images/ (e.g. diagrams not rendered yet) - can't tell if in sync
+                result['images']['unverified'].append(img_name)
+                result['warnings'].append(f"Image not in images/, sync not verified: {img_name}")
+            else:
+                result['images']['stale'].append(img_name)
+                result['errors'].append(f"Image out of date: {img_name}")
                 result['valid'] = False
 
     except Exception as e:
         result['errors'].append(f"Exception: {e}")
         result['valid'] = False
-        import traceback
-        traceback.print_exc()
 
     return result
 
 
-def main():
-    parser = argparse.ArgumentParser(description='Validate sync to training-material')
-    parser.add_argument('--topic', help='Topic ID to validate')
-    parser.add_argument(
-        '--training-material-root',
-        type=Path,
-        default=Path.home() / 'workspace' / 'training-material',
-        help='Path to training-material repository'
-    )
+def validate_all(topics: list[str], tm_root: Path, jobs: int = None) -> dict:
+    """Validate all topics against a single shared image index.
 
-    args = parser.parse_args()
+    Returns dict with:
+        - valid: bool
+        - errors: list of repository-wide error messages
+        - topics: dict mapping topic ID to validate_topic() result
+    """
+    image_index = build_image_index(tm_root)
+    errors = []
 
-    if not args.training_material_root.exists():
-        print(f"❌ Training-material not found: {args.training_material_root}")
-        sys.exit(1)
+    # Source files are a property of the directory, not of any one topic
+    source_files = find_source_files(image_index)
+    if source_files:
+        errors.append(f"Source files found in training-material: {source_files}")
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = executor.map(lambda t: validate_topic(t, tm_root, image_index), topics)
+        topic_results = dict(zip(topics, results))
+
+    return {
+        'valid': not errors and all(r['valid'] for r in topic_results.values()),
+        'errors': errors,
+        'topics': topic_results,
+    }
 
-    # Get list of topics
-    if args.topic:
-        topics = [args.topic]
-    else:
-        topics_dir = Path('topics')
-        topics = sorted([d.name for d in topics_dir.iterdir() if d.is_dir()])
 
-    # Validate each topic
-    all_valid = True
-    total_errors = 0
+def print_report(report: dict) -> None:
+    """Print human-readable validation report."""
+    total_errors = len(report['errors'])
     total_warnings = 0
 
-    for topic in topics:
+    if report['errors']:
+        print(f"\n❌ Errors ({len(report['errors'])}):")
+        for error in report['errors']:
+            print(f"  - {error}")
+
+    for topic, result in report['topics'].items():
         print(f"\n{'='*60}")
         print(f"Topic: {topic}")
         print('='*60)
 
-        result = validate_topic(topic, args.training_material_root)
-
         if result['errors']:
             print(f"\n❌ Errors ({len(result['errors'])}):")
             for error in result['errors']:
                 print(f"  - {error}")
             total_errors += len(result['errors'])
-            all_valid = False
         else:
             print(f"\n✅ Valid")
 
@@ -134,17 +221,53 @@ def main():
     print(f"\n{'='*60}")
     print("SUMMARY")
     print('='*60)
-    print(f"Topics validated: {len(topics)}")
+    print(f"Topics validated: {len(report['topics'])}")
     print(f"Errors: {total_errors}")
     print(f"Warnings: {total_warnings}")
 
-    if all_valid:
+    if report['valid']:
         print("\n✅ All topics valid!")
-        sys.exit(0)
     else:
         print("\n❌ Validation failed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate sync to training-material')
+    parser.add_argument('--topic', help='Topic ID to validate')
+    parser.add_argument(
+        '--training-material-root',
+        type=Path,
+        default=Path.home() / 'workspace' / 'training-material',
+        help='Path to training-material repository'
+    )
+    parser.add_argument('--json', action='store_true', help='Print a JSON report for CI')
+    parser.add_argument('--jobs', '-j', type=int, default=None, help='Number of topics to validate in parallel')
+
+    args = parser.parse_args()
+
+    if not args.training_material_root.exists():
+        if args.json:
+            print(json.dumps({'valid': False, 'errors': [f"Training-material not found: {args.training_material_root}"], 'topics': {}}))
+        else:
+            print(f"❌ Training-material not found: {args.training_material_root}")
         sys.exit(1)
 
+    # Get list of topics
+    if args.topic:
+        topics = [args.topic]
+    else:
+        topics_dir = Path('topics')
+        topics = sorted([d.name for d in topics_dir.iterdir() if d.is_dir()])
+
+    report = validate_all(topics, args.training_material_root, args.jobs)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    sys.exit(0 if report['valid'] else 1)
+
 
 if __name__ == '__main__':
     main()
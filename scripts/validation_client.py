@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Thin client for the validation service, used by the pre-commit hook.
+
+Sends the given files to a running validation_service.py and prints its
+diagnostics as ``path:line:column: severity: message``. Only the standard
+library is imported, so a request takes milliseconds. If no service is
+running, the files are validated in-process instead (with the usual
+start-up cost), so the hook works either way.
+
+Exits with status 1 if there are errors.
+
+Usage:
+    uv run python scripts/validation_client.py topics/tasks/content.yaml
+    uv run python scripts/validation_client.py --all
+    uv run python scripts/validation_client.py --port 8765 --json topics/tasks/metadata.yaml
+"""
+
+import argparse
+import json
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+# Add scripts to path for models
+sys.path.insert(0, str(Path(__file__).parent))
+from build_cache import cache_root
+
+DEFAULT_SOCKET = "validation.sock"
+TIMEOUT = 30
+
+
+def request(method: str, params: Optional[dict] = None, socket_path: Optional[Path] = None,
+            port: Optional[int] = None, timeout: float = TIMEOUT) -> Any:
+    """Send one JSON-RPC request to the service and return its result.
+
+    Raises:
+        ConnectionError: If the service isn't running
+        RuntimeError: If the service returns an error
+    """
+    try:
+        if port is not None:
+            conn = socket.create_connection(("127.0.0.1", port), timeout=timeout)
+        else:
+            conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            conn.settimeout(timeout)
+            conn.connect(str(socket_path or cache_root() / DEFAULT_SOCKET))
+    except (FileNotFoundError, ConnectionRefusedError) as e:
+        raise ConnectionError(f"validation service not running ({e})") from e
+
+    with conn, conn.makefile("rwb") as stream:
+        stream.write(json.dumps({'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params or {}}).encode() + b"\n")
+        stream.flush()
+        line = stream.readline()
+    if not line:
+        raise ConnectionError("validation service closed the connection")
+    response = json.loads(line)
+    if 'error' in response:
+        raise RuntimeError(response['error']['message'])
+    return response['result']
+
+
+def validate_in_process(paths: Optional[list[str]]) -> dict:
+    from validation_service import ValidationService
+
+    return ValidationService().validate(paths)
+
+
+def format_diagnostic(diagnostic: dict) -> str:
+    return f"{diagnostic['path']}:{diagnostic['line']}:{diagnostic['column']}: {diagnostic['severity']}: {diagnostic['message']}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate topic files via the validation service')
+    parser.add_argument('paths', nargs='*', help='Changed files (topics outside topics/ are ignored)')
+    parser.add_argument('--all', action='store_true', help='Validate all topics')
+    parser.add_argument('--socket', type=Path, help=f'Service Unix socket (default: .cache/{DEFAULT_SOCKET})')
+    parser.add_argument('--port', type=int, help='Service localhost TCP port')
+    parser.add_argument('--json', action='store_true', help='Print the JSON result')
+
+    args = parser.parse_args()
+    if not args.paths and not args.all:
+        # Nothing to check (e.g. pre-commit with no matching files)
+        sys.exit(0)
+
+    paths = None if args.all else [str(Path(p).resolve()) for p in args.paths]
+    try:
+        result = request('validate', {'paths': paths} if paths is not None else {}, args.socket, args.port)
+    except ConnectionError:
+        result = validate_in_process(paths)
+
+    diagnostics = result['diagnostics']
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for diagnostic in diagnostics:
+            print(format_diagnostic(diagnostic))
+
+    sys.exit(1 if any(d['severity'] == 'error' for d in diagnostics) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Long-running validation service for editors and the pre-commit hook.
+
+``make validate`` starts Python, imports pydantic and re-validates every
+topic. This service does that once, keeps the validated models and the
+tutorial chain in memory, and on each request re-checks only the files
+whose size or mtime changed (metadata.yaml and content.yaml/fragments are
+tracked separately per topic). Diagnostics carry line/column positions
+(see diagnostics.py).
+
+Protocol: JSON-RPC 2.0, one JSON object per line, over a Unix socket
+(default .cache/validation.sock) or localhost TCP (--port). Methods:
+
+    validate {"paths": [...]}   Diagnostics for the topics of the given
+                                files (all topics if omitted) plus the
+                                tutorial chain
+    ping                        "pong"
+    shutdown                    Stop the service
+
+scripts/validation_client.py is the thin client used by pre-commit.
+
+Usage:
+    uv run python scripts/validation_service.py
+    uv run python scripts/validation_service.py --port 8765
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+# Add scripts to path for models
+sys.path.insert(0, str(Path(__file__).parent))
+from build_cache import cache_path, fingerprint_files
+from compiled_topics import list_topic_ids, topic_input_files
+from diagnostics import Diagnostic, chain_diagnostics, check_content, check_metadata
+from validate import validate_tutorial_chain
+
+DEFAULT_SOCKET = "validation.sock"
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+
+
+@dataclass
+class TopicState:
+    """Last validation results of a topic's files."""
+    metadata_fingerprint: str = ""
+    content_fingerprint: str = ""
+    metadata: Any = None
+    metadata_root: Any = None
+    metadata_diagnostics: list[Diagnostic] = field(default_factory=list)
+    content_diagnostics: list[Diagnostic] = field(default_factory=list)
+
+
+class ValidationService:
+    """Warm validation state for all topics.
+
+    Args:
+        topics_dir: Topics directory
+    """
+
+    def __init__(self, topics_dir: Path = Path("topics")):
+        self.topics_dir = topics_dir
+        self.topics: dict[str, TopicState] = {}
+        self.lock = threading.Lock()
+
+    def topic_for(self, path: str) -> Optional[str]:
+        """Topic ID a file belongs to (None if it's outside the topics directory)."""
+        try:
+            relative = Path(path).resolve().relative_to(self.topics_dir.resolve())
+        except ValueError:
+            return None
+        return relative.parts[0] if relative.parts else None
+
+    def refresh(self, topic_id: str) -> list[str]:
+        """Re-check a topic's files that changed since the last check.
+
+        Returns:
+            Names of the files that were re-validated
+        """
+        topic_dir = self.topics_dir / topic_id
+        state = self.topics.setdefault(topic_id, TopicState())
+        inputs = topic_input_files(topic_id, self.topics_dir)
+        metadata_files = [f for f in inputs if f.name == "metadata.yaml"]
+        content_files = [f for f in inputs if f.name != "metadata.yaml"]
+
+        revalidated = []
+        fingerprint = fingerprint_files(metadata_files, salt="metadata")
+        if fingerprint != state.metadata_fingerprint:
+            state.metadata, state.metadata_root, state.metadata_diagnostics = check_metadata(topic_dir)
+            state.metadata_fingerprint = fingerprint
+            revalidated.append(str(topic_dir / "metadata.yaml"))
+
+        fingerprint = fingerprint_files(content_files, salt="content")
+        if fingerprint != state.content_fingerprint:
+            _, state.content_diagnostics = check_content(topic_dir)
+            state.content_fingerprint = fingerprint
+            revalidated.append(str(topic_dir / "content.yaml"))
+        return revalidated
+
+    def validate(self, paths: Optional[list[str]] = None) -> dict:
+        """Validate topics, re-checking only changed files.
+
+        Args:
+            paths: Files whose topics to report (default: all topics)
+
+        Returns dict with:
+            - diagnostics: Diagnostic dicts for the requested topics and the chain
+            - revalidated: Files that were re-checked for this request
+            - elapsed_ms: Time taken
+        """
+        start = time.perf_counter()
+        with self.lock:
+            topic_ids = list_topic_ids(self.topics_dir)
+            for removed in set(self.topics) - set(topic_ids):
+                del self.topics[removed]
+
+            # Stat checks are cheap; only changed files are parsed again
+            revalidated = []
+            for topic_id in topic_ids:
+                revalidated += self.refresh(topic_id)
+
+            if paths is None:
+                requested = set(topic_ids)
+            else:
+                requested = {self.topic_for(p) for p in paths} & set(topic_ids)
+
+            diagnostics = []
+            for topic_id in sorted(requested):
+                state = self.topics[topic_id]
+                diagnostics += state.metadata_diagnostics + state.content_diagnostics
+            diagnostics += self.chain()
+
+        return {
+            'diagnostics': [d.to_dict() for d in diagnostics],
+            'revalidated': revalidated,
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 2),
+        }
+
+    def chain(self) -> list[Diagnostic]:
+        """Tutorial chain diagnostics across all topics with valid metadata."""
+        valid = {t: s for t, s in self.topics.items() if s.metadata is not None}
+        messages = validate_tutorial_chain({t: s.metadata for t, s in valid.items()})
+        roots = {t: (self.topics_dir / t / "metadata.yaml", s.metadata_root) for t, s in valid.items()}
+        return chain_diagnostics(messages, roots)
+
+    def handle(self, request: Any) -> Optional[dict]:
+        """Answer one JSON-RPC request (None for notifications)."""
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return rpc_error(None, INVALID_REQUEST, "Invalid request")
+        request_id = request.get('id')
+        params = request.get('params') or {}
+
+        if request['method'] == 'ping':
+            result = "pong"
+        elif request['method'] == 'validate':
+            paths = params.get('paths') if isinstance(params, dict) else None
+            if paths is not None and not (isinstance(paths, list) and all(isinstance(p, str) for p in paths)):
+                return rpc_error(request_id, INVALID_PARAMS, "paths must be a list of strings")
+            result = self.validate(paths)
+        elif request['method'] == 'shutdown':
+            result = None
+        else:
+            return rpc_error(request_id, METHOD_NOT_FOUND, f"Unknown method: {request['method']}")
+
+        if 'id' not in request:
+            return None
+        return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+
+def rpc_error(request_id: Any, code: int, message: str) -> dict:
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    service: ValidationService
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError:
+                response = rpc_error(None, PARSE_ERROR, "Parse error")
+            else:
+                response = self.service.handle(request)
+            if response is not None:
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+                self.wfile.flush()
+            if isinstance(request, dict) and request.get('method') == 'shutdown':
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def make_server(service: ValidationService, socket_path: Optional[Path] = None, port: Optional[int] = None):
+    """Create a Unix socket server (default) or a localhost TCP server if port is given."""
+    handler = type("ValidationRequestHandler", (RequestHandler,), {"service": service})
+    if port is not None:
+        return TCPServer(("127.0.0.1", port), handler)
+
+    socket_path = socket_path or cache_path(DEFAULT_SOCKET)
+    if socket_path.exists():
+        # Remove a stale socket left by a service that didn't shut down cleanly
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(socket_path))
+            except OSError:
+                socket_path.unlink()
+            else:
+                raise RuntimeError(f"Validation service already running on {socket_path}")
+    return UnixServer(str(socket_path), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the persistent topic validation service')
+    parser.add_argument('--socket', type=Path, help=f'Unix socket path (default: .cache/{DEFAULT_SOCKET})')
+    parser.add_argument('--port', type=int, help='Listen on localhost TCP instead of a Unix socket')
+
+    args = parser.parse_args()
+
+    service = ValidationService()
+    result = service.validate()
+    errors = sum(d['severity'] == 'error' for d in result['diagnostics'])
+    print(f"✓ Validated {len(service.topics)} topics in {result['elapsed_ms']:.0f} ms ({errors} error(s))")
+
+    try:
+        server = make_server(service, args.socket, args.port)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    address = f"127.0.0.1:{args.port}" if args.port is not None else server.server_address
+    print(f"✓ Listening on {address} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print()
+    finally:
+        server.server_close()
+        if args.port is None and os.path.exists(server.server_address):
+            os.unlink(server.server_address)
+
+
+if __name__ == '__main__':
+    main()
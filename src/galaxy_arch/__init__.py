@@ -0,0 +1,29 @@
+"""
+Installed ``galaxy-arch`` entry point.
+
+The scripts/ modules import each other by plain name (models, cli,
+build_cache, ...), so they are not installed into site-packages where those
+names could collide with other packages. Only this package is; it runs
+scripts/cli.py of the checkout in the current directory, as the scripts
+resolve topics/, images/ and outputs/ relative to the repository root.
+"""
+
+import sys
+from pathlib import Path
+
+
+def is_checkout(path: Path) -> bool:
+    return (path / "topics").is_dir() and (path / "scripts" / "cli.py").is_file()
+
+
+def main() -> int:
+    root = Path.cwd()
+    if not is_checkout(root):
+        print(f"galaxy-arch: {root} is not a galaxy-architecture checkout (no topics/ and scripts/cli.py)",
+              file=sys.stderr)
+        print("Run it from the repository root.", file=sys.stderr)
+        return 2
+    sys.path.insert(0, str(root / "scripts"))
+    from cli import main as cli_main
+
+    return cli_main()
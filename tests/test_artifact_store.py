@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed artifact store.
+
+Tests:
+- Storing and restoring outputs, with blobs shared between keys
+- Corrupt or missing blobs are misses
+- LRU eviction by blob size and merging with concurrent writers
+- Tarball export/import
+- Builders restoring diagrams and slides without rendering
+"""
+
+from pathlib import Path
+import shutil
+import sys
+import tarfile
+import time
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from artifact_store import ArtifactStore, input_key, parse_size
+from build_cache import hash_file
+from build_metrics import BuildMetrics
+from compiled_topics import load_builder
+from render_diagrams import plantuml_inputs, render_diagrams
+
+
+class TestStore:
+    """Test storing and looking up outputs."""
+
+    def test_round_trip_and_shared_blobs(self, tmp_path):
+        store = ArtifactStore(tmp_path / "store")
+        store.put("a", {'svg': b"<svg/>", 'md': b"# A"})
+        store.put("b", {'svg': b"<svg/>"})
+        store.save()
+
+        reloaded = ArtifactStore(tmp_path / "store")
+        assert reloaded.get("a") == {'svg': b"<svg/>", 'md': b"# A"}
+        assert reloaded.get("missing") is None
+        assert (reloaded.hits, reloaded.misses) == (1, 1)
+        assert len(list((tmp_path / "store" / "objects").glob("*/*"))) == 2
+
+    def test_corrupt_blob_is_miss(self, tmp_path):
+        store = ArtifactStore(tmp_path / "store")
+        store.put("a", {'svg': b"<svg/>"})
+        store.blob_path(store.entries["a"]['outputs']['svg']).write_bytes(b"broken")
+        assert store.get("a") is None
+        assert "a" not in store.entries
+
+    def test_restore_files(self, tmp_path):
+        store = ArtifactStore(tmp_path / "store")
+        source = tmp_path / "out.svg"
+        source.write_text("<svg/>")
+        store.store("k", {'svg': source})
+
+        target = tmp_path / "restored" / "out.svg"
+        assert store.restore("k", {'svg': target})
+        assert target.read_text() == "<svg/>"
+        assert not store.restore("other", {'svg': target})
+
+    def test_input_key(self, tmp_path):
+        source = tmp_path / "a.txt"
+        source.write_text("one")
+        key = input_key("stage", [Path("a.txt")], base=tmp_path)
+        assert key == input_key("stage", [Path("a.txt")], base=tmp_path)
+        assert key != input_key("other", [Path("a.txt")], base=tmp_path)
+        source.write_text("two")
+        assert key != input_key("stage", [Path("a.txt")], base=tmp_path)
+
+    def test_parse_size(self):
+        assert parse_size("500M") == 500 << 20
+        assert parse_size("2g") == 2 << 30
+        assert parse_size("1024") == 1024
+        with pytest.raises(ValueError):
+            parse_size("lots")
+
+
+class TestEviction:
+    """Test LRU eviction and index merging."""
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        store = ArtifactStore(tmp_path / "store", max_size=250)
+        for key in ("old", "shared", "new"):
+            store.put(key, {'out': key.encode() * 40})
+            time.sleep(0.01)
+        store.get("old")
+        store.save()
+
+        assert set(store.entries) == {"old", "new"}
+        assert store.size() <= 250
+        assert len(list((tmp_path / "store" / "objects").glob("*/*"))) == 2
+
+    def test_save_merges_concurrent_writers(self, tmp_path):
+        first = ArtifactStore(tmp_path / "store")
+        second = ArtifactStore(tmp_path / "store")
+        first.put("a", {'out': b"a"})
+        second.put("b", {'out': b"b"})
+        first.save()
+        second.save()
+        assert set(ArtifactStore(tmp_path / "store").entries) == {"a", "b"}
+
+
+class TestTarball:
+    """Test export and import."""
+
+    def test_export_import(self, tmp_path):
+        store = ArtifactStore(tmp_path / "store")
+        store.put("a", {'out': b"contents"})
+        assert store.export(tmp_path / "artifacts.tar.gz") == 1
+
+        restored = ArtifactStore(tmp_path / "other")
+        assert restored.import_tarball(tmp_path / "artifacts.tar.gz") == 1
+        assert ArtifactStore(tmp_path / "other").get("a") == {'out': b"contents"}
+
+    def test_import_rejects_bad_blobs(self, tmp_path):
+        store = ArtifactStore(tmp_path / "store")
+        store.put("a", {'out': b"contents"})
+        store.export(tmp_path / "good.tar.gz")
+
+        # Replace the blob with different contents under the same name
+        with tarfile.open(tmp_path / "good.tar.gz") as tar:
+            tar.extractall(tmp_path / "extracted", filter="data")
+        blob = next((tmp_path / "extracted" / "objects").glob("*/*"))
+        blob.write_bytes(b"tampered")
+        with tarfile.open(tmp_path / "bad.tar.gz", "w:gz") as tar:
+            tar.add(tmp_path / "extracted", arcname=".")
+
+        other = ArtifactStore(tmp_path / "other")
+        assert other.import_tarball(tmp_path / "bad.tar.gz") == 0
+        assert other.get("a") is None
+
+
+class TestBuilders:
+    """Test builders consulting the store."""
+
+    def test_plantuml_inputs_follow_includes(self, tmp_path):
+        (tmp_path / "a.plantuml.txt").write_text("@startuml\n!include style.txt\n@enduml\n")
+        (tmp_path / "style.txt").write_text("!include colors.txt\n")
+        (tmp_path / "plantuml_options.txt").write_text("")
+        inputs = plantuml_inputs(tmp_path / "a.plantuml.txt", tmp_path)
+        assert inputs == [Path("a.plantuml.txt"), Path("plantuml_options.txt"), Path("style.txt"), Path("colors.txt")]
+
+    def test_diagrams_restored_without_renderer(self, tmp_path):
+        images = tmp_path / "images"
+        images.mkdir()
+        (images / "a.plantuml.txt").write_text("@startuml\nA -> B\n@enduml\n")
+        (images / "plantuml_options.txt").write_text("")
+        jar = images / "plantuml.jar"
+        jar.write_bytes(b"jar")
+
+        store = ArtifactStore(tmp_path / "store")
+        key = input_key("plantuml", plantuml_inputs(images / "a.plantuml.txt", images), [hash_file(jar)], base=images)
+        store.put(key, {'svg': b"<svg>a</svg>"})
+
+        # No java is run: every diagram is in the store
+        result = render_diagrams(images, jar, store, BuildMetrics("diagrams", tmp_path / "m.sqlite"))
+        assert result['restored'] == ["a.plantuml.svg"] and result['rendered'] == []
+        assert (images / "a.plantuml.svg").read_bytes() == b"<svg>a</svg>"
+
+    def test_slides_restored(self, tmp_path, monkeypatch):
+        shutil.copytree("topics", tmp_path / "topics")
+        shutil.copytree("images", tmp_path / "images")
+        shutil.copytree("outputs/training-slides", tmp_path / "outputs/training-slides",
+                        ignore=shutil.ignore_patterns("generated"))
+        shutil.copytree("scripts", tmp_path / "scripts")
+        monkeypatch.chdir(tmp_path)
+        builder = load_builder("training-slides")
+        store = ArtifactStore(tmp_path / "store")
+
+        md_file, html_file = builder.generate_slides("tasks", BuildMetrics("slides", tmp_path / "m.sqlite"), store)
+        rendered = html_file.read_text()
+        html_file.unlink()
+
+        monkeypatch.setattr(builder, "render_slides", lambda *args: pytest.fail("rendered again"))
+        builder.generate_slides("tasks", BuildMetrics("slides", tmp_path / "m.sqlite"), store)
+        assert html_file.read_text() == rendered
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
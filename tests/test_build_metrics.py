@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the build metrics history.
+
+Tests:
+- Recording stage durations, file sizes and cache hits per run
+- Per-stage series summed over topics, and cache hit rates
+- Regression detection against the rolling median baseline
+"""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from build_metrics import BuildMetrics, cache_hit_rates, connect, find_regressions, stage_series
+
+
+def record(db: Path, builder: str, durations: dict[str, float]) -> int:
+    metrics = BuildMetrics(builder, db)
+    for stage, duration in durations.items():
+        metrics.add(stage, "duration", duration / 2, topic="a")
+        metrics.add(stage, "duration", duration / 2, topic="b")
+    return metrics.save(args=[])
+
+
+class TestRecording:
+    """Test recording runs."""
+
+    def test_save_run(self, tmp_path):
+        db = tmp_path / "metrics.sqlite"
+        output = tmp_path / "out.md"
+        output.write_text("x" * 100)
+
+        metrics = BuildMetrics("sphinx", db)
+        with metrics.stage("markdown", topic="tasks"):
+            pass
+        metrics.files("write", [output, tmp_path / "missing.md"], topic="tasks")
+        metrics.cache("markdown", hits=3, misses=1)
+        run_id = metrics.save(args=["all"])
+
+        conn = connect(db)
+        values = {(stage, topic, name): value for stage, topic, name, value in
+                  conn.execute("SELECT stage, topic, name, value FROM metrics WHERE run_id = ?", (run_id,))}
+        assert values[("write", "tasks", "files")] == 1
+        assert values[("write", "tasks", "bytes_written")] == 100
+        assert ("markdown", "tasks", "duration") in values
+        assert cache_hit_rates(conn, run_id) == {"markdown": 0.75}
+
+    def test_stage_series_sums_topics(self, tmp_path):
+        db = tmp_path / "metrics.sqlite"
+        first = record(db, "sphinx", {"markdown": 1.0})
+        second = record(db, "sphinx", {"markdown": 2.0, "index": 0.5})
+        record(db, "slides", {"render": 3.0})
+
+        series = stage_series(connect(db), "sphinx")
+        assert series == {"markdown": [(first, 1.0), (second, 2.0)], "index": [(second, 0.5)]}
+
+
+class TestRegressions:
+    """Test regression detection."""
+
+    def test_regression_flagged(self, tmp_path):
+        db = tmp_path / "metrics.sqlite"
+        for duration in (1.0, 1.1, 0.9, 1.0):
+            record(db, "sphinx", {"markdown": duration, "index": 0.2})
+        record(db, "sphinx", {"markdown": 1.6, "index": 0.21})
+
+        regressions = find_regressions(connect(db), threshold=0.25)
+        assert [(r['stage'], r['baseline'], round(r['change'], 2)) for r in regressions] == [("markdown", 1.0, 0.6)]
+
+    def test_needs_baseline_and_ignores_noise(self, tmp_path):
+        db = tmp_path / "metrics.sqlite"
+        record(db, "sphinx", {"markdown": 1.0, "tiny": 0.001})
+        record(db, "sphinx", {"markdown": 5.0, "tiny": 0.001})
+        assert find_regressions(connect(db)) == []
+
+        for _ in range(3):
+            record(db, "sphinx", {"markdown": 1.0, "tiny": 0.001})
+        record(db, "sphinx", {"markdown": 1.1, "tiny": 0.04})
+        assert find_regressions(connect(db)) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline slides bundle.
+
+Tests:
+- Decks reference fingerprinted shared assets instead of remarkjs.com
+- Only referenced images are copied, and only once
+- Stale fingerprinted assets are pruned
+- Rebundling one topic keeps the files the other decks use
+"""
+
+from pathlib import Path
+import re
+import sys
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from bundle_slides import bundle_slides, fingerprint_name
+
+TOPICS = ["dependency-injection", "ecosystem"]
+
+
+@pytest.fixture
+def remark(tmp_path):
+    path = tmp_path / "remark.min.js"
+    path.write_text("var remark = {create: function () {}};")
+    return path
+
+
+@pytest.fixture
+def bundle(tmp_path, remark):
+    output = tmp_path / "bundle"
+    return output, bundle_slides(TOPICS, output, remark)
+
+
+class TestFingerprint:
+    def test_hash_inserted_after_base_name(self):
+        name = fingerprint_name("remark.min.js", b"x")
+        assert name.startswith("remark.") and name.endswith(".min.js")
+        assert fingerprint_name("remark.min.js", b"y") != name
+
+
+class TestBundle:
+    def test_decks_use_shared_assets(self, bundle):
+        output, result = bundle
+        assert len(result["decks"]) == len(TOPICS)
+        for deck in result["decks"]:
+            html = deck.read_text()
+            assert "remarkjs.com" not in html
+            assert "../../../../images/" not in html
+            for asset in result["assets"]:
+                if "/" not in asset:
+                    assert f"../assets/{asset}" in html
+                assert (output / "assets" / asset).is_file()
+
+    def test_only_referenced_images_copied(self, bundle):
+        output, result = bundle
+        referenced = set()
+        for deck in result["decks"]:
+            referenced |= set(re.findall(r"\.\./images/([^)\s\"'<>]+)", deck.read_text()))
+        copied = {path.name for path in (output / "images").iterdir()}
+        assert copied == set(result["images"]["copied"])
+        assert copied <= referenced
+        assert len(copied) < len(list(Path("images").glob("*.png")) + list(Path("images").glob("*.svg")))
+
+    def test_rebuild_is_incremental_and_prunes(self, tmp_path, bundle, remark):
+        output, first = bundle
+        remark.write_text("var remark = {create: function () { return 2; }};")
+        second = bundle_slides(TOPICS, output, remark)
+        assert second["images"]["copied"] == []
+        assert second["images"]["unchanged"] == first["images"]["copied"]
+        old = [a for a in first["assets"] if a.startswith("remark.")][0]
+        assert output / "assets" / old in second["pruned"]
+        assert not (output / "assets" / old).exists()
+
+    def test_single_topic_rebuild_keeps_other_decks_files(self, bundle, remark):
+        output, first = bundle
+        files = {path for path in output.rglob("*") if path.is_file()}
+        second = bundle_slides(TOPICS[:1], output, remark)
+        assert second["pruned"] == []
+        assert {path for path in output.rglob("*") if path.is_file()} == files
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tests for the external link checker.
+
+Runs the checker against a local stand-in HTTP server.
+
+Tests:
+- URL extraction from markdown
+- HEAD-then-GET fallback, redirects and broken links
+- Connection reuse and incremental caching
+- Timeouts not counting time queued behind other requests to a host
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from check_links import check_links, extract_urls_from_markdown, pull_request_url
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Minimal server with a few canned behaviors."""
+    protocol_version = "HTTP/1.1"
+    requests: list = []
+    connections: set = set()
+
+    def _respond(self, status: int, headers: dict = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_HEAD(self):
+        StandInHandler.requests.append(("HEAD", self.path))
+        StandInHandler.connections.add(self.client_address)
+        if self.path == "/no-head":
+            self._respond(405)
+        elif self.path == "/redirect":
+            self._respond(301, {"Location": "/ok"})
+        elif self.path.startswith("/slow"):
+            time.sleep(0.4)
+            self._respond(200)
+        elif self.path.startswith("/ok"):
+            self._respond(200)
+        else:
+            self._respond(404)
+
+    def do_GET(self):
+        StandInHandler.requests.append(("GET", self.path))
+        StandInHandler.connections.add(self.client_address)
+        if self.path in ("/no-head",) or self.path.startswith("/ok"):
+            self._respond(200)
+        else:
+            self._respond(404)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    StandInHandler.requests = []
+    StandInHandler.connections = set()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestExtractUrls:
+    """Test URL extraction from markdown."""
+
+    def test_bare_and_markdown_links(self):
+        markdown = "See https://galaxyproject.org/community/. and [docs](https://docs.galaxyproject.org/en/latest/)"
+        assert extract_urls_from_markdown(markdown) == {
+            "https://galaxyproject.org/community/",
+            "https://docs.galaxyproject.org/en/latest/",
+        }
+
+    def test_code_and_local_urls_skipped(self):
+        markdown = (
+            "Run `curl https://example.net/api`\n\n"
+            "```bash\ncurl https://github.com/galaxyproject/galaxy\n```\n\n"
+            "Open http://localhost:8080 or https://{{ host }}/x"
+        )
+        assert extract_urls_from_markdown(markdown) == set()
+
+    def test_pull_request_url(self):
+        assert pull_request_url("12345") == "https://github.com/galaxyproject/galaxy/pull/12345"
+        assert pull_request_url("https://github.com/galaxyproject/galaxy/pull/1") == \
+            "https://github.com/galaxyproject/galaxy/pull/1"
+        assert pull_request_url("not a pr") is None
+
+
+class TestCheckLinks:
+    """Test checking URLs against the stand-in server."""
+
+    def test_statuses(self, server, tmp_path):
+        urls = {
+            f"{server}/ok": ["topic:a"],
+            f"{server}/no-head": ["topic:b"],
+            f"{server}/redirect": ["topic:c"],
+            f"{server}/missing": ["topic:d"],
+        }
+        report = check_links(urls, tmp_path / "links.json")
+        results = report["results"]
+
+        assert results[f"{server}/ok"]["ok"]
+        assert results[f"{server}/no-head"]["ok"]
+        assert ("GET", "/no-head") in StandInHandler.requests
+        assert results[f"{server}/redirect"]["ok"]
+        assert results[f"{server}/redirect"]["final_url"] == f"{server}/ok"
+        assert not results[f"{server}/missing"]["ok"]
+        assert results[f"{server}/missing"]["status"] == 404
+        assert results[f"{server}/missing"]["locations"] == ["topic:d"]
+
+    def test_connections_reused_per_host(self, server, tmp_path):
+        urls = {f"{server}/ok/{i}": ["topic:a"] for i in range(10)}
+        check_links(urls, tmp_path / "links.json", per_host=2)
+        assert len(StandInHandler.requests) == 10
+        assert len(StandInHandler.connections) <= 2
+
+    def test_queued_requests_dont_time_out(self, server, tmp_path):
+        # One connection, four 0.4 s requests: the last waits ~1.2 s for its turn
+        urls = {f"{server}/slow/{i}": ["topic:a"] for i in range(4)}
+        report = check_links(urls, tmp_path / "links.json", per_host=1, timeout=1)
+        assert all(result["ok"] for result in report["results"].values())
+
+    def test_incremental_cache(self, server, tmp_path):
+        cache_file = tmp_path / "links.json"
+        check_links({f"{server}/ok": ["topic:a"]}, cache_file)
+        StandInHandler.requests = []
+
+        report = check_links({f"{server}/ok": ["topic:a"], f"{server}/ok/new": ["topic:b"]}, cache_file)
+        assert report["checked"] == 1
+        assert StandInHandler.requests == [("HEAD", "/ok/new")]
+        assert report["results"][f"{server}/ok"]["cached"]
+
+    def test_failures_expire_sooner(self, server, tmp_path):
+        cache_file = tmp_path / "links.json"
+        check_links({f"{server}/missing": ["topic:a"]}, cache_file)
+        report = check_links({f"{server}/missing": ["topic:a"]}, cache_file, failure_ttl=0)
+        assert report["checked"] == 1
+
+    def test_unreachable_host(self, tmp_path):
+        report = check_links({"http://127.0.0.1:9/": ["topic:a"]}, tmp_path / "links.json", timeout=2)
+        result = report["results"]["http://127.0.0.1:9/"]
+        assert not result["ok"]
+        assert result["error"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
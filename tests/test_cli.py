@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for the galaxy-arch command line entry point.
+
+Tests:
+- Command dispatch and exit codes
+- The installed launcher refusing to run outside a checkout
+- Import-time budget: --help and trivial commands stay fast and never
+  import heavy dependencies
+"""
+
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from cli import COMMANDS, ROOT, main
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import galaxy_arch
+
+CLI = Path(__file__).parent.parent / "scripts" / "cli.py"
+HEAVY_MODULES = {"pydantic", "yaml", "jinja2", "numpy", "scipy"}
+# Cumulative import time of top-level imports, well above what's measured
+# locally (~30 ms for --help) to leave room for slow CI machines
+IMPORT_BUDGET_MS = {"--help": 100, "topics": 150}
+
+
+def import_times(*args: str) -> dict[str, int]:
+    """Run the CLI under -X importtime; return top-level module -> cumulative µs."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", str(CLI), *args],
+        capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestDispatch:
+    def test_every_command_script_exists(self):
+        for script, _ in COMMANDS.values():
+            assert (ROOT / script).is_file(), script
+
+    def test_help(self, capsys):
+        assert main(["--help"]) == 0
+        out = capsys.readouterr().out
+        for name in COMMANDS:
+            assert name in out
+
+    def test_unknown_command(self, capsys):
+        assert main(["no-such-command"]) == 2
+        assert "unknown command" in capsys.readouterr().err
+
+    def test_topics(self, capsys):
+        assert main(["topics"]) == 0
+        assert "dependency-injection" in capsys.readouterr().out.split()
+
+    def test_exit_code_propagates(self, monkeypatch, capsys):
+        monkeypatch.setattr(sys, "argv", list(sys.argv))
+        # build-slides without a topic prints usage and exits 1
+        assert main(["build-slides"]) == 1
+        assert "Usage" in capsys.readouterr().out
+
+
+class TestLauncher:
+    def test_outside_checkout(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.chdir(tmp_path)
+        assert galaxy_arch.main() == 2
+        assert "not a galaxy-architecture checkout" in capsys.readouterr().err
+
+    def test_in_checkout(self, monkeypatch, capsys):
+        monkeypatch.chdir(ROOT)
+        monkeypatch.setattr(sys, "argv", ["galaxy-arch", "topics"])
+        assert galaxy_arch.main() == 0
+        assert "dependency-injection" in capsys.readouterr().out.split()
+
+
+class TestImportTime:
+    @pytest.mark.parametrize("args", [("--help",), ("topics",)])
+    def test_no_heavy_imports(self, args):
+        assert not HEAVY_MODULES & set(import_times(*args))
+
+    @pytest.mark.parametrize("args", [("--help",), ("topics",)])
+    def test_import_budget(self, args):
+        total_ms = sum(import_times(*args).values()) / 1000
+        assert total_ms < IMPORT_BUDGET_MS[args[0]], f"{total_ms:.1f} ms"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
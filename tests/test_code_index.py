@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the code path reverse index.
+
+Tests:
+- Path normalization
+- Trie insertion, prefix lookup and ancestor lookup
+- Mindmap tree flattening
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from code_index import (
+    iter_mindmap_paths,
+    new_node,
+    normalize_path,
+    query_index,
+    trie_insert,
+)
+
+
+@pytest.fixture
+def trie():
+    root = new_node()
+    trie_insert(root, "lib/galaxy/managers", {"topic": "dependency-injection", "source": "metadata"})
+    trie_insert(root, "lib/galaxy/managers/hdas.py", {"topic": "application-components", "source": "mindmap"})
+    trie_insert(root, "lib/galaxy/files/plugins.py", {"topic": "file-sources", "source": "metadata"})
+    return root
+
+
+class TestNormalizePath:
+    def test_strips_slashes_anchors_and_symbols(self):
+        assert normalize_path("/lib/galaxy/managers/") == "lib/galaxy/managers"
+        assert normalize_path("./lib/galaxy/app.py#L10") == "lib/galaxy/app.py"
+        assert normalize_path("lib/galaxy/app.py::UniverseApplication") == "lib/galaxy/app.py"
+
+
+class TestQuery:
+    def test_prefix_lookup(self, trie):
+        result = query_index(trie, "lib/galaxy/managers/", include_ancestors=False)
+        assert [(r["path"], r["topic"]) for r in result["matches"]] == [
+            ("lib/galaxy/managers", "dependency-injection"),
+            ("lib/galaxy/managers/hdas.py", "application-components"),
+        ]
+
+    def test_ancestors(self, trie):
+        result = query_index(trie, "lib/galaxy/managers/hdas.py")
+        assert [r["topic"] for r in result["matches"]] == ["application-components"]
+        assert [r["topic"] for r in result["ancestors"]] == ["dependency-injection"]
+
+    def test_unknown_path(self, trie):
+        assert query_index(trie, "client/src") == {"matches": [], "ancestors": []}
+
+    def test_duplicate_refs_collapsed(self, trie):
+        trie_insert(trie, "lib/galaxy/files/plugins.py", {"topic": "file-sources", "source": "metadata"})
+        assert len(query_index(trie, "lib/galaxy/files")["matches"]) == 1
+
+
+class TestMindmapPaths:
+    def test_nested_items(self):
+        mindmap = {
+            "label": "/lib/galaxy/managers",
+            "doc": "Managers",
+            "items": [{"label": "users.py", "doc": "User managers"}, "hdas.py", {"label": "_base/"}],
+        }
+        assert list(iter_mindmap_paths(mindmap)) == [
+            ("lib/galaxy/managers", "Managers"),
+            ("lib/galaxy/managers/users.py", "User managers"),
+            ("lib/galaxy/managers/hdas.py", None),
+            ("lib/galaxy/managers/base", None),
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
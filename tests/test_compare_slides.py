@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Unit tests for slide-level deck comparison.
+
+Tests:
+- Slide splitting
+- Hash-based slide alignment
+- Added/removed/moved/modified classification
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from compare_slides import align_slides, count_slides, diff_slides, split_slides
+
+
+class TestSplitSlides:
+    """Test splitting Remark markdown into slides."""
+
+    def test_split_on_separators(self):
+        markdown = "# One\n\n---\n\n### Two\n\ntext\n\n---\n\n### Three"
+        assert split_slides(markdown) == ["# One", "### Two\n\ntext", "### Three"]
+
+    def test_separator_inside_code_block_ignored(self):
+        markdown = "### YAML\n\n```yaml\n---\nkey: value\n```\n\n---\n\n### Next"
+        slides = split_slides(markdown)
+        assert len(slides) == 2
+        assert "key: value" in slides[0]
+
+    def test_count_empty(self):
+        assert count_slides("") == 0
+        assert count_slides("\n---\n\n---\n") == 0
+
+
+class TestAlignSlides:
+    """Test patience/histogram alignment of slide hashes."""
+
+    def test_identical(self):
+        seq = ["a", "b", "c"]
+        assert align_slides(seq, seq) == [(0, 0), (1, 1), (2, 2)]
+
+    def test_insertion(self):
+        assert align_slides(["a", "b", "c"], ["a", "x", "b", "c"]) == [(0, 0), (1, 2), (2, 3)]
+
+    def test_duplicates_use_histogram_fallback(self):
+        matches = align_slides(["x", "a", "x", "a"], ["a", "x", "a"])
+        assert len(matches) == 3
+        assert all(a < a2 and b < b2 for (a, b), (a2, b2) in zip(matches, matches[1:]))
+
+
+class TestDiffSlides:
+    """Test slide-level change classification."""
+
+    def test_no_changes(self):
+        slides = ["### One\n\nfoo", "### Two\n\nbar"]
+        report = diff_slides(slides, list(slides))
+        assert report["unchanged"] == 2
+        assert not report["added"] and not report["removed"]
+        assert not report["moved"] and not report["modified"]
+
+    def test_whitespace_only_changes_ignored(self):
+        report = diff_slides(["### One\n\n\n\nfoo  "], ["### One\n\nfoo"])
+        assert report["unchanged"] == 1
+
+    def test_added_and_removed(self):
+        theirs = ["### A", "### Old"]
+        ours = ["### A"]
+        report = diff_slides(theirs, ours)
+        assert report["removed"] == [{"slide": 2, "title": "Old"}]
+
+        report = diff_slides(ours, theirs)
+        assert report["added"] == [{"slide": 2, "title": "Old"}]
+
+    def test_moved(self):
+        theirs = ["### A", "### B", "### C", "### D"]
+        ours = ["### B", "### C", "### D", "### A"]
+        report = diff_slides(theirs, ours)
+        assert report["moved"] == [{"from": 1, "to": 4, "title": "A"}]
+        assert report["unchanged"] == 3
+        assert not report["modified"]
+
+    def test_modified_pair_gets_line_diff(self):
+        theirs = ["### A", "### B\n\nold text", "### C"]
+        ours = ["### A", "### B\n\nnew text", "### C"]
+        report = diff_slides(theirs, ours, include_diff=True)
+        assert len(report["modified"]) == 1
+        modified = report["modified"][0]
+        assert (modified["from"], modified["to"]) == (2, 2)
+        assert modified["lines_added"] == 1
+        assert modified["lines_removed"] == 1
+        assert "+new text" in modified["diff"]
+
+    def test_diff_omitted_by_default(self):
+        report = diff_slides(["### B\n\nold"], ["### B\n\nnew"])
+        assert "diff" not in report["modified"][0]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for near-duplicate content detection.
+
+Tests:
+- Shingling and MinHash estimates of Jaccard similarity
+- LSH band selection
+- Duplicate pairs found across topics, with cached signatures
+"""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from compiled_topics import CompiledBlock
+from dedupe_report import choose_bands, find_duplicates, minhash, permutations, shingles
+from models import ContentBlockType
+
+BASE = " ".join(f"word{i}" for i in range(60))
+
+
+def block(topic_id, block_id, text):
+    return CompiledBlock(topic_id=topic_id, block_id=block_id, type=ContentBlockType.SLIDE, position=0, text=text)
+
+
+class TestMinHash:
+    def test_shingles(self):
+        assert len(shingles("a b c d e f")) == 2
+        assert shingles("A, b. C d E") == shingles("a b c d e")
+        assert len(shingles("short text")) == 1
+
+    def test_signature_estimates_jaccard(self):
+        a, b = permutations()
+        s1 = shingles(BASE)
+        s2 = shingles(BASE.replace("word30", "changed"))
+        exact = len(s1 & s2) / len(s1 | s2)
+        estimate = (minhash(s1, a, b) == minhash(s2, a, b)).mean()
+        assert abs(estimate - exact) < 0.15
+
+    @pytest.mark.parametrize("threshold", [0.3, 0.5, 0.7, 0.9])
+    def test_band_threshold_at_or_below_requested(self, threshold):
+        bands, rows = choose_bands(threshold)
+        assert bands * rows == 128
+        assert (1 / bands) ** (1 / rows) <= threshold
+
+
+class TestFindDuplicates:
+    @pytest.fixture
+    def blocks(self):
+        return [
+            block("startup", "intro", BASE),
+            block("frameworks", "intro-copy", BASE.replace("word59", "extra")),
+            block("frameworks", "unrelated", " ".join(f"other{i}" for i in range(60))),
+            block("frameworks", "tiny", "too short"),
+        ]
+
+    def test_reports_near_duplicates(self, tmp_path, blocks):
+        result = find_duplicates(blocks, threshold=0.7, cache_file=tmp_path / "minhash.npz")
+        assert [(p["a"], p["b"]) for p in result["pairs"]] == [("startup:intro", "frameworks:intro-copy")]
+        assert result["pairs"][0]["similarity"] > 0.9
+        assert result["blocks"] == 3
+
+    def test_cross_topic_filter(self, tmp_path, blocks):
+        blocks.append(block("frameworks", "unrelated-copy", blocks[2].text))
+        result = find_duplicates(blocks, threshold=0.7, cross_topic=True, cache_file=tmp_path / "minhash.npz")
+        assert all(p["a"].split(":")[0] != p["b"].split(":")[0] for p in result["pairs"])
+
+    def test_signatures_cached_by_block_hash(self, tmp_path, blocks):
+        cache_file = tmp_path / "minhash.npz"
+        assert find_duplicates(blocks, cache_file=cache_file)["hashed"] == 3
+        assert find_duplicates(blocks, cache_file=cache_file)["hashed"] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for the live-reload development server.
+
+Tests:
+- URL routing and on-demand rendering without output or cache files
+- Rendered pages cached by dependency content hash
+- Reload events only for pages whose dependencies changed
+- HTTP endpoints (pages, images, Server-Sent Events)
+"""
+
+import http.client
+import os
+from pathlib import Path
+import shutil
+import sys
+import threading
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from dev_server import DevServer, make_server, route
+
+SLIDES = "/architecture/client/slides.html"
+DOC = "/architecture/tasks.html"
+
+
+@pytest.fixture
+def app(tmp_path):
+    images = tmp_path / "images"
+    shutil.copytree("images", images)
+    return DevServer(images_dir=images)
+
+
+class TestRendering:
+    """Test page rendering and caching."""
+
+    def test_route(self):
+        assert route("/") == ("index", None)
+        assert route("/architecture/client.html") == ("doc", "client")
+        assert route(SLIDES) == ("slides", "client")
+        assert route("/architecture/../etc/passwd") is None
+
+    def test_pages(self, app):
+        index = app.get_page("/").decode()
+        assert 'href="/architecture/client/slides.html"' in index
+
+        slides = app.get_page(SLIDES).decode()
+        assert 'src="/_images/jsload.png"' in slides
+        assert "EventSource" in slides
+
+        doc = app.get_page(DOC).decode()
+        assert "<h1>" in doc or "<pre>" in doc
+
+        assert app.get_page("/architecture/no-such-topic.html") is None
+
+    def test_no_cache_writes(self, tmp_path, monkeypatch):
+        cache = tmp_path / "cache"
+        monkeypatch.setenv("GALAXY_ARCH_CACHE_DIR", str(cache))
+        app = DevServer(images_dir=Path("images"))
+        app.get_page(SLIDES)
+        # Image sizes were measured, but only kept in memory
+        assert app.dimensions.sizes and app.dimensions.dirty
+        assert not any(path.is_file() for path in cache.rglob("*"))
+
+    def test_cached_until_dependency_changes(self, app):
+        first = app.get_page(SLIDES)
+        assert app.get_page(SLIDES) is first
+        assert app.renders == 1
+        assert app.images_dir / "jsload.png" in app.dependencies[SLIDES]
+
+        (app.images_dir / "jsload.png").write_bytes(b"changed")
+        app.get_page(SLIDES)
+        assert app.renders == 2
+
+
+class TestReload:
+    """Test dependency-based reload events."""
+
+    def test_only_affected_pages_reload(self, app):
+        app.get_page(SLIDES)
+        app.get_page(DOC)
+
+        image = app.images_dir / "jsload.png"
+        stat = image.stat()
+        # Touching without a content change doesn't reload
+        os.utime(image, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert app.poll() == []
+
+        image.write_bytes(b"changed")
+        assert app.poll() == [SLIDES]
+        assert app.generations == {SLIDES: 1}
+        assert app.poll() == []
+
+
+class TestHTTP:
+    """Test the HTTP server."""
+
+    @pytest.fixture
+    def server(self, app):
+        server = make_server(app, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+    def request(self, server, path):
+        conn = http.client.HTTPConnection(*server.server_address, timeout=10)
+        conn.request("GET", path)
+        response = conn.getresponse()
+        return response.status, response.read()
+
+    def test_endpoints(self, server):
+        assert self.request(server, SLIDES)[0] == 200
+        status, data = self.request(server, "/_images/jsload.png")
+        assert status == 200 and data.startswith(b"\x89PNG")
+        assert self.request(server, "/assets/css/fonts.css")[0] == 200
+        assert self.request(server, "/_images/../../README.md")[0] == 404
+        assert self.request(server, "/nope")[0] == 404
+
+    def test_server_sent_reload(self, server, app):
+        self.request(server, SLIDES)
+        conn = http.client.HTTPConnection(*server.server_address, timeout=10)
+        conn.request("GET", f"/events?page={SLIDES}")
+        response = conn.getresponse()
+        assert response.getheader("Content-Type") == "text/event-stream"
+
+        (app.images_dir / "jsload.png").write_bytes(b"changed")
+        assert app.poll() == [SLIDES]
+        assert response.fp.readline() == b"data: reload\n"
+        conn.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests for token-budgeted agentic operation generation.
+
+Tests:
+- Token count approximation and caching
+- Greedy and knapsack packing
+- Generated commands respect the budget and include relevant context
+- Topics and related topics that fail to load are reported and fail the run
+"""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from compiled_topics import compile_all_topics
+import generate_agentic_operation
+from generate_agentic_operation import (
+    Candidate,
+    TokenCounter,
+    count_tokens,
+    generate_operation,
+    operation_query,
+    pack_greedy,
+    pack_knapsack,
+)
+from tfidf_index import build_index
+
+
+@pytest.fixture(scope="module")
+def topics():
+    return {topic.topic_id: topic for topic in compile_all_topics()}
+
+
+@pytest.fixture(scope="module")
+def topic(topics):
+    return topics["dependency-injection"]
+
+
+@pytest.fixture(scope="module")
+def scores(topics, topic):
+    index = build_index(list(topics.values()))
+    operation = next(op for op in topic.metadata.agentic_operations if op.name == "refactor-to-di")
+    return index.scores_by_location(index.score([operation_query(operation.name, operation.prompt)])[0])
+
+
+@pytest.fixture
+def counter(tmp_path):
+    return TokenCounter(tmp_path / "token_counts.json")
+
+
+def candidate(tokens, value):
+    return Candidate(block=None, text="", tokens=tokens, value=value)
+
+
+class TestTokenCount:
+    def test_words_and_punctuation(self):
+        assert count_tokens("") == 0
+        assert count_tokens("app.model") == 3
+        assert count_tokens("dependency") > count_tokens("app")
+
+    def test_counts_are_cached_by_key(self, tmp_path, counter):
+        assert counter.count("abc", "one two three") == 3
+        assert counter.count("abc", "ignored because cached") == 3
+        counter.save()
+        assert TokenCounter(tmp_path / "token_counts.json").counts == {"abc": 3}
+
+
+class TestPacking:
+    def test_knapsack_beats_greedy_density(self):
+        # Greedy takes the densest item first and then nothing else fits
+        items = [candidate(16, 2.0), candidate(32, 3.0), candidate(32, 3.0)]
+        assert sum(c.value for c in pack_greedy(items, 64)) == 5.0
+        assert sum(c.value for c in pack_knapsack(items, 64)) == 6.0
+
+    def test_greedy_falls_back_to_best_single_item(self):
+        items = [candidate(1, 1.0), candidate(100, 50.0)]
+        assert pack_greedy(items, 100) == [items[1]]
+
+    def test_nothing_fits(self):
+        items = [candidate(500, 1.0)]
+        assert pack_greedy(items, 100) == []
+        assert pack_knapsack(items, 100) == []
+
+
+class TestGenerateOperation:
+    @pytest.mark.parametrize("budget", [600, 1500, 4000])
+    def test_respects_budget(self, topic, counter, scores, budget):
+        result = generate_operation(topic, "refactor-to-di", budget=budget, counter=counter, scores=scores)
+        assert result["tokens"] <= budget
+        assert result["markdown"].startswith("# ")
+        assert "lib/galaxy/di/" in result["markdown"]
+
+    def test_smaller_budget_drops_blocks(self, topic, counter, scores):
+        small = generate_operation(topic, "refactor-to-di", budget=800, counter=counter, scores=scores)
+        large = generate_operation(topic, "refactor-to-di", budget=4000, counter=counter, scores=scores)
+        assert len(small["blocks"]) < len(large["blocks"])
+        assert small["dropped"]
+
+    def test_most_relevant_block_is_packed(self, topic, counter, scores):
+        result = generate_operation(topic, "refactor-to-di", budget=800, counter=counter, scores=scores)
+        assert "dependency-injection:god_object" in result["blocks"]
+
+    def test_related_topic_blocks(self, topics, topic, counter, scores):
+        result = generate_operation(topic, "refactor-to-di", budget=6000, counter=counter, scores=scores,
+                                    related=[topics["tasks"]])
+        assert "tasks:celery-and-dependency-injection" in result["blocks"]
+        # Related topic context follows the topic's own blocks
+        assert result["blocks"][-1].startswith("tasks:")
+
+    def test_unknown_operation(self, topic, counter, scores):
+        with pytest.raises(KeyError):
+            generate_operation(topic, "no-such-operation", counter=counter, scores=scores)
+
+
+class TestMain:
+    """Test the command line's handling of topics that don't load."""
+
+    @pytest.fixture
+    def run(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("GALAXY_ARCH_CACHE_DIR", str(tmp_path / "cache"))
+        original = generate_agentic_operation.compile_topic
+
+        def run(*args, broken=()):
+            def compile_topic(topic_id):
+                if topic_id in broken:
+                    raise ValueError(f"broken topic {topic_id}")
+                return original(topic_id)
+
+            monkeypatch.setattr(generate_agentic_operation, "compile_topic", compile_topic)
+            monkeypatch.setattr(sys, "argv", ["generate_agentic_operation.py", *args, "--dry-run"])
+            with pytest.raises(SystemExit) as exit_info:
+                generate_agentic_operation.main()
+            return exit_info.value.code
+
+        return run
+
+    def test_invalid_topic_counted(self, run, capsys):
+        assert run("tests", broken={"tests"}) == 1
+        assert "❌ tests: broken topic tests" in capsys.readouterr().out
+
+    def test_invalid_related_topic_counted(self, run, capsys):
+        assert run("tests") == 0
+        assert run("tests", broken={"project-management"}) == 1
+        out = capsys.readouterr().out
+        assert "❌ project-management: broken topic project-management" in out
+        assert "tests/review-vitests" in out
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the image_checks Sphinx extension.
+
+Tests:
+- Extracting local src attributes from raw HTML
+- Resolving page-relative and absolute srcs to output paths
+- Precomputing the set of output files
+- Locating the topic block an image comes from
+- Broken references in pages an incremental build doesn't re-read
+"""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add Sphinx extension directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "doc" / "source" / "_ext"))
+
+from image_checks import BlockLocator, output_files, raw_html_sources, resolve_output_path
+
+
+class TestSources:
+    """Test raw HTML src handling."""
+
+    def test_raw_html_sources(self):
+        html = '<img src="../_images/a.png"> <img SRC=\'b.svg\' /> <img src="https://x/c.png"><img src="data:image/png;base64,AA">'
+        assert raw_html_sources(html) == ["../_images/a.png", "b.svg"]
+
+    def test_resolve_output_path(self):
+        assert resolve_output_path("architecture/tasks", "../_images/a.png") == "_images/a.png"
+        assert resolve_output_path("architecture/tasks", "b.svg?v=1#top") == "architecture/b.svg"
+        assert resolve_output_path("architecture/tasks", "/images/c.png") == "images/c.png"
+
+
+class TestOutputFiles:
+    """Test the precomputed output set."""
+
+    def test_output_files(self, tmp_path):
+        static = tmp_path / "static"
+        (static / "css").mkdir(parents=True)
+        (static / "css" / "site.css").write_text("")
+        copied = tmp_path / "images"
+        copied.mkdir()
+        (copied / "logo.png").write_bytes(b"")
+        outdir = tmp_path / "html"
+        (outdir / "_static").mkdir(parents=True)
+        (outdir / "_static" / "theme.js").write_text("")
+
+        files = output_files(
+            outdir,
+            ["index", "architecture/tasks"],
+            {"_images/a.png": ({"architecture/tasks"}, "a.png")},
+            [static],
+            [],
+            {"images": copied},
+        )
+        assert files == {
+            "index.html", "architecture/tasks.html", "_images/a.png",
+            "_static/css/site.css", "_static/theme.js", "images/logo.png",
+        }
+
+
+class TestIncrementalBuild:
+    """Test that unchanged pages keep failing the build (needs the docs extra)."""
+
+    @staticmethod
+    def build(srcdir: Path, outdir: Path) -> int:
+        from sphinx.application import Sphinx
+
+        app = Sphinx(str(srcdir), str(srcdir), str(outdir), str(outdir / ".doctrees"), "html",
+                     status=None, warning=None, freshenv=False)
+        app.build()
+        return app.statuscode
+
+    def test_broken_image_in_unchanged_page(self, tmp_path):
+        pytest.importorskip("sphinx")
+        srcdir, outdir = tmp_path / "source", tmp_path / "html"
+        srcdir.mkdir()
+        (srcdir / "conf.py").write_text(
+            f"import sys\nsys.path.insert(0, {str(Path(__file__).parent.parent / 'doc' / 'source' / '_ext')!r})\n"
+            f"extensions = ['image_checks']\nimage_checks_topics_dir = {str(tmp_path / 'topics')!r}\n"
+        )
+        (srcdir / "index.rst").write_text("Index\n=====\n\n.. toctree::\n\n   broken\n")
+        (srcdir / "broken.rst").write_text(
+            "Broken\n======\n\n.. raw:: html\n\n   <img src=\"_images/missing.png\">\n"
+        )
+        assert self.build(srcdir, outdir) == 1
+
+        # A stale copy in the output doesn't count, and broken.rst isn't re-read
+        (outdir / "_images").mkdir(exist_ok=True)
+        (outdir / "_images" / "missing.png").write_bytes(b"")
+        (srcdir / "index.rst").write_text("Index\n=====\n\nChanged.\n\n.. toctree::\n\n   broken\n")
+        assert self.build(srcdir, outdir) == 1
+
+
+class TestBlockLocator:
+    """Test mapping image references to topic blocks."""
+
+    def test_locate(self):
+        locator = BlockLocator(Path("topics"))
+        where = locator.locate("architecture/tasks", "../_images/core_backend_celery.plantuml.svg")
+        assert where == "tasks:infrastructure-including-celery"
+        assert locator.locate("architecture/tasks", "../_images/unknown.png") == "tasks"
+        assert locator.locate("architecture/tasks", "x.png", "Key Takeaways") == "tasks metadata.yaml"
+        assert locator.locate("index", "x.png") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests for image dimension detection and the layout hints emitted by builders.
+
+Tests:
+- PNG, GIF, JPEG header parsing and SVG width/height/viewBox sizes
+- Dimension cache keyed by image content
+- Sphinx markdown size attributes and slide <img> tags
+- lazy_images Sphinx extension HTML rewriting
+"""
+
+from pathlib import Path
+import struct
+import sys
+import zlib
+
+import pytest
+
+# Add scripts and Sphinx extension directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "doc" / "source" / "_ext"))
+
+from compiled_topics import load_builder
+from image_dimensions import ImageDimensions, image_size, jpeg_size, svg_size
+from lazy_images import rewrite_images
+
+
+def make_png(width: int, height: int) -> bytes:
+    def chunk(chunk_type, payload):
+        return struct.pack('>I4s', len(payload), chunk_type) + payload + struct.pack('>I', zlib.crc32(chunk_type + payload))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 0, 0, 0, 0)
+    pixels = zlib.compress(b''.join(b'\x00' + b'\x00' * width for _ in range(height)))
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', pixels) + chunk(b'IEND', b'')
+
+
+def make_jpeg(width: int, height: int) -> bytes:
+    app0 = b'\xff\xe0' + struct.pack('>H', 16) + b'JFIF\x00' + b'\x00' * 9
+    sof0 = b'\xff\xc0' + struct.pack('>HBHHB', 11, 8, height, width, 1) + b'\x01\x11\x00'
+    return b'\xff\xd8' + app0 + sof0 + b'\xff\xd9'
+
+
+class TestImageSize:
+    """Test header parsing."""
+
+    def test_png(self, tmp_path):
+        path = tmp_path / "a.png"
+        path.write_bytes(make_png(7, 3))
+        assert image_size(path) == (7, 3)
+
+    def test_gif(self, tmp_path):
+        path = tmp_path / "a.gif"
+        path.write_bytes(b'GIF89a' + struct.pack('<HH', 20, 10) + b'\x00' * 10)
+        assert image_size(path) == (20, 10)
+
+    def test_jpeg_skips_segments_before_frame(self, tmp_path):
+        path = tmp_path / "a.jpg"
+        path.write_bytes(make_jpeg(640, 480))
+        assert image_size(path) == (640, 480)
+        assert jpeg_size(b'\xff\xd8\xff\xd9') is None
+
+    def test_svg_pixel_size(self):
+        assert svg_size(b'<svg width="120px" height="80" viewBox="0 0 12 8"></svg>') == (120, 80)
+
+    def test_svg_falls_back_to_viewbox(self):
+        svg = b'<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg" width="100%" viewBox="0 0 960 540.4">'
+        assert svg_size(svg) == (960, 540)
+
+    def test_unknown_size(self, tmp_path):
+        path = tmp_path / "a.svg"
+        path.write_text('<svg xmlns="http://www.w3.org/2000/svg"></svg>')
+        assert image_size(path) is None
+        assert svg_size(b'not an image') is None
+
+
+class TestImageDimensions:
+    """Test the content-hash keyed cache."""
+
+    def test_cached_by_content(self, tmp_path):
+        image = tmp_path / "a.png"
+        image.write_bytes(make_png(4, 2))
+        cache_file = tmp_path / "dimensions.json"
+
+        dimensions = ImageDimensions(cache_file)
+        assert dimensions.get(image) == (4, 2)
+        assert dimensions.get(tmp_path / "missing.png") is None
+        dimensions.save()
+
+        reloaded = ImageDimensions(cache_file)
+        assert len(reloaded.sizes) == 1
+        assert reloaded.get(image) == (4, 2)
+        assert not reloaded.dirty
+
+        # Edited image is parsed again
+        image.write_bytes(make_png(5, 5))
+        assert reloaded.get(image) == (5, 5)
+        assert reloaded.dirty
+
+
+class TestBuilders:
+    """Test layout hints in generated markdown and HTML."""
+
+    @pytest.fixture
+    def dimensions(self, tmp_path):
+        (tmp_path / "a.png").write_bytes(make_png(640, 480))
+        return ImageDimensions(tmp_path / "dimensions.json")
+
+    def test_sphinx_size_attributes(self, tmp_path, dimensions):
+        add_image_dimensions = load_builder("sphinx-docs").add_image_dimensions
+        markdown = ("![A](../_images/a.png)\n"
+                    "![B](../_images/b.svg)\n"
+                    "![C](../_images/a.png){width=10px}\n")
+        assert add_image_dimensions(markdown, dimensions, tmp_path) == (
+            "![A](../_images/a.png){width=640px height=480px}\n"
+            "![B](../_images/b.svg)\n"
+            "![C](../_images/a.png){width=10px}\n"
+        )
+
+    def test_slide_img_tags(self, tmp_path, dimensions):
+        add_image_hints = load_builder("training-slides").add_image_hints
+        markdown = '.image-50[![A "quoted"](../../../../images/a.png)] ![B](../../../../images/b.svg) ![C](https://x/c.png)'
+        assert add_image_hints(markdown, dimensions, tmp_path) == (
+            '.image-50[<img src="../../../../images/a.png" alt="A &quot;quoted&quot;" width="640" height="480" '
+            'loading="lazy" decoding="async">] '
+            '<img src="../../../../images/b.svg" alt="B" loading="lazy" decoding="async"> '
+            '![C](https://x/c.png)'
+        )
+
+
+class TestLazyImagesExtension:
+    """Test the Sphinx HTML rewriting."""
+
+    def test_rewrites_sizes_and_hints(self):
+        html = ('<img alt="A" src="a.png" style="width: 640px; height: 480px;" />'
+                '<img alt="B" src="b.svg" width="300px" height="200px" />'
+                '<img src="c.png" style="width: 10px; height: 20px; float: left;" loading="eager" />')
+        assert rewrite_images(html) == (
+            '<img alt="A" src="a.png" width="640" height="480" decoding="async" />'
+            '<img alt="B" src="b.svg" width="300" height="200" decoding="async" loading="lazy" />'
+            '<img src="c.png" style="float: left;" loading="eager" width="10" height="20" decoding="async" />'
+        )
+
+    def test_page_without_images(self):
+        assert rewrite_images("<p>No images</p>") == "<p>No images</p>"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
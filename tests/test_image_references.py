@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for the image reference index.
+
+Tests:
+- Image reference extraction (path forms, external URLs)
+- Diagram sources and PlantUML !include resolution
+- Missing, unbuilt, orphaned and duplicate images
+- Repository topics reference no missing images
+"""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from compiled_topics import CompiledBlock, CompiledTopic, compile_all_topics
+from image_references import build_reference_index, diagram_source, extract_image_names
+from models import ContentBlockType
+from sync_images import find_referenced_images
+
+
+def make_topic(topic_id: str, *texts: str) -> CompiledTopic:
+    blocks = [
+        CompiledBlock(topic_id=topic_id, block_id=f"block-{i}", type=ContentBlockType.SLIDE, position=i, text=text)
+        for i, text in enumerate(texts)
+    ]
+    return CompiledTopic(topic_id=topic_id, metadata=None, blocks=blocks)
+
+
+class TestExtraction:
+    """Test reference parsing."""
+
+    def test_path_forms(self):
+        markdown = """
+![a](../../images/a.png)
+![b]({{ site.baseurl }}/assets/images/b.png)
+![c](../../../../shared/images/c.svg "Title")
+![d](https://example.org/d.png)
+"""
+        assert extract_image_names(markdown) == {"a.png", "b.png", "c.svg"}
+
+    def test_diagram_source(self):
+        assert diagram_source("x.mindmap.plantuml.svg") == "x.mindmap.yml"
+        assert diagram_source("x.plantuml.svg") == "x.plantuml.txt"
+        assert diagram_source("x.mermaid.svg") == "x.mermaid.txt"
+        assert diagram_source("x.svg") is None
+
+
+class TestReferenceIndex:
+    """Test the one-pass report."""
+
+    @pytest.fixture
+    def images_dir(self, tmp_path):
+        images = tmp_path / "images"
+        images.mkdir()
+        (images / "used.png").write_bytes(b"png-1")
+        (images / "copy.png").write_bytes(b"png-1")
+        (images / "unused.png").write_bytes(b"png-2")
+        (images / "flow.plantuml.txt").write_text("@startuml\n!include style.txt\n@enduml\n")
+        (images / "style.txt").write_text("skinparam x y\n")
+        (images / "old.plantuml.txt").write_text("@startuml\n@enduml\n")
+        (images / "tree.mindmap.yml").write_text("label: Tree\n")
+        (images / "mindmap_yaml_to_plantuml.py").write_text("lines = ['!include style.txt', '!include options.txt']\n")
+        (images / "README.md").write_text("# Images\n")
+        return images
+
+    def test_report(self, images_dir):
+        topics = [
+            make_topic("one", "![Used](../../images/used.png)\n![Flow](../../images/flow.plantuml.svg)"),
+            make_topic("two", "![Tree](../../images/tree.mindmap.plantuml.svg)", "![Gone](../../images/gone.png)"),
+        ]
+        index = build_reference_index(topics, images_dir)
+
+        assert index['references']['used.png'] == ["one:block-0"]
+        assert index['unbuilt'] == ["flow.plantuml.svg", "tree.mindmap.plantuml.svg"]
+        # options.txt is included by mindmaps but doesn't exist
+        assert index['missing'] == {"gone.png": ["two:block-1"], "options.txt": ["images/tree.mindmap.yml"]}
+        assert "style.txt" in index['used']
+        assert "tree.mindmap.plantuml.txt" in index['used']
+        # README.md and style.txt aren't images or diagram sources
+        assert index['orphaned'] == ["copy.png", "old.plantuml.txt", "unused.png"]
+        assert index['duplicates'] == [["copy.png", "used.png"]]
+
+    def test_built_diagram_is_used(self, images_dir):
+        (images_dir / "flow.plantuml.svg").write_text("<svg/>")
+        index = build_reference_index([make_topic("one", "![Flow](../../images/flow.plantuml.svg)")], images_dir)
+        assert index['unbuilt'] == []
+        assert {"flow.plantuml.svg", "flow.plantuml.txt", "style.txt"} <= set(index['used'])
+
+
+class TestRepository:
+    """Test the repository's own topics and images."""
+
+    def test_no_missing_images(self):
+        index = build_reference_index(compile_all_topics())
+        assert index['missing'] == {}
+
+    def test_sync_uses_compiled_blocks(self):
+        assert "jsload.png" in find_referenced_images("client")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Tests for the topic language server.
+
+Tests:
+- Diagnostics for content.yaml and metadata.yaml, positioned in the document
+- Only edited blocks are re-validated after an incremental change
+- Completion for topic IDs, fragment paths, images and layout names
+- Go-to-definition for file/fragments paths
+- Content-Length framed messages over a stream
+"""
+
+import io
+import json
+from pathlib import Path
+import shutil
+import sys
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from language_server import LanguageServer, apply_change, path_to_uri, read_message, serve, split_blocks
+
+
+@pytest.fixture
+def topics(tmp_path):
+    topics_dir = tmp_path / "topics"
+    shutil.copytree("topics", topics_dir)
+    (tmp_path / "images").mkdir()
+    (tmp_path / "images" / "tasks.png").write_bytes(b"")
+    (tmp_path / "images" / "tasks_flow.plantuml.txt").write_text("@startuml\n@enduml\n")
+    return topics_dir
+
+
+def open_document(server: LanguageServer, path: Path, text: str = None) -> tuple[str, list[dict]]:
+    uri = path_to_uri(path)
+    text = path.read_text() if text is None else text
+    out = server.handle({'method': 'textDocument/didOpen', 'params': {'textDocument': {'uri': uri, 'text': text}}})
+    return uri, out
+
+
+def edit(server: LanguageServer, uri: str, line: int, start: int, end: int, text: str) -> list[dict]:
+    change = {'range': {'start': {'line': line, 'character': start}, 'end': {'line': line, 'character': end}}, 'text': text}
+    return server.handle({'method': 'textDocument/didChange',
+                          'params': {'textDocument': {'uri': uri}, 'contentChanges': [change]}})
+
+
+def complete(server: LanguageServer, uri: str, line: int, character: int) -> list[str]:
+    out = server.handle({'jsonrpc': '2.0', 'id': 1, 'method': 'textDocument/completion',
+                         'params': {'textDocument': {'uri': uri}, 'position': {'line': line, 'character': character}}})
+    return [item['label'] for item in out[0]['result']['items']]
+
+
+def diagnostics_of(out: list[dict]) -> list[dict]:
+    return [d for message in out for d in message['params']['diagnostics']]
+
+
+CONTENT = """\
+# Blocks
+- type: slide
+  id: intro
+  content: Hello
+- type: prose
+  id: details
+  fragments:
+    - fragments/details.md
+    - fragments/missing.md
+- type: slide
+  id: layout
+  content: '![Flow](../../images/tasks'
+  slides:
+    layout_name: left
+"""
+
+
+class TestDiagnostics:
+    """Test document diagnostics."""
+
+    def test_split_blocks(self):
+        assert [start for start, _ in split_blocks(CONTENT)] == [1, 4, 9]
+        assert split_blocks("root: 1\n- a\n") is None
+
+    def test_valid_topic(self, topics):
+        server = LanguageServer()
+        _, out = open_document(server, topics / "tasks" / "content.yaml")
+        assert diagnostics_of(out) == []
+        _, out = open_document(server, topics / "tasks" / "metadata.yaml")
+        assert diagnostics_of(out) == []
+
+    def test_only_edited_block_revalidated(self, topics):
+        server = LanguageServer()
+        path = topics / "tasks" / "content.yaml"
+        uri, _ = open_document(server, path)
+        blocks = len(split_blocks(path.read_text()))
+        assert server.blocks_checked == blocks
+
+        line = path.read_text().splitlines()[0]
+        assert line == "- type: slide"
+        diagnostics = diagnostics_of(edit(server, uri, 0, 8, 13, "slidez"))
+        assert server.blocks_checked == blocks + 1
+        assert len(diagnostics) == 1
+        assert diagnostics[0]['range']['start'] == {'line': 0, 'character': 8}
+        assert diagnostics[0]['message'].startswith("type:")
+
+        # Reverting hits the cache; unchanged diagnostics aren't re-published
+        assert diagnostics_of(edit(server, uri, 0, 8, 14, "slide")) == []
+        assert server.blocks_checked == blocks + 1
+        assert edit(server, uri, 0, 8, 13, "slide") == []
+
+    def test_references_and_duplicates(self, topics):
+        server = LanguageServer()
+        (topics / "tasks" / "fragments").mkdir()
+        (topics / "tasks" / "fragments" / "details.md").write_text("Details")
+        _, out = open_document(server, topics / "tasks" / "content.yaml", CONTENT.replace("id: layout", "id: intro"))
+        diagnostics = diagnostics_of(out)
+        assert [(d['range']['start']['line'], d['message']) for d in diagnostics] == [
+            (8, "Block 'details': fragment not found: fragments/missing.md"),
+            (10, "Value error, Duplicate block IDs found: {'intro'}"),
+        ]
+
+    def test_metadata(self, topics):
+        server = LanguageServer()
+        path = topics / "tasks" / "metadata.yaml"
+        text = path.read_text().replace("related_topics: []", "related_topics: [nowhere]")
+        _, out = open_document(server, path, text)
+        diagnostics = diagnostics_of(out)
+        assert [d['message'] for d in diagnostics] == ["Related topic not found: nowhere"]
+
+    def test_apply_change(self):
+        change = {'range': {'start': {'line': 1, 'character': 1}, 'end': {'line': 2, 'character': 0}}, 'text': "X"}
+        assert apply_change("ab\ncd\nef\n", change) == "ab\ncXef\n"
+        assert apply_change("ab", {'text': "new"}) == "new"
+
+
+class TestNavigation:
+    """Test completion and go-to-definition."""
+
+    def test_topic_ids(self, topics):
+        server = LanguageServer()
+        path = topics / "tasks" / "metadata.yaml"
+        lines = path.read_text().splitlines()
+        line = next(i for i, l in enumerate(lines) if "continues_to:" in l)
+        uri, _ = open_document(server, path)
+        labels = complete(server, uri, line, len("  continues_to: app"))
+        assert labels == ["application-components"]
+
+        text = path.read_text().replace("related_topics: []", "related_topics:\n  - cl")
+        uri, _ = open_document(server, path, text)
+        line = text.splitlines().index("  - cl")
+        assert "client" in complete(server, uri, line, len("  - cl"))
+
+    def test_paths_images_and_layouts(self, topics):
+        server = LanguageServer()
+        (topics / "tasks" / "fragments").mkdir()
+        (topics / "tasks" / "fragments" / "details.md").write_text("Details")
+        uri, _ = open_document(server, topics / "tasks" / "content.yaml", CONTENT)
+        lines = CONTENT.splitlines()
+
+        assert complete(server, uri, 7, len("    - fragments/d")) == ["fragments/details.md"]
+        image_line = lines.index("  content: '![Flow](../../images/tasks'")
+        assert complete(server, uri, image_line, len(lines[image_line]) - 1) == ["tasks.png", "tasks_flow.plantuml.svg"]
+        layout_line = lines.index("    layout_name: left")
+        assert complete(server, uri, layout_line, len(lines[layout_line])) == ["left-aligned"]
+        assert complete(server, uri, 2, len("  id: in")) == []
+
+    def test_definition(self, topics):
+        server = LanguageServer()
+        (topics / "tasks" / "fragments").mkdir()
+        (topics / "tasks" / "fragments" / "details.md").write_text("Details")
+        uri, _ = open_document(server, topics / "tasks" / "content.yaml", CONTENT)
+
+        def definition(line):
+            out = server.handle({'id': 2, 'method': 'textDocument/definition',
+                                 'params': {'textDocument': {'uri': uri}, 'position': {'line': line, 'character': 8}}})
+            return out[0]['result']
+
+        assert definition(7)['uri'] == path_to_uri(topics / "tasks" / "fragments" / "details.md")
+        assert definition(8) is None  # Missing fragment
+        assert definition(2) is None
+
+
+class TestProtocol:
+    """Test the stdio transport."""
+
+    def test_session(self, topics):
+        messages = [
+            {'jsonrpc': '2.0', 'id': 1, 'method': 'initialize', 'params': {}},
+            {'jsonrpc': '2.0', 'method': 'initialized', 'params': {}},
+            {'jsonrpc': '2.0', 'method': 'textDocument/didOpen', 'params': {'textDocument': {
+                'uri': path_to_uri(topics / "tasks" / "content.yaml"), 'text': "- type: nope\n  id: a\n  content: x\n"}}},
+            {'jsonrpc': '2.0', 'id': 2, 'method': 'unknown/method'},
+            {'jsonrpc': '2.0', 'id': 3, 'method': 'shutdown'},
+            {'jsonrpc': '2.0', 'method': 'exit'},
+        ]
+        reader = io.BytesIO()
+        for message in messages:
+            body = json.dumps(message).encode()
+            reader.write(f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        reader.seek(0)
+        writer = io.BytesIO()
+        serve(LanguageServer(), reader, writer)
+
+        writer.seek(0)
+        responses = []
+        while (message := read_message(writer)) is not None:
+            responses.append(message)
+        assert responses[0]['result']['capabilities']['definitionProvider'] is True
+        assert responses[1]['method'] == 'textDocument/publishDiagnostics'
+        assert len(responses[1]['params']['diagnostics']) == 1
+        assert responses[2]['error']['code'] == -32601
+        assert responses[3] == {'jsonrpc': '2.0', 'id': 3, 'result': None}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
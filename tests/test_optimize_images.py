@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for the image optimization pipeline.
+
+Tests:
+- Lossless PNG recompression (pixel data unchanged, text chunks dropped)
+- SVG comment removal that leaves whitespace (tspan, foreignObject) alone
+- Content-addressed caching of optimized images
+- Separate metrics history per source and mode
+"""
+
+from pathlib import Path
+import struct
+import sys
+import zlib
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from optimize_images import (
+    PNG_SIGNATURE,
+    metrics_builder,
+    minify_svg,
+    optimize_images,
+    png_chunk,
+    png_chunks,
+    recompress_png,
+)
+
+SVG = b"""<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg">
+    <!--
+    @startuml
+    class App
+    @enduml
+    -->
+    <g>
+        <text><tspan>Galaxy</tspan> <tspan>App</tspan></text>
+    </g>
+</svg>
+"""
+
+
+def make_png(width=64, height=64) -> bytes:
+    """An RGB gradient PNG stored uncompressed, with a text chunk."""
+    rows = b"".join(b"\x00" + bytes((x * 4) % 256 for x in range(width * 3)) for _ in range(height))
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"".join([
+        PNG_SIGNATURE,
+        png_chunk(b"IHDR", ihdr),
+        png_chunk(b"tEXt", b"Software\x00PlantUML"),
+        png_chunk(b"IDAT", zlib.compress(rows, 0)),
+        png_chunk(b"IEND", b""),
+    ])
+
+
+def pixels(data: bytes) -> bytes:
+    return zlib.decompress(b"".join(payload for chunk_type, payload in png_chunks(data) if chunk_type == b"IDAT"))
+
+
+class TestPng:
+    def test_recompression_is_lossless_and_smaller(self):
+        original = make_png()
+        optimized = recompress_png(original)
+        assert len(optimized) < len(original)
+        assert pixels(optimized) == pixels(original)
+        assert [t for t, _ in png_chunks(optimized)] == [b"IHDR", b"IDAT", b"IEND"]
+
+    def test_already_optimal_png_unchanged(self):
+        optimized = recompress_png(make_png())
+        assert recompress_png(optimized) == optimized
+
+    def test_rejects_non_png(self):
+        with pytest.raises(ValueError):
+            png_chunks(b"GIF89a")
+
+
+class TestSvg:
+    def test_comments_removed(self):
+        minified = minify_svg(SVG)
+        assert b"@startuml" not in minified
+        assert len(minified) < len(SVG)
+
+    def test_text_whitespace_preserved(self):
+        assert b"<tspan>Galaxy</tspan> <tspan>App</tspan>" in minify_svg(SVG)
+
+    def test_foreign_object_unchanged_apart_from_comments(self):
+        # Mermaid renders labels as HTML, where whitespace between tags is a space
+        svg = (b'<svg xmlns="http://www.w3.org/2000/svg"><!-- graph TD -->\n'
+               b'<foreignObject width="80" height="24"><div xmlns="http://www.w3.org/1999/xhtml">\n'
+               b'    <span>Job</span>\n    <span>Handler</span>\n</div></foreignObject>\n'
+               b'<text xml:space="preserve">a\n  <tspan>b</tspan></text></svg>')
+        assert minify_svg(svg) == svg.replace(b"<!-- graph TD -->", b"")
+
+
+class TestOptimizeImages:
+    @pytest.fixture
+    def images(self, tmp_path):
+        src = tmp_path / "src"
+        src.mkdir()
+        (src / "diagram.png").write_bytes(make_png())
+        (src / "diagram.svg").write_bytes(SVG)
+        (src / "broken.png").write_bytes(b"not a png")
+        return sorted(src.iterdir())
+
+    def test_optimizes_into_output_and_caches(self, tmp_path, images):
+        kwargs = dict(output_dir=tmp_path / "out", use_oxipng=False, jobs=1, cache_dir=tmp_path / "cache")
+        first = optimize_images(images, **kwargs)
+        assert first["processed"] == 3
+        assert first["optimized_bytes"] < first["original_bytes"]
+        assert len(first["errors"]) == 1 and "broken.png" in first["errors"][0]
+        assert (tmp_path / "out" / "broken.png").read_bytes() == b"not a png"
+        assert pixels((tmp_path / "out" / "diagram.png").read_bytes()) == pixels(make_png())
+
+        second = optimize_images(images, **kwargs)
+        assert second["processed"] == 0
+        assert second["optimized_bytes"] == first["optimized_bytes"]
+
+    def test_in_place(self, tmp_path, images):
+        optimize_images(images, use_oxipng=False, jobs=1, cache_dir=tmp_path / "cache")
+        assert images[2].read_bytes() == minify_svg(SVG)
+
+    def test_metrics_builder_per_workload(self):
+        in_place = metrics_builder([Path("doc/build/html/_images")], in_place=True)
+        copied = metrics_builder([Path("images")], in_place=False)
+        assert in_place == "optimize-images/doc/build/html/_images:in-place"
+        assert copied == "optimize-images/images:output"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Tests for batched GitHub pull request resolution.
+
+Runs the resolver against a local stand-in GraphQL server.
+
+Tests:
+- PR reference parsing
+- Batching and caching of GraphQL requests, kept when a later batch fails
+- Markdown rendering of resolved PRs
+"""
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from models import PullRequestReference
+from pull_requests import (
+    format_pull_request_markdown,
+    parse_pull_request,
+    resolve_pull_requests,
+)
+
+
+class GraphQLHandler(BaseHTTPRequestHandler):
+    """Answers repository/pullRequest aliases; PR numbers >= 90000 don't exist.
+
+    Queries for PR 666 get a response that isn't JSON, like a proxy error page.
+    """
+    queries: list = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        GraphQLHandler.queries.append(body["query"])
+        if "number: 666)" in body["query"]:
+            self.send_response(200)
+            self.send_header("Content-Length", "11")
+            self.end_headers()
+            self.wfile.write(b"Bad Gateway")
+            return
+
+        data = {}
+        for alias, number in re.findall(r'(pr\d+): repository\(.*?\) \{\s*pullRequest\(number: (\d+)\)', body["query"]):
+            number = int(number)
+            if number >= 90000:
+                data[alias] = {"pullRequest": None}
+            else:
+                data[alias] = {"pullRequest": {
+                    "number": number,
+                    "title": f"PR {number}",
+                    "state": "MERGED",
+                    "merged": True,
+                    "mergedAt": "2024-01-02T03:04:05Z",
+                    "url": f"https://github.com/galaxyproject/galaxy/pull/{number}",
+                }}
+
+        payload = json.dumps({"data": data}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def endpoint():
+    GraphQLHandler.queries = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), GraphQLHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/graphql"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestParsePullRequest:
+    """Test PR reference parsing."""
+
+    def test_number(self):
+        assert parse_pull_request("9888") == ("galaxyproject", "galaxy", 9888)
+
+    def test_url(self):
+        assert parse_pull_request("https://github.com/galaxyproject/galaxy-release-util/pull/12") == \
+            ("galaxyproject", "galaxy-release-util", 12)
+
+    def test_shorthand(self):
+        assert parse_pull_request("galaxyproject/planemo#3") == ("galaxyproject", "planemo", 3)
+
+    def test_invalid(self):
+        assert parse_pull_request("see the mailing list") is None
+
+
+class TestResolvePullRequests:
+    """Test resolving PRs against the stand-in server."""
+
+    def test_batches_and_caches(self, endpoint, tmp_path):
+        keys = [f"galaxyproject/galaxy#{n}" for n in (1, 2, 3)]
+        cache_file = tmp_path / "prs.json"
+
+        result = resolve_pull_requests(keys, cache_file, endpoint=endpoint, batch_size=2)
+        assert result["requests"] == 2
+        assert result["pull_requests"]["galaxyproject/galaxy#3"]["title"] == "PR 3"
+
+        # Merged PRs are final - nothing left to fetch
+        result = resolve_pull_requests(keys + ["galaxyproject/galaxy#4"], cache_file, endpoint=endpoint, batch_size=2)
+        assert result["requests"] == 1
+        assert len(GraphQLHandler.queries) == 3
+        assert "number: 4" in GraphQLHandler.queries[-1]
+        assert "number: 1" not in GraphQLHandler.queries[-1]
+
+    def test_failed_batch_keeps_earlier_batches(self, endpoint, tmp_path):
+        keys = [f"galaxyproject/galaxy#{n}" for n in (1, 2, 666)]
+        cache_file = tmp_path / "prs.json"
+
+        with pytest.raises(json.JSONDecodeError):
+            resolve_pull_requests(keys, cache_file, endpoint=endpoint, batch_size=2)
+        result = resolve_pull_requests(keys[:2], cache_file, endpoint=endpoint)
+        assert result["requests"] == 0
+        assert set(result["pull_requests"]) == set(keys[:2])
+
+    def test_missing_pull_request(self, endpoint, tmp_path):
+        result = resolve_pull_requests(["galaxyproject/galaxy#99999"], tmp_path / "prs.json", endpoint=endpoint)
+        assert result["pull_requests"]["galaxyproject/galaxy#99999"] == {
+            "missing": True,
+            "fetched_at": result["pull_requests"]["galaxyproject/galaxy#99999"]["fetched_at"],
+        }
+
+
+class TestFormatPullRequest:
+    """Test markdown rendering of PR references."""
+
+    def test_resolved(self):
+        resolved = {"galaxyproject/galaxy#9888": {
+            "title": "File Sources", "state": "MERGED", "merged": True, "mergedAt": "2020-06-01T00:00:00Z",
+        }}
+        item = PullRequestReference(pull_request="https://github.com/galaxyproject/galaxy/pull/9888", note="Origin")
+        assert format_pull_request_markdown(item, resolved) == (
+            "- [galaxyproject/galaxy#9888](https://github.com/galaxyproject/galaxy/pull/9888) "
+            "File Sources (merged 2020-06-01) — Origin"
+        )
+
+    def test_unresolved(self):
+        assert format_pull_request_markdown("123", {}) == \
+            "- [galaxyproject/galaxy#123](https://github.com/galaxyproject/galaxy/pull/123)"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the full-text search index.
+
+Tests:
+- Incremental indexing of real topics
+- BM25-ranked search with stemming
+- Client-side shard export
+"""
+
+import gzip
+import json
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from search_index import connect, export_shard, search, to_match_expression, update_index
+
+
+@pytest.fixture(scope="module")
+def conn(tmp_path_factory):
+    conn = connect(tmp_path_factory.mktemp("search") / "search.sqlite")
+    update_index(conn)
+    yield conn
+    conn.close()
+
+
+class TestIndexing:
+    def test_incremental_update_skips_unchanged_topics(self, conn):
+        assert update_index(conn) == []
+
+    def test_rebuild_reindexes_everything(self, conn):
+        assert len(update_index(conn, rebuild=True)) == len(list(Path("topics").glob("*/metadata.yaml")))
+
+
+class TestSearch:
+    def test_stemmed_match(self, conn):
+        results = search(conn, "injecting dependencies", limit=5)
+        assert results
+        assert results[0]["topic"] == "dependency-injection"
+
+    def test_slide_positions(self, conn):
+        results = search(conn, "celery", limit=20)
+        slides = [r for r in results if r["type"] == "slide"]
+        assert slides
+        assert all(r["slide"] >= 2 for r in slides)
+
+    def test_query_syntax_is_escaped(self, conn):
+        assert to_match_expression('lib/galaxy "managers"') == '"lib" "galaxy" "managers"'
+        assert search(conn, "AND OR (") is not None
+
+    def test_no_results(self, conn):
+        assert search(conn, "zzzyyyxxx") == []
+
+
+class TestExport:
+    def test_shard_round_trip(self, conn, tmp_path):
+        output = tmp_path / "tasks.json.gz"
+        counts = export_shard(conn, output, topic_id="tasks")
+        with gzip.open(output, "rt") as f:
+            shard = json.load(f)
+
+        assert counts["docs"] == len(shard["docs"]) == len(shard["lengths"])
+        assert {doc[0] for doc in shard["docs"]} == {"tasks"}
+        assert "celeri" in shard["terms"]  # Porter stem of "celery"
+        postings = shard["terms"]["celeri"]
+        assert len(postings) % 2 == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for per-block memoization of the Sphinx markdown transforms.
+
+Tests:
+- Block-by-block output is identical to transforming the whole topic document
+- Editing one block only re-transforms that block
+- Memoized outputs persist and are invalidated by the transform version
+"""
+
+from pathlib import Path
+import shutil
+import sys
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from compiled_topics import list_topic_ids, load_builder
+
+builder = load_builder("sphinx-docs")
+
+
+@pytest.fixture
+def topics(tmp_path, monkeypatch):
+    shutil.copytree("topics", tmp_path / "topics")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / "topics"
+
+
+class TestBlockTransforms:
+    """Test memoized block transforms."""
+
+    def test_identical_to_whole_document(self, tmp_path):
+        cache = builder.BlockTransformCache(tmp_path / "blocks.json")
+        for topic_id in list_topic_ids(Path("topics")):
+            topic_dir = Path("topics") / topic_id
+            whole = builder.process_markdown_for_sphinx(builder.generate_topic_markdown(topic_id, topic_dir), topic_id)
+            assert cache.topic_markdown(topic_id, topic_dir) == whole, topic_id
+
+    def test_only_edited_block_transformed(self, topics):
+        cache = builder.BlockTransformCache(Path("blocks.json"))
+        first = cache.topic_markdown("tests", topics / "tests")
+        parts = len(set(builder.topic_markdown_parts("tests", topics / "tests")))
+        assert cache.misses == parts
+
+        cache.topic_markdown("tests", topics / "tests")
+        assert cache.misses == parts
+
+        content = topics / "tests" / "content.yaml"
+        content.write_text(content.read_text().replace("heading: Writing Tests for Galaxy", "heading: Edited", 1))
+        edited = cache.topic_markdown("tests", topics / "tests")
+        assert cache.misses == parts + 1
+        assert edited != first and "## Edited" in edited
+
+    def test_persisted_and_versioned(self, topics, monkeypatch):
+        cache = builder.BlockTransformCache(Path("blocks.json"))
+        cache.topic_markdown("tasks", topics / "tasks")
+        cache.save()
+
+        reloaded = builder.BlockTransformCache(Path("blocks.json"))
+        reloaded.topic_markdown("tasks", topics / "tasks")
+        assert reloaded.misses == 0
+
+        monkeypatch.setattr(builder, "TRANSFORM_VERSION", builder.TRANSFORM_VERSION + 1)
+        bumped = builder.BlockTransformCache(Path("blocks.json"))
+        bumped.topic_markdown("tasks", topics / "tasks")
+        # Identical parts (e.g. repeated image slides) are transformed once
+        assert bumped.misses == len(set(builder.topic_markdown_parts("tasks", topics / "tasks")))
+
+    def test_prune(self, topics):
+        cache = builder.BlockTransformCache(Path("blocks.json"))
+        cache.topic_markdown("tasks", topics / "tasks")
+        cache.topic_markdown("client", topics / "client")
+        cache.save()
+
+        cache = builder.BlockTransformCache(Path("blocks.json"))
+        cache.topic_markdown("tasks", topics / "tasks")
+        cache.save(prune=True)
+        assert len(builder.BlockTransformCache(Path("blocks.json")).outputs) == len(cache.used)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
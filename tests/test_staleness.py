@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Tests for the staleness report.
+
+Tests:
+- Parsing a single git log pass into per-path and per-directory change times
+- Flagging references changed after the topic, ranked by churn
+- Reading only referenced paths' changes after their topic's last update
+- Caching them by HEAD, topic update times and --since resolved to a date
+"""
+
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+import time
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import staleness
+from code_index import new_node, trie_insert
+from staleness import (DAY, change_index, find_stale_topics, load_galaxy_changes, load_topic_changes, parse_log,
+                       reference_updates, resolve_since)
+
+
+def commit(root: Path, path: str, timestamp: int) -> None:
+    file = root / path
+    file.parent.mkdir(parents=True, exist_ok=True)
+    file.write_text(f"{timestamp}\n")
+    env = {**os.environ, "GIT_AUTHOR_DATE": f"@{timestamp} +0000", "GIT_COMMITTER_DATE": f"@{timestamp} +0000"}
+    subprocess.run(["git", "-C", str(root), "add", "-A"], check=True)
+    subprocess.run(["git", "-C", str(root), "-c", "user.name=t", "-c", "user.email=t@t",
+                    "commit", "-q", "-m", path], check=True, env=env)
+
+
+@pytest.fixture
+def galaxy(tmp_path):
+    root = tmp_path / "galaxy"
+    root.mkdir()
+    subprocess.run(["git", "init", "-q", str(root)], check=True)
+    commit(root, "lib/galaxy/managers/hdas.py", 1000)
+    commit(root, "lib/galaxy/managers/jobs.py", 2000)
+    commit(root, "lib/galaxy/managers/hdas.py", 3000)
+    commit(root, "lib/galaxy/tools/__init__.py", 4000)
+    return root
+
+
+def trie_for(refs: list[tuple[str, dict]]) -> dict:
+    root = new_node()
+    for path, ref in refs:
+        trie_insert(root, path, ref)
+    return root
+
+
+class TestChangeIndex:
+    """Test the single-pass change index."""
+
+    def test_parse_log(self):
+        output = "\x00300\n\na/b/c.py\na/b/d.py\n\x00100\n\na/b/c.py\n"
+        times = parse_log(output)
+        assert times["a/b/c.py"] == [100, 300]
+        assert times["a/b/d.py"] == [300]
+        # One entry per commit for each directory, even with several files
+        assert times["a/b"] == [100, 300]
+        assert times["a"] == [100, 300]
+
+    def test_change_index(self, galaxy):
+        times = change_index(galaxy)
+        assert times["lib/galaxy/managers/hdas.py"] == [1000, 3000]
+        assert times["lib/galaxy/managers"] == [1000, 2000, 3000]
+        assert times["lib/galaxy"] == [1000, 2000, 3000, 4000]
+        assert change_index(galaxy, since="1970-01-01 00:40:00 +0000")["lib/galaxy"] == [3000, 4000]
+
+    def test_limited_to_paths(self, galaxy):
+        times = change_index(galaxy, since="1970-01-01 00:41:40 +0000",
+                             paths=("lib/galaxy/managers", "lib/galaxy/managers/hdas.py"),
+                             only={"lib/galaxy/managers", "lib/galaxy/managers/hdas.py"})
+        assert times == {"lib/galaxy/managers": [3000], "lib/galaxy/managers/hdas.py": [3000]}
+
+    def test_topic_changes(self, tmp_path):
+        repo = tmp_path / "architecture"
+        repo.mkdir()
+        subprocess.run(["git", "init", "-q", str(repo)], check=True)
+        commit(repo, "topics/jobs/content.md", 1000)
+        commit(repo, "topics/jobs/meta.yml", 3000)
+        commit(repo, "README.md", 4000)
+        commit(repo, "images/jobs.mindmap.yml", 5000)
+
+        topic_changes = load_topic_changes(repo)
+        assert topic_changes["topics/jobs"] == [1000, 3000]
+        assert "README.md" not in topic_changes
+
+        trie = trie_for([
+            ("lib/galaxy/jobs", {'topic': "jobs", 'source': "topics/jobs/content.md"}),
+            ("lib/galaxy/tools", {'topic': "jobs", 'source': "jobs.mindmap.yml", 'mindmap': "jobs.mindmap.yml"}),
+        ])
+        updates = reference_updates(trie, topic_changes)
+        assert updates[("jobs", "lib/galaxy/jobs")][0] == 3000
+        assert updates[("jobs", "lib/galaxy/tools")][0] == 5000
+
+    def test_keeps_changes_after_topic_update(self, galaxy, tmp_path):
+        updated = {"lib/galaxy/managers/hdas.py": 2000, "lib/galaxy/managers/jobs.py": 2500, "lib/galaxy": 0}
+        _, changes = load_galaxy_changes(galaxy, updated, cache_file=tmp_path / "staleness.json")
+        assert changes == {"lib/galaxy/managers/hdas.py": [3000], "lib/galaxy": [1000, 2000, 3000, 4000]}
+
+    def test_cached_by_head_and_updates(self, galaxy, tmp_path, monkeypatch):
+        cache_file = tmp_path / "staleness.json"
+        calls = []
+        original = staleness.change_index
+        monkeypatch.setattr(staleness, "change_index", lambda *args, **kwargs: calls.append(args) or original(*args, **kwargs))
+        updated = {"lib/galaxy/managers/hdas.py": 0}
+
+        head, first = load_galaxy_changes(galaxy, updated, cache_file=cache_file)
+        assert load_galaxy_changes(galaxy, updated, cache_file=cache_file) == (head, first)
+        assert len(calls) == 1
+
+        commit(galaxy, "lib/galaxy/managers/hdas.py", 5000)
+        new_head, changes = load_galaxy_changes(galaxy, updated, cache_file=cache_file)
+        assert new_head != head and len(calls) == 2
+        assert changes["lib/galaxy/managers/hdas.py"][-1] == 5000
+
+        # The topic was updated since
+        _, changes = load_galaxy_changes(galaxy, {"lib/galaxy/managers/hdas.py": 4500}, cache_file=cache_file)
+        assert len(calls) == 3
+        assert changes == {"lib/galaxy/managers/hdas.py": [5000]}
+
+    def test_relative_since_resolved_to_a_date(self, galaxy, tmp_path):
+        assert resolve_since(galaxy, "1970-01-02 12:00:00 +0000") == DAY
+        start = resolve_since(galaxy, "1 day ago")
+        assert start % DAY == 0
+        assert time.time() - 2 * DAY < start <= time.time() - DAY
+
+        cache_file = tmp_path / "staleness.json"
+        load_galaxy_changes(galaxy, {"lib/galaxy": 0}, since="1 day ago", cache_file=cache_file)
+        assert json.loads(cache_file.read_text())['key']['since'] == start
+
+
+class TestStaleness:
+    """Test finding stale topics."""
+
+    def test_ranked_by_churn(self, galaxy):
+        trie = trie_for([
+            ("lib/galaxy/managers/hdas.py", {'topic': 'histories', 'source': 'metadata'}),
+            ("lib/galaxy/managers", {'topic': 'managers', 'source': 'content', 'block': 'intro'}),
+            ("lib/galaxy/tools/__init__.py", {'topic': 'tools', 'source': 'metadata'}),
+            ("lib/galaxy/missing.py", {'topic': 'tools', 'source': 'metadata'}),
+        ])
+        topic_changes = {"topics/histories": [2500], "topics/managers": [500], "topics/tools": [4500]}
+        stale = find_stale_topics(trie, change_index(galaxy), topic_changes)
+
+        assert [(t['topic'], t['churn']) for t in stale] == [('managers', 3), ('histories', 1)]
+        assert stale[1]['stale'] == [{
+            'path': 'lib/galaxy/managers/hdas.py', 'sources': ['metadata'], 'last_changed': 3000, 'commits': 1,
+        }]
+
+    def test_mindmap_counts_as_topic_update(self, galaxy):
+        trie = trie_for([
+            ("lib/galaxy/managers/jobs.py", {'topic': 'jobs', 'source': 'mindmap', 'mindmap': 'core_files.mindmap.yml'}),
+        ])
+        changes = change_index(galaxy)
+        assert find_stale_topics(trie, changes, {"topics/jobs": [100]})[0]['churn'] == 1
+        assert find_stale_topics(trie, changes, {"topics/jobs": [100], "images/core_files.mindmap.yml": [2500]}) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
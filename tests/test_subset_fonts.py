@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for DIN 1451 font subsetting.
+
+Tests:
+- Collecting characters from deck heading lines
+- Adding font-display: swap to @font-face rules
+- Subsets keep only heading glyphs and are cached by glyph set
+- Full fonts are used without fontTools
+- Published decks are pointed at the hashed font names
+"""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from subset_fonts import FontSubsetter, ensure_font_display, heading_characters, rewrite_font_names, write_fonts
+
+FONT = Path("outputs/training-slides/assets/fonts/DIN1451/Altinn-DINCondensed.woff2")
+
+
+class TestCharacters:
+    """Test heading character collection."""
+
+    def test_heading_characters(self):
+        decks = [
+            "# Title\n\nBody text xyz\n\n### Q&amp;A\n",
+            "#### Not DIN\n## Zz\n    ### indented\n",
+        ]
+        assert heading_characters(decks) == "".join(sorted(set(" TitleQ&AZzindented")))
+
+    def test_font_display(self):
+        css = "@font-face {\n  font-family: 'A';\n  src: url(a.woff2);\n}\n@font-face {\n  font-display: block;\n}\n"
+        rewritten = ensure_font_display(css)
+        assert rewritten.count("font-display: swap;") == 1
+        assert "font-display: block;" in rewritten
+
+
+class TestSubsetting:
+    """Test subsetting and caching."""
+
+    def test_without_fonttools(self, tmp_path, monkeypatch):
+        subsetter = FontSubsetter("ABC", tmp_path)
+        monkeypatch.setattr(subsetter, "available", False)
+        assert subsetter.font(FONT) == FONT.read_bytes()
+
+    def test_subset_cached_by_glyph_set(self, tmp_path):
+        pytest.importorskip("fontTools.subset")
+        pytest.importorskip("brotli")
+        from fontTools.ttLib import TTFont
+        import io
+
+        subsetter = FontSubsetter(" Galaxy", tmp_path)
+        data = subsetter.font(FONT)
+        assert len(data) < FONT.stat().st_size
+        assert set(TTFont(io.BytesIO(data)).getBestCmap()) == {ord(c) for c in " Galaxy"}
+
+        assert FontSubsetter(" Galaxy", tmp_path).font(FONT) == data
+        other = FontSubsetter(" Galaxy!", tmp_path)
+        other.font(FONT)
+        assert (other.hits, other.misses) == (0, 1)
+        assert len(list(tmp_path.glob("*.woff2"))) == 2
+
+    def test_write_fonts(self, tmp_path):
+        written = {}
+
+        def name_font(name, data):
+            written[name] = data
+            return f"fonts/{name}"
+
+        css = write_fonts(FontSubsetter("AB", tmp_path), name_font)
+        assert set(written) == {"Altinn-DINCondensed.woff2", "Altinn-DINCondensed-Bold.woff2"}
+        assert "url(fonts/Altinn-DINCondensed.woff2)" in css
+        assert css.count("font-display: swap") == 2
+
+    def test_rewrite_font_names(self):
+        deck = ("src: url(${fontPath}Altinn-DINCondensed.woff2);\n"
+                "src: url(${fontPath}Altinn-DINCondensed-Bold.0123456789ab.woff2);\n")
+        names = {"Altinn-DINCondensed.woff2": "Altinn-DINCondensed.aaaaaaaaaaaa.woff2",
+                 "Altinn-DINCondensed-Bold.woff2": "Altinn-DINCondensed-Bold.bbbbbbbbbbbb.woff2"}
+        assert rewrite_font_names(deck, names) == (
+            "src: url(${fontPath}Altinn-DINCondensed.aaaaaaaaaaaa.woff2);\n"
+            "src: url(${fontPath}Altinn-DINCondensed-Bold.bbbbbbbbbbbb.woff2);\n")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
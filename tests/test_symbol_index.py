@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Tests for the Galaxy symbol index.
+
+Tests:
+- Symbol extraction with ast (classes, methods, module-level names)
+- path and path::Symbol resolution against a git checkout
+- Parsing in a process pool; results cached per blob hash (only changed modules re-parsed)
+- Loading without a full build: only referenced modules are parsed
+- Deep links for backticked references in Sphinx markdown
+"""
+
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from symbol_index import (
+    build_symbol_index,
+    extract_symbols,
+    link_code_references,
+    load_symbol_index,
+    parse_reference,
+    save_symbols,
+)
+
+HDAS = '''\
+LIMIT = 10
+
+
+class HDAManager:
+    """Manager."""
+
+    @property
+    def model(self):
+        pass
+
+    def purge(self, hda):
+        pass
+
+
+async def serve():
+    pass
+'''
+
+
+def commit(root: Path) -> None:
+    subprocess.run(["git", "-C", str(root), "add", "-A"], check=True)
+    subprocess.run(["git", "-C", str(root), "-c", "user.name=t", "-c", "user.email=t@t",
+                    "commit", "-q", "-m", "change"], check=True)
+
+
+@pytest.fixture
+def galaxy(tmp_path):
+    root = tmp_path / "galaxy"
+    (root / "lib" / "galaxy" / "managers").mkdir(parents=True)
+    (root / "lib" / "galaxy" / "managers" / "hdas.py").write_text(HDAS)
+    (root / "lib" / "galaxy" / "managers" / "legacy.py").write_text("print 'python 2'\n")
+    (root / "client").mkdir()
+    (root / "client" / "index.ts").write_text("export {};\n")
+    subprocess.run(["git", "init", "-q", str(root)], check=True)
+    commit(root)
+    return root
+
+
+class TestSymbols:
+    """Test symbol extraction."""
+
+    def test_extract_symbols(self):
+        assert extract_symbols(HDAS.encode()) == {
+            'LIMIT': 1, 'HDAManager': 4, 'HDAManager.model': 8, 'HDAManager.purge': 11, 'serve': 15,
+        }
+
+    def test_unparseable_module(self):
+        assert extract_symbols(b"print 'python 2'\n") == {}
+
+    def test_parse_reference(self):
+        assert parse_reference("lib/galaxy/x.py::A.b") == ("lib/galaxy/x.py", "A.b")
+        assert parse_reference("lib/galaxy/x.py:resolve()") == ("lib/galaxy/x.py", "resolve")
+        assert parse_reference("./lib/galaxy/") == ("lib/galaxy", None)
+
+
+class TestIndex:
+    """Test the checkout index."""
+
+    def test_check_references(self, galaxy, tmp_path):
+        index, parsed = build_symbol_index(galaxy, tmp_path / "symbols.json")
+        assert parsed == 2
+        assert index.check("lib/galaxy/managers/hdas.py::HDAManager.purge") is None
+        assert index.check("lib/galaxy/managers/") is None
+        assert index.check("client/index.ts") is None
+        assert index.check("lib/galaxy/managers/hdas.py::Missing") == (
+            "Symbol not found in lib/galaxy/managers/hdas.py: Missing"
+        )
+        assert index.check("lib/galaxy/nope.py").startswith("Code path not found")
+
+    def test_urls(self, galaxy, tmp_path):
+        index, _ = build_symbol_index(galaxy, tmp_path / "symbols.json")
+        url = index.url("lib/galaxy/managers/hdas.py::HDAManager.purge")
+        assert url == f"https://github.com/galaxyproject/galaxy/blob/{index.head}/lib/galaxy/managers/hdas.py#L11"
+        assert index.url("lib/galaxy") == f"https://github.com/galaxyproject/galaxy/tree/{index.head}/lib/galaxy"
+        assert index.url("lib/galaxy/nope.py") is None
+
+    def test_process_pool(self, galaxy, tmp_path, monkeypatch):
+        import symbol_index
+        monkeypatch.setattr(symbol_index, "POOL_THRESHOLD", 0)
+        index, parsed = build_symbol_index(galaxy, tmp_path / "symbols.json", workers=2)
+        assert parsed == 2
+        assert index.line("lib/galaxy/managers/hdas.py", "HDAManager.purge") == 11
+
+    def test_cached_by_blob(self, galaxy, tmp_path):
+        cache_file = tmp_path / "symbols.json"
+        build_symbol_index(galaxy, cache_file)
+        assert build_symbol_index(galaxy, cache_file)[1] == 0
+
+        (galaxy / "lib" / "galaxy" / "managers" / "hdas.py").write_text("\n" + HDAS)
+        commit(galaxy)
+        index, parsed = build_symbol_index(galaxy, cache_file)
+        assert parsed == 1
+        assert index.line("lib/galaxy/managers/hdas.py", "serve") == 16
+
+    def test_load_parses_referenced_modules_only(self, galaxy, tmp_path):
+        cache_file = tmp_path / "symbols.json"
+        index = load_symbol_index(galaxy, cache_file)
+        assert index.check("client/index.ts") is None
+        assert index.parsed == 0
+        assert index.check("lib/galaxy/managers/hdas.py::HDAManager.purge") is None
+        assert index.parsed == 1
+        save_symbols(index, cache_file)
+
+        # The cache now serves hdas.py; legacy.py was never parsed
+        index = load_symbol_index(galaxy, cache_file)
+        assert index.line("lib/galaxy/managers/hdas.py", "serve") == 15
+        assert index.parsed == 0
+        assert len(index.symbols) == 1
+        assert build_symbol_index(galaxy, cache_file)[1] == 1
+
+    def test_load_without_checkout(self, tmp_path):
+        assert load_symbol_index(tmp_path) is None
+
+
+class TestLinks:
+    """Test deep links in Sphinx markdown."""
+
+    def test_link_code_references(self, galaxy, tmp_path):
+        index, _ = build_symbol_index(galaxy, tmp_path / "symbols.json")
+        markdown = (
+            "See `lib/galaxy/managers/hdas.py::HDAManager` and `lib/galaxy/gone.py`.\n\n"
+            "```\n`lib/galaxy/managers/hdas.py`\n```\n"
+        )
+        linked = link_code_references(markdown, index)
+        assert f"[`lib/galaxy/managers/hdas.py::HDAManager`](https://github.com/galaxyproject/galaxy/blob/{index.head}/lib/galaxy/managers/hdas.py#L4)" in linked
+        assert " `lib/galaxy/gone.py`." in linked
+        assert linked.endswith("```\n`lib/galaxy/managers/hdas.py`\n```\n")
+
+    def test_no_index(self):
+        assert link_code_references("`lib/galaxy/x.py`", None) == "`lib/galaxy/x.py`"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
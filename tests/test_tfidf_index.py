@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the TF-IDF block relevance index.
+
+Tests:
+- Term analysis
+- Batched cosine scoring of prompts against all blocks
+- Caching and incremental reuse of per-block term counts
+"""
+
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from compiled_topics import compile_all_topics
+from tfidf_index import analyze, build_index, load_index
+
+
+@pytest.fixture(scope="module")
+def topics():
+    return compile_all_topics()
+
+
+@pytest.fixture(scope="module")
+def index(topics):
+    return build_index(topics)
+
+
+class TestAnalyze:
+    def test_stopwords_and_plurals(self):
+        assert analyze("The managers use the App") == ["manager", "app"]
+        assert analyze("class access") == ["class", "access"]
+
+
+class TestScoring:
+    def test_rows_are_normalized(self, index):
+        norms = np.sqrt(index.matrix.multiply(index.matrix).sum(axis=1))
+        assert np.allclose(norms[norms > 0], 1.0)
+
+    def test_batch_scores_every_prompt_against_every_block(self, index):
+        scores = index.score(["dependency injection container", "celery tasks", "zzzunknownterm"])
+        assert scores.shape == (3, len(index.locations))
+        assert not scores[2].any()
+
+    def test_ranking(self, index):
+        scores = index.score(["Refactor a Galaxy component to use dependency injection instead of the app god object"])
+        top = [index.locations[i] for i in np.argsort(-scores[0])[:5]]
+        assert top[0].startswith("dependency-injection:")
+
+
+class TestCaching:
+    def test_term_counts_reused_by_block_hash(self, topics):
+        term_cache = {}
+        build_index(topics, term_cache)
+        sentinel = next(iter(term_cache))
+        term_cache[sentinel] = {"sentinelterm": 1}
+        index = build_index(topics, term_cache)
+        assert "sentinelterm" in index.vocabulary
+
+    def test_load_index_round_trip(self, tmp_path, index):
+        index_file, terms_file = tmp_path / "tfidf.npz", tmp_path / "terms.json"
+        built = load_index(index_file=index_file, terms_file=terms_file)
+        loaded = load_index(index_file=index_file, terms_file=terms_file)
+        assert loaded.locations == built.locations == index.locations
+        assert (loaded.matrix != built.matrix).nnz == 0
+        assert terms_file.exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for validating the sync to training-material.
+
+Runs against a temporary training-material tree.
+
+Tests:
+- Indexing the dev and shared image directories
+- Image status: in sync, missing, stale and unverified (no local copy)
+- Image hashes computed once per file
+- Whole-repository validation, including copied diagram sources
+"""
+
+from pathlib import Path
+import shutil
+import sys
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from sync_images import find_referenced_images
+import validate_sync
+from validate_sync import build_image_index, check_image, validate_all
+
+TOPIC = "ecosystem"
+
+
+@pytest.fixture
+def tm_root(tmp_path):
+    """Training-material tree with TOPIC's slides and images in sync."""
+    root = tmp_path / "training-material"
+    (root / "topics/dev/images").mkdir(parents=True)
+    (root / "shared/images").mkdir(parents=True)
+    slides = root / "topics/dev/tutorials" / f"architecture-{TOPIC}" / "slides.html"
+    slides.parent.mkdir(parents=True)
+    slides.write_text("---\n---\n")
+    for name in find_referenced_images(TOPIC):
+        shutil.copyfile(Path("images") / name, root / "topics/dev/images" / name)
+    return root
+
+
+class TestCheckImage:
+    """Test single image checks against the index."""
+
+    @pytest.fixture
+    def images(self, tmp_path):
+        images = tmp_path / "images"
+        images.mkdir()
+        (images / "a.png").write_bytes(b"aaaa")
+        (images / "b.png").write_bytes(b"bbbb")
+        (images / "GTNLogo1000.png").write_bytes(b"logo")
+        return images
+
+    def test_index(self, tmp_path):
+        (tmp_path / "tm/topics/dev/images").mkdir(parents=True)
+        (tmp_path / "tm/topics/dev/images/a.png").write_bytes(b"aaaa")
+        index = build_image_index(tmp_path / "tm")
+        assert set(index['dev']) == {"a.png"}
+        assert index['dev']["a.png"]['size'] == 4
+        assert index['shared'] == {}
+
+    def test_statuses(self, tmp_path, images):
+        tm = tmp_path / "tm"
+        (tm / "topics/dev/images").mkdir(parents=True)
+        (tm / "shared/images").mkdir(parents=True)
+        (tm / "topics/dev/images/a.png").write_bytes(b"aaaa")
+        (tm / "topics/dev/images/b.png").write_bytes(b"BBBB")
+        (tm / "topics/dev/images/diagram.plantuml.svg").write_bytes(b"<svg/>")
+        (tm / "shared/images/GTNLogo1000.png").write_bytes(b"logo")
+        index = build_image_index(tm)
+
+        assert check_image("a.png", index, images) == 'ok'
+        assert check_image("GTNLogo1000.png", index, images) == 'ok'
+        # Same size, different contents
+        assert check_image("b.png", index, images) == 'stale'
+        assert check_image("c.png", index, images) == 'missing'
+        # Present in training-material, but there is nothing of ours to compare with
+        assert check_image("diagram.plantuml.svg", index, images) == 'unverified'
+
+    def test_hashes_memoized(self, tmp_path, images, monkeypatch):
+        (tmp_path / "tm/topics/dev/images").mkdir(parents=True)
+        (tmp_path / "tm/topics/dev/images/a.png").write_bytes(b"aaaa")
+        index = build_image_index(tmp_path / "tm")
+        hashed = []
+        monkeypatch.setattr(validate_sync, "hash_file", lambda path: hashed.append(path) or path.read_bytes())
+        validate_sync.file_hash.cache_clear()
+
+        assert check_image("a.png", index, images) == 'ok'
+        assert check_image("a.png", index, images) == 'ok'
+        assert len(hashed) == 2
+
+
+class TestValidateAll:
+    """Test validating topics against a training-material tree."""
+
+    def test_in_sync(self, tm_root):
+        report = validate_all([TOPIC], tm_root)
+        assert report['valid'], report
+        assert report['topics'][TOPIC]['images']['ok'] == len(find_referenced_images(TOPIC))
+
+    def test_missing_and_stale(self, tm_root):
+        missing, stale = sorted(find_referenced_images(TOPIC))[:2]
+        (tm_root / "topics/dev/images" / missing).unlink()
+        (tm_root / "topics/dev/images" / stale).write_bytes(b"old")
+
+        report = validate_all([TOPIC], tm_root)
+        images = report['topics'][TOPIC]['images']
+        assert not report['valid']
+        assert images['missing'] == [missing]
+        assert images['stale'] == [stale]
+
+    def test_missing_slides_and_copied_sources(self, tm_root):
+        (tm_root / "topics/dev/tutorials" / f"architecture-{TOPIC}" / "slides.html").unlink()
+        (tm_root / "topics/dev/images/app.plantuml.txt").write_text("@startuml\n@enduml\n")
+
+        report = validate_all([TOPIC], tm_root)
+        assert not report['valid']
+        assert report['errors'] == ["Source files found in training-material: ['app.plantuml.txt']"]
+        assert any("Slides not found" in error for error in report['topics'][TOPIC]['errors'])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for positioned diagnostics and the persistent validation service.
+
+Tests:
+- Line/column positions for YAML syntax, schema and reference errors
+- Incremental revalidation of changed files only
+- Tutorial chain diagnostics
+- JSON-RPC over a Unix socket with the thin client
+"""
+
+from pathlib import Path
+import shutil
+import sys
+import threading
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from diagnostics import check_content, check_metadata, parse, position
+from validation_client import request
+from validation_service import ValidationService, make_server
+
+
+@pytest.fixture
+def topics(tmp_path):
+    topics_dir = tmp_path / "topics"
+    shutil.copytree("topics", topics_dir)
+    return topics_dir
+
+
+def replace(path: Path, old: str, new: str) -> None:
+    text = path.read_text()
+    assert old in text
+    path.write_text(text.replace(old, new, 1))
+
+
+def line_of(path: Path, needle: str) -> int:
+    return next(i for i, line in enumerate(path.read_text().splitlines(), 1) if needle in line)
+
+
+class TestDiagnostics:
+    """Test positioned diagnostics."""
+
+    def test_position(self):
+        _, root = parse("a:\n  b:\n    - x\n    - y: 1\n")
+        assert position(root, ("a", "b", 1, "y")) == (4, 10)
+        # Missing keys point at the enclosing mapping
+        assert position(root, ("a", "missing")) == (2, 3)
+
+    def test_valid_topic(self, topics):
+        metadata, _, diagnostics = check_metadata(topics / "tasks")
+        assert metadata is not None and diagnostics == []
+        assert check_content(topics / "tasks")[1] == []
+
+    def test_schema_error_position(self, topics):
+        path = topics / "tasks" / "metadata.yaml"
+        replace(path, "tutorial_number: ", "tutorial_number: x")
+        metadata, _, diagnostics = check_metadata(topics / "tasks")
+        assert metadata is None
+        assert len(diagnostics) == 1
+        assert diagnostics[0].line == line_of(path, "tutorial_number")
+        assert diagnostics[0].message.startswith("training -> tutorial_number:")
+
+    def test_content_error_position(self, topics):
+        path = topics / "tasks" / "content.yaml"
+        replace(path, "type: slide", "type: slidez")
+        _, diagnostics = check_content(topics / "tasks")
+        assert diagnostics[0].line == line_of(path, "slidez")
+        assert diagnostics[0].message.startswith("0 -> type:")
+
+    def test_syntax_error(self, topics):
+        path = topics / "tasks" / "content.yaml"
+        path.write_text("- id: a\n  content: [\n")
+        _, diagnostics = check_content(topics / "tasks")
+        assert diagnostics[0].message.startswith("YAML syntax error")
+        assert diagnostics[0].line == 3
+
+
+class TestService:
+    """Test the warm validation state."""
+
+    def test_only_changed_files_revalidated(self, topics):
+        service = ValidationService(topics)
+        first = service.validate()
+        assert first['diagnostics'] == []
+        assert len(first['revalidated']) == 2 * len(service.topics)
+
+        assert service.validate([str(topics / "tasks" / "content.yaml")])['revalidated'] == []
+
+        replace(topics / "tasks" / "content.yaml", "type: slide", "type: slidez")
+        result = service.validate([str(topics / "tasks" / "content.yaml")])
+        assert result['revalidated'] == [str(topics / "tasks" / "content.yaml")]
+        assert [d['path'] for d in result['diagnostics']] == [str(topics / "tasks" / "content.yaml")]
+
+        # Other topics' diagnostics aren't reported for unrelated files
+        assert service.validate([str(topics / "client" / "content.yaml")])['diagnostics'] == []
+
+    def test_chain_diagnostics(self, topics):
+        service = ValidationService(topics)
+        service.validate()
+        path = topics / "tasks" / "metadata.yaml"
+        replace(path, "continues_to:", "continues_to: nowhere\n  old_continues_to:")
+        diagnostics = service.validate([str(path)])['diagnostics']
+        messages = [d for d in diagnostics if d['message'] == "tasks: continues_to 'nowhere' not found"]
+        assert len(messages) == 1
+        assert messages[0]['path'] == str(path)
+        assert messages[0]['line'] == line_of(path, "continues_to: nowhere")
+        # Follow-on errors are attributed to the topic they're about
+        assert any(d['path'].endswith("application-components/metadata.yaml") for d in diagnostics)
+
+
+class TestRPC:
+    """Test the socket server and client."""
+
+    @pytest.fixture
+    def socket_path(self, topics, tmp_path):
+        path = tmp_path / "validation.sock"
+        server = make_server(ValidationService(topics), socket_path=path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield path
+        server.shutdown()
+        server.server_close()
+
+    def test_round_trip(self, topics, socket_path):
+        assert request('ping', socket_path=socket_path) == "pong"
+        replace(topics / "tasks" / "content.yaml", "type: slide", "type: slidez")
+        result = request('validate', {'paths': [str(topics / "tasks" / "content.yaml")]}, socket_path=socket_path)
+        assert len(result['diagnostics']) == 1
+
+    def test_errors(self, socket_path, tmp_path):
+        with pytest.raises(RuntimeError, match="Unknown method"):
+            request('nope', socket_path=socket_path)
+        with pytest.raises(RuntimeError, match="paths"):
+            request('validate', {'paths': "topics"}, socket_path=socket_path)
+        with pytest.raises(ConnectionError):
+            request('ping', socket_path=tmp_path / "missing.sock")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])